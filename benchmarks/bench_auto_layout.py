@@ -0,0 +1,54 @@
+"""Benchmark for automatic graph layout.
+
+Times the layered layout and the force-directed layout, with NumPy when
+it is installed and in pure Python, on story graphs of increasing size
+whose nodes start scattered at random.
+
+Usage: python benchmarks/bench_auto_layout.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dvge.core.auto_layout import (
+    NUMPY_AVAILABLE, LayoutGraph, force_directed_layout, layered_layout
+)
+from dvge.core.graph_index import GraphIndex
+from dvge.models import DialogueNode
+
+
+def build_nodes(node_count, seed=1):
+    """Creates dialogue nodes whose choices mostly lead a little further into the story."""
+    rng = random.Random(seed)
+    nodes = {}
+    for i in range(node_count):
+        options = [{"text": f"Choice {j}",
+                    "nextNode": f"node_{min(i + 1 + rng.randrange(30), node_count - 1)}"}
+                   for j in range(2)]
+        nodes[f"node_{i}"] = DialogueNode(rng.randrange(20000), rng.randrange(20000),
+                                          f"node_{i}", text="Text", options=options)
+    return nodes
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f"{'nodes':>8} {'layered ms':>12} {'numpy ms':>12} {'python ms':>12}")
+    for node_count in (500, 2000, 5000):
+        graph = LayoutGraph.from_nodes(build_nodes(node_count), GraphIndex())
+        layered_ms = timed(layered_layout, graph)
+        numpy_ms = timed(force_directed_layout, graph, use_numpy=True) if NUMPY_AVAILABLE else float('nan')
+        python_ms = timed(force_directed_layout, graph, use_numpy=False)
+        print(f"{node_count:>8} {layered_ms:>12.1f} {numpy_ms:>12.1f} {python_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
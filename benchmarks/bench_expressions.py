@@ -0,0 +1,98 @@
+"""Benchmark for expression evaluation.
+
+Compares the compiled expression engine with the previous approach of
+substituting every variable into the text and calling eval() each time,
+for {= ...} math, {condition ? a : b} conditions and ${var} expressions,
+with a growing number of project variables.
+
+Usage: python benchmarks/bench_expressions.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dvge.core.condition_evaluator import ConditionEvaluator
+from dvge.core.variable_system import VariableSystem
+
+
+def legacy_math(expression, variables):
+    """The former evaluate_math_expression: replace every variable, then eval."""
+    expr = expression
+    for var_name, value in variables.items():
+        expr = expr.replace(f"{{{var_name}}}", str(value))
+    expr = re.sub(r'random\((\d+),\s*(\d+)\)',
+                  lambda m: str(random.randint(int(m.group(1)), int(m.group(2)))), expr)
+    if all(c in set('0123456789+-*/.() ') for c in expr):
+        return eval(expr)
+    return 0
+
+
+def legacy_condition(condition, variables, flags):
+    """The former _evaluate_condition: replace every name, then split on the operator."""
+    for var_name, value in variables.items():
+        condition = condition.replace(f"{var_name}", str(value))
+    for flag_name, value in flags.items():
+        condition = condition.replace(f"{flag_name}", str(value).lower())
+    if '>=' in condition:
+        left, right = condition.split('>=')
+        return float(left.strip()) >= float(right.strip())
+    condition = condition.strip().lower()
+    return condition in ['true', '1']
+
+
+def legacy_expression(expression, context, functions):
+    """The former ConditionEvaluator.evaluate_expression: regex substitution, then eval."""
+    def replace_var(match):
+        value = context.get(match.group(1), "")
+        return f'"{value}"' if isinstance(value, str) else str(value)
+    processed = re.sub(r'\$\{([^}]+)\}', replace_var, expression)
+    return eval(processed, {"__builtins__": {}, **functions})
+
+
+def time_call(function, repeat):
+    """Returns mean microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) * 1e6 / repeat
+
+
+def run(variable_count, repeat=2000):
+    """Returns (legacy, compiled) microseconds for each kind of expression."""
+    variables = {f"var_{i}": i for i in range(variable_count)}
+    variables.update({"gold": 120, "level": 7})
+    flags = {f"flag_{i}": bool(i % 2) for i in range(variable_count)}
+
+    var_system = VariableSystem()
+    var_system.set_variables_ref(variables)
+    var_system.set_flags_ref(flags)
+    evaluator = ConditionEvaluator(var_system)
+
+    math = "{gold} * 2 + {level} * 10"
+    condition = "gold >= 100"
+    expression = "${gold} > 100 and max(${level}, 3) == 7"
+
+    return {
+        "math": (time_call(lambda: legacy_math(math, variables), repeat),
+                 time_call(lambda: var_system.evaluate_math_expression(math), repeat)),
+        "condition": (time_call(lambda: legacy_condition(condition, variables, flags), repeat),
+                      time_call(lambda: var_system._evaluate_condition(condition), repeat)),
+        "expression": (time_call(lambda: legacy_expression(expression, variables, evaluator.functions), repeat),
+                       time_call(lambda: evaluator.evaluate_expression(expression, variables), repeat)),
+    }
+
+
+def main():
+    print(f"{'variables':>10} {'kind':>12} {'legacy us':>12} {'compiled us':>12}")
+    for variable_count in (10, 200, 2000):
+        for kind, (legacy_us, compiled_us) in run(variable_count).items():
+            print(f"{variable_count:>10} {kind:>12} {legacy_us:>12.2f} {compiled_us:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark for undo/redo snapshot cost.
+
+Times save_state, undo and redo on projects of increasing size while
+editing a fixed number of nodes per action. With structural sharing the
+per-action cost should stay roughly flat as the project grows.
+
+Usage: python benchmarks/bench_state_manager.py
+"""
+
+import os
+import sys
+import time
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dvge.core.state_manager import StateManager
+from dvge.models import DialogueNode
+
+
+def build_app(node_count):
+    """Creates a headless stand-in for the editor with dialogue nodes."""
+    app = Mock()
+    app.nodes = {}
+    for i in range(node_count):
+        node_id = f"node_{i}"
+        options = [{"text": f"Choice {j}", "nextNode": f"node_{(i + j + 1) % node_count}",
+                    "conditions": [], "effects": []} for j in range(3)]
+        app.nodes[node_id] = DialogueNode(i * 40, (i % 50) * 40, node_id,
+                                          text=f"Dialogue line {i} " * 10, options=options)
+    app.player_stats = {"health": 100, "strength": 10}
+    app.player_inventory = []
+    app.story_flags = {f"flag_{i}": False for i in range(50)}
+    app.variables = {f"var_{i}": i for i in range(50)}
+    app.quests = {}
+    app.enemies = {}
+    app.timers = {}
+    app.project_settings = {"title": "Benchmark"}
+    app.node_id_counter = node_count
+    app.active_node_id = None
+    app.selected_node_ids = []
+    return app
+
+
+def run(node_count, actions=50, edits_per_action=1):
+    """Returns mean milliseconds for save, undo and redo."""
+    app = build_app(node_count)
+    manager = StateManager(app)
+    manager.max_undo_states = actions + 1
+    manager.save_state("Initial State")
+
+    node_ids = list(app.nodes)
+    start = time.perf_counter()
+    for action in range(actions):
+        for edit in range(edits_per_action):
+            node = app.nodes[node_ids[(action * edits_per_action + edit) % node_count]]
+            node.x += 1
+        manager.save_state("Move")
+    save_ms = (time.perf_counter() - start) * 1000 / actions
+
+    start = time.perf_counter()
+    for _ in range(actions):
+        manager.undo()
+    undo_ms = (time.perf_counter() - start) * 1000 / actions
+
+    start = time.perf_counter()
+    for _ in range(actions):
+        manager.redo()
+    redo_ms = (time.perf_counter() - start) * 1000 / actions
+
+    return save_ms, undo_ms, redo_ms
+
+
+def main():
+    print(f"{'nodes':>8} {'save ms':>10} {'undo ms':>10} {'redo ms':>10}")
+    for node_count in (250, 1000, 4000):
+        save_ms, undo_ms, redo_ms = run(node_count)
+        print(f"{node_count:>8} {save_ms:>10.3f} {undo_ms:>10.3f} {redo_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
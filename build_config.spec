@@ -17,6 +17,9 @@ if template_dir.exists():
     for template_file in template_dir.glob('*.json'):
         datas.append((str(template_file), 'dvge/templates'))
 
+# Include the Node.js script worker
+datas.append((str(project_root / 'dvge' / 'core' / 'script_worker.js'), 'dvge/core'))
+
 # Include any other data files
 data_dirs = [
     'dvge/constants',
@@ -8,11 +8,18 @@ A powerful, intuitive, node-based editor for creating branching dialogue and nar
 __version__ = "1.0.0"
 __author__ = "Dice Verce"
 
-# Import main components for easier access
-from .core.application import DVGApp
-
+# Import main components for easier access. The editor is imported on first
+# use, so GUI-free packages such as dvge.runtime load without Tk.
 from .models import DialogueNode, CombatNode, DiceRollNode, Quest, GameTimer, Enemy
 
+
+def __getattr__(name):
+    if name == 'DVGApp':
+        from .core.application import DVGApp
+        return DVGApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     'DVGApp',
     'DialogueNode', 
@@ -2,6 +2,7 @@
 
 # AI Service imports
 from .ai_service import AIService, AIProvider, AIRequest, AIResponse
+from .batch_executor import AIBatchExecutor
 from .providers import OpenAIProvider, AnthropicProvider, LocalAIProvider
 from .generators import DialogueGenerator, CharacterGenerator, StoryGenerator, ContentAnalyzer
 
@@ -10,6 +11,7 @@ __all__ = [
     'AIProvider', 
     'AIRequest',
     'AIResponse',
+    'AIBatchExecutor',
     'OpenAIProvider',
     'AnthropicProvider', 
     'LocalAIProvider',
@@ -12,6 +12,10 @@ import threading
 from datetime import datetime, timedelta
 
 
+# Error of responses refused because the provider's rate limit is reached
+RATE_LIMIT_ERROR = "Rate limit exceeded. Please try again later."
+
+
 class AIProviderType(Enum):
     """Supported AI provider types."""
     OPENAI = "openai"
@@ -116,6 +120,11 @@ class AIService:
         self.request_history: List[Dict[str, Any]] = []
         self.max_history = 100
         
+        # Event loop all requests run on, started on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        
         # Initialize default providers
         self._initialize_providers()
     
@@ -246,18 +255,19 @@ class AIService:
             return AIResponse(
                 content="",
                 success=False,
-                error="Rate limit exceeded. Please try again later.",
+                error=RATE_LIMIT_ERROR,
                 provider=provider_name
             )
         
+        # Count the request before awaiting it so that concurrent requests
+        # cannot all pass the check above
+        provider.increment_rate_limit()
+        
         try:
             # Generate content
             response = await provider.generate_content(request)
             response.provider = provider_name
             
-            # Increment rate limit
-            provider.increment_rate_limit()
-            
             # Cache successful responses
             if response.success:
                 self._cache_response(cache_key, response)
@@ -279,21 +289,37 @@ class AIService:
     
     def generate_content_sync(self, request: AIRequest, provider_name: Optional[str] = None) -> AIResponse:
         """Synchronous wrapper for generate_content."""
-        try:
-            # Try to get the current running loop
-            try:
-                loop = asyncio.get_running_loop()
-                # If we're already in an async context, run in thread
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, self.generate_content(request, provider_name))
-                    return future.result(timeout=30)
-            except RuntimeError:
-                # No running loop, safe to use asyncio.run
-                return asyncio.run(self.generate_content(request, provider_name))
-        except Exception:
-            # Fallback for any other issues
-            return asyncio.run(self.generate_content(request, provider_name))
+        if threading.current_thread() is self._loop_thread:
+            # Called from a coroutine on the service loop, which cannot wait for itself
+            import concurrent.futures
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                future = executor.submit(asyncio.run, self.generate_content(request, provider_name))
+                return future.result(timeout=30)
+        return self.run_coroutine(self.generate_content(request, provider_name))
+    
+    def get_event_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop requests run on, starting it on first use.
+        
+        The loop runs on a daemon thread for the lifetime of the service, so
+        synchronous callers do not pay for a new event loop per request and
+        concurrent requests share provider state such as rate limits.
+        """
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="AIServiceLoop", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+    
+    def run_coroutine(self, coroutine, timeout: Optional[float] = None):
+        """Run a coroutine on the service loop and wait for its result."""
+        if threading.current_thread() is self._loop_thread:
+            coroutine.close()
+            raise RuntimeError("run_coroutine() cannot be called from the AI service loop")
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.get_event_loop())
+        return future.result(timeout)
     
     def _get_cached_response(self, cache_key: str) -> Optional[AIResponse]:
         """Get response from cache if available and not expired."""
@@ -0,0 +1,155 @@
+"""Concurrent execution of batches of AI requests for DVGE."""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .ai_service import AIService, AIRequest, AIResponse, RATE_LIMIT_ERROR
+
+
+# Requests in flight at once unless the provider allows fewer
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Shortest wait before a rate-limited request is tried again, in seconds
+MIN_RATE_LIMIT_DELAY = 0.05
+
+
+class BatchCancelled(Exception):
+    """Raised by AIBatchExecutor.generate() once the batch is cancelled."""
+
+
+class AIBatchExecutor:
+    """Runs many AI requests concurrently on the AI service's event loop.
+
+    At most max_concurrency requests are in flight at a time; a provider can
+    lower this with its "max_concurrent_requests" setting. Requests over the
+    provider's per-minute rate limit wait for the next window instead of
+    failing. Results are handed to a callback as they arrive, and a batch
+    can be cancelled from any thread.
+
+    An executor runs one batch; create a new one for the next.
+    """
+
+    def __init__(self,
+                 ai_service: AIService,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 provider_name: Optional[str] = None):
+        self.ai_service = ai_service
+        self.provider_name = provider_name
+        self.max_concurrency = max(1, max_concurrency)
+        self.cancelled = False
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks = set()
+        self._lock = threading.Lock()
+
+    @property
+    def concurrency(self) -> int:
+        """Number of requests allowed in flight at once."""
+        provider = self._provider()
+        if provider is not None:
+            limit = provider.config.get("max_concurrent_requests")
+            if limit:
+                return max(1, min(self.max_concurrency, int(limit)))
+        return self.max_concurrency
+
+    async def generate(self, request: AIRequest) -> AIResponse:
+        """Generate content for one request of the batch.
+
+        Jobs passed to run() call this instead of AIService.generate_content.
+        Raises BatchCancelled once the batch is cancelled.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            while True:
+                self._check_cancelled()
+                provider = self._provider()
+                if provider is not None and not provider.check_rate_limit():
+                    await asyncio.sleep(self._rate_limit_delay(provider))
+                    continue
+                response = await self.ai_service.generate_content(request, self.provider_name)
+                # Another caller may have used up the limit in the meantime
+                if response.success or response.error != RATE_LIMIT_ERROR or provider is None:
+                    return response
+
+    def run(self,
+            jobs: Dict[Hashable, Callable[[], Awaitable[Any]]],
+            on_result: Optional[Callable[[Hashable, Any, Optional[Exception]], None]] = None
+            ) -> Dict[Hashable, Any]:
+        """Run jobs concurrently and wait for them to finish.
+
+        Args:
+            jobs: Key -> coroutine function taking no arguments; jobs make
+                their requests through generate().
+            on_result: Called as on_result(key, result, error) as each job
+                finishes, on the AI service's loop thread. error is the
+                exception the job raised, or None. Jobs stopped by cancel()
+                are not reported.
+
+        Returns:
+            Key -> result of every job that finished without error.
+        """
+        if not jobs:
+            return {}
+        return self.ai_service.run_coroutine(self._run_jobs(jobs, on_result))
+
+    def cancel(self):
+        """Stop the batch; requests in flight are abandoned. Thread-safe."""
+        with self._lock:
+            self.cancelled = True
+            tasks = list(self._tasks)
+        if tasks:
+            loop = self.ai_service.get_event_loop()
+            for task in tasks:
+                loop.call_soon_threadsafe(task.cancel)
+
+    async def _run_jobs(self, jobs, on_result):
+        results = {}
+        with self._lock:
+            if self.cancelled:
+                return results
+            pending = {asyncio.ensure_future(job()): key for key, job in jobs.items()}
+            self._tasks.update(pending)
+
+        try:
+            waiting = set(pending)
+            while waiting:
+                done, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    key = pending[task]
+                    error = task.exception()
+                    if isinstance(error, BatchCancelled):
+                        continue
+                    if error is None:
+                        results[key] = task.result()
+                    self._report(on_result, key, task.result() if error is None else None, error)
+        finally:
+            with self._lock:
+                self._tasks.difference_update(pending)
+            for task in pending:
+                task.cancel()
+        return results
+
+    @staticmethod
+    def _report(on_result, key, result, error):
+        if on_result is None:
+            return
+        try:
+            on_result(key, result, error)
+        except Exception as e:
+            print(f"Error handling AI batch result for {key}: {e}")
+
+    def _check_cancelled(self):
+        if self.cancelled:
+            raise BatchCancelled()
+
+    def _provider(self):
+        name = self.provider_name or self.ai_service.default_provider
+        return self.ai_service.providers.get(name) if name else None
+
+    @staticmethod
+    def _rate_limit_delay(provider) -> float:
+        return max(provider.rate_limit_reset - time.time(), MIN_RATE_LIMIT_DELAY)
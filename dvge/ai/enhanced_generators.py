@@ -2,9 +2,10 @@
 
 import json
 import re
-from typing import Dict, Any, List, Optional, Tuple, Set
+from typing import Dict, Any, Callable, List, Optional, Tuple, Set
 from dataclasses import dataclass
 from .ai_service import AIService, AIRequest, AIResponse
+from .batch_executor import AIBatchExecutor
 from .generators import DialogueGenerator, CharacterGenerator, StoryGenerator
 
 
@@ -158,7 +159,19 @@ Format as JSON:
                                     hidden_motivation: str,
                                     story_context: StoryContext) -> str:
         """Add subtext and deeper meaning to dialogue."""
+        request = self._subtext_request(original_dialogue, character, hidden_motivation, story_context)
+        response = self.ai_service.generate_content_sync(request)
         
+        if response.success:
+            return self._clean_dialogue(response.content, character)
+        return original_dialogue
+    
+    def _subtext_request(self,
+                         original_dialogue: str,
+                         character: str,
+                         hidden_motivation: str,
+                         story_context: StoryContext) -> AIRequest:
+        """Build the request for enhance_dialogue_with_subtext."""
         prompt = f"""Enhance this dialogue with subtext and deeper meaning:
 
 ORIGINAL: "{original_dialogue}"
@@ -177,7 +190,7 @@ Rewrite the dialogue to:
 
 Return only the enhanced dialogue line."""
 
-        request = AIRequest(
+        return AIRequest(
             prompt=prompt,
             context={
                 "character": character,
@@ -187,12 +200,6 @@ Return only the enhanced dialogue line."""
             max_tokens=120,
             temperature=0.8
         )
-        
-        response = self.ai_service.generate_content_sync(request)
-        
-        if response.success:
-            return self._clean_dialogue(response.content, character)
-        return original_dialogue
     
     def _build_context_prompt(self, character: str, story_context: StoryContext) -> str:
         """Build comprehensive context prompt for character."""
@@ -266,7 +273,15 @@ class StoryIntelligenceAnalyzer:
         
     def analyze_story_structure(self, nodes: Dict[str, Any]) -> Dict[str, Any]:
         """Comprehensive story structure analysis."""
+        response = self.ai_service.generate_content_sync(self._structure_request(nodes))
+        
+        if response.success:
+            return self._parse_story_analysis(response.content)
         
+        return {"error": response.error}
+    
+    def _structure_request(self, nodes: Dict[str, Any]) -> AIRequest:
+        """Build the request for analyze_story_structure."""
         # Build story graph representation
         story_summary = self._build_story_summary(nodes)
         
@@ -313,23 +328,24 @@ Provide analysis in these categories:
 
 Return detailed analysis with specific examples and actionable suggestions."""
 
-        request = AIRequest(
+        return AIRequest(
             prompt=prompt,
             context={"node_count": len(nodes)},
             max_tokens=800,
             temperature=0.3
         )
-        
-        response = self.ai_service.generate_content_sync(request)
-        
-        if response.success:
-            return self._parse_story_analysis(response.content)
-        
-        return {"error": response.error}
     
     def detect_plot_holes(self, nodes: Dict[str, Any], story_context: StoryContext) -> List[Dict[str, Any]]:
         """Detect logical inconsistencies and plot holes."""
+        response = self.ai_service.generate_content_sync(self._plot_holes_request(nodes, story_context))
         
+        if response.success:
+            return self._parse_plot_holes(response.content)
+        
+        return [{"error": response.error}]
+    
+    def _plot_holes_request(self, nodes: Dict[str, Any], story_context: StoryContext) -> AIRequest:
+        """Build the request for detect_plot_holes."""
         # Analyze story logic
         story_logic = self._extract_story_logic(nodes, story_context)
         
@@ -368,26 +384,31 @@ For each issue found, provide:
 
 Format as structured list with clear categories."""
 
-        request = AIRequest(
+        return AIRequest(
             prompt=prompt,
             context={"story_context": story_context.__dict__},
             max_tokens=600,
             temperature=0.2
         )
-        
-        response = self.ai_service.generate_content_sync(request)
-        
-        if response.success:
-            return self._parse_plot_holes(response.content)
-        
-        return [{"error": response.error}]
     
     def suggest_story_improvements(self, 
                                  nodes: Dict[str, Any], 
                                  story_context: StoryContext,
                                  focus_area: str = "overall") -> List[Dict[str, str]]:
         """Generate specific, actionable story improvement suggestions."""
+        request = self._improvements_request(nodes, story_context, focus_area)
+        response = self.ai_service.generate_content_sync(request)
         
+        if response.success:
+            return self._parse_improvement_suggestions(response.content)
+        
+        return [{"error": response.error}]
+    
+    def _improvements_request(self,
+                              nodes: Dict[str, Any],
+                              story_context: StoryContext,
+                              focus_area: str = "overall") -> AIRequest:
+        """Build the request for suggest_story_improvements."""
         focus_prompts = {
             "pacing": "Focus on story pacing and rhythm issues",
             "character": "Focus on character development and consistency",
@@ -421,7 +442,7 @@ For each suggestion, provide:
 
 Focus on practical, implementable suggestions that will meaningfully enhance the story."""
 
-        request = AIRequest(
+        return AIRequest(
             prompt=prompt,
             context={
                 "focus_area": focus_area,
@@ -430,13 +451,6 @@ Focus on practical, implementable suggestions that will meaningfully enhance the
             max_tokens=700,
             temperature=0.4
         )
-        
-        response = self.ai_service.generate_content_sync(request)
-        
-        if response.success:
-            return self._parse_improvement_suggestions(response.content)
-        
-        return [{"error": response.error}]
     
     def _build_story_summary(self, nodes: Dict[str, Any]) -> str:
         """Build concise story summary for analysis."""
@@ -975,8 +989,31 @@ Provide specific, actionable feedback."""
         return validation
 
 
+def get_node_game_data(node: Any) -> Dict[str, Any]:
+    """Get the text, character and choices of a node.
+
+    Accepts node dictionaries with a 'game_data' entry as well as node
+    objects, whose npc and options are returned as character and choices.
+    """
+    if isinstance(node, dict):
+        return node.get('game_data', {})
+    game_data = getattr(node, 'game_data', None)
+    if isinstance(game_data, dict):
+        return game_data
+    return {
+        key: getattr(node, attribute)
+        for key, attribute in (('text', 'text'), ('character', 'npc'), ('choices', 'options'))
+        if hasattr(node, attribute)
+    }
+
+
 class BatchAIOperations:
-    """Batch AI operations for mass content improvement and generation."""
+    """Batch AI operations for mass content improvement and generation.
+    
+    Requests of a batch run concurrently through an AIBatchExecutor. Pass
+    your own executor to choose the concurrency or to cancel the batch, and
+    on_result to receive each node's result as soon as it arrives.
+    """
     
     def __init__(self, ai_service: AIService):
         self.ai_service = ai_service
@@ -986,129 +1023,186 @@ class BatchAIOperations:
     def batch_improve_dialogue(self,
                              nodes: Dict[str, Any],
                              improvement_type: str = "general",
-                             character_context: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Improve dialogue across all nodes in batch."""
+                             character_context: Dict[str, Dict[str, Any]] = None,
+                             on_result: Optional[Callable] = None,
+                             executor: Optional[AIBatchExecutor] = None) -> Dict[str, Any]:
+        """Improve dialogue across all nodes in batch.
+        
+        on_result(node_id, improvement, error) is called as each node is
+        done; improvement is the entry added to results["improvements"], or
+        None if the text was left unchanged.
+        """
         
         results = {
             "processed": 0,
             "improved": 0,
             "errors": 0,
             "improvements": {},
-            "summary": ""
+            "summary": "",
+            "cancelled": False
         }
         
         character_context = character_context or {}
+        executor = executor or AIBatchExecutor(self.ai_service)
+        originals = {}
+        jobs = {}
         
         for node_id, node in nodes.items():
-            try:
-                game_data = node.get('game_data', {})
-                text = game_data.get('text', '')
+            game_data = get_node_game_data(node)
+            text = game_data.get('text', '')
+            
+            if text and len(text.strip()) > 10:  # Only process substantial text
+                # Determine character if possible
+                character = game_data.get('character', 'Unknown')
+                originals[node_id] = (text, character)
                 
-                if text and len(text.strip()) > 10:  # Only process substantial text
-                    # Determine character if possible
-                    character = game_data.get('character', 'Unknown')
-                    
-                    # Build story context for this node
+                if character in character_context:
                     story_context = self._build_node_context(node, nodes, character_context)
-                    
-                    # Improve the dialogue
-                    if character in character_context:
-                        improved = self.dialogue_engine.enhance_dialogue_with_subtext(
-                            text, character, "engage the player", story_context
-                        )
-                    else:
-                        # Fallback to basic improvement
-                        improved = self._basic_dialogue_improvement(text, improvement_type)
-                    
-                    if improved != text:
-                        results["improvements"][node_id] = {
-                            "original": text,
-                            "improved": improved,
-                            "character": character
-                        }
-                        results["improved"] += 1
-                    
-                    results["processed"] += 1
-                    
-            except Exception as e:
-                results["errors"] += 1
-                print(f"Error processing node {node_id}: {e}")
+                    request = self.dialogue_engine._subtext_request(
+                        text, character, "engage the player", story_context
+                    )
+                    parse = lambda response, text=text, character=character: (
+                        self.dialogue_engine._clean_dialogue(response.content, character)
+                        if response.success else text
+                    )
+                else:
+                    # Fallback to basic improvement
+                    request = self._improvement_request(text, improvement_type)
+                    parse = lambda response, text=text: self._parse_improvement(response, text)
+                
+                jobs[node_id] = self._job(executor, request, parse)
         
+        def collect(node_id, improved, error):
+            improvement = None
+            if error is not None:
+                results["errors"] += 1
+                print(f"Error processing node {node_id}: {error}")
+            else:
+                text, character = originals[node_id]
+                if improved != text:
+                    improvement = {
+                        "original": text,
+                        "improved": improved,
+                        "character": character
+                    }
+                    results["improvements"][node_id] = improvement
+                    results["improved"] += 1
+                results["processed"] += 1
+            if on_result:
+                on_result(node_id, improvement, error)
+        
+        executor.run(jobs, collect)
+        results["cancelled"] = executor.cancelled
         results["summary"] = f"Processed {results['processed']} nodes, improved {results['improved']}, {results['errors']} errors"
         return results
     
     def batch_generate_missing_choices(self,
                                      nodes: Dict[str, Any],
                                      min_choices: int = 2,
-                                     story_context: StoryContext = None) -> Dict[str, Any]:
-        """Generate missing player choices for nodes that need them."""
+                                     story_context: StoryContext = None,
+                                     on_result: Optional[Callable] = None,
+                                     executor: Optional[AIBatchExecutor] = None) -> Dict[str, Any]:
+        """Generate missing player choices for nodes that need them.
+        
+        on_result(node_id, new_choices, error) is called as each node is done.
+        """
         
         results = {
             "nodes_processed": 0,
             "choices_generated": 0,
             "new_choices": {},
-            "errors": []
+            "errors": [],
+            "cancelled": False
         }
         
         story_context = story_context or StoryContext()
+        executor = executor or AIBatchExecutor(self.ai_service)
+        jobs = {}
         
         for node_id, node in nodes.items():
-            try:
-                game_data = node.get('game_data', {})
-                current_choices = game_data.get('choices', [])
-                
-                if len(current_choices) < min_choices:
-                    # Generate additional choices
-                    situation = game_data.get('text', 'A story situation')
-                    character = game_data.get('character', 'Character')
-                    
-                    # Use context-aware choice generation
-                    needed_choices = min_choices - len(current_choices)
-                    
-                    new_choices = self._generate_contextual_choices(
-                        situation, character, needed_choices, story_context
-                    )
-                    
-                    if new_choices:
-                        results["new_choices"][node_id] = new_choices
-                        results["choices_generated"] += len(new_choices)
+            game_data = get_node_game_data(node)
+            current_choices = game_data.get('choices', [])
+            
+            if len(current_choices) < min_choices:
+                # Generate additional choices
+                situation = game_data.get('text', 'A story situation')
+                character = game_data.get('character', 'Character')
                 
+                # Use context-aware choice generation
+                needed_choices = min_choices - len(current_choices)
+                request = self._choices_request(situation, character, needed_choices, story_context)
+                jobs[node_id] = self._job(
+                    executor, request,
+                    lambda response, count=needed_choices: self._parse_choices(response, count)
+                )
+            else:
                 results["nodes_processed"] += 1
-                
-            except Exception as e:
-                results["errors"].append(f"Node {node_id}: {str(e)}")
         
+        def collect(node_id, new_choices, error):
+            if error is not None:
+                results["errors"].append(f"Node {node_id}: {str(error)}")
+            else:
+                if new_choices:
+                    results["new_choices"][node_id] = new_choices
+                    results["choices_generated"] += len(new_choices)
+                results["nodes_processed"] += 1
+            if on_result:
+                on_result(node_id, new_choices, error)
+        
+        executor.run(jobs, collect)
+        results["cancelled"] = executor.cancelled
         return results
     
     def batch_analyze_story_quality(self,
                                    nodes: Dict[str, Any],
-                                   story_context: StoryContext = None) -> Dict[str, Any]:
-        """Comprehensive batch analysis of story quality metrics."""
+                                   story_context: StoryContext = None,
+                                   on_result: Optional[Callable] = None,
+                                   executor: Optional[AIBatchExecutor] = None) -> Dict[str, Any]:
+        """Comprehensive batch analysis of story quality metrics.
+        
+        The analyses run concurrently; on_result(name, analysis, error) is
+        called as each of "structure", "plot_holes" and "improvements" is done.
+        """
         
         story_context = story_context or StoryContext(nodes=nodes)
+        executor = executor or AIBatchExecutor(self.ai_service)
+        analyzer = self.story_analyzer
         
         # Run multiple analysis types
-        analyses = {}
-        
-        try:
+        analyses = {
+            "structure": {"error": "Analysis was cancelled"},
+            "plot_holes": [{"error": "Analysis was cancelled"}],
+            "improvements": [{"error": "Analysis was cancelled"}]
+        }
+        jobs = {
             # Structure analysis
-            analyses["structure"] = self.story_analyzer.analyze_story_structure(nodes)
-        except Exception as e:
-            analyses["structure"] = {"error": str(e)}
-        
-        try:
+            "structure": self._job(
+                executor, lambda: analyzer._structure_request(nodes),
+                lambda response: analyzer._parse_story_analysis(response.content)
+                if response.success else {"error": response.error}
+            ),
             # Plot hole detection
-            analyses["plot_holes"] = self.story_analyzer.detect_plot_holes(nodes, story_context)
-        except Exception as e:
-            analyses["plot_holes"] = [{"error": str(e)}]
-        
-        try:
+            "plot_holes": self._job(
+                executor, lambda: analyzer._plot_holes_request(nodes, story_context),
+                lambda response: analyzer._parse_plot_holes(response.content)
+                if response.success else [{"error": response.error}]
+            ),
             # Improvement suggestions
-            analyses["improvements"] = self.story_analyzer.suggest_story_improvements(
-                nodes, story_context, "overall"
+            "improvements": self._job(
+                executor, lambda: analyzer._improvements_request(nodes, story_context, "overall"),
+                lambda response: analyzer._parse_improvement_suggestions(response.content)
+                if response.success else [{"error": response.error}]
             )
-        except Exception as e:
-            analyses["improvements"] = [{"error": str(e)}]
+        }
+        
+        def collect(name, analysis, error):
+            if error is not None:
+                analysis = {"error": str(error)} if name == "structure" else [{"error": str(error)}]
+            analyses[name] = analysis
+            if on_result:
+                on_result(name, analysis, error)
+        
+        executor.run(jobs, collect)
         
         # Calculate overall quality score
         analyses["overall_score"] = self._calculate_quality_score(analyses)
@@ -1118,6 +1212,17 @@ class BatchAIOperations:
         
         return analyses
     
+    @staticmethod
+    def _job(executor: AIBatchExecutor, request, parse: Callable[[AIResponse], Any]):
+        """Make a job for executor.run() sending a request and parsing its response.
+        
+        request is an AIRequest or a function building one when the job runs.
+        """
+        async def job():
+            response = await executor.generate(request() if callable(request) else request)
+            return parse(response)
+        return job
+    
     def _build_node_context(self, 
                           node: Dict[str, Any], 
                           all_nodes: Dict[str, Any], 
@@ -1132,16 +1237,21 @@ class BatchAIOperations:
     
     def _basic_dialogue_improvement(self, text: str, improvement_type: str) -> str:
         """Basic dialogue improvement without character context."""
+        response = self.ai_service.generate_content_sync(self._improvement_request(text, improvement_type))
+        return self._parse_improvement(response, text)
+    
+    def _improvement_request(self, text: str, improvement_type: str) -> AIRequest:
+        """Build the request for _basic_dialogue_improvement."""
         prompt = f"Improve this dialogue to be more {improvement_type}: \"{text}\"\n\nReturn only the improved dialogue."
         
-        request = AIRequest(
+        return AIRequest(
             prompt=prompt,
             max_tokens=150,
             temperature=0.7
         )
-        
-        response = self.ai_service.generate_content_sync(request)
-        
+    
+    def _parse_improvement(self, response: AIResponse, text: str) -> str:
+        """Extract the improved dialogue from a response."""
         if response.success:
             improved = response.content.strip()
             improved = re.sub(r'^["\']|["\']$', '', improved)
@@ -1155,6 +1265,16 @@ class BatchAIOperations:
                                    count: int,
                                    story_context: StoryContext) -> List[str]:
         """Generate contextual player choices."""
+        request = self._choices_request(situation, character, count, story_context)
+        response = self.ai_service.generate_content_sync(request)
+        return self._parse_choices(response, count)
+    
+    def _choices_request(self,
+                         situation: str,
+                         character: str,
+                         count: int,
+                         story_context: StoryContext) -> AIRequest:
+        """Build the request for _generate_contextual_choices."""
         prompt = f"""Generate {count} player choice options for this situation: {situation}
         
 Character involved: {character}
@@ -1169,14 +1289,14 @@ Create {count} distinct, meaningful choices that:
 
 Return each choice on a separate line, without numbering."""
 
-        request = AIRequest(
+        return AIRequest(
             prompt=prompt,
             max_tokens=200,
             temperature=0.8
         )
-        
-        response = self.ai_service.generate_content_sync(request)
-        
+    
+    def _parse_choices(self, response: AIResponse, count: int) -> List[str]:
+        """Extract the choices from a response."""
         if response.success:
             lines = response.content.strip().split('\n')
             choices = []
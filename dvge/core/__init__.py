@@ -1,29 +1,45 @@
 # dvge/core/__init__.py
 
-"""Core functionality package for DVGE."""
-
-from .application import DVGApp
-from .state_manager import StateManager
-from .project_handler import ProjectHandler
-from .html_exporter import HTMLExporter
-from .validation import ProjectValidator
-from .utils import *
-
-__all__ = [
-    'DVGApp',
-    'StateManager',
-    'ProjectHandler', 
-    'HTMLExporter',
-    'ProjectValidator',
-    'encode_file_to_base64',
-    'validate_node_id',
-    'safe_float_conversion',
-    'safe_int_conversion',
-    'show_error',
-    'show_warning',
-    'show_info',
-    'ask_yes_no',
-    'get_file_mime_type',
-    'validate_file_size',
-    'get_supported_formats'
-]
\ No newline at end of file
+"""Core functionality package for DVGE.
+
+Submodules are imported on first use of the names below, so GUI-free
+modules (expression engine, condition programs, project containers) can be
+imported without loading Tk.
+"""
+
+import importlib
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    'DVGApp': 'application',
+    'StateManager': 'state_manager',
+    'ProjectHandler': 'project_handler',
+    'HTMLExporter': 'html_exporter',
+    'ProjectValidator': 'validation',
+    'encode_file_to_base64': 'utils',
+    'validate_node_id': 'utils',
+    'safe_float_conversion': 'utils',
+    'safe_int_conversion': 'utils',
+    'show_error': 'utils',
+    'show_warning': 'utils',
+    'show_info': 'utils',
+    'ask_yes_no': 'utils',
+    'get_file_mime_type': 'utils',
+    'validate_file_size': 'utils',
+    'get_supported_formats': 'utils',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
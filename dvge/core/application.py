@@ -70,6 +70,12 @@ class DVGApp(ctk.CTk):
         # Initialize plugin system
         self._initialize_plugin_system()
         
+        # Initialize autosave before the first snapshot is taken
+        self._initialize_autosave()
+        
+        # Continuous validation feedback on the canvas
+        self._initialize_live_validation()
+        
         # Initial state
         self.after(100, self.state_manager.save_state, "Initial State")
 
@@ -186,7 +192,7 @@ class DVGApp(ctk.CTk):
         
         # Update UI
         self.canvas_manager.update_selection_visuals()
-        self.properties_panel.update_properties_panel()
+        self.canvas_manager.schedule_properties_update()
         
         # Update preview toolbar if it exists
         if hasattr(self, 'preview_toolbar'):
@@ -213,6 +219,7 @@ class DVGApp(ctk.CTk):
                     
                 if result["action"] == "create_blank":
                     print("DEBUG: Creating blank project")
+                    self.project_handler.cancel_loading()
                     self._initialize_project_state()
                 elif result["action"] == "create_from_template":
                     template = result["template"]
@@ -237,7 +244,11 @@ class DVGApp(ctk.CTk):
 
     def save_project_handler(self): 
         """Save the current project."""
-        return self.project_handler.save_project()
+        success = self.project_handler.save_project()
+        if success and self.autosave_journal:
+            # The saved file supersedes the autosave
+            self.autosave_journal.reset()
+        return success
         
     def load_project_handler(self): 
         """Load a project from file."""
@@ -273,12 +284,14 @@ class DVGApp(ctk.CTk):
     def remove_node(self, node_id):
         """Remove a node from the project."""
         if node_id in self.nodes:
+            from .graph_index import get_graph_index, remove_links_to
+            
+            linking_ids = get_graph_index(self).predecessors(node_id)
             del self.nodes[node_id]
             # Clean up references
-            for node in self.nodes.values():
-                for option in getattr(node, 'options', []):
-                    if option.get('nextNode') == node_id:
-                        option['nextNode'] = ""
+            for source_id in linking_ids:
+                if source_id in self.nodes:
+                    remove_links_to(self.nodes[source_id], node_id)
 
     def _initialize_feature_systems(self):
         """Initialize the advanced feature systems."""
@@ -341,6 +354,8 @@ class DVGApp(ctk.CTk):
         """Apply a project template to create a new project."""
         from .template_manager import TemplateManager
         
+        # The template replaces a project that may still be loading
+        self.project_handler.cancel_loading()
         template_manager = TemplateManager()
         template_manager.apply_template(template, self)
     
@@ -425,7 +440,62 @@ class DVGApp(ctk.CTk):
             # Cleanup plugins
             self.plugin_manager.cleanup()
     
+    def _initialize_autosave(self):
+        """Start the autosave journal and offer to restore a crashed session."""
+        try:
+            from .autosave import AutosaveJournal
+            
+            # Journals of editors that crashed are kept until the user has decided
+            recoverable = AutosaveJournal.find_recoverable()
+            if recoverable:
+                recovery_data = recoverable.read_recovery_data()
+                if recovery_data and recovery_data.get("nodes"):
+                    self.after(50, self._offer_autosave_recovery, recoverable, recovery_data)
+                else:
+                    recoverable.discard()
+            
+            # Each running editor writes a journal of its own
+            self.autosave_journal = AutosaveJournal.for_session(
+                extra_sections=self._get_autosave_extra_sections
+            )
+            
+            self.state_manager.snapshot_listeners.append(self.autosave_journal.record)
+            
+        except Exception as e:
+            print(f"Failed to initialize autosave: {e}")
+            self.autosave_journal = None
+    
+    def _initialize_live_validation(self):
+        """Start incremental validation after every change."""
+        from .live_validation import LiveValidator
+        
+        self.live_validator = LiveValidator(self)
+        self.live_validator.listeners.append(self.canvas_manager.show_validation_issues)
+        self.state_manager.snapshot_listeners.append(self.live_validator.schedule)
+    
+    def _get_autosave_extra_sections(self):
+        """Project data saved by autosave compactions but not tracked by undo."""
+        if hasattr(self, 'media_library') and self.media_library:
+            return {"media_library": self.media_library.to_dict()}
+        return {}
+    
+    def _offer_autosave_recovery(self, recoverable, recovery_data):
+        """Ask whether to restore the project autosaved before a crash."""
+        from tkinter import messagebox
+        if messagebox.askyesno(
+            "Recover Project",
+            "DVGE did not shut down cleanly. Restore the autosaved project?"
+        ):
+            self.project_handler._load_project_data(recovery_data)
+            self.variable_system.set_variables_ref(self.variables)
+            self.variable_system.set_flags_ref(self.story_flags)
+        # Only deleted once answered, so closing the editor at the prompt keeps it
+        recoverable.discard()
+    
     def destroy(self):
         """Override destroy to cleanup plugins."""
         self.cleanup_plugins()
+        if getattr(self, 'autosave_journal', None):
+            # A clean exit leaves nothing to recover
+            self.autosave_journal.discard()
         super().destroy()
\ No newline at end of file
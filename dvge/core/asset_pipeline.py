@@ -0,0 +1,163 @@
+# dvge/core/asset_pipeline.py
+
+"""Concurrent, streaming base64 encoder for exported media.
+
+Exports embed media files as base64 text. AssetPipeline reads and encodes
+them on a thread pool a chunk at a time, so a file is never held in memory
+both raw and encoded, only a few files are in flight at once, and the
+caller can report progress and cancel between chunks.
+"""
+
+import base64
+import hashlib
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# Bytes read per chunk; a multiple of 3 so chunks encode without padding
+READ_CHUNK_SIZE = 3 * 256 * 1024
+
+# Seconds between progress callbacks while waiting for workers
+POLL_INTERVAL = 0.05
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled while its assets are being encoded."""
+
+
+def data_uri_prefix(mime_type):
+    """Returns the text preceding the base64 data of a data URI."""
+    return f"data:{mime_type};base64,"
+
+
+def encode_file(path, prefix="", chunk_size=READ_CHUNK_SIZE, cancel_event=None):
+    """Base64-encodes a file one chunk at a time.
+
+    Args:
+        path: File to encode.
+        prefix: Text placed before the base64 data, e.g. a data URI prefix.
+        chunk_size: Bytes read at a time; must be a multiple of 3.
+        cancel_event: Optional threading.Event checked between chunks.
+
+    Returns:
+        (SHA-256 hex digest of the file content, prefix + base64 text).
+
+    Raises:
+        ExportCancelled: If cancel_event was set.
+    """
+    if chunk_size <= 0 or chunk_size % 3:
+        raise ValueError("chunk_size must be a positive multiple of 3")
+
+    digest = hashlib.sha256()
+    parts = [prefix]
+    leftover = b""
+    with open(path, "rb") as f:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            if leftover:
+                chunk = leftover + chunk
+            # Short reads would otherwise put padding in the middle of the output
+            cut = len(chunk) - len(chunk) % 3
+            leftover = chunk[cut:]
+            parts.append(base64.b64encode(chunk[:cut]).decode('ascii'))
+    if leftover:
+        parts.append(base64.b64encode(leftover).decode('ascii'))
+    return digest.hexdigest(), "".join(parts)
+
+
+class AssetPipeline:
+    """Encodes export media on a pool of worker threads.
+
+    A pipeline can be cancelled from any thread with cancel(); running and
+    later encodes then raise ExportCancelled.
+    """
+
+    def __init__(self, max_workers=None, chunk_size=READ_CHUNK_SIZE):
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self.chunk_size = chunk_size
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        """Whether cancel() has been called."""
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Stops encoding; workers finish their current chunk and give up."""
+        self._cancel_event.set()
+
+    def encode_file(self, path, prefix=""):
+        """Encodes one file on the calling thread; see encode_file()."""
+        return encode_file(path, prefix, self.chunk_size, self._cancel_event)
+
+    def encode_files(self, jobs, progress_callback=None):
+        """Encodes several files concurrently.
+
+        Args:
+            jobs: Mapping of caller-chosen keys to (path, prefix) pairs.
+            progress_callback: Optional callable receiving (done, total). It
+                is called on the calling thread after files complete and at
+                least every POLL_INTERVAL seconds while waiting, so a dialog
+                can keep processing events (and a Cancel button) meanwhile.
+
+        Returns:
+            {key: (digest, text)} for every file that could be read. Files
+            that fail are reported and left out.
+
+        Raises:
+            ExportCancelled: If the pipeline was cancelled.
+        """
+        results = {}
+        if not jobs:
+            return results
+
+        total = len(jobs)
+        done = 0
+        queued = iter(jobs.items())
+        in_flight = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                      thread_name_prefix="dvge-assets")
+        try:
+            while True:
+                # Only a bounded number of files are read at once
+                while len(in_flight) < self.max_workers:
+                    job = next(queued, None)
+                    if job is None:
+                        break
+                    key, (path, prefix) = job
+                    in_flight[executor.submit(self.encode_file, path, prefix)] = key
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key = in_flight.pop(future)
+                    try:
+                        results[key] = future.result()
+                    except ExportCancelled:
+                        raise
+                    except Exception as e:
+                        print(f"Could not encode asset {jobs[key][0]}: {e}")
+                    done += 1
+
+                if self.cancelled:
+                    raise ExportCancelled()
+                if progress_callback:
+                    progress_callback(done, total)
+        except BaseException:
+            # Make running workers stop at their next chunk
+            self._cancel_event.set()
+            raise
+        finally:
+            # shutdown(cancel_futures=True) needs Python 3.9
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+        return results
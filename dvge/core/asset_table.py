@@ -0,0 +1,122 @@
+# dvge/core/asset_table.py
+
+"""Shared, content-addressed asset table for exported games.
+
+Media files are read and encoded once per export and stored in a single
+table keyed by a hash of their content. Node data then refers to an asset
+with an "asset:<id>" string, so a background used by hundreds of nodes is
+embedded only once.
+"""
+
+import hashlib
+import os
+
+from .asset_pipeline import data_uri_prefix, encode_file
+
+
+ASSET_REF_PREFIX = "asset:"
+
+# Number of hex digits of the SHA-256 content hash used as asset ID
+ASSET_ID_LENGTH = 16
+
+IMAGE_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+}
+
+AUDIO_MIME_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.ogg': 'audio/ogg',
+}
+
+
+def image_mime_type(path):
+    """Returns the MIME type of a background image, defaulting to PNG."""
+    return IMAGE_MIME_TYPES.get(os.path.splitext(path or "")[1].lower(), 'image/png')
+
+
+def audio_mime_type(path):
+    """Returns the MIME type of a voice or music file, defaulting to MP3."""
+    return AUDIO_MIME_TYPES.get(os.path.splitext(path or "")[1].lower(), 'audio/mpeg')
+
+
+def is_asset_ref(value):
+    """Checks whether a value is a reference into an asset table."""
+    return isinstance(value, str) and value.startswith(ASSET_REF_PREFIX)
+
+
+class ExportAssetTable:
+    """Collects the media of an export, storing each distinct file once.
+
+    With a BuildCache, files unchanged since an earlier export are taken
+    from the cache instead of being encoded again.
+    """
+
+    def __init__(self, cache=None):
+        self.assets = {}    # asset ID -> data URI
+        self.cache = cache
+        self._refs = {}     # (absolute path, MIME type) -> reference
+
+    def add_file(self, path, mime_type):
+        """Adds a file and returns its reference, or "" if it does not exist."""
+        if not path or not os.path.exists(path):
+            return ""
+        key = (os.path.abspath(path), mime_type)
+        if key not in self._refs and not self._load_cached(key):
+            digest, data_uri = encode_file(path, data_uri_prefix(mime_type))
+            self._store(key, digest, data_uri, cache=True)
+        return self._refs[key]
+
+    def add_image(self, path):
+        """Adds a background image, defaulting to PNG for unknown types."""
+        return self.add_file(path, image_mime_type(path))
+
+    def add_audio(self, path):
+        """Adds a voice or music file, defaulting to MP3 for unknown types."""
+        return self.add_file(path, audio_mime_type(path))
+
+    def prefetch(self, files, pipeline, progress_callback=None):
+        """Encodes files concurrently so that later add_file() calls are lookups.
+
+        Args:
+            files: Iterable of (path, mime_type) pairs; missing files are skipped.
+            pipeline: AssetPipeline doing the encoding.
+            progress_callback: Passed on to AssetPipeline.encode_files().
+        """
+        jobs = {}
+        for path, mime_type in files:
+            if path and os.path.exists(path):
+                key = (os.path.abspath(path), mime_type)
+                if key not in self._refs and key not in jobs and not self._load_cached(key):
+                    jobs[key] = (path, data_uri_prefix(mime_type))
+
+        for key, (digest, data_uri) in pipeline.encode_files(jobs, progress_callback).items():
+            self._store(key, digest, data_uri, cache=True)
+
+    def resolve(self, ref):
+        """Returns the data URI of a reference; other values are returned unchanged."""
+        if is_asset_ref(ref):
+            return self.assets.get(ref[len(ASSET_REF_PREFIX):], "")
+        return ref
+
+    def __len__(self):
+        return len(self.assets)
+
+    def _load_cached(self, key):
+        """Stores a file from the build cache; returns False if it is not cached."""
+        cached = self.cache.get_asset(*key) if self.cache else None
+        if cached is None:
+            return False
+        self._store(key, *cached)
+        return True
+
+    def _store(self, key, digest, data_uri, cache=False):
+        mime_type = key[1]
+        asset_id = hashlib.sha256(f"{mime_type}:{digest}".encode('utf-8')).hexdigest()[:ASSET_ID_LENGTH]
+        self.assets.setdefault(asset_id, data_uri)
+        self._refs[key] = ASSET_REF_PREFIX + asset_id
+        if cache and self.cache:
+            self.cache.put_asset(key[0], mime_type, digest, data_uri)
@@ -0,0 +1,665 @@
+# dvge/core/auto_layout.py
+
+"""Automatic arrangement of the story graph.
+
+Two layouts are available:
+
+- layered_layout() arranges the story left to right in the style of
+  Sugiyama: cycles are broken, every node gets a column (layer) after the
+  nodes leading to it, the order within each column is improved with
+  barycenter sweeps to reduce crossings, and nodes are placed level with
+  the nodes they follow.
+- force_directed_layout() lets linked nodes pull together and nearby nodes
+  push apart (Fruchterman-Reingold). Only nodes closer than a cutoff repel
+  each other, found with a uniform grid, so an iteration costs about the
+  number of nodes rather than its square. Distant nodes push each other
+  apart by grid cell, which keeps large graphs from collapsing into a
+  dense ball. With NumPy installed the forces
+  are computed with vectorized array operations; otherwise in pure Python.
+  A subset of nodes can be moved while the rest stays put, which makes it
+  suitable for tidying up around new or edited nodes.
+
+Layouts work on a LayoutGraph snapshot taken on the UI thread, so
+AutoLayoutJob can compute them on a background thread and stream
+intermediate positions while the editor stays responsive.
+"""
+
+import math
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+from ..constants import NODE_WIDTH, GRID_SIZE
+from .spatial_index import DEFAULT_NODE_HEIGHT
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+LAYERED = "layered"
+FORCE_DIRECTED = "force_directed"
+LAYOUT_ALGORITHMS = (LAYERED, FORCE_DIRECTED)
+
+# Horizontal distance between the left edges of neighbouring layers
+LAYER_SPACING = NODE_WIDTH + 150
+
+# Vertical gap between nodes of the same layer
+ROW_GAP = 50
+
+# Down and up passes of the crossing reduction
+BARYCENTER_SWEEPS = 4
+
+# Preferred distance between the centers of linked nodes in force-directed layouts
+IDEAL_EDGE_LENGTH = NODE_WIDTH + 150
+
+# Nodes further apart than this many ideal edge lengths do not repel each other
+REPULSION_CUTOFF = 2.0
+
+DEFAULT_FORCE_ITERATIONS = 60
+
+# Iterations between rebuilds of the list of nearby node pairs and of the far-field forces
+NEIGHBOR_REBUILD_INTERVAL = 5
+
+# Distant nodes are grouped in grid cells of this many ideal edge lengths for the far field
+FAR_FIELD_CELL = 4.0
+
+# Cells are made larger when more than this many would be needed along either axis
+MAX_FAR_FIELD_CELLS = 24
+
+# Iterations between streamed intermediate positions
+PROGRESS_INTERVAL = 5
+
+
+class LayoutCancelled(Exception):
+    """Raised inside a layout computation that was cancelled."""
+
+
+@dataclass
+class LayoutGraph:
+    """Snapshot of the nodes and links a layout is computed for.
+
+    ids[i] is the node ID of node i; edges are (source, target) index pairs;
+    positions are the current top-left corners and heights the node heights.
+    """
+
+    ids: list
+    edges: list
+    positions: list
+    heights: list
+    fixed: set = field(default_factory=set)  # indices of nodes the layout must not move
+
+    @classmethod
+    def from_nodes(cls, nodes, graph_index, node_ids=None, include_neighbors=False):
+        """Takes a snapshot of nodes, or only of node_ids, and the links between them.
+
+        With include_neighbors=True the nodes directly linked to node_ids are
+        included as fixed nodes, so a force-directed layout of node_ids fits
+        in with its surroundings. Nodes of a lazily loaded project that have
+        not been built yet are not built by this.
+        """
+        graph_index.sync(nodes)
+        if node_ids is None:
+            ids = list(nodes)
+            fixed_ids = []
+        else:
+            ids = [node_id for node_id in dict.fromkeys(node_ids) if node_id in nodes]
+            fixed_ids = []
+            if include_neighbors:
+                chosen = set(ids)
+                for node_id in ids:
+                    neighbors = graph_index.successors(node_id) | graph_index.predecessors(node_id)
+                    for neighbor in sorted(neighbors - chosen):
+                        if neighbor in nodes:
+                            chosen.add(neighbor)
+                            fixed_ids.append(neighbor)
+        all_ids = ids + fixed_ids
+        index_of = {node_id: i for i, node_id in enumerate(all_ids)}
+
+        peek_raw = getattr(nodes, 'peek_raw', None)
+        positions, heights, edges = [], [], []
+        for node_id in all_ids:
+            if peek_raw is not None and peek_raw(node_id) is not None:
+                positions.append(tuple(nodes.peek_position(node_id)))
+                heights.append(DEFAULT_NODE_HEIGHT)
+            else:
+                node = nodes[node_id]
+                positions.append((node.x, node.y))
+                heights.append(node.get_height())
+            source = index_of[node_id]
+            for target_id in dict.fromkeys(link[2] for link in graph_index.links(node_id)):
+                target = index_of.get(target_id)
+                if target is not None and target != source:
+                    edges.append((source, target))
+
+        fixed = set(range(len(ids), len(all_ids)))
+        return cls(all_ids, edges, positions, heights, fixed)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def to_positions(self, positions):
+        """Returns {node_id: (x, y)} for the nodes the layout may move."""
+        return {self.ids[i]: positions[i] for i in range(len(self.ids)) if i not in self.fixed}
+
+
+def snap_to_grid(positions, grid_size=GRID_SIZE):
+    """Rounds {node_id: (x, y)} positions to the editor grid."""
+    return {
+        node_id: (round(x / grid_size) * grid_size, round(y / grid_size) * grid_size)
+        for node_id, (x, y) in positions.items()
+    }
+
+
+# Layered layout
+
+def layered_layout(graph, origin=None, should_stop=None):
+    """Arranges a graph in left-to-right layers and returns {node_id: (x, y)}.
+
+    origin is the top-left corner of the layout; by default the top-left
+    corner of the nodes' current area, so the layout stays where the
+    nodes are. Fixed nodes are left out of the layout.
+    """
+    movable = [i for i in range(len(graph)) if i not in graph.fixed]
+    if not movable:
+        return {}
+    if origin is None:
+        origin = (min(graph.positions[i][0] for i in movable),
+                  min(graph.positions[i][1] for i in movable))
+
+    chosen = set(movable)
+    successors = {i: [] for i in movable}
+    predecessors = {i: [] for i in movable}
+    for source, target in graph.edges:
+        if source in chosen and target in chosen:
+            successors[source].append(target)
+            predecessors[target].append(source)
+
+    order = _depth_first_order(movable, successors, predecessors)
+    _check_stop(should_stop)
+    forward = _acyclic_successors(order, successors)
+    layers = _assign_layers(order, forward)
+    _check_stop(should_stop)
+    rows = _order_layers(order, layers, forward, should_stop)
+    y_positions = _place_rows(rows, predecessors, graph.heights)
+
+    origin_x, origin_y = origin
+    min_y = min(y_positions.values())
+    return {
+        graph.ids[i]: (origin_x + layers[i] * LAYER_SPACING, origin_y + y_positions[i] - min_y)
+        for i in movable
+    }
+
+
+def _depth_first_order(nodes, successors, predecessors):
+    """Returns the nodes in depth-first discovery order, starting from sources."""
+    roots = [i for i in nodes if not predecessors[i]] + list(nodes)
+    seen = set()
+    order = []
+    for root in roots:
+        if root in seen:
+            continue
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            order.append(node)
+            stack.extend(reversed([s for s in successors[node] if s not in seen]))
+    return order
+
+
+def _acyclic_successors(order, successors):
+    """Returns the successor lists without the edges that close cycles.
+
+    Uses an iterative depth-first search; an edge into a node that is still
+    on the search path is a back edge and is dropped.
+    """
+    state = dict.fromkeys(order, 0)  # 0 unvisited, 1 on the path, 2 done
+    forward = {i: [] for i in order}
+    for root in order:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node, targets = stack[-1]
+            for target in targets:
+                if state[target] == 1:
+                    continue
+                forward[node].append(target)
+                if state[target] == 0:
+                    state[target] = 1
+                    stack.append((target, iter(successors[target])))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+    return forward
+
+
+def _assign_layers(order, forward):
+    """Puts every node one layer after the furthest node leading to it.
+
+    Nodes nothing leads to are then moved up to just before their first
+    successor, so side branches do not all start in the first column.
+    """
+    in_degree = dict.fromkeys(order, 0)
+    for node in order:
+        for target in forward[node]:
+            in_degree[target] += 1
+    sources = [node for node in order if in_degree[node] == 0]
+
+    layers = dict.fromkeys(order, 0)
+    queue = deque(sources)
+    while queue:
+        node = queue.popleft()
+        for target in forward[node]:
+            layers[target] = max(layers[target], layers[node] + 1)
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+                queue.append(target)
+
+    for node in sources[1:]:
+        if forward[node]:
+            layers[node] = max(min(layers[target] for target in forward[node]) - 1, 0)
+    return layers
+
+
+def _order_layers(order, layers, forward, should_stop):
+    """Returns the nodes of each layer, ordered to reduce edge crossings."""
+    rows = [[] for _ in range(max(layers.values()) + 1)]
+    for node in order:
+        rows[layers[node]].append(node)
+
+    backward = {node: [] for node in order}
+    for node in order:
+        for target in forward[node]:
+            backward[target].append(node)
+
+    position = {node: i for row in rows for i, node in enumerate(row)}
+    for sweep in range(BARYCENTER_SWEEPS):
+        _check_stop(should_stop)
+        downward = sweep % 2 == 0
+        neighbors = backward if downward else forward
+        layer_range = range(1, len(rows)) if downward else range(len(rows) - 2, -1, -1)
+        for layer in layer_range:
+
+            def barycenter(item):
+                index, node = item
+                linked = [position[n] for n in neighbors[node]]
+                return (sum(linked) / len(linked) if linked else index, index)
+
+            rows[layer] = [node for _, node in sorted(enumerate(rows[layer]), key=barycenter)]
+            position.update((node, i) for i, node in enumerate(rows[layer]))
+    return rows
+
+
+def _place_rows(rows, predecessors, heights):
+    """Returns the y of each node, level with its predecessors where there is room."""
+    y_positions = {}
+    for row in rows:
+        bottom = None
+        for node in row:
+            placed = [y_positions[p] for p in predecessors[node] if p in y_positions]
+            y = sum(placed) / len(placed) if placed else (bottom if bottom is not None else 0)
+            if bottom is not None:
+                y = max(y, bottom)
+            y_positions[node] = y
+            bottom = y + heights[node] + ROW_GAP
+    return y_positions
+
+
+# Force-directed layout
+
+def force_directed_layout(graph, iterations=DEFAULT_FORCE_ITERATIONS, on_progress=None,
+                          should_stop=None, use_numpy=None, seed=0):
+    """Improves the current positions with a force simulation; returns {node_id: (x, y)}.
+
+    Fixed nodes attract and repel the others but do not move. on_progress
+    receives intermediate {node_id: (x, y)} positions every
+    PROGRESS_INTERVAL iterations. use_numpy defaults to NUMPY_AVAILABLE.
+    """
+    if use_numpy is None:
+        use_numpy = NUMPY_AVAILABLE
+    count = len(graph)
+    if count == 0 or len(graph.fixed) == count:
+        return {}
+
+    rng = random.Random(seed)
+    half_widths = [NODE_WIDTH / 2] * count
+    half_heights = [height / 2 for height in graph.heights]
+    centers = _separate_duplicates(
+        [(x + half_widths[i], y + half_heights[i]) for i, (x, y) in enumerate(graph.positions)],
+        graph.fixed, rng
+    )
+    movable = [i not in graph.fixed for i in range(count)]
+    k = IDEAL_EDGE_LENGTH
+    cutoff = REPULSION_CUTOFF * k
+    # The first steps may move a node about one edge length
+    start_temperature = k
+
+    def to_positions(centers):
+        return graph.to_positions([
+            (cx - half_widths[i], cy - half_heights[i]) for i, (cx, cy) in enumerate(centers)
+        ])
+
+    if use_numpy:
+        simulation = _NumpySimulation(centers, graph.edges, movable, k, cutoff)
+    else:
+        simulation = _PythonSimulation(centers, graph.edges, movable, k, cutoff)
+
+    for iteration in range(iterations):
+        _check_stop(should_stop)
+        if iteration % NEIGHBOR_REBUILD_INTERVAL == 0:
+            simulation.rebuild_neighbors(cutoff * 1.5)
+        temperature = start_temperature * (1 - iteration / iterations) + 1
+        simulation.step(temperature)
+        if on_progress is not None and (iteration + 1) % PROGRESS_INTERVAL == 0 and iteration + 1 < iterations:
+            on_progress(to_positions(simulation.centers()))
+
+    return to_positions(simulation.centers())
+
+
+def _separate_duplicates(centers, fixed, rng):
+    """Spreads out movable nodes sharing a position, which exert no force on each other."""
+    seen = set()
+    result = []
+    for i, (x, y) in enumerate(centers):
+        key = (round(x), round(y))
+        if key in seen and i not in fixed:
+            angle = rng.random() * 2 * math.pi
+            distance = IDEAL_EDGE_LENGTH * (0.5 + rng.random())
+            x, y = x + math.cos(angle) * distance, y + math.sin(angle) * distance
+        seen.add(key)
+        result.append((x, y))
+    return result
+
+
+def _neighbor_pairs(centers, radius):
+    """Returns (i, j) index pairs, i < j, of points closer than radius, using a grid."""
+    cells = {}
+    for i, (x, y) in enumerate(centers):
+        cells.setdefault((int(x // radius), int(y // radius)), []).append(i)
+
+    pairs = []
+    radius_squared = radius * radius
+    for (column, row), members in cells.items():
+        for dc, dr in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            others = members if (dc, dr) == (0, 0) else cells.get((column + dc, row + dr))
+            if not others:
+                continue
+            same_cell = others is members
+            for a, i in enumerate(members):
+                xi, yi = centers[i]
+                for j in (members[a + 1:] if same_cell else others):
+                    xj, yj = centers[j]
+                    if (xi - xj) ** 2 + (yi - yj) ** 2 < radius_squared:
+                        pairs.append((i, j) if i < j else (j, i))
+    return pairs
+
+
+def _far_field_cell_size(min_x, min_y, max_x, max_y, k):
+    return max(FAR_FIELD_CELL * k, (max_x - min_x) / MAX_FAR_FIELD_CELLS,
+               (max_y - min_y) / MAX_FAR_FIELD_CELLS)
+
+
+def _far_field(centers, k):
+    """Returns the repulsion of the other grid cells on every point, as (x, y) forces.
+
+    Each cell acts as if all its points were at its centroid, and every
+    point gets the force on its own cell. The force is softened below one
+    cell size, where _neighbor_pairs handles repulsion exactly.
+    """
+    xs = [x for x, _ in centers]
+    ys = [y for _, y in centers]
+    cell_size = _far_field_cell_size(min(xs), min(ys), max(xs), max(ys), k)
+    cells = {}
+    for i, (x, y) in enumerate(centers):
+        cells.setdefault((math.floor(x / cell_size), math.floor(y / cell_size)), []).append(i)
+
+    summaries = [(len(members), sum(xs[i] for i in members) / len(members),
+                  sum(ys[i] for i in members) / len(members)) for members in cells.values()]
+    k_squared = k * k
+    min_distance_squared = cell_size * cell_size
+    forces = [None] * len(centers)
+    for members, (_, x, y) in zip(cells.values(), summaries):
+        fx = fy = 0.0
+        for mass, other_x, other_y in summaries:
+            dx, dy = x - other_x, y - other_y
+            factor = mass * k_squared / max(dx * dx + dy * dy, min_distance_squared)
+            fx += dx * factor
+            fy += dy * factor
+        for i in members:
+            forces[i] = (fx, fy)
+    return forces
+
+
+class _PythonSimulation:
+    """Fruchterman-Reingold steps in pure Python."""
+
+    def __init__(self, centers, edges, movable, k, cutoff):
+        self._centers = [list(center) for center in centers]
+        self.edges = edges
+        self.movable = movable
+        self.k = k
+        self.cutoff_squared = cutoff * cutoff
+        self.pairs = []
+        self.far_field = [(0.0, 0.0)] * len(centers)
+
+    def centers(self):
+        return [tuple(center) for center in self._centers]
+
+    def rebuild_neighbors(self, radius):
+        centers = self.centers()
+        self.pairs = _neighbor_pairs(centers, radius)
+        self.far_field = _far_field(centers, self.k)
+
+    def step(self, temperature):
+        centers = self._centers
+        displacement = [list(force) for force in self.far_field]
+        k_squared = self.k * self.k
+
+        for i, j in self.pairs:
+            dx = centers[i][0] - centers[j][0]
+            dy = centers[i][1] - centers[j][1]
+            distance_squared = dx * dx + dy * dy
+            if distance_squared >= self.cutoff_squared:
+                continue
+            distance_squared = max(distance_squared, 1.0)
+            factor = k_squared / distance_squared
+            displacement[i][0] += dx * factor
+            displacement[i][1] += dy * factor
+            displacement[j][0] -= dx * factor
+            displacement[j][1] -= dy * factor
+
+        for i, j in self.edges:
+            dx = centers[i][0] - centers[j][0]
+            dy = centers[i][1] - centers[j][1]
+            factor = math.sqrt(dx * dx + dy * dy) / self.k
+            displacement[i][0] -= dx * factor
+            displacement[i][1] -= dy * factor
+            displacement[j][0] += dx * factor
+            displacement[j][1] += dy * factor
+
+        for i, (dx, dy) in enumerate(displacement):
+            if not self.movable[i]:
+                continue
+            length = math.sqrt(dx * dx + dy * dy)
+            if length > 0:
+                scale = min(length, temperature) / length
+                centers[i][0] += dx * scale
+                centers[i][1] += dy * scale
+
+
+class _NumpySimulation:
+    """Fruchterman-Reingold steps as vectorized NumPy operations."""
+
+    def __init__(self, centers, edges, movable, k, cutoff):
+        self._centers = np.array(centers, dtype=float)
+        edges = np.array(edges, dtype=np.intp).reshape(-1, 2)
+        self.sources, self.targets = edges[:, 0], edges[:, 1]
+        self.movable = np.array(movable, dtype=bool)
+        self.k = k
+        self.cutoff_squared = cutoff * cutoff
+        self.first = self.second = np.zeros(0, dtype=np.intp)
+        self.far_field = np.zeros_like(self._centers)
+
+    def centers(self):
+        return [tuple(center) for center in self._centers.tolist()]
+
+    def rebuild_neighbors(self, radius):
+        self._rebuild_pairs(radius)
+        self._rebuild_far_field()
+
+    def _rebuild_pairs(self, radius):
+        """Finds the pairs closer than radius with the grid of _neighbor_pairs, vectorized."""
+        centers = self._centers
+        cells = np.floor(centers / radius).astype(np.int64)
+        cells -= cells.min(axis=0)
+        stride = int(cells[:, 1].max()) + 3
+        keys = (cells[:, 0] + 1) * stride + cells[:, 1] + 1
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+
+        firsts, seconds = [], []
+        for dc, dr in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+            wanted = sorted_keys + dc * stride + dr
+            start = np.searchsorted(sorted_keys, wanted, side='left')
+            end = np.searchsorted(sorted_keys, wanted, side='right')
+            if (dc, dr) == (0, 0):
+                # Within a cell only pair each node with the ones after it
+                start = np.arange(len(order)) + 1
+            counts = np.maximum(end - start, 0)
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            first = np.repeat(np.arange(len(order)), counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            firsts.append(order[first])
+            seconds.append(order[np.repeat(start, counts) + offsets])
+
+        if not firsts:
+            self.first = self.second = np.zeros(0, dtype=np.intp)
+            return
+        first, second = np.concatenate(firsts), np.concatenate(seconds)
+        delta = centers[first] - centers[second]
+        close = np.einsum('ij,ij->i', delta, delta) < radius * radius
+        self.first = np.minimum(first[close], second[close])
+        self.second = np.maximum(first[close], second[close])
+
+    def _rebuild_far_field(self):
+        """Computes the forces of _far_field, vectorized."""
+        centers = self._centers
+        low, high = centers.min(axis=0), centers.max(axis=0)
+        cell_size = _far_field_cell_size(low[0], low[1], high[0], high[1], self.k)
+        cells = np.floor(centers / cell_size).astype(np.int64)
+        _, cell_of = np.unique(cells, axis=0, return_inverse=True)
+        cell_of = cell_of.reshape(-1)
+        cell_count = int(cell_of.max()) + 1
+
+        mass = np.bincount(cell_of, minlength=cell_count)
+        centroids = _scatter(cell_of, centers, cell_count) / mass[:, None]
+        delta = centroids[:, None, :] - centroids[None, :, :]
+        distance_squared = np.maximum(np.einsum('ijk,ijk->ij', delta, delta), cell_size * cell_size)
+        factor = mass[None, :] * (self.k * self.k) / distance_squared
+        self.far_field = np.einsum('ijk,ij->ik', delta, factor)[cell_of]
+
+    def step(self, temperature):
+        centers = self._centers
+        count = len(centers)
+
+        delta = centers[self.first] - centers[self.second]
+        distance_squared = np.einsum('ij,ij->i', delta, delta)
+        factor = np.where(distance_squared < self.cutoff_squared,
+                          self.k * self.k / np.maximum(distance_squared, 1.0), 0.0)
+        force = delta * factor[:, None]
+        displacement = self.far_field + _scatter(self.first, force, count) - _scatter(self.second, force, count)
+
+        delta = centers[self.sources] - centers[self.targets]
+        force = delta * (np.sqrt(np.einsum('ij,ij->i', delta, delta)) / self.k)[:, None]
+        displacement += _scatter(self.targets, force, count) - _scatter(self.sources, force, count)
+
+        length = np.sqrt(np.einsum('ij,ij->i', displacement, displacement))
+        scale = np.where(length > 0, np.minimum(length, temperature) / np.maximum(length, 1e-9), 0.0)
+        scale[~self.movable] = 0.0
+        centers += displacement * scale[:, None]
+
+
+def _scatter(indices, values, count):
+    """Sums the rows of values into a (count, 2) array at indices; faster than np.add.at."""
+    return np.stack([
+        np.bincount(indices, weights=values[:, 0], minlength=count),
+        np.bincount(indices, weights=values[:, 1], minlength=count),
+    ], axis=1)
+
+
+def _check_stop(should_stop):
+    if should_stop is not None and should_stop():
+        raise LayoutCancelled()
+
+
+class AutoLayoutJob:
+    """Computes a layout on a background thread.
+
+    on_progress is called on the worker thread with intermediate
+    {node_id: (x, y)} positions; the final positions are in result once
+    the job is done, or the exception in error. Callers on the Tk thread
+    should hand positions over through a queue rather than touching
+    widgets from on_progress.
+    """
+
+    def __init__(self, graph, algorithm=LAYERED, iterations=DEFAULT_FORCE_ITERATIONS,
+                 on_progress=None, snap=True):
+        if algorithm not in LAYOUT_ALGORITHMS:
+            raise ValueError(f"Unknown layout algorithm: {algorithm}")
+        self.graph = graph
+        self.algorithm = algorithm
+        self.iterations = iterations
+        self.on_progress = on_progress
+        self.snap = snap
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self._thread = threading.Thread(target=self._run, name="AutoLayout", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stops the computation at the next opportunity. Thread-safe."""
+        self.cancelled = True
+
+    def wait(self, timeout=None):
+        """Waits for the job to finish; returns True if it did."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        should_stop = lambda: self.cancelled
+        try:
+            if self.algorithm == LAYERED:
+                positions = layered_layout(self.graph, should_stop=should_stop)
+            else:
+                positions = force_directed_layout(
+                    self.graph, self.iterations, on_progress=self._report, should_stop=should_stop
+                )
+            self.result = snap_to_grid(positions) if self.snap else positions
+        except LayoutCancelled:
+            self.cancelled = True
+        except Exception as e:
+            print(f"Error computing layout: {e}")
+            self.error = e
+
+    def _report(self, positions):
+        if self.on_progress is not None and not self.cancelled:
+            self.on_progress(positions)
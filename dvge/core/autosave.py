@@ -0,0 +1,331 @@
+# dvge/core/autosave.py
+
+"""Autosave journal for crash recovery.
+
+Every undo snapshot is turned into a small delta (the nodes and project
+sections that changed since the previous snapshot) and appended to a JSON
+Lines journal by a background thread, so the Tk main loop never serializes
+or writes the project. Every so often the journal is compacted into a full
+project file and truncated.
+
+Undo snapshots share unchanged data and are never mutated once created,
+which is what makes it safe to serialize them from another thread.
+
+Every running editor keeps its journal in a session directory of its own,
+holding a lock on a file in it. The operating system releases the lock
+when the process ends, however it ends, so a session directory that can
+be locked belongs to an editor that is no longer running.
+"""
+
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+AUTOSAVE_DIR = os.path.expanduser('~/.dvge/autosave')
+JOURNAL_FILENAME = "journal.jsonl"
+BASE_FILENAME = "autosave.dvgproj"
+LOCK_FILENAME = "session.lock"
+SESSION_PREFIX = "session-"
+
+# Snapshot sections stored alongside the nodes
+PROJECT_SECTIONS = (
+    "player_stats", "player_inventory", "story_flags", "quests", "variables",
+    "enemies", "timers", "node_id_counter", "project_settings"
+)
+
+_STOP = object()
+
+
+def _try_lock(lock_file):
+    """Locks an open file without waiting; raises OSError if another process holds it."""
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+class AutosaveJournal:
+    """Appends project deltas to disk off the main thread."""
+
+    def __init__(self, directory=AUTOSAVE_DIR, compact_every=200, extra_sections=None):
+        """Creates a journal.
+
+        Args:
+            directory: Where the journal and compacted project are kept.
+            compact_every: Number of entries between compactions.
+            extra_sections: Optional callable returning project sections the
+                undo history does not track (e.g. the media library). It is
+                called on the main thread whenever a compaction is queued.
+        """
+        self.directory = directory
+        self.journal_path = os.path.join(directory, JOURNAL_FILENAME)
+        self.base_path = os.path.join(directory, BASE_FILENAME)
+        self.compact_every = compact_every
+        self.extra_sections = extra_sections
+
+        self._queue = queue.Queue()
+        self._last_snapshot = None
+        self._seq = 0
+        self._entries_since_compaction = 0
+        self._thread = None
+        self._lock_file = None
+
+    @classmethod
+    def for_session(cls, root=AUTOSAVE_DIR, **kwargs):
+        """Creates the journal of this editor session in its own locked directory under root."""
+        os.makedirs(root, exist_ok=True)
+        journal = cls(tempfile.mkdtemp(prefix=f"{SESSION_PREFIX}{os.getpid()}-", dir=root), **kwargs)
+        if not journal.claim():
+            raise OSError(f"Autosave directory is in use: {journal.directory}")
+        return journal
+
+    @classmethod
+    def find_recoverable(cls, root=AUTOSAVE_DIR):
+        """Returns the newest journal left behind by an editor that is no longer running.
+
+        The returned journal is claimed by this process, so other editors
+        started meanwhile do not offer it as well; call discard() once it has
+        been restored or declined. Sessions without anything to recover are
+        deleted. Returns None if there is nothing to recover.
+        """
+        try:
+            names = [name for name in os.listdir(root) if name.startswith(SESSION_PREFIX)]
+        except OSError:
+            return None
+        directories = [os.path.join(root, name) for name in names]
+        directories = [directory for directory in directories if os.path.isdir(directory)]
+        directories.sort(key=os.path.getmtime, reverse=True)
+
+        for directory in directories:
+            journal = cls(directory)
+            if not journal.claim():
+                # Another editor is still using it
+                continue
+            if journal.has_recovery_data():
+                return journal
+            journal.discard()
+        return None
+
+    def claim(self):
+        """Locks the journal directory for this process; returns False if another process holds it."""
+        if self._lock_file is not None:
+            return True
+        os.makedirs(self.directory, exist_ok=True)
+        lock_file = open(os.path.join(self.directory, LOCK_FILENAME), 'a')
+        try:
+            _try_lock(lock_file)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def discard(self):
+        """Stops the journal and deletes it along with its session directory."""
+        self.close(discard=True)
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        try:
+            os.remove(os.path.join(self.directory, LOCK_FILENAME))
+            os.rmdir(self.directory)
+        except OSError:
+            # Claimed by another editor in the meantime, or not empty
+            pass
+
+    def record(self, snapshot):
+        """Queues the changes between the previous snapshot and this one.
+
+        Called on the main thread; only compares references, so it is cheap
+        even for large projects.
+        """
+        entry = self._create_entry(snapshot)
+        self._last_snapshot = snapshot
+        if entry is None:
+            return
+
+        self._entries_since_compaction += 1
+        compact = self._entries_since_compaction >= self.compact_every
+        if compact:
+            self._entries_since_compaction = 0
+
+        self._ensure_thread()
+        if compact:
+            self._queue.put((entry, snapshot, self._get_extra_sections(), self._seq))
+        else:
+            self._queue.put((entry, None, None, self._seq))
+
+    def compact(self):
+        """Queues a compaction of everything recorded so far into a full project file."""
+        if self._last_snapshot is None:
+            return
+        self._entries_since_compaction = 0
+        self._ensure_thread()
+        self._queue.put((None, self._last_snapshot, self._get_extra_sections(), self._seq))
+
+    def flush(self):
+        """Blocks until every queued entry has been written."""
+        if self._thread:
+            self._queue.join()
+
+    def reset(self):
+        """Deletes the journal; the next snapshot is written in full."""
+        self.flush()
+        self._last_snapshot = None
+        self._entries_since_compaction = 0
+        for path in (self.journal_path, self.base_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self, discard=False):
+        """Writes pending entries and stops the writer thread."""
+        if self._thread:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if discard:
+            self.reset()
+
+    def has_recovery_data(self):
+        """Checks whether a previous session left unsaved work behind."""
+        return os.path.exists(self.journal_path) or os.path.exists(self.base_path)
+
+    def read_recovery_data(self):
+        """Rebuilds the last autosaved project, or returns None if there is nothing to recover.
+
+        A partially written last line, as left by a crash, is ignored.
+        """
+        project_data = None
+        base_seq = 0
+        if os.path.exists(self.base_path):
+            try:
+                with open(self.base_path, 'r', encoding='utf-8') as f:
+                    project_data = json.load(f)
+                base_seq = project_data.pop("journal_seq", 0)
+            except (OSError, ValueError) as e:
+                print(f"Could not read autosave: {e}")
+                project_data = None
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    if entry["seq"] <= base_seq:
+                        continue
+                    if entry.get("full"):
+                        project_data = {"version": "1.0.0", "nodes": {}}
+                    elif project_data is None:
+                        # Deltas without a starting point cannot be applied
+                        continue
+                    self._apply_entry(project_data, entry)
+
+        return project_data
+
+    def _get_extra_sections(self):
+        if not self.extra_sections:
+            return None
+        try:
+            return self.extra_sections()
+        except Exception as e:
+            print(f"Could not collect autosave data: {e}")
+            return None
+
+    def _create_entry(self, snapshot):
+        """Builds a journal entry from shared snapshot data, without copying it."""
+        previous = self._last_snapshot
+        self._seq += 1
+        if previous is None:
+            return {
+                "seq": self._seq, "time": time.time(), "full": True,
+                "action": snapshot.get('action_name', ""),
+                "nodes": snapshot['nodes'], "removed": [],
+                "sections": {key: snapshot.get(key) for key in PROJECT_SECTIONS}
+            }
+
+        previous_nodes = previous['nodes']
+        nodes = {node_id: data for node_id, data in snapshot['nodes'].items()
+                 if previous_nodes.get(node_id) is not data}
+        removed = [node_id for node_id in previous_nodes if node_id not in snapshot['nodes']]
+        sections = {key: snapshot.get(key) for key in PROJECT_SECTIONS
+                    if snapshot.get(key) is not previous.get(key)
+                    and snapshot.get(key) != previous.get(key)}
+        if not nodes and not removed and not sections:
+            self._seq -= 1
+            return None
+
+        return {
+            "seq": self._seq, "time": time.time(),
+            "action": snapshot.get('action_name', ""),
+            "nodes": nodes, "removed": removed, "sections": sections
+        }
+
+    @staticmethod
+    def _apply_entry(project_data, entry):
+        """Applies one journal entry to a project dictionary."""
+        nodes = project_data.setdefault("nodes", {})
+        nodes.update(entry.get("nodes", {}))
+        for node_id in entry.get("removed", []):
+            nodes.pop(node_id, None)
+        project_data.update(entry.get("sections", {}))
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="dvge-autosave", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Writer thread: appends entries and performs compactions."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                entry, compact_snapshot, extra_sections, seq = item
+                if entry is not None:
+                    self._append(entry)
+                if compact_snapshot is not None:
+                    self._write_base(compact_snapshot, extra_sections, seq)
+            except Exception as e:
+                print(f"Autosave failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _append(self, entry):
+        line = json.dumps(entry, separators=(',', ':'))
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_base(self, snapshot, extra_sections, seq):
+        """Writes a full project file atomically, then truncates the journal."""
+        project_data = {"version": "1.0.0", "journal_seq": seq, "nodes": snapshot['nodes']}
+        for key in PROJECT_SECTIONS:
+            project_data[key] = snapshot.get(key)
+        if extra_sections:
+            project_data.update(extra_sections)
+
+        temp_path = self.base_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(project_data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.base_path)
+
+        # Entries up to seq are now in the base file; later ones may already be queued
+        if self._queue.empty():
+            open(self.journal_path, 'w', encoding='utf-8').close()
@@ -3,6 +3,7 @@
 import re
 from typing import List, Dict, Any, Callable, Set, Union
 from ..models.base_node import BaseNode
+from .graph_index import GraphIndex, get_graph_index
 
 
 class BatchOperation:
@@ -93,25 +94,20 @@ class NodeFilter:
                 if hasattr(node, 'color') and node.color == color]
     
     @staticmethod
-    def orphaned_nodes(nodes: Dict[str, BaseNode]) -> List[BaseNode]:
+    def orphaned_nodes(nodes: Dict[str, BaseNode], index: GraphIndex = None) -> List[BaseNode]:
         """Find nodes with no incoming connections (except intro)."""
-        referenced_ids = set()
-        
-        for node in nodes.values():
-            if hasattr(node, 'options'):
-                for option in node.options:
-                    next_node = option.get('nextNode')
-                    if next_node:
-                        referenced_ids.add(next_node)
-        
-        return [node for node_id, node in nodes.items() 
-                if node_id != 'intro' and node_id not in referenced_ids]
+        if index is None:
+            index = GraphIndex()
+            index.sync(nodes)
+        return [nodes[node_id] for node_id in index.orphans("intro")]
     
     @staticmethod
-    def dead_end_nodes(nodes: Dict[str, BaseNode]) -> List[BaseNode]:
+    def dead_end_nodes(nodes: Dict[str, BaseNode], index: GraphIndex = None) -> List[BaseNode]:
         """Find nodes with no outgoing connections."""
-        return [node for node in nodes.values() 
-                if not hasattr(node, 'options') or not node.options]
+        if index is None:
+            index = GraphIndex()
+            index.sync(nodes)
+        return [nodes[node_id] for node_id in index.dead_ends()]
     
     @staticmethod
     def by_custom_filter(nodes: Dict[str, BaseNode], filter_func: Callable[[BaseNode], bool]) -> List[BaseNode]:
@@ -246,6 +242,8 @@ class BatchOperationManager:
         
         # Save state for undo if any changes were made
         if result['successful'] > 0:
+            # Operations may edit node lists and dicts in place
+            self.app.state_manager.mark_dirty(*(node.id for node in nodes))
             self.app.state_manager.save_state(f"Batch: {operation_name}")
         
         # Add to history
@@ -265,8 +263,8 @@ class BatchOperationManager:
             'by_theme': lambda: NodeFilter.by_theme(nodes, filter_params.get('theme', '')),
             'by_chapter': lambda: NodeFilter.by_chapter(nodes, filter_params.get('chapter', '')),
             'by_color': lambda: NodeFilter.by_color(nodes, filter_params.get('color', '')),
-            'orphaned': lambda: NodeFilter.orphaned_nodes(nodes),
-            'dead_end': lambda: NodeFilter.dead_end_nodes(nodes),
+            'orphaned': lambda: NodeFilter.orphaned_nodes(nodes, get_graph_index(self.app)),
+            'dead_end': lambda: NodeFilter.dead_end_nodes(nodes, get_graph_index(self.app)),
             'selected': lambda: [nodes[node_id] for node_id in self.app.selected_node_ids if node_id in nodes]
         }
         
@@ -0,0 +1,188 @@
+# dvge/core/build_cache.py
+
+"""On-disk cache of export build products.
+
+Like a compiler's object cache, exports store what they produce for each
+node and media file and reuse it as long as the inputs are unchanged:
+
+    assets.json             path, MIME type, size and mtime -> encoded asset
+    assets/<name>.txt       data URI of an encoded media file
+    nodes/<xx>/<key>.json   processed JSON of one node, keyed by input hash
+
+Node keys are hashes of everything the processed output depends on, so
+stale entries are never looked up again and only need pruning.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+
+BUILD_CACHE_DIR = os.path.expanduser('~/.dvge/build_cache')
+
+# Bump when the processed node format or text substitution changes, to ignore older entries
+BUILD_CACHE_VERSION = 2
+
+# Entries not used for this many seconds are removed by prune()
+MAX_ENTRY_AGE = 30 * 24 * 3600
+
+_ASSET_INDEX = "assets.json"
+
+
+def hash_data(data):
+    """Returns a stable SHA-256 hex digest of JSON-serializable data."""
+    text = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def file_fingerprint(path):
+    """Returns (size, mtime_ns) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class BuildCache:
+    """Stores processed nodes and encoded assets between exports."""
+
+    def __init__(self, directory=BUILD_CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._asset_index = None
+        self._asset_index_changed = False
+
+    # Nodes
+
+    def get_node(self, key):
+        """Returns the cached JSON of a processed node, or None."""
+        path = self._node_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                fragment = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        self._mark_used(path)
+        self.hits += 1
+        return fragment
+
+    def put_node(self, key, fragment):
+        """Stores the JSON of a processed node."""
+        try:
+            self._write_text(self._node_path(key), fragment)
+        except OSError as e:
+            print(f"Could not write build cache: {e}")
+
+    # Assets
+
+    def get_asset(self, path, mime_type):
+        """Returns the cached (digest, data URI) of an unchanged file, or None."""
+        entry = self._load_asset_index().get(self._asset_key(path, mime_type))
+        if entry is None or tuple(entry[:2]) != file_fingerprint(path):
+            return None
+        data_path = os.path.join(self.directory, "assets", entry[3])
+        try:
+            with open(data_path, 'r', encoding='utf-8') as f:
+                data_uri = f.read()
+        except OSError:
+            return None
+        self._mark_used(data_path)
+        return entry[2], data_uri
+
+    def put_asset(self, path, mime_type, digest, data_uri):
+        """Stores an encoded file under its current size and modification time."""
+        fingerprint = file_fingerprint(path)
+        if fingerprint is None:
+            return
+        name = hashlib.sha256(f"{mime_type}:{digest}".encode('utf-8')).hexdigest()[:32] + ".txt"
+        data_path = os.path.join(self.directory, "assets", name)
+        try:
+            if not os.path.exists(data_path):
+                self._write_text(data_path, data_uri)
+        except OSError as e:
+            print(f"Could not write build cache: {e}")
+            return
+        self._load_asset_index()[self._asset_key(path, mime_type)] = [*fingerprint, digest, name]
+        self._asset_index_changed = True
+
+    # Maintenance
+
+    def save(self):
+        """Writes the asset index if it changed."""
+        if self._asset_index_changed:
+            try:
+                self._write_text(os.path.join(self.directory, _ASSET_INDEX),
+                                 json.dumps(self._asset_index, separators=(',', ':')))
+                self._asset_index_changed = False
+            except OSError as e:
+                print(f"Could not write build cache: {e}")
+
+    def prune(self, max_age=MAX_ENTRY_AGE):
+        """Removes entries that were not used recently; returns how many were removed."""
+        cutoff = time.time() - max_age
+        removed = 0
+        for subdirectory in ("nodes", "assets"):
+            for root, _, files in os.walk(os.path.join(self.directory, subdirectory)):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        if os.path.getmtime(path) < cutoff:
+                            os.remove(path)
+                            removed += 1
+                    except OSError:
+                        pass
+        if removed:
+            # Forget assets whose data was removed
+            index = self._load_asset_index()
+            assets_dir = os.path.join(self.directory, "assets")
+            for key in [k for k, entry in index.items()
+                        if not os.path.exists(os.path.join(assets_dir, entry[3]))]:
+                del index[key]
+                self._asset_index_changed = True
+            self.save()
+        return removed
+
+    def clear(self):
+        """Removes every cached entry."""
+        self.prune(max_age=-1)
+        self._asset_index = {}
+        self._asset_index_changed = True
+        self.save()
+
+    # Helpers
+
+    def _node_path(self, key):
+        return os.path.join(self.directory, "nodes", key[:2], key + ".json")
+
+    @staticmethod
+    def _asset_key(path, mime_type):
+        return f"{os.path.abspath(path)}|{mime_type}"
+
+    def _load_asset_index(self):
+        if self._asset_index is None:
+            try:
+                with open(os.path.join(self.directory, _ASSET_INDEX), 'r', encoding='utf-8') as f:
+                    self._asset_index = json.load(f)
+            except (OSError, ValueError):
+                self._asset_index = {}
+        return self._asset_index
+
+    @staticmethod
+    def _mark_used(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _write_text(path, text):
+        """Writes a file atomically, so a crash never leaves a truncated entry."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
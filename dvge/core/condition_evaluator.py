@@ -7,6 +7,12 @@ from typing import Any, Dict, List, Union, Callable, Optional
 from datetime import datetime
 import math
 
+from .expression_engine import PLACEHOLDER_DOLLAR, ExpressionError, compile_expression
+
+
+# Number of distinct condition dictionaries whose compiled form is kept
+CONDITION_CACHE_SIZE = 4096
+
 
 class ConditionEvaluator:
     """Advanced condition evaluation with support for complex expressions."""
@@ -85,86 +91,97 @@ class ConditionEvaluator:
             **self.math_functions,
             **self.date_functions
         }
+        
+        # Compiled conditions, keyed by condition_key()
+        self._compiled_conditions = {}
     
     def evaluate_condition(self, condition: Dict[str, Any], context: Dict[str, Any] = None) -> bool:
         """Evaluate a single condition."""
-        if context is None:
-            context = {}
+        return self.compile_condition(condition)(context if context is not None else {})
+    
+    def compile_condition(self, condition: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        """Compile a condition into a function taking a context and returning a bool.
         
-        # Get variable value
+        The operator is resolved and a constant comparison value converted to
+        its data type once; only the variables are looked up per call.
+        Compiled conditions are cached by content.
+        """
+        key = self.condition_key(condition)
+        test = self._compiled_conditions.get(key)
+        if test is None:
+            if len(self._compiled_conditions) >= CONDITION_CACHE_SIZE:
+                self._compiled_conditions.clear()
+            test = self._compiled_conditions[key] = self._compile_condition(condition)
+        return test
+    
+    @staticmethod
+    def condition_key(condition: Dict[str, Any]) -> tuple:
+        """Return a hashable key identifying what a condition tests."""
+        value = condition.get("value", "")
+        return (condition.get("variable", ""), condition.get("operator", "=="),
+                condition.get("data_type", "string"), bool(condition.get("negated", False)),
+                type(value).__name__, value if isinstance(value, (str, int, float, bool)) else repr(value))
+    
+    def _compile_condition(self, condition: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
         variable_name = condition.get("variable", "")
-        variable_value = self._get_variable_value(variable_name, context)
+        data_type = condition.get("data_type", "string")
+        negated = bool(condition.get("negated", False))
+        apply = self._resolve_operator(condition.get("operator", "=="))
+        convert = self._convert_value
+        get_value = self._get_variable_value
         
-        # Get comparison value
         compare_value = condition.get("value", "")
         if isinstance(compare_value, str) and compare_value.startswith("$"):
             # Reference to another variable
-            compare_value = self._get_variable_value(compare_value[1:], context)
-        
-        # Get operator
-        operator_name = condition.get("operator", "==")
-        
-        # Convert values based on data type
-        data_type = condition.get("data_type", "string")
-        variable_value = self._convert_value(variable_value, data_type)
-        compare_value = self._convert_value(compare_value, data_type)
-        
-        # Evaluate condition
-        result = self._apply_operator(variable_value, operator_name, compare_value)
-        
-        # Apply negation if specified
-        if condition.get("negated", False):
-            result = not result
+            reference = compare_value[1:]
+            def get_compare_value(context):
+                return convert(get_value(reference, context), data_type)
+        else:
+            constant = convert(compare_value, data_type)
+            def get_compare_value(context):
+                return constant
         
-        return bool(result)
+        def test(context):
+            result = apply(convert(get_value(variable_name, context), data_type),
+                           get_compare_value(context))
+            return bool(not result if negated else result)
+        return test
     
     def evaluate_conditions_list(self, conditions: List[Dict[str, Any]], 
                                 logic: str = "AND", context: Dict[str, Any] = None) -> bool:
         """Evaluate a list of conditions with specified logic."""
         if not conditions:
             return True
+        if context is None:
+            context = {}
         
-        results = []
-        for condition in conditions:
-            result = self.evaluate_condition(condition, context)
-            results.append(result)
+        tests = [self.compile_condition(condition) for condition in conditions]
+        if logic.upper() == "OR":
+            return any(test(context) for test in tests)
+        # AND, and custom logic which is not implemented in this basic version
+        return all(test(context) for test in tests)
+    
+    def evaluate_conditions_batch(self, conditions: List[Dict[str, Any]], contexts: List[Dict[str, Any]],
+                                  logic: str = "AND") -> List[bool]:
+        """Evaluate a list of conditions against many contexts, compiling it once."""
+        if not conditions:
+            return [True] * len(contexts)
         
-        if logic.upper() == "AND":
-            return all(results)
-        elif logic.upper() == "OR":
-            return any(results)
-        else:
-            # Custom logic - not implemented in this basic version
-            return all(results)
+        tests = [self.compile_condition(condition) for condition in conditions]
+        combine = any if logic.upper() == "OR" else all
+        return [combine(test(context) for test in tests) for context in contexts]
     
     def evaluate_expression(self, expression: str, context: Dict[str, Any] = None) -> Any:
         """Evaluate a complex expression string."""
         if context is None:
             context = {}
         
-        # This is a simplified expression evaluator
-        # In a full implementation, you'd use a proper parser
-        
+        # ${variable} references and bare names are looked up on every call;
+        # the expression itself is parsed and compiled only once
         try:
-            # Replace variables with their values
-            processed_expression = self._replace_variables(expression, context)
-            
-            # Replace function calls
-            processed_expression = self._replace_functions(processed_expression, context)
-            
-            # Safe evaluation (limited scope)
-            safe_dict = {
-                "__builtins__": {},
-                "True": True,
-                "False": False,
-                "None": None,
-                **self.functions
-            }
-            
-            result = eval(processed_expression, safe_dict)
-            return result
-            
-        except Exception as e:
+            return compile_expression(expression, PLACEHOLDER_DOLLAR).evaluate(
+                lambda name: self._get_variable_value(name, context), self.functions)
+        except ExpressionError as e:
             print(f"Error evaluating expression '{expression}': {e}")
             return False
     
@@ -220,54 +237,24 @@ class ConditionEvaluator:
     
     def _apply_operator(self, left: Any, operator_name: str, right: Any) -> Any:
         """Apply operator to two values."""
+        return self._resolve_operator(operator_name)(left, right)
+    
+    def _resolve_operator(self, operator_name: str) -> Callable:
+        """Return the function of an operator name."""
         # Standard operators
         if operator_name in self.operators:
-            return self.operators[operator_name](left, right)
+            return self.operators[operator_name]
         
         # String operators
         if operator_name in self.string_operators:
-            return self.string_operators[operator_name](left, right)
+            return self.string_operators[operator_name]
         
         # List operators
         if operator_name in self.list_operators:
-            return self.list_operators[operator_name](left, right)
+            return self.list_operators[operator_name]
         
         # Default to equality
-        return left == right
-    
-    def _replace_variables(self, expression: str, context: Dict[str, Any]) -> str:
-        """Replace variable references in expression."""
-        # Find all variable references like ${variable_name}
-        pattern = r'\$\{([^}]+)\}'
-        
-        def replace_var(match):
-            var_name = match.group(1)
-            value = self._get_variable_value(var_name, context)
-            
-            # Return properly quoted value
-            if isinstance(value, str):
-                return f'"{value}"'
-            elif value is None:
-                return "None"
-            else:
-                return str(value)
-        
-        return re.sub(pattern, replace_var, expression)
-    
-    def _replace_functions(self, expression: str, context: Dict[str, Any]) -> str:
-        """Replace function calls in expression."""
-        # This is a simplified implementation
-        # A full implementation would need a proper parser
-        
-        # Handle common function patterns
-        for func_name in self.functions:
-            pattern = rf'{func_name}\(([^)]*)\)'
-            if re.search(pattern, expression):
-                # This would need more sophisticated parsing
-                # For now, we'll leave function calls as-is
-                pass
-        
-        return expression
+        return operator.eq
     
     def _calculate_age(self, birth_date: str) -> int:
         """Calculate age from birth date."""
@@ -326,19 +313,10 @@ class ConditionEvaluator:
                 if re.search(pattern, expression):
                     errors.append(f"Potentially unsafe operation detected: {pattern}")
             
-            # Try to parse the expression
-            try:
-                # Create a test context
-                test_context = {"test_var": "test_value", "test_num": 42}
-                processed = self._replace_variables(expression, test_context)
-                
-                # Try to compile (but not execute)
-                compile(processed, '<string>', 'eval')
-                
-            except SyntaxError as e:
-                errors.append(f"Syntax error: {e}")
-            except Exception as e:
-                warnings.append(f"Potential runtime error: {e}")
+            # Try to compile (but not execute) the expression
+            compiled = compile_expression(expression, PLACEHOLDER_DOLLAR)
+            if compiled.error:
+                errors.append(f"Syntax error: {compiled.error}")
         
         except Exception as e:
             errors.append(f"Validation error: {e}")
@@ -0,0 +1,267 @@
+# dvge/core/condition_program.py
+
+"""Compiled choice conditions for the preview engine and analytics.
+
+Option conditions are dictionaries such as
+
+    {"type": "stat", "subject": "gold", "operator": ">=", "value": "10"}
+
+Instead of dispatching on the type and operator strings every time an
+option is shown, each condition is compiled once into a test function with
+its operator resolved and its value converted to the right type. The tests
+of all options of a node are collected into one NodeConditionProgram, which
+evaluates every option in a single pass and checks conditions shared by
+several options only once.
+
+Game state is passed as a ConditionState, which holds the stats, flags,
+quests and variables and the set of inventory item names, so item
+conditions are set lookups rather than scans of the inventory list.
+"""
+
+import operator
+from typing import Any, Dict, Iterable, List, Optional
+
+# Operators of stat and variable comparisons
+_COMPARE_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+}
+
+
+def _always_true(state):
+    return True
+
+
+class ConditionState:
+    """The parts of a game state that option conditions read."""
+
+    __slots__ = ('stats', 'inventory_names', 'flags', 'quests', 'variables', '_var_system')
+
+    def __init__(self, stats=None, inventory=None, flags=None, quests=None,
+                 variables=None, var_system=None):
+        self.stats = stats if stats is not None else {}
+        self.inventory_names = inventory_names(inventory)
+        self.flags = flags if flags is not None else {}
+        self.quests = quests if quests is not None else {}
+        self.variables = variables if variables is not None else {}
+        self._var_system = var_system
+
+    @classmethod
+    def from_engine(cls, engine):
+        """Returns the current state of a preview engine."""
+        return cls(engine.player_stats, engine.player_inventory, engine.story_flags,
+                   engine.quests, engine.variables, getattr(engine, 'var_system', None))
+
+    @classmethod
+    def from_dict(cls, data):
+        """Returns the state stored in a saved game or project dictionary."""
+        quests = {}
+        for quest_id, quest in (data.get('quests') or {}).items():
+            quests[quest_id] = quest if isinstance(quest, dict) else {'state': getattr(quest, 'state', 'inactive')}
+        return cls(data.get('player_stats'), data.get('player_inventory'),
+                   data.get('story_flags'), quests, data.get('variables'))
+
+    @property
+    def var_system(self):
+        """Variable system used for variable conditions with {expression} values."""
+        if self._var_system is None:
+            from .variable_system import VariableSystem
+            self._var_system = VariableSystem()
+            self._var_system.set_variables_ref(self.variables)
+            self._var_system.set_flags_ref(self.flags)
+        return self._var_system
+
+
+def inventory_names(inventory) -> frozenset:
+    """Returns the item names of an inventory list (or of a name-keyed dict)."""
+    if not inventory:
+        return frozenset()
+    if isinstance(inventory, dict):
+        return frozenset(inventory)
+    return frozenset(item.get('name') for item in inventory if isinstance(item, dict))
+
+
+def condition_key(condition: Dict[str, Any]) -> tuple:
+    """Returns a hashable key identifying what a condition tests."""
+    value = condition.get('value', 0)
+    # The value's type is part of the key: True, 1 and "1" test differently
+    return (condition.get('type', 'stat'), condition.get('subject', ''), condition.get('operator', '>='),
+            type(value).__name__, value if isinstance(value, (str, int, float, bool)) else repr(value))
+
+
+def compile_condition(condition: Dict[str, Any]):
+    """Compiles a condition into a function taking a ConditionState and returning a bool."""
+    cond_type = condition.get('type', 'stat')
+    subject = condition.get('subject', '')
+    op_name = condition.get('operator', '>=')
+    value = condition.get('value', 0)
+
+    if cond_type == 'stat':
+        compare = _compile_comparison(op_name, value)
+        return lambda state: compare(state.stats.get(subject, 0))
+
+    elif cond_type == 'item':
+        wanted = (op_name == 'has')
+        return lambda state: (subject in state.inventory_names) == wanted
+
+    elif cond_type == 'flag':
+        expected = (str(value).lower() == 'true')
+        wanted = (op_name == 'is')
+        return lambda state: (state.flags.get(subject, False) == expected) == wanted
+
+    elif cond_type == 'quest':
+        wanted = (op_name == 'is')
+        return lambda state: (state.quests.get(subject, {}).get('state', 'inactive') == value) == wanted
+
+    elif cond_type == 'variable':
+        if isinstance(value, str) and '{' in value:
+            # Values referring to other variables are computed per state
+            def test_expression(state):
+                right = state.var_system.evaluate_math_expression(value)
+                return _compile_comparison(op_name, right)(state.variables.get(subject, 0))
+            return test_expression
+        try:
+            number = float(value)
+        except (ValueError, TypeError):
+            number = 0
+        compare = _compile_comparison(op_name, number)
+        return lambda state: compare(state.variables.get(subject, 0))
+
+    return _always_true
+
+
+def _compile_comparison(op_name, right):
+    """Returns a function comparing a value against `right` as numbers.
+
+    Values that are not numbers are compared as text for equality, as the
+    preview engine always has.
+    """
+    op = _COMPARE_OPERATORS.get(op_name)
+    try:
+        right_number = float(right)
+    except (ValueError, TypeError):
+        right_number = None
+    right_text = str(right)
+
+    if right_number is None:
+        def compare_text(left):
+            try:
+                left = float(left)
+            except (ValueError, TypeError):
+                pass
+            return str(left) == right_text
+        return compare_text
+
+    def compare(left):
+        try:
+            left = float(left)
+        except (ValueError, TypeError):
+            return str(left) == right_text
+        return op(left, right_number) if op is not None else False
+    return compare
+
+
+class NodeConditionProgram:
+    """The compiled conditions of every option of one node."""
+
+    __slots__ = ('tests', 'options')
+
+    def __init__(self, options: Iterable[Dict[str, Any]]):
+        tests = []
+        test_indices = {}
+        self.options = []
+        for option in options:
+            indices = []
+            for condition in option.get('conditions', None) or []:
+                key = condition_key(condition)
+                if key not in test_indices:
+                    test_indices[key] = len(tests)
+                    tests.append(compile_condition(condition))
+                indices.append(test_indices[key])
+            self.options.append(tuple(indices))
+        self.tests = tuple(tests)
+
+    def evaluate(self, state: ConditionState) -> List[bool]:
+        """Returns whether each option is available in the given state."""
+        results = [None] * len(self.tests)
+        available = []
+        for indices in self.options:
+            passed = True
+            for index in indices:
+                result = results[index]
+                if result is None:
+                    result = results[index] = self.tests[index](state)
+                if not result:
+                    passed = False
+                    break
+            available.append(passed)
+        return available
+
+
+class ConditionProgramCache:
+    """Compiled programs of nodes, recompiled when their conditions change.
+
+    Programs are looked up by the content of the conditions rather than the
+    node revision, because editors change conditions in place without
+    touching the node.
+    """
+
+    def __init__(self):
+        self._programs = {}  # node_id -> (conditions signature, program)
+
+    def get(self, node) -> NodeConditionProgram:
+        """Returns the compiled program of a node's options."""
+        options = getattr(node, 'options', None) or []
+        signature = tuple(
+            tuple(condition_key(condition) for condition in option.get('conditions', None) or [])
+            for option in options
+        )
+        known = self._programs.get(node.id)
+        if known and known[0] == signature:
+            return known[1]
+        program = NodeConditionProgram(options)
+        self._programs[node.id] = (signature, program)
+        return program
+
+    def clear(self):
+        self._programs.clear()
+
+
+def evaluate_project(nodes: Dict[str, Any], states: Iterable[Any],
+                     cache: Optional[ConditionProgramCache] = None) -> Dict[str, List[List[bool]]]:
+    """Evaluates every option of every node against many game states.
+
+    Args:
+        nodes: Mapping of node ids to nodes.
+        states: ConditionState objects or saved-game dictionaries.
+        cache: Optional cache of compiled programs to reuse between calls.
+
+    Returns:
+        For each node id, one list per state of whether each option is available.
+    """
+    cache = cache or ConditionProgramCache()
+    programs = [(node_id, cache.get(node)) for node_id, node in nodes.items()
+                if getattr(node, 'options', None)]
+    results = {node_id: [] for node_id, _ in programs}
+    for state in states:
+        if not isinstance(state, ConditionState):
+            state = ConditionState.from_dict(state)
+        for node_id, program in programs:
+            results[node_id].append(program.evaluate(state))
+    return results
+
+
+def option_availability(results: Dict[str, List[List[bool]]]) -> Dict[str, List[float]]:
+    """Returns, for each node, the fraction of states in which each option is available."""
+    availability = {}
+    for node_id, per_state in results.items():
+        if not per_state:
+            availability[node_id] = []
+            continue
+        totals = [sum(column) for column in zip(*per_state)]
+        availability[node_id] = [total / len(per_state) for total in totals]
+    return availability
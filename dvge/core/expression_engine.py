@@ -0,0 +1,315 @@
+# dvge/core/expression_engine.py
+
+"""Safe, compiled expressions for text substitution and scripting.
+
+Expressions are parsed with Python's ast module, checked against a whitelist
+of node types and compiled once into a tree of closures. Evaluating a
+compiled expression only walks those closures; it never re-parses the text,
+substitutes strings or calls eval().
+
+Variables are referenced by bare name or through placeholders, depending
+on where the expression comes from:
+
+    PLACEHOLDER_BRACES   {gold} * 2          ({= ...} math in dialogue text)
+    PLACEHOLDER_DOLLAR   ${gold} > 10        (ConditionEvaluator expressions)
+"""
+
+import ast
+import operator
+import re
+from functools import lru_cache
+
+
+PLACEHOLDER_BRACES = "{}"
+PLACEHOLDER_DOLLAR = "${}"
+
+_PLACEHOLDER_PATTERNS = {
+    PLACEHOLDER_BRACES: re.compile(r'\{([^{}]*)\}'),
+    PLACEHOLDER_DOLLAR: re.compile(r'\$\{([^}]+)\}'),
+}
+
+# Number of distinct expressions whose compiled form is kept
+EXPRESSION_CACHE_SIZE = 4096
+
+# Largest exponent allowed for **, to keep evaluation cheap
+MAX_EXPONENT = 1000
+
+_SLOT_PREFIX = "_slot"
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: None,  # see _power
+}
+
+_UNARY_OPERATORS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.not_,
+}
+
+_COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+_ORDERING_OPERATORS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+# Bare words accepted as constants in lenient expressions
+_LENIENT_CONSTANTS = {"true": True, "false": False, "none": None}
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that cannot be parsed, are not allowed or fail to evaluate."""
+
+
+class UnknownName(ExpressionError):
+    """Raised when an expression refers to a name with no value."""
+
+
+def mapping_lookup(*mappings):
+    """Returns a lookup function that searches the mappings in order."""
+    def lookup(name):
+        for mapping in mappings:
+            if name in mapping:
+                return mapping[name]
+        raise KeyError(name)
+    return lookup
+
+
+class CompiledExpression:
+    """An expression compiled to closures, ready to be evaluated many times."""
+
+    __slots__ = ('source', 'names', 'error', '_evaluate')
+
+    def __init__(self, source, evaluate=None, names=(), error=None):
+        self.source = source
+        self.names = tuple(names)   # variable names referenced, in order of appearance
+        self.error = error          # message if the expression could not be compiled
+        self._evaluate = evaluate
+
+    def evaluate(self, lookup, functions=None):
+        """Evaluates the expression.
+
+        Args:
+            lookup: Callable returning the value of a variable name, raising
+                KeyError for unknown names.
+            functions: Optional mapping of callable names to functions.
+
+        Raises:
+            ExpressionError: If the expression is invalid or evaluation fails.
+        """
+        if self.error is not None:
+            raise ExpressionError(self.error)
+        try:
+            return self._evaluate(lookup, functions or {})
+        except ExpressionError:
+            raise
+        except Exception as e:
+            raise ExpressionError(f"Error evaluating '{self.source}': {e}") from e
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(source, placeholder=None, lenient=False):
+    """Compiles an expression; results are cached per arguments.
+
+    Args:
+        source: Expression text.
+        placeholder: PLACEHOLDER_BRACES or PLACEHOLDER_DOLLAR to allow
+            variable references in that syntax, or None.
+        lenient: Accept the loose syntax of dialogue conditions: unknown
+            bare words compare as their own text (and are false on their
+            own), true/false are case-insensitive, and ordering comparisons
+            convert numeric strings to numbers.
+
+    Invalid expressions are returned with `error` set rather than raising,
+    so that they are cached too.
+    """
+    slots = []
+    text = source.strip()
+    if placeholder is not None:
+        def add_slot(match):
+            slots.append(match.group(1).strip())
+            return f" {_SLOT_PREFIX}{len(slots) - 1} "
+        text = _PLACEHOLDER_PATTERNS[placeholder].sub(add_slot, text).strip()
+
+    try:
+        tree = ast.parse(text, mode='eval')
+        compiler = _Compiler(slots, lenient)
+        evaluate = compiler.compile(tree.body)
+    except (SyntaxError, ExpressionError, RecursionError) as e:
+        return CompiledExpression(source, error=f"Invalid expression '{source}': {e}")
+    return CompiledExpression(source, evaluate, compiler.names)
+
+
+def evaluate_expression(source, lookup, functions=None, placeholder=None, lenient=False):
+    """Compiles (or fetches from the cache) and evaluates an expression."""
+    return compile_expression(source, placeholder, lenient).evaluate(lookup, functions)
+
+
+class _Compiler:
+    """Turns a whitelisted ast into nested closures taking (lookup, functions)."""
+
+    def __init__(self, slots, lenient):
+        self.slots = slots
+        self.lenient = lenient
+        self.names = []
+
+    def compile(self, node, as_word=False):
+        method = getattr(self, f"_compile_{type(node).__name__}", None)
+        if method is None:
+            raise ExpressionError(f"'{type(node).__name__}' is not allowed")
+        if isinstance(node, ast.Name):
+            return method(node, as_word)
+        return method(node)
+
+    def _compile_Constant(self, node):
+        value = node.value
+        if not isinstance(value, (int, float, str, bool, type(None))):
+            raise ExpressionError(f"Constant {value!r} is not allowed")
+        return lambda lookup, functions: value
+
+    def _compile_Name(self, node, as_word=False):
+        name = node.id
+        slot = name[len(_SLOT_PREFIX):]
+        if name.startswith(_SLOT_PREFIX) and slot.isdigit() and int(slot) < len(self.slots):
+            name = self.slots[int(slot)]
+        elif name.startswith("_"):
+            raise ExpressionError(f"Name '{name}' is not allowed")
+        elif self.lenient and name.lower() in _LENIENT_CONSTANTS:
+            value = _LENIENT_CONSTANTS[name.lower()]
+            return lambda lookup, functions: value
+        self.names.append(name)
+
+        if self.lenient:
+            # Unknown words compare as text but are false on their own
+            default = name if as_word else None
+            def evaluate_word(lookup, functions):
+                try:
+                    return lookup(name)
+                except KeyError:
+                    return default
+            return evaluate_word
+
+        def evaluate_name(lookup, functions):
+            try:
+                return lookup(name)
+            except KeyError:
+                raise UnknownName(f"Unknown name '{name}'") from None
+        return evaluate_name
+
+    def _compile_BinOp(self, node):
+        op_type = type(node.op)
+        if op_type not in _BINARY_OPERATORS:
+            raise ExpressionError(f"Operator '{op_type.__name__}' is not allowed")
+        left, right = self.compile(node.left), self.compile(node.right)
+        if op_type is ast.Pow:
+            return lambda lookup, functions: _power(left(lookup, functions), right(lookup, functions))
+        op = _BINARY_OPERATORS[op_type]
+        return lambda lookup, functions: op(left(lookup, functions), right(lookup, functions))
+
+    def _compile_UnaryOp(self, node):
+        op_type = type(node.op)
+        if op_type not in _UNARY_OPERATORS:
+            raise ExpressionError(f"Operator '{op_type.__name__}' is not allowed")
+        op, operand = _UNARY_OPERATORS[op_type], self.compile(node.operand)
+        return lambda lookup, functions: op(operand(lookup, functions))
+
+    def _compile_BoolOp(self, node):
+        values = [self.compile(value) for value in node.values]
+        if isinstance(node.op, ast.And):
+            def evaluate_and(lookup, functions):
+                result = True
+                for value in values:
+                    result = value(lookup, functions)
+                    if not result:
+                        return result
+                return result
+            return evaluate_and
+
+        def evaluate_or(lookup, functions):
+            result = False
+            for value in values:
+                result = value(lookup, functions)
+                if result:
+                    return result
+            return result
+        return evaluate_or
+
+    def _compile_Compare(self, node):
+        operands = [self.compile(operand, as_word=True)
+                    for operand in [node.left, *node.comparators]]
+        steps = []
+        for i, op in enumerate(node.ops):
+            op_type = type(op)
+            if op_type not in _COMPARE_OPERATORS:
+                raise ExpressionError(f"Operator '{op_type.__name__}' is not allowed")
+            coerce = self.lenient and op_type in _ORDERING_OPERATORS
+            steps.append((_COMPARE_OPERATORS[op_type], coerce, operands[i + 1]))
+        first = operands[0]
+
+        def evaluate_compare(lookup, functions):
+            left = first(lookup, functions)
+            for op, coerce, right_operand in steps:
+                right = right_operand(lookup, functions)
+                if coerce:
+                    result = op(_to_number(left), _to_number(right))
+                else:
+                    result = op(left, right)
+                if not result:
+                    return False
+                left = right
+            return True
+        return evaluate_compare
+
+    def _compile_IfExp(self, node):
+        test, body, orelse = self.compile(node.test), self.compile(node.body), self.compile(node.orelse)
+        return lambda lookup, functions: (body(lookup, functions) if test(lookup, functions)
+                                          else orelse(lookup, functions))
+
+    def _compile_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise ExpressionError("Only calls of named functions with positional arguments are allowed")
+        name = node.func.id
+        args = [self.compile(arg) for arg in node.args]
+
+        def evaluate_call(lookup, functions):
+            function = functions.get(name)
+            if function is None:
+                raise ExpressionError(f"Unknown function '{name}'")
+            return function(*[arg(lookup, functions) for arg in args])
+        return evaluate_call
+
+    def _compile_List(self, node):
+        items = [self.compile(item) for item in node.elts]
+        return lambda lookup, functions: [item(lookup, functions) for item in items]
+
+    def _compile_Tuple(self, node):
+        items = [self.compile(item) for item in node.elts]
+        return lambda lookup, functions: tuple(item(lookup, functions) for item in items)
+
+
+def _power(base, exponent):
+    if isinstance(exponent, (int, float)) and abs(exponent) > MAX_EXPONENT:
+        raise ExpressionError(f"Exponent {exponent} is too large")
+    return base ** exponent
+
+
+def _to_number(value):
+    """Converts numeric strings for lenient ordering comparisons."""
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
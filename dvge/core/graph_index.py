@@ -0,0 +1,253 @@
+# dvge/core/graph_index.py
+
+"""Incrementally maintained index of the links between nodes."""
+
+from collections import deque
+
+
+END_GAME = "[End Game]"
+
+# Number of syncs remembered for changes_since()
+MAX_CHANGE_LOG = 100
+
+# Node attributes holding a single target node ID, with their display names
+SINGLE_LINK_FIELDS = {
+    'success_node': "Success node",
+    'failure_node': "Failure node",
+    'partial_success_node': "Partial success node",
+    'next_node': "Next node",
+    'successNode': "Success node",
+    'failNode': "Failure node",
+    'continue_node': "Continue node",
+    'true_node': "True node",
+    'false_node': "False node",
+    'victory_node': "Victory node",
+    'defeat_node': "Defeat node",
+    'escape_node': "Escape node",
+}
+
+# Node attributes holding a list of dicts, the key of the target and the display name
+LIST_LINK_FIELDS = {
+    'options': ('nextNode', "Choice"),
+    'random_outcomes': ('next_node', "Outcome"),
+    'branches': ('target_node', "Branch"),
+}
+
+
+def extract_links(node):
+    """Returns the (field, index, target_id) links of a node object or serialized node.
+
+    index is the position within list fields such as options, or None.
+    Works on any node type, including nodes that were never built from
+    their serialized data.
+    """
+    if isinstance(node, dict):
+        sources = [node.get('game_data', {}), node]
+        get = lambda field: next((s[field] for s in sources if field in s), None)
+    else:
+        get = lambda field: getattr(node, field, None)
+
+    links = []
+    for field, (key, _) in LIST_LINK_FIELDS.items():
+        items = get(field)
+        if isinstance(items, list):
+            for i, item in enumerate(items):
+                target = item.get(key) if isinstance(item, dict) else None
+                if target and isinstance(target, str):
+                    links.append((field, i, target))
+    for field in SINGLE_LINK_FIELDS:
+        target = get(field)
+        if target and isinstance(target, str):
+            links.append((field, None, target))
+    return links
+
+
+def remove_links_to(node, target_id):
+    """Clears every link on a node object that points at target_id.
+
+    Returns True if the node was changed.
+    """
+    changed = False
+    for field, (key, _) in LIST_LINK_FIELDS.items():
+        for item in getattr(node, field, None) or []:
+            if isinstance(item, dict) and item.get(key) == target_id:
+                item[key] = ""
+                changed = True
+    for field in SINGLE_LINK_FIELDS:
+        if getattr(node, field, None) == target_id:
+            setattr(node, field, "")
+            changed = True
+    if changed:
+        node.touch()
+    return changed
+
+
+def describe_link(field, index):
+    """Returns a readable name for a link, e.g. "Choice #2" or "Success node"."""
+    if index is not None:
+        return f"{LIST_LINK_FIELDS[field][1]} #{index + 1}"
+    return SINGLE_LINK_FIELDS.get(field, field)
+
+
+class GraphIndex:
+    """Forward and reverse adjacency of a node graph.
+
+    sync() brings the index up to date with a node mapping, re-reading only
+    nodes that were added, replaced or touched (their revision changed) since
+    the previous sync. Queries then work on the index instead of rescanning
+    every node.
+    """
+
+    def __init__(self):
+        self._links = {}       # source_id -> [(field, index, target_id)]
+        self._reverse = {}     # target_id -> {source_id}
+        self._versions = {}    # source_id -> (node or raw dict, revision)
+        self._present = {}     # node IDs in project order
+        # Bumped by every sync that changed something; see changes_since()
+        self.generation = 0
+        self._change_log = []  # (generation, updated IDs), oldest first
+
+    def sync(self, nodes):
+        """Updates the index for changed nodes and returns the IDs re-read."""
+        peek_raw = getattr(nodes, 'peek_raw', None)
+        unchanged_since_load = getattr(nodes, 'is_unchanged_since_load', None)
+        updated = []
+
+        for node_id in nodes:
+            raw = peek_raw(node_id) if peek_raw else None
+            if raw is not None:
+                if self._versions.get(node_id, (None,))[0] is not raw:
+                    self._set_links(node_id, extract_links(raw), (raw, None))
+                    updated.append(node_id)
+                continue
+
+            version = self._versions.get(node_id)
+            if (version is not None and isinstance(version[0], dict)
+                    and unchanged_since_load and unchanged_since_load(node_id)):
+                # Built from the raw data already indexed and not edited since
+                continue
+
+            node = nodes[node_id]
+            revision = getattr(node, 'revision', 0)
+            if version is None or version[0] is not node or version[1] != revision:
+                self._set_links(node_id, extract_links(node), (node, revision))
+                updated.append(node_id)
+
+        if len(self._versions) != len(nodes) or updated:
+            for node_id in [nid for nid in self._versions if nid not in nodes]:
+                self._set_links(node_id, [], None)
+                updated.append(node_id)
+        self._present = dict.fromkeys(nodes)
+        if updated:
+            self.generation += 1
+            self._change_log.append((self.generation, updated))
+            del self._change_log[:-MAX_CHANGE_LOG]
+        return updated
+
+    def changes_since(self, generation):
+        """Returns the IDs re-read by syncs after generation, or None if that is unknown.
+
+        None means the log no longer reaches back that far (or the index was
+        cleared), so callers should treat every node as changed.
+        """
+        if generation >= self.generation:
+            return set()
+        if not self._change_log or self._change_log[0][0] > generation + 1:
+            return None
+        changed = set()
+        for entry_generation, ids in self._change_log:
+            if entry_generation > generation:
+                changed.update(ids)
+        return changed
+
+    def invalidate(self, node_id):
+        """Forces a node to be re-read on the next sync."""
+        self._versions.pop(node_id, None)
+
+    def clear(self):
+        """Empties the index."""
+        self._links.clear()
+        self._reverse.clear()
+        self._versions.clear()
+        self._present = {}
+        self._change_log = []
+        self.generation += 1
+
+    def _set_links(self, node_id, links, version):
+        for target in {link[2] for link in self._links.get(node_id, [])}:
+            sources = self._reverse.get(target)
+            if sources:
+                sources.discard(node_id)
+                if not sources:
+                    del self._reverse[target]
+
+        if version is None:
+            self._links.pop(node_id, None)
+            self._versions.pop(node_id, None)
+            return
+
+        self._links[node_id] = links
+        self._versions[node_id] = version
+        for _, _, target in links:
+            self._reverse.setdefault(target, set()).add(node_id)
+
+    # Queries
+
+    def links(self, node_id):
+        """Returns the (field, index, target_id) links leaving a node."""
+        return list(self._links.get(node_id, []))
+
+    def contains(self, node_id):
+        """Checks whether a node existed at the last sync."""
+        return node_id in self._present
+
+    def successors(self, node_id):
+        """Returns the existing nodes a node links to."""
+        return {target for _, _, target in self._links.get(node_id, []) if target in self._present}
+
+    def predecessors(self, node_id):
+        """Returns the nodes that link to a node ("who links here")."""
+        return set(self._reverse.get(node_id, ()))
+
+    def reachable_from(self, start_id):
+        """Returns every node reachable from start_id, including itself."""
+        if start_id not in self._present:
+            return set()
+        reachable = {start_id}
+        queue = deque([start_id])
+        while queue:
+            for target in self.successors(queue.popleft()):
+                if target not in reachable:
+                    reachable.add(target)
+                    queue.append(target)
+        return reachable
+
+    def broken_links(self):
+        """Returns (source_id, field, index, target_id) for links to missing nodes."""
+        broken = []
+        missing = [target for target in self._reverse
+                   if target not in self._present and target != END_GAME]
+        for source in sorted({s for target in missing for s in self._reverse[target]}):
+            for field, index, target in self._links[source]:
+                if target not in self._present and target != END_GAME:
+                    broken.append((source, field, index, target))
+        return broken
+
+    def orphans(self, start_id="intro"):
+        """Returns nodes that nothing links to, other than the start node."""
+        return [node_id for node_id in self._present
+                if node_id != start_id and not self._reverse.get(node_id)]
+
+    def dead_ends(self):
+        """Returns nodes without any outgoing link."""
+        return [node_id for node_id in self._present if not self._links.get(node_id)]
+
+
+def get_graph_index(app):
+    """Returns the app's shared graph index, synced with its current nodes."""
+    index = getattr(app, 'graph_index', None)
+    if not isinstance(index, GraphIndex):
+        index = GraphIndex()
+        app.graph_index = index
+    index.sync(app.nodes)
+    return index
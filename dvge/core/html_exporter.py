@@ -3,6 +3,9 @@ import base64
 import os
 from tkinter import filedialog, messagebox
 from .variable_system import VariableSystem
+from .asset_table import ExportAssetTable, audio_mime_type, image_mime_type
+from .asset_pipeline import AssetPipeline, ExportCancelled
+from .build_cache import BUILD_CACHE_VERSION, BuildCache, file_fingerprint, hash_data
 
 # Import modern web export system
 try:
@@ -31,6 +34,10 @@ class HTMLExporter:
         
         # Initialize modern web exporter if available
         self.react_exporter = ReactExporter(app) if MODERN_WEB_AVAILABLE else None
+        
+        # Processed nodes and encoded media kept between exports
+        self.build_cache = BuildCache()
+        self._build_cache_pruned = False
     
     def export_game(self, export_format="classic"):
         """Exports the current project to a playable web format.
@@ -88,11 +95,13 @@ class HTMLExporter:
                 return False
 
         try:
-            # Process dialogue data
-            dialogue_data = self._process_dialogue_data()
+            # Process dialogue data, encoding media in the background and
+            # reusing whatever earlier exports built from unchanged inputs
+            asset_table = ExportAssetTable(cache=self.build_cache)
+            dialogue_json_string = self._build_dialogue_json_with_progress(asset_table)
             
             # Create JSON strings
-            dialogue_json_string = json.dumps(dialogue_data, indent=4)
+            asset_data = json.dumps(asset_table.assets, indent=4)
             player_data = json.dumps({
                 "stats": self.app.player_stats, 
                 "inventory": self.app.player_inventory
@@ -155,7 +164,8 @@ class HTMLExporter:
                 portrait_data,
                 music_data,
                 media_data,
-                voice_data
+                voice_data,
+                asset_data
             )
 
             # Save file
@@ -171,105 +181,147 @@ class HTMLExporter:
             
             return False
             
+        except ExportCancelled:
+            return False
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export game: {e}")
             return False
     
-    def _process_dialogue_data(self):
-        """Process node data for export, including media encoding."""
-        dialogue_data = {}
+    def _build_dialogue_json_with_progress(self, asset_table):
+        """Build the dialogue JSON while showing a cancellable progress dialog for media encoding."""
+        from ..ui.dialogs.export_progress_dialog import ExportProgressDialog
+        
+        pipeline = AssetPipeline()
+        progress_dialog = ExportProgressDialog(self.app, "Exporting Game", on_cancel=pipeline.cancel)
+        try:
+            return self._build_dialogue_json(asset_table, pipeline, progress_dialog.update_progress)
+        finally:
+            progress_dialog.destroy()
     
-    # Initialize variable system for text substitution
-        temp_var_system = VariableSystem()
-        temp_var_system.set_variables_ref(getattr(self.app, 'variables', {}))
-        temp_var_system.set_flags_ref(self.app.story_flags)
+    def _build_dialogue_json(self, asset_table, pipeline=None, progress_callback=None):
+        """Build the dialogue JSON of the exported game, reusing cached nodes.
+        
+        Nodes whose inputs are unchanged since an earlier export are taken
+        from asset_table's build cache (if any) as ready-made JSON and linked
+        into the output; only the others are processed again.
+        """
+        build_cache = asset_table.cache
+        asset_table.prefetch(self._collect_media_files(), pipeline or AssetPipeline(), progress_callback)
         
+        temp_var_system = self._create_substitution_system()
+        context_key = hash_data([getattr(self.app, 'variables', {}), self.app.story_flags])
+        
+        fragments = []
         for node_id, node in self.app.nodes.items():
-            game_data = node.to_dict()['game_data']
-            
-            # Add node type to game data
-            game_data['node_type'] = node.to_dict()['node_type']
-            
-            # Embed image as Base64 data URI if it exists
-            if game_data.get('backgroundImage') and os.path.exists(game_data['backgroundImage']):
-                try:
-                    with open(game_data['backgroundImage'], "rb") as image_file:
-                        encoded_string = base64.b64encode(image_file.read()).decode('utf-8')
-                        # Detect file type
-                        ext = os.path.splitext(game_data['backgroundImage'])[1].lower()
-                        if ext in ['.jpg', '.jpeg']:
-                            game_data['backgroundImage'] = f"data:image/jpeg;base64,{encoded_string}"
-                        elif ext == '.png':
-                            game_data['backgroundImage'] = f"data:image/png;base64,{encoded_string}"
-                        elif ext == '.gif':
-                            game_data['backgroundImage'] = f"data:image/gif;base64,{encoded_string}"
-                        else:
-                            game_data['backgroundImage'] = f"data:image/png;base64,{encoded_string}"
-                except Exception as e:
-                    print(f"Could not process image for node {node_id}: {e}")
-                    game_data['backgroundImage'] = ""
-            else:
-                game_data['backgroundImage'] = ""
-            
-            # Embed audio as Base64 data URI if it exists
-            if game_data.get('audio') and os.path.exists(game_data['audio']):
-                try:
-                    with open(game_data['audio'], "rb") as audio_file:
-                        encoded_string = base64.b64encode(audio_file.read()).decode('utf-8')
-                        # Detect file type
-                        ext = os.path.splitext(game_data['audio'])[1].lower()
-                        if ext == '.mp3':
-                            game_data['audio'] = f"data:audio/mpeg;base64,{encoded_string}"
-                        elif ext == '.wav':
-                            game_data['audio'] = f"data:audio/wav;base64,{encoded_string}"
-                        elif ext == '.ogg':
-                            game_data['audio'] = f"data:audio/ogg;base64,{encoded_string}"
-                        else:
-                            game_data['audio'] = f"data:audio/mpeg;base64,{encoded_string}"
-                except Exception as e:
-                    print(f"Could not process audio for node {node_id}: {e}")
-                    game_data['audio'] = ""
-            else:
-                game_data['audio'] = ""
-
-            # Embed music as Base64 data URI if it exists
-            if game_data.get('music') and os.path.exists(game_data['music']):
-                try:
-                    with open(game_data['music'], "rb") as music_file:
-                        encoded_string = base64.b64encode(music_file.read()).decode('utf-8')
-                        # Detect file type
-                        ext = os.path.splitext(game_data['music'])[1].lower()
-                        if ext == '.mp3':
-                            game_data['music'] = f"data:audio/mpeg;base64,{encoded_string}"
-                        elif ext == '.wav':
-                            game_data['music'] = f"data:audio/wav;base64,{encoded_string}"
-                        elif ext == '.ogg':
-                            game_data['music'] = f"data:audio/ogg;base64,{encoded_string}"
-                        else:
-                            game_data['music'] = f"data:audio/mpeg;base64,{encoded_string}"
-                except Exception as e:
-                    print(f"Could not process music for node {node_id}: {e}")
-                    game_data['music'] = ""
-            else:
-                game_data['music'] = ""
-            
-            # Process advanced media assets
-            self._process_advanced_media_assets(game_data, node)
-            
-            # Apply variable substitution to text content
-            if 'text' in game_data:
-                game_data['text'] = temp_var_system.substitute_text(game_data['text'])
-            
-            # Apply variable substitution to option text
-            for option in game_data.get('options', []):
-                if 'text' in option:
-                    option['text'] = temp_var_system.substitute_text(option['text'])
+            key = self._get_node_cache_key(node_id, node, context_key) if build_cache else None
+            fragment = build_cache.get_node(key) if build_cache else None
+            if fragment is None:
+                game_data = self._process_node_data(node_id, node, asset_table, temp_var_system)
+                fragment = json.dumps(game_data)
+                if build_cache and self._is_node_cacheable(node):
+                    build_cache.put_node(key, fragment)
+            fragments.append(f"{json.dumps(node_id)}: {fragment}")
+        
+        if build_cache:
+            build_cache.save()
+            if not self._build_cache_pruned:
+                build_cache.prune()
+                self._build_cache_pruned = True
+        return "{\n" + ",\n".join(fragments) + "\n}"
+    
+    def _get_node_cache_key(self, node_id, node, context_key):
+        """Returns a hash of everything the processed output of a node depends on.
         
-            dialogue_data[node_id] = game_data
+        The node is serialized every time: editors change options in place
+        without bumping the node revision, so the revision cannot tell
+        whether the content changed.
+        """
+        content_hash = hash_data(node.to_dict())
+        
+        inputs = [BUILD_CACHE_VERSION, node_id, content_hash, context_key]
+        for field in ('backgroundImage', 'audio', 'music'):
+            path = getattr(node, field, "")
+            inputs.append(file_fingerprint(path) if path else None)
+        media_library = getattr(self.app, 'media_library', None)
+        if media_library:
+            for asset_id in getattr(node, 'media_assets', None) or []:
+                asset = media_library.get_asset(asset_id)
+                if asset:
+                    inputs.append([asset.to_dict(), file_fingerprint(asset.file_path)])
+        return hash_data(inputs)
+    
+    def _is_node_cacheable(self, node):
+        """Checks whether a node's processed output can be reused by later exports.
+        
+        Text using random() is substituted anew by every export.
+        """
+        texts = [getattr(node, 'text', '') or '']
+        texts.extend(option.get('text', '') or '' for option in getattr(node, 'options', None) or []
+                     if isinstance(option, dict))
+        return not any('random(' in str(text) for text in texts)
+    
+    def _create_substitution_system(self):
+        """Creates the variable system used for text substitution."""
+        temp_var_system = VariableSystem()
+        temp_var_system.set_variables_ref(getattr(self.app, 'variables', {}))
+        temp_var_system.set_flags_ref(self.app.story_flags)
+        return temp_var_system
     
-        return dialogue_data
+    def _process_node_data(self, node_id, node, asset_table, temp_var_system):
+        """Process the game data of one node for export."""
+        node_dict = node.to_dict()
+        game_data = node_dict['game_data']
+        
+        # Add node type to game data
+        game_data['node_type'] = node_dict['node_type']
+        
+        # Reference media through the shared asset table, so each file is embedded once
+        for field, add_asset in (('backgroundImage', asset_table.add_image),
+                                 ('audio', asset_table.add_audio),
+                                 ('music', asset_table.add_audio)):
+            try:
+                game_data[field] = add_asset(game_data.get(field))
+            except Exception as e:
+                print(f"Could not process {field} for node {node_id}: {e}")
+                game_data[field] = ""
+        
+        # Process advanced media assets
+        self._process_advanced_media_assets(game_data, node, asset_table)
+        
+        # Apply variable substitution to text content
+        if 'text' in game_data:
+            game_data['text'] = temp_var_system.substitute_text(game_data['text'])
+        
+        # Apply variable substitution to option text, on copies since the
+        # options list is shared with the node
+        if 'options' in game_data:
+            game_data['options'] = [dict(option) for option in game_data['options']]
+        for option in game_data.get('options', []):
+            if 'text' in option:
+                option['text'] = temp_var_system.substitute_text(option['text'])
+        
+        return game_data
+    
+    def _collect_media_files(self):
+        """Returns (path, mime_type) pairs for every media file used by the nodes."""
+        media_library = getattr(self.app, 'media_library', None)
+        files = []
+        for node in self.app.nodes.values():
+            background = getattr(node, 'backgroundImage', "")
+            if background:
+                files.append((background, image_mime_type(background)))
+            for field in ('audio', 'music'):
+                path = getattr(node, field, "")
+                if path:
+                    files.append((path, audio_mime_type(path)))
+            if media_library:
+                for asset_id in getattr(node, 'media_assets', None) or []:
+                    asset = media_library.get_asset(asset_id)
+                    if asset:
+                        files.append((asset.file_path, media_library.get_export_mime_type(asset)))
+        return files
     
-    def _process_advanced_media_assets(self, game_data, node):
+    def _process_advanced_media_assets(self, game_data, node, asset_table):
         """Process advanced media assets for a node."""
         # Check if node has media assets and media library is available
         if not hasattr(node, 'media_assets') or not node.media_assets:
@@ -287,8 +339,12 @@ class HTMLExporter:
             if not asset:
                 continue
             
-            # Encode asset file
-            encoded_data = media_library.encode_asset_for_export(asset)
+            # Encode asset file once per export, however many nodes use it
+            try:
+                encoded_data = asset_table.add_file(asset.file_path, media_library.get_export_mime_type(asset))
+            except Exception as e:
+                print(f"Error encoding asset {asset.asset_id}: {e}")
+                continue
             if not encoded_data:
                 continue
             
@@ -323,7 +379,7 @@ class HTMLExporter:
         # Add processed assets to game data
         game_data['advanced_media_assets'] = processed_assets
     
-    def _generate_html(self, dialogue_data, player_data, flags_data, quests_data, variables_data, enemies_data=None, timers_data=None, feature_data=None, portrait_data=None, music_data=None, media_data=None, voice_data=None):
+    def _generate_html(self, dialogue_data, player_data, flags_data, quests_data, variables_data, enemies_data=None, timers_data=None, feature_data=None, portrait_data=None, music_data=None, media_data=None, voice_data=None, asset_data=None):
         """Generate the complete HTML file content."""
         # Ensure all optional data parameters have default values
         enemies_data = enemies_data or "{}"
@@ -1130,6 +1186,7 @@ class HTMLExporter:
     </div>
     
     <script>
+        const assetData = {asset_data};
         const dialogueData = {dialogue_data};
         let player = {player_data};
         let currentNode = "intro";
@@ -1499,6 +1556,14 @@ class HTMLExporter:
             setTimeout(() => {{ if(t.parentNode) t.remove() }}, 4000);
         }}
 
+        function resolveAsset(ref) {{
+            // Media is stored once in assetData and referenced as "asset:<id>"
+            if (typeof ref === 'string' && ref.startsWith('asset:')) {{
+                return assetData[ref.slice(6)] || '';
+            }}
+            return ref;
+        }}
+
         function setBackground(nodeData) {{
             let themeName = nodeData.backgroundTheme || 'theme-default';
             if (!document.body.classList.contains(themeName)) {{
@@ -1506,7 +1571,7 @@ class HTMLExporter:
                 document.body.classList.add(themeName);
             }}
             if (nodeData.backgroundImage) {{
-                document.body.style.backgroundImage = `url(${{nodeData.backgroundImage}})`;
+                document.body.style.backgroundImage = `url(${{resolveAsset(nodeData.backgroundImage)}})`;
             }} else {{
                 document.body.style.backgroundImage = '';
             }}
@@ -1563,12 +1628,12 @@ class HTMLExporter:
             switch(asset.type) {{
                 case 'image':
                     element = document.createElement('img');
-                    element.src = asset.data;
+                    element.src = resolveAsset(asset.data);
                     element.alt = asset.name;
                     break;
                 case 'video':
                     element = document.createElement('video');
-                    element.src = asset.data;
+                    element.src = resolveAsset(asset.data);
                     element.autoplay = props.autoplay;
                     element.loop = props.loop;
                     element.muted = props.muted;
@@ -1579,7 +1644,7 @@ class HTMLExporter:
                     break;
                 case 'audio':
                     element = document.createElement('audio');
-                    element.src = asset.data;
+                    element.src = resolveAsset(asset.data);
                     element.autoplay = props.autoplay;
                     element.loop = props.loop;
                     element.muted = props.muted;
@@ -1932,17 +1997,18 @@ class HTMLExporter:
             // Handle audio/music
             const audioPlayer = document.getElementById('audio-player');
             if (nodeData.audio) {{
-                audioPlayer.src = nodeData.audio;
+                audioPlayer.src = resolveAsset(nodeData.audio);
                 audioPlayer.play().catch(e => console.log("Audio autoplay prevented"));
             }} else {{
                 audioPlayer.src = "";
             }}
 
             const musicPlayer = document.getElementById('music-player');
-            if (nodeData.music && musicPlayer.src !== nodeData.music) {{
-                musicPlayer.src = nodeData.music;
+            const musicSrc = resolveAsset(nodeData.music);
+            if (musicSrc && musicPlayer.src !== musicSrc) {{
+                musicPlayer.src = musicSrc;
                 musicPlayer.play().catch(e => console.log("Music autoplay prevented"));
-            }} else if (!nodeData.music) {{
+            }} else if (!musicSrc) {{
                 musicPlayer.src = "";
                 musicPlayer.pause();
             }}
@@ -3190,6 +3256,7 @@ class HTMLExporter:
         html_result = html_result.replace('{music_data}', music_data or '{}')
         html_result = html_result.replace('{media_data}', media_data or '{}')
         html_result = html_result.replace('{voice_data}', voice_data or '{}')
+        html_result = html_result.replace('{asset_data}', asset_data or '{}')
         html_result = html_result.replace('{manifest_data}', manifest_data)
         html_result = html_result.replace('{font_link}', font_link)
         html_result = html_result.replace('{font_css}', font_css)
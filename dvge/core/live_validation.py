@@ -0,0 +1,235 @@
+# dvge/core/live_validation.py
+
+"""Continuous, incremental project validation.
+
+LiveValidator keeps the issues of every node in a cache and, after each
+edit, re-checks only the nodes whose links changed, the nodes linking to
+them and the nodes whose reachability from 'intro' flipped. The work runs in
+short slices on the Tk event loop, and listeners receive only the nodes
+whose issues changed.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from .graph_index import END_GAME, describe_link, get_graph_index
+
+
+# Key used for issues that concern the whole project rather than one node
+PROJECT_ISSUE_KEY = ""
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """A single validation error or warning."""
+
+    node_id: str
+    severity: str  # "error" or "warning"
+    message: str
+
+
+class LiveValidator:
+    """Validates the project incrementally in the background of the Tk loop."""
+
+    def __init__(self, app, delay_ms=150, time_budget=0.008):
+        self.app = app
+        self.delay_ms = delay_ms
+        self.time_budget = time_budget
+
+        self.issues = {}      # node_id -> tuple of ValidationIssue
+        self.listeners = []   # callables receiving {node_id: issues} diffs
+
+        self._generation = 0
+        self._reachable = set()
+        self._targets = {}    # node_id -> link targets as of the last pass
+        self._dirty = set()
+        self._after_id = None
+
+    def schedule(self, *args):
+        """Requests a validation pass; repeated calls before it runs are merged.
+
+        Accepts and ignores arguments so it can be used as a snapshot listener.
+        """
+        if self._after_id is None:
+            self._after_id = self.app.after(self.delay_ms, self._start_pass)
+
+    def validate_now(self):
+        """Runs a complete pass synchronously and returns the issue cache."""
+        self._collect_dirty()
+        changed = self._process(budget=None)
+        self._publish(changed)
+        return self.issues
+
+    def get_errors_and_warnings(self):
+        """Returns the cached issues as (errors, warnings) message lists."""
+        errors, warnings = [], []
+        for issues in self.issues.values():
+            for issue in issues:
+                (errors if issue.severity == "error" else warnings).append(issue.message)
+        return errors, warnings
+
+    def _start_pass(self):
+        self._after_id = None
+        self._collect_dirty()
+        self._continue_pass()
+
+    def _continue_pass(self):
+        changed = self._process(budget=self.time_budget)
+        self._publish(changed)
+        if self._dirty and self._after_id is None:
+            self._after_id = self.app.after(1, self._resume_pass)
+
+    def _resume_pass(self):
+        self._after_id = None
+        self._continue_pass()
+
+    def _collect_dirty(self):
+        """Works out which nodes need re-checking since the last pass."""
+        index = get_graph_index(self.app)
+        changed = index.changes_since(self._generation)
+        self._generation = index.generation
+        rebuild = changed is None
+        if rebuild:
+            changed = set(self.app.nodes) | set(self.issues) | set(self._targets)
+            self._targets.clear()
+        if not changed:
+            return
+
+        self._dirty.update(changed)
+        for node_id in changed:
+            # Their links to this node may have become broken or fixed
+            self._dirty.update(index.predecessors(node_id))
+
+        self._dirty.update(self._update_reachable(index, changed, rebuild))
+        self._dirty.add(PROJECT_ISSUE_KEY)
+
+    def _update_reachable(self, index, changed, rebuild):
+        """Updates the nodes reachable from 'intro' and returns those that flipped.
+
+        Only the links of the changed nodes are compared with the previous
+        pass. Nodes behind a removed link are searched again from what is
+        still reachable, and nodes behind an added link are searched from
+        there, so the whole graph is walked only on rebuilds.
+        """
+        added, removed = set(), set()
+        for node_id in changed:
+            old = self._targets.pop(node_id, None)
+            if index.contains(node_id):
+                new = frozenset(target for _, _, target in index.links(node_id))
+                self._targets[node_id] = new
+                if old is None:
+                    # Links into a new node start to count
+                    added.add(node_id)
+                    old = frozenset()
+            elif old is not None:
+                # Links into a deleted node stop counting
+                removed.add(node_id)
+                new = frozenset()
+            else:
+                continue
+            added |= new - old
+            removed |= old - new
+
+        reachable = self._reachable
+        if not index.contains("intro") or rebuild or "intro" not in reachable:
+            new_reachable = index.reachable_from("intro")
+            flipped = new_reachable ^ reachable
+            self._reachable = new_reachable
+            return flipped
+        if not added and not removed:
+            return set()
+
+        # Drop everything reached through a removed link...
+        lost = {node_id for node_id in removed if node_id in reachable}
+        queue = deque(lost)
+        while queue:
+            for target in index.successors(queue.popleft()):
+                if target in reachable and target not in lost:
+                    lost.add(target)
+                    queue.append(target)
+        reachable -= lost
+
+        # ...then search again from the nodes still linked to
+        seeds = [node_id for node_id in lost | added
+                 if index.contains(node_id) and node_id not in reachable
+                 and (node_id == "intro" or not index.predecessors(node_id).isdisjoint(reachable))]
+        gained = set(seeds)
+        reachable.update(seeds)
+        queue = deque(seeds)
+        while queue:
+            for target in index.successors(queue.popleft()):
+                if target not in reachable:
+                    reachable.add(target)
+                    gained.add(target)
+                    queue.append(target)
+        return lost ^ gained
+
+    def _process(self, budget):
+        """Re-checks dirty nodes until the time budget runs out; returns changed IDs."""
+        index = get_graph_index(self.app)
+        deadline = None if budget is None else time.perf_counter() + budget
+        changed = {}
+
+        while self._dirty:
+            node_id = self._dirty.pop()
+            issues = self._check_node(node_id, index)
+            if issues != self.issues.get(node_id, ()):
+                if issues:
+                    self.issues[node_id] = issues
+                else:
+                    self.issues.pop(node_id, None)
+                changed[node_id] = issues
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        return changed
+
+    def _publish(self, changed):
+        if not changed:
+            return
+        for listener in self.listeners:
+            try:
+                listener(changed)
+            except Exception as e:
+                print(f"Error in validation listener: {e}")
+
+    def _check_node(self, node_id, index):
+        """Returns the issues of one node, mirroring ProjectValidator's checks."""
+        if node_id == PROJECT_ISSUE_KEY:
+            if "intro" not in self.app.nodes:
+                return (ValidationIssue(PROJECT_ISSUE_KEY, "error",
+                                        "Project must contain a node with the ID 'intro' to start."),)
+            return ()
+        if node_id not in self.app.nodes:
+            return ()
+
+        issues = []
+        for field, link_index, target_id in index.links(node_id):
+            if target_id == END_GAME or index.contains(target_id):
+                continue
+            if field == 'options':
+                message = f"Node '{node_id}', Choice #{link_index+1}: Links to non-existent node '{target_id}'."
+            else:
+                message = f"Node '{node_id}': {describe_link(field, link_index)} '{target_id}' does not exist."
+            issues.append(ValidationIssue(node_id, "error", message))
+
+        if "intro" in self.app.nodes and node_id not in self._reachable:
+            issues.append(ValidationIssue(node_id, "warning", f"Node '{node_id}' is unreachable."))
+
+        text, npc = self._read_text_fields(node_id)
+        if not text.strip():
+            issues.append(ValidationIssue(node_id, "warning", f"Node '{node_id}' has empty dialogue text."))
+        if not npc.strip():
+            issues.append(ValidationIssue(node_id, "warning", f"Node '{node_id}' has empty NPC name."))
+
+        return tuple(issues)
+
+    def _read_text_fields(self, node_id):
+        """Returns a node's text and NPC, without building lazily loaded nodes."""
+        peek_raw = getattr(self.app.nodes, 'peek_raw', None)
+        raw = peek_raw(node_id) if peek_raw else None
+        if raw is not None:
+            game_data = raw.get('game_data', {})
+            return str(game_data.get('text', '') or ''), str(game_data.get('npc', '') or '')
+        node = self.app.nodes[node_id]
+        return str(getattr(node, 'text', '') or ''), str(getattr(node, 'npc', '') or '')
@@ -0,0 +1,121 @@
+# dvge/core/node_map.py
+
+"""Lazily materialized node collection."""
+
+import copy
+from collections.abc import MutableMapping
+
+from ..models import create_node_from_dict
+
+
+class LazyNodeMap(MutableMapping):
+    """A node_id -> node mapping that builds node objects on first access.
+
+    Loaded projects keep each node as its serialized dictionary until the node
+    is looked up, so opening a project does not pay for creating every node.
+    Membership tests, len() and iterating over IDs never build nodes; indexing,
+    get(), values() and items() do. Raw dictionaries are treated as read-only
+    and may be shared with undo snapshots.
+    """
+
+    def __init__(self, raw_nodes=None):
+        # node_id -> node object, or serialized dict while not yet materialized
+        self._data = {}
+        self._raw_ids = set()
+        # node_id -> (node, revision) recorded when a node is built from raw data
+        self._built = {}
+        if raw_nodes:
+            self.add_raw(raw_nodes)
+
+    def add_raw(self, raw_nodes):
+        """Adds serialized nodes without materializing them."""
+        for node_id, node_data in raw_nodes.items():
+            self._data[node_id] = node_data
+            self._raw_ids.add(node_id)
+
+    def __getitem__(self, node_id):
+        value = self._data[node_id]
+        if node_id in self._raw_ids:
+            value = create_node_from_dict(copy.deepcopy(value))
+            self._data[node_id] = value
+            self._raw_ids.discard(node_id)
+            self._built[node_id] = (value, getattr(value, 'revision', 0))
+        return value
+
+    def __setitem__(self, node_id, node):
+        self._data[node_id] = node
+        self._raw_ids.discard(node_id)
+        self._built.pop(node_id, None)
+
+    def __delitem__(self, node_id):
+        del self._data[node_id]
+        self._raw_ids.discard(node_id)
+        self._built.pop(node_id, None)
+
+    def __contains__(self, node_id):
+        return node_id in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def pop(self, node_id, *default):
+        """Removes a node without materializing it; returns the node or its raw data."""
+        self._raw_ids.discard(node_id)
+        self._built.pop(node_id, None)
+        return self._data.pop(node_id, *default)
+
+    def clear(self):
+        self._data.clear()
+        self._raw_ids.clear()
+        self._built.clear()
+
+    def is_materialized(self, node_id):
+        """Checks whether a node object has been built for this ID."""
+        return node_id in self._data and node_id not in self._raw_ids
+
+    def is_unchanged_since_load(self, node_id):
+        """Checks whether a node is still raw, or was built from raw data and not edited since.
+
+        Edits that mutate lists or dicts in place without assigning an
+        attribute are not detected.
+        """
+        if node_id in self._raw_ids:
+            return True
+        built = self._built.get(node_id)
+        return (built is not None and built[0] is self._data.get(node_id)
+                and built[1] == getattr(built[0], 'revision', 0))
+
+    def peek_raw(self, node_id):
+        """Returns the serialized data of a node that has not been built yet, else None."""
+        if node_id in self._raw_ids:
+            return self._data[node_id]
+        return None
+
+    def peek_position(self, node_id):
+        """Returns a node's (x, y) position without materializing it."""
+        raw = self.peek_raw(node_id)
+        if raw is not None:
+            editor_data = raw.get('editor_data', {})
+            return editor_data.get('x', 0), editor_data.get('y', 0)
+        node = self._data[node_id]
+        return node.x, node.y
+
+    def materialized_items(self):
+        """Returns (node_id, node) pairs for nodes that have already been built."""
+        return [(node_id, value) for node_id, value in self._data.items()
+                if node_id not in self._raw_ids]
+
+    @property
+    def unmaterialized_count(self):
+        """Number of nodes still held as serialized data."""
+        return len(self._raw_ids)
+
+
+def iter_materialized(nodes):
+    """Returns (node_id, node) pairs that exist as objects, for dicts and LazyNodeMaps alike."""
+    if isinstance(nodes, LazyNodeMap):
+        return nodes.materialized_items()
+    return nodes.items()
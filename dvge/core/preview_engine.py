@@ -3,10 +3,13 @@
 """Enhanced preview game engine with full support for special node types."""
 
 import copy
-import random
 import time
 from typing import Dict, Any, List, Optional, Callable
 from ..models import DiceRollNode, CombatNode, ShopNode, RandomEventNode, TimerNode, InventoryNode
+from .condition_program import ConditionProgramCache, ConditionState, compile_condition
+from ..runtime.rules import (
+    apply_effect, buy_item, choose_random_outcome, craft_item, resolve_combat, roll_dice, sell_item
+)
 
 
 class EnhancedPreviewGameEngine:
@@ -27,6 +30,9 @@ class EnhancedPreviewGameEngine:
         self.variables = {}
         self.quests = {}
         
+        # Compiled option conditions, per node
+        self.condition_programs = ConditionProgramCache()
+        
         # Callbacks for UI updates
         self.on_node_change: Optional[Callable] = None
         self.on_state_change: Optional[Callable] = None
@@ -265,10 +271,12 @@ class EnhancedPreviewGameEngine:
         # Apply variable substitution to text
         processed_text = self.var_system.substitute_text(node.text)
         
-        # Get available options based on conditions
+        # Get available options based on conditions, all checked in one pass
+        options = getattr(node, 'options', [])
+        availability = self.condition_programs.get(node).evaluate(ConditionState.from_engine(self)) if options else []
         available_options = []
-        for i, option in enumerate(getattr(node, 'options', [])):
-            if self._check_conditions(option.get('conditions', [])):
+        for i, option in enumerate(options):
+            if availability[i]:
                 processed_option_text = self.var_system.substitute_text(option.get('text', ''))
                 available_options.append({
                     'index': i,
@@ -362,21 +370,7 @@ class EnhancedPreviewGameEngine:
             
     def _trigger_random_event(self, node: RandomEventNode):
         """Triggers a random event."""
-        if not node.random_outcomes:
-            return
-            
-        # Calculate weighted random selection
-        total_weight = sum(outcome.get('weight', 1) for outcome in node.random_outcomes)
-        random_value = random.random() * total_weight
-        
-        current_weight = 0
-        selected_outcome = None
-        
-        for outcome in node.random_outcomes:
-            current_weight += outcome.get('weight', 1)
-            if random_value <= current_weight:
-                selected_outcome = outcome
-                break
+        selected_outcome = choose_random_outcome(node.random_outcomes)
                 
         if selected_outcome:
             if self.on_message:
@@ -415,19 +409,9 @@ class EnhancedPreviewGameEngine:
         """Handles buying an item from a shop."""
         current_currency = self.variables.get(currency_var, 0)
         
-        if current_currency >= price:
-            # Deduct currency
-            self.variables[currency_var] = current_currency - price
-            
-            # Add item to inventory
-            self.player_inventory.append({
-                'name': item_name,
-                'description': f'Purchased from shop for {price} {currency_var}'
-            })
-            
+        if buy_item(self, item_name, price, currency_var):
             if self.on_message:
                 self.on_message(f"Bought {item_name} for {price} {currency_var}!", "success")
-                
             return True
         else:
             if self.on_message:
@@ -436,20 +420,9 @@ class EnhancedPreviewGameEngine:
             
     def sell_item(self, item_name: str, price: int, currency_var: str):
         """Handles selling an item to a shop."""
-        # Find item in inventory
-        item_index = next((i for i, item in enumerate(self.player_inventory) 
-                          if item.get('name') == item_name), -1)
-        
-        if item_index >= 0:
-            # Remove item from inventory
-            del self.player_inventory[item_index]
-            
-            # Add currency
-            self.variables[currency_var] = self.variables.get(currency_var, 0) + price
-            
+        if sell_item(self, item_name, price, currency_var):
             if self.on_message:
                 self.on_message(f"Sold {item_name} for {price} {currency_var}!", "success")
-                
             return True
         else:
             if self.on_message:
@@ -458,31 +431,11 @@ class EnhancedPreviewGameEngine:
             
     def craft_item(self, recipe_name: str, ingredients: List[str], result: str):
         """Handles crafting an item."""
-        # Check if all ingredients are available
-        inventory_items = [item.get('name') for item in self.player_inventory]
-        
-        missing_ingredients = []
-        for ingredient in ingredients:
-            if ingredient not in inventory_items:
-                missing_ingredients.append(ingredient)
-                
+        missing_ingredients = craft_item(self, recipe_name, ingredients, result)
         if missing_ingredients:
             if self.on_message:
                 self.on_message(f"Missing ingredients: {', '.join(missing_ingredients)}", "warning")
             return False
-            
-        # Remove ingredients from inventory
-        for ingredient in ingredients:
-            item_index = next((i for i, item in enumerate(self.player_inventory) 
-                              if item.get('name') == ingredient), -1)
-            if item_index >= 0:
-                del self.player_inventory[item_index]
-                
-        # Add result to inventory
-        self.player_inventory.append({
-            'name': result,
-            'description': f'Crafted using {recipe_name}'
-        })
         
         if self.on_message:
             self.on_message(f"Successfully crafted {result}!", "success")
@@ -528,13 +481,7 @@ class EnhancedPreviewGameEngine:
             return
             
         # Roll dice
-        total = 0
-        rolls = []
-        for _ in range(node.num_dice):
-            roll = random.randint(1, node.num_sides)
-            rolls.append(roll)
-            total += roll
-            
+        total, rolls = roll_dice(node.num_dice, node.num_sides)
         success = total >= node.success_threshold
         
         # Show result
@@ -558,19 +505,8 @@ class EnhancedPreviewGameEngine:
         if not isinstance(node, CombatNode):
             return
             
-        # Simple combat calculation
-        player_power = (
-            self.player_stats.get('strength', 10) + 
-            self.player_stats.get('defense', 5) + 
-            (self.player_stats.get('health', 100) / 10)
-        )
-        
-        # Add some randomness
-        random_factor = random.uniform(0.8, 1.2)
-        final_power = player_power * random_factor
-        
-        # Determine victory (adjust threshold as needed)
-        victory = final_power > 50
+        # Simple combat calculation, with some randomness
+        final_power, victory = resolve_combat(self.player_stats)
         
         result_text = f"Combat Power: {final_power:.1f} - {'Victory!' if victory else 'Defeat!'}"
         if self.on_message:
@@ -596,67 +532,12 @@ class EnhancedPreviewGameEngine:
         if not conditions:
             return True
             
-        for condition in conditions:
-            if not self._check_single_condition(condition):
-                return False
-        return True
+        state = ConditionState.from_engine(self)
+        return all(compile_condition(condition)(state) for condition in conditions)
         
     def _check_single_condition(self, condition: Dict[str, Any]) -> bool:
         """Checks a single condition."""
-        cond_type = condition.get('type', 'stat')
-        subject = condition.get('subject', '')
-        operator = condition.get('operator', '>=')
-        value = condition.get('value', 0)
-        
-        if cond_type == 'stat':
-            player_stat = self.player_stats.get(subject, 0)
-            return self._compare_values(player_stat, operator, value)
-            
-        elif cond_type == 'item':
-            has_item = any(item.get('name') == subject for item in self.player_inventory)
-            return (operator == 'has') == has_item
-            
-        elif cond_type == 'flag':
-            flag_value = self.story_flags.get(subject, False)
-            comparison_value = (str(value).lower() == 'true')
-            return (operator == 'is') == (flag_value == comparison_value)
-            
-        elif cond_type == 'quest':
-            quest = self.quests.get(subject, {})
-            quest_state = quest.get('state', 'inactive')
-            return (operator == 'is') == (quest_state == value)
-            
-        elif cond_type == 'variable':
-            var_value = self.variables.get(subject, 0)
-            try:
-                # Handle variable references in value
-                if isinstance(value, str) and '{' in str(value):
-                    value = self.var_system.evaluate_math_expression(str(value))
-                else:
-                    value = float(value)
-            except:
-                value = 0
-            return self._compare_values(var_value, operator, value)
-            
-        return True
-        
-    def _compare_values(self, left, operator: str, right) -> bool:
-        """Compares two values using the given operator."""
-        try:
-            left = float(left)
-            right = float(right)
-            
-            if operator == '==': return left == right
-            elif operator == '!=': return left != right
-            elif operator == '>': return left > right
-            elif operator == '<': return left < right
-            elif operator == '>=': return left >= right
-            elif operator == '<=': return left <= right
-            
-        except (ValueError, TypeError):
-            return str(left) == str(right)
-            
-        return False
+        return compile_condition(condition)(ConditionState.from_engine(self))
         
     def _apply_effects(self, effects: List[Dict[str, Any]]):
         """Applies a list of effects."""
@@ -669,60 +550,7 @@ class EnhancedPreviewGameEngine:
         
     def _apply_single_effect(self, effect: Dict[str, Any]):
         """Applies a single effect."""
-        effect_type = effect.get('type', 'stat')
-        subject = effect.get('subject', '')
-        operator = effect.get('operator', '+=')
-        value = effect.get('value', 0)
-        
-        if effect_type == 'stat':
-            try:
-                value = float(value)
-            except:
-                value = 0
-                
-            if subject not in self.player_stats:
-                self.player_stats[subject] = 0
-                
-            current = self.player_stats[subject]
-            if operator == '=':
-                self.player_stats[subject] = value
-            elif operator == '+=':
-                self.player_stats[subject] = current + value
-            elif operator == '-=':
-                self.player_stats[subject] = current - value
-                
-        elif effect_type == 'item':
-            if operator == 'add':
-                if not any(item.get('name') == subject for item in self.player_inventory):
-                    self.player_inventory.append({'name': subject, 'description': ''})
-            elif operator == 'remove':
-                self.player_inventory = [
-                    item for item in self.player_inventory 
-                    if item.get('name') != subject
-                ]
-                
-        elif effect_type == 'flag':
-            bool_value = (str(value).lower() == 'true')
-            self.story_flags[subject] = bool_value
-            
-        elif effect_type == 'quest':
-            if subject in self.quests:
-                self.quests[subject]['state'] = value
-                
-        elif effect_type == 'variable':
-            try:
-                # Handle expressions in value
-                if isinstance(value, str) and ('{' in str(value) or any(op in str(value) for op in ['+', '-', '*', '/'])):
-                    value = self.var_system.evaluate_math_expression(str(value))
-                else:
-                    value = float(value)
-            except:
-                value = 0
-                
-            if subject not in self.variables:
-                self.variables[subject] = 0
-                
-            self.var_system.apply_variable_effect(subject, operator, value)
+        apply_effect(self, effect)
             
     def _initialize_feature_systems(self):
         """Initialize feature systems for the preview engine."""
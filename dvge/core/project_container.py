@@ -0,0 +1,177 @@
+# dvge/core/project_container.py
+
+"""Chunked, compressed container format for DVGE projects.
+
+A container is a zip archive holding:
+
+    manifest.json             format version, node count and chunk list
+    project.json              everything except the nodes
+    nodes/chunk_0000.json     up to ``chunk_size`` nodes per chunk
+
+Each entry is deflate-compressed on its own, so a project can be written one
+chunk at a time and read back chunk by chunk without holding the whole file
+(or every serialized node) in memory at once.
+"""
+
+import json
+import os
+import tempfile
+import zipfile
+
+
+CONTAINER_FORMAT = "dvge-container"
+CONTAINER_VERSION = 1
+CONTAINER_EXTENSION = ".dvgz"
+DEFAULT_CHUNK_SIZE = 250
+
+_ZIP_MAGIC = b"PK\x03\x04"
+_MANIFEST = "manifest.json"
+_PROJECT = "project.json"
+
+
+def is_container_file(filepath):
+    """Checks whether a file is a project container rather than plain JSON."""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(_ZIP_MAGIC)) == _ZIP_MAGIC
+    except OSError:
+        return False
+
+
+def write_project_container(filepath, project_data, node_items, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Writes a project container.
+
+    Args:
+        filepath: Destination path. The file is replaced atomically.
+        project_data: Project dictionary without the "nodes" key.
+        node_items: Iterable of (node_id, node_dict) pairs. Consumed lazily,
+            so callers can serialize nodes on demand.
+        chunk_size: Number of nodes stored per chunk.
+
+    Returns:
+        The number of nodes written.
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, temp_path = tempfile.mkstemp(suffix=CONTAINER_EXTENSION, dir=directory)
+    os.close(fd)
+
+    try:
+        chunk_names = []
+        node_count = 0
+        with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(_PROJECT, json.dumps(project_data, separators=(',', ':')))
+
+            chunk = {}
+            for node_id, node_data in node_items:
+                chunk[node_id] = node_data
+                if len(chunk) >= chunk_size:
+                    chunk_names.append(_write_chunk(archive, len(chunk_names), chunk))
+                    node_count += len(chunk)
+                    chunk = {}
+            if chunk:
+                chunk_names.append(_write_chunk(archive, len(chunk_names), chunk))
+                node_count += len(chunk)
+
+            # Written last so it can describe the chunks; readers look it up by name
+            archive.writestr(_MANIFEST, json.dumps({
+                "format": CONTAINER_FORMAT,
+                "container_version": CONTAINER_VERSION,
+                "project_version": project_data.get("version", "1.0.0"),
+                "node_count": node_count,
+                "chunk_size": chunk_size,
+                "node_chunks": chunk_names
+            }, indent=4))
+
+        os.replace(temp_path, filepath)
+        return node_count
+
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _write_chunk(archive, index, chunk):
+    """Writes one chunk of nodes and returns its entry name."""
+    name = f"nodes/chunk_{index:04d}.json"
+    archive.writestr(name, json.dumps(chunk, separators=(',', ':')))
+    return name
+
+
+class ProjectContainerReader:
+    """Reads a project container one section at a time.
+
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._archive = zipfile.ZipFile(filepath, 'r')
+        try:
+            self.manifest = self._read_json(_MANIFEST)
+        except KeyError:
+            self._archive.close()
+            raise ValueError(f"{os.path.basename(filepath)} is not a DVGE project container")
+
+        if self.manifest.get("format") != CONTAINER_FORMAT:
+            self._archive.close()
+            raise ValueError(f"{os.path.basename(filepath)} is not a DVGE project container")
+        if self.manifest.get("container_version", 0) > CONTAINER_VERSION:
+            self._archive.close()
+            raise ValueError("Project container was saved by a newer version of DVGE")
+
+    @property
+    def node_count(self):
+        """Total number of nodes in the container."""
+        return self.manifest.get("node_count", 0)
+
+    @property
+    def chunk_names(self):
+        """Names of the node chunks in load order."""
+        return list(self.manifest.get("node_chunks", []))
+
+    def read_project_data(self):
+        """Returns the project dictionary without nodes."""
+        return self._read_json(_PROJECT)
+
+    def read_chunk(self, name):
+        """Returns the {node_id: node_dict} mapping stored in one chunk."""
+        return self._read_json(name)
+
+    def iter_node_chunks(self):
+        """Yields node chunks one at a time."""
+        for name in self.chunk_names:
+            yield self.read_chunk(name)
+
+    def read_all(self):
+        """Returns the full project dictionary, matching the plain JSON layout."""
+        project_data = self.read_project_data()
+        nodes = {}
+        for chunk in self.iter_node_chunks():
+            nodes.update(chunk)
+        project_data["nodes"] = nodes
+        return project_data
+
+    def close(self):
+        """Closes the underlying archive."""
+        self._archive.close()
+
+    def _read_json(self, name):
+        with self._archive.open(name) as f:
+            return json.load(f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+def read_project_file(filepath):
+    """Reads a full project dictionary from either a container or plain JSON."""
+    if is_container_file(filepath):
+        with ProjectContainerReader(filepath) as reader:
+            return reader.read_all()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -6,6 +6,17 @@ import json
 import os
 from tkinter import filedialog, messagebox
 from ..models import create_node_from_dict, Quest, GameTimer, Enemy
+from .graph_index import get_graph_index
+from .node_map import LazyNodeMap
+from .project_container import (
+    CONTAINER_EXTENSION, ProjectContainerReader, is_container_file, write_project_container
+)
+
+
+PROJECT_FILETYPES = [
+    ("DVG Project Files", "*.dvgproj"),
+    ("DVG Compressed Project Files", f"*{CONTAINER_EXTENSION}")
+]
 
 
 class ProjectHandler:
@@ -13,21 +24,46 @@ class ProjectHandler:
     
     def __init__(self, app):
         self.app = app
+        # Incremented on every load or reset so a superseded progressive load stops
+        self._load_generation = 0
+        # Generation of the progressive load still adding chunks, if any
+        self._active_load = None
+    
+    @property
+    def is_loading(self):
+        """Whether nodes of a progressively loaded project are still being added."""
+        return self._active_load is not None and self._active_load == self._load_generation
+    
+    def cancel_loading(self):
+        """Stops adding chunks of a progressively loaded project.
+
+        Called whenever the project is replaced, so the remaining nodes of the
+        old project do not end up in the new one.
+        """
+        self._load_generation += 1
+        self._active_load = None
     
     def save_project(self):
         """Saves the current project state to a .dvgproj file."""
+        if self.is_loading:
+            # Saving now would write only the nodes loaded so far
+            messagebox.showinfo("Save Project", "Please wait until the project has finished loading.")
+            return False
         try:
             filepath = filedialog.asksaveasfilename(
                 defaultextension=".dvgproj", 
-                filetypes=[("DVG Project Files", "*.dvgproj")]
+                filetypes=PROJECT_FILETYPES
             )
             if not filepath: 
                 return False
-                
-            project_data = self._create_project_data()
             
-            with open(filepath, 'w', encoding='utf-8') as f: 
-                json.dump(project_data, f, indent=4)
+            if filepath.lower().endswith(CONTAINER_EXTENSION):
+                self._save_project_container(filepath)
+            else:
+                project_data = self._create_project_data()
+                
+                with open(filepath, 'w', encoding='utf-8') as f: 
+                    json.dump(project_data, f, indent=4)
                 
             messagebox.showinfo("Save Successful", f"Project saved to {os.path.basename(filepath)}")
             return True
@@ -40,11 +76,15 @@ class ProjectHandler:
         """Loads a project from a .dvgproj file."""
         try:
             filepath = filedialog.askopenfilename(
-                filetypes=[("DVG Project Files", "*.dvgproj")]
+                filetypes=[("All DVG Projects", f"*.dvgproj *{CONTAINER_EXTENSION}")] + PROJECT_FILETYPES
             )
             if not filepath: 
                 return False
 
+            if is_container_file(filepath):
+                self._load_project_container(filepath)
+                return True
+
             with open(filepath, 'r', encoding='utf-8') as f: 
                 project_data = json.load(f)
 
@@ -57,11 +97,27 @@ class ProjectHandler:
             messagebox.showerror("Load Error", f"Failed to load project: {e}")
             return False
     
+    def _save_project_container(self, filepath):
+        """Saves the project as a chunked container, serializing nodes as they are written."""
+        write_project_container(filepath, self._create_project_settings_data(), self._iter_node_data())
+    
+    def _iter_node_data(self):
+        """Yields (node_id, node_dict) pairs, reusing loaded data for nodes never built."""
+        peek_raw = getattr(self.app.nodes, 'peek_raw', None)
+        for node_id in self.app.nodes:
+            raw = peek_raw(node_id) if peek_raw else None
+            yield node_id, raw if raw is not None else self.app.nodes[node_id].to_dict()
+    
     def _create_project_data(self):
         """Create the project data dictionary for saving."""
+        project_data = self._create_project_settings_data()
+        project_data["nodes"] = dict(self._iter_node_data())
+        return project_data
+    
+    def _create_project_settings_data(self):
+        """Create the project data dictionary for everything except nodes."""
         return {
             "version": "1.0.0",
-            "nodes": {node_id: node.to_dict() for node_id, node in self.app.nodes.items()},
             "player_stats": self.app.player_stats,
             "player_inventory": self.app.player_inventory,
             "story_flags": self.app.story_flags,
@@ -74,8 +130,69 @@ class ProjectHandler:
             "project_settings": self.app.project_settings
         }
     
+    def _load_project_container(self, filepath):
+        """Loads a project container progressively.
+
+        The first chunk of nodes is shown right away; the remaining chunks are
+        added from the Tk event loop so the editor stays responsive.
+        """
+        reader = ProjectContainerReader(filepath)
+        try:
+            self._load_project_settings(reader.read_project_data())
+            chunk_names = reader.chunk_names
+            if chunk_names:
+                self._add_nodes(reader.read_chunk(chunk_names[0]))
+            self.app.canvas_manager.redraw_all_nodes()
+        except Exception:
+            reader.close()
+            raise
+        
+        self._active_load = self._load_generation
+        self.app.after(1, self._load_remaining_chunks, reader, chunk_names[1:], self._load_generation)
+    
+    def _load_remaining_chunks(self, reader, chunk_names, generation):
+        """Adds one chunk of nodes, then reschedules itself for the rest."""
+        if generation != self._load_generation:
+            # Another project was loaded in the meantime
+            reader.close()
+            return
+        
+        if not chunk_names:
+            reader.close()
+            self._active_load = None
+            self._finish_project_load(redraw=False)
+            messagebox.showinfo("Load Successful", "Project loaded successfully.")
+            return
+        
+        try:
+            chunk = reader.read_chunk(chunk_names[0])
+        except Exception as e:
+            reader.close()
+            self._active_load = None
+            self._finish_project_load(redraw=False)
+            messagebox.showerror("Load Error", f"Project was only partially loaded: {e}")
+            return
+        
+        added = self._add_nodes(chunk)
+        canvas_manager = self.app.canvas_manager
+        for node_id in added:
+            canvas_manager.create_node_visual(self.app.nodes[node_id])
+        canvas_manager.connection_renderer.draw_connections_for(self.app.nodes, added,
+                                                          get_graph_index(self.app))
+        canvas_manager.update_selection_visuals(added)
+        
+        self.app.after(1, self._load_remaining_chunks, reader, chunk_names[1:], generation)
+    
     def _load_project_data(self, project_data):
         """Load project data into the application."""
+        self._load_project_settings(project_data)
+        self._add_nodes(project_data.get("nodes", {}))
+        self._finish_project_load()
+    
+    def _load_project_settings(self, project_data):
+        """Reset the editor and load everything except nodes."""
+        self.cancel_loading()
+        
         # Clear current state
         self.app.canvas.delete("all")
         self.app.nodes.clear()
@@ -84,6 +201,8 @@ class ProjectHandler:
 
         # Reset to defaults first
         self.app._initialize_project_state()
+        # Nodes are built on first access rather than all up front
+        self.app.nodes = LazyNodeMap()
         
         # Load data
         self.app.node_id_counter = project_data.get("node_id_counter", 0)
@@ -117,15 +236,24 @@ class ProjectHandler:
             media_library_data = project_data.get("media_library", {})
             if media_library_data:
                 self.app.media_library.from_dict(media_library_data)
-
-        # Load nodes
-        for node_id, node_data in project_data.get("nodes", {}).items():
-            self.app.nodes[node_data['editor_data']['id']] = create_node_from_dict(node_data)
-        
+    
+    def _add_nodes(self, nodes_data):
+        """Add serialized nodes to the project and return their IDs."""
+        raw_nodes = {node_data['editor_data']['id']: node_data for node_data in nodes_data.values()}
+        if isinstance(self.app.nodes, LazyNodeMap):
+            self.app.nodes.add_raw(raw_nodes)
+        else:
+            for node_id, node_data in raw_nodes.items():
+                self.app.nodes[node_id] = create_node_from_dict(node_data)
+        return list(raw_nodes)
+    
+    def _finish_project_load(self, redraw=True):
+        """Reset history and refresh the UI once all nodes are in place."""
         # Reset undo/redo
         self.app.state_manager.clear_history()
         self.app.state_manager.save_state("Load Project")
 
         # Update UI
-        self.app.canvas_manager.redraw_all_nodes()
-        self.app.properties_panel.update_all_panels()
\ No newline at end of file
+        if redraw:
+            self.app.canvas_manager.redraw_all_nodes()
+        self.app.properties_panel.update_all_panels()
@@ -0,0 +1,179 @@
+# dvge/core/redraw_scheduler.py
+
+"""Coalescing of editor redraw requests.
+
+A single user action often asks for the same redraw many times: a property
+edit redraws its node and all connections, then the selection highlight,
+then the properties panel, and batch operations do so once per node.
+RedrawScheduler records these requests as dirty nodes, dirty regions and
+flags, and hands them to a handler in one RedrawBatch on the next idle turn
+of the Tk event loop, so each piece of work is done at most once per turn.
+"""
+
+from dataclasses import dataclass, field
+
+
+# Request kinds, as counted by get_stats()
+FULL = "full"
+NODES = "nodes"
+REGIONS = "regions"
+CONNECTIONS = "connections"
+SELECTION = "selection"
+PROPERTIES = "properties"
+REQUEST_KINDS = (FULL, NODES, REGIONS, CONNECTIONS, SELECTION, PROPERTIES)
+
+
+@dataclass
+class RedrawBatch:
+    """The redraw work collected since the last flush."""
+
+    full: bool = False                                  # redraw the whole canvas
+    nodes: set = field(default_factory=set)             # nodes to redraw
+    regions: list = field(default_factory=list)         # (x1, y1, x2, y2) node-coordinate areas to redraw
+    all_connections: bool = False                       # redraw every connection
+    connection_nodes: set = field(default_factory=set)  # redraw the connections of these nodes
+    all_selection: bool = False                         # refresh the selection highlight of every node
+    selection_nodes: set = field(default_factory=set)   # refresh the selection highlight of these nodes
+    properties: bool = False                            # refresh the properties panel
+
+    def kinds(self):
+        """Returns the request kinds this batch performs."""
+        if self.full:
+            return {FULL, PROPERTIES} if self.properties else {FULL}
+        kinds = set()
+        if self.nodes:
+            kinds.add(NODES)
+        if self.regions:
+            kinds.add(REGIONS)
+        if self.all_connections or self.connection_nodes:
+            kinds.add(CONNECTIONS)
+        if self.all_selection or self.selection_nodes:
+            kinds.add(SELECTION)
+        if self.properties:
+            kinds.add(PROPERTIES)
+        return kinds
+
+    def __bool__(self):
+        return bool(self.kinds())
+
+
+class RedrawScheduler:
+    """Batches redraw requests and performs them once per idle callback.
+
+    Requests made before the pending flush runs are merged into its batch;
+    a full redraw makes the canvas requests pending beside it redundant.
+    handler receives the RedrawBatch. get_stats() reports how many requests
+    were made and how many of them were coalesced into work already pending.
+    """
+
+    def __init__(self, app, handler):
+        self.app = app
+        self.handler = handler
+        self._batch = RedrawBatch()
+        self._after_id = None
+        self._flushing = False
+        self.reset_stats()
+
+    @property
+    def pending(self):
+        """True while a flush is scheduled."""
+        return self._after_id is not None
+
+    def request_full_redraw(self):
+        self._request(FULL).full = True
+
+    def request_nodes(self, node_ids):
+        """Requests nodes be redrawn, along with their connections and selection highlight."""
+        node_ids = set(node_ids)
+        if node_ids:
+            self._request(NODES).nodes.update(node_ids)
+
+    def request_region(self, rect):
+        """Requests the nodes overlapping an area, in node coordinates, be redrawn."""
+        self._request(REGIONS).regions.append(tuple(rect))
+
+    def request_connections(self, node_ids=None):
+        """Requests the connections of the given nodes, or of all nodes, be redrawn."""
+        batch = self._request(CONNECTIONS)
+        if node_ids is None:
+            batch.all_connections = True
+        else:
+            batch.connection_nodes.update(node_ids)
+
+    def request_selection(self, node_ids=None):
+        """Requests the selection highlight of the given nodes, or of all nodes, be refreshed."""
+        batch = self._request(SELECTION)
+        if node_ids is None:
+            batch.all_selection = True
+        else:
+            batch.selection_nodes.update(node_ids)
+
+    def request_properties(self):
+        self._request(PROPERTIES).properties = True
+
+    def flush(self):
+        """Performs the pending work now instead of on the next idle turn."""
+        if self._after_id is not None:
+            try:
+                self.app.after_cancel(self._after_id)
+            except Exception:
+                pass
+        self._run()
+
+    def discard_canvas_work(self):
+        """Drops pending canvas work, e.g. because the canvas was just redrawn in full.
+
+        A pending properties panel refresh is kept.
+        """
+        # The dropped requests stay counted as coalesced
+        self._batch = RedrawBatch(properties=self._batch.properties)
+
+    def get_stats(self):
+        """Returns request, flush and coalescing counters.
+
+        "coalesced" counts requests whose work was merged into other
+        requests of the same batch or made redundant by a full redraw.
+        """
+        requests = sum(self._requests.values())
+        return {
+            'requests': requests,
+            'flushes': self._flushes,
+            'coalesced': sum(self._coalesced.values()),
+            'requests_by_kind': dict(self._requests),
+            'coalesced_by_kind': dict(self._coalesced),
+        }
+
+    def reset_stats(self):
+        self._requests = dict.fromkeys(REQUEST_KINDS, 0)
+        self._coalesced = dict.fromkeys(REQUEST_KINDS, 0)
+        self._flushes = 0
+
+    def _request(self, kind):
+        self._requests[kind] += 1
+        # Every request is coalesced unless it ends up being the one that is performed
+        self._coalesced[kind] += 1
+        if self._after_id is None and not self._flushing:
+            self._after_id = self.app.after_idle(self._run)
+        return self._batch
+
+    def _run(self):
+        self._after_id = None
+        batch, self._batch = self._batch, RedrawBatch()
+        if batch.full:
+            # A full redraw covers every other canvas request
+            batch = RedrawBatch(full=True, properties=batch.properties)
+        kinds = batch.kinds()
+        if not kinds:
+            return
+        for kind in kinds:
+            self._coalesced[kind] = max(self._coalesced[kind] - 1, 0)
+        self._flushes += 1
+
+        self._flushing = True
+        try:
+            self.handler(batch)
+        finally:
+            self._flushing = False
+        if self._batch and self._after_id is None:
+            # The handler itself asked for more work
+            self._after_id = self.app.after_idle(self._run)
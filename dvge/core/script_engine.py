@@ -3,11 +3,15 @@
 import json
 import time
 import threading
-import subprocess
-import tempfile
-import os
 from typing import Dict, List, Any, Optional, Union, Callable
-from pathlib import Path
+
+from .script_worker_pool import (
+    get_python_worker_pool, get_worker_pool, nodejs_available, python_workers_available, script_hash
+)
+
+
+# Maximum number of compiled fallback scripts kept per engine
+SCRIPT_CACHE_SIZE = 1024
 
 
 class ScriptExecutionResult:
@@ -59,6 +63,14 @@ class ScriptEngine:
             'showMessage': self._api_show_message
         }
         
+        # Fallback scripts converted to Python source and compiled to code objects, by source hash
+        self._converted_scripts = {}
+        self._compiled_scripts = {}
+        
+        # Run fallback scripts in worker processes with CPU and memory limits
+        # (not possible in frozen builds, which run them on a thread instead)
+        self.fallback_workers_enabled = python_workers_available()
+        
         # Check if Node.js is available
         self.nodejs_available = self._check_nodejs()
         
@@ -67,13 +79,8 @@ class ScriptEngine:
             print("Warning: Node.js not found. JavaScript execution will be limited.")
     
     def _check_nodejs(self) -> bool:
-        """Check if Node.js is available on the system."""
-        try:
-            result = subprocess.run(['node', '--version'], 
-                                  capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+        """Check if Node.js is available on the system (cached per process)."""
+        return nodejs_available()
     
     def execute_script(self, script_code: str, context: Dict[str, Any] = None, 
                       timeout_ms: Optional[int] = None) -> ScriptExecutionResult:
@@ -99,75 +106,102 @@ class ScriptEngine:
         result.execution_time_ms = (time.time() - start_time) * 1000
         return result
     
+    def execute_batch(self, scripts: Union[str, List[tuple]], contexts: Optional[List[Dict[str, Any]]] = None,
+                      timeout_ms: Optional[int] = None) -> List[ScriptExecutionResult]:
+        """Execute many scripts in one call.
+        
+        `scripts` is either a list of (script_code, context) pairs or a single
+        script, which is then run once for each context in `contexts`. All
+        calls are sent to a worker in a single round-trip; each call still
+        gets its own timeout.
+        """
+        if isinstance(scripts, str):
+            calls = [(scripts, context or {}) for context in (contexts or [])]
+        else:
+            calls = [(script_code, context or {}) for script_code, context in scripts]
+        timeout_ms = timeout_ms or self.default_timeout_ms
+        
+        if self.nodejs_available:
+            pool = get_worker_pool(self.max_memory_mb)
+        elif self.fallback_workers_enabled:
+            pool = get_python_worker_pool(self.max_memory_mb)
+            calls = [(self._convert_fallback(script_code), context) for script_code, context in calls]
+        else:
+            return [self.execute_script(script_code, context, timeout_ms) for script_code, context in calls]
+        
+        try:
+            responses = pool.run_batch(
+                [(script_code, self._prepare_context(context)) for script_code, context in calls], timeout_ms
+            )
+        except Exception as e:
+            responses = [{'success': False, 'error': f"Script worker error: {str(e)}"} for _ in calls]
+        
+        results = []
+        for output_data in responses:
+            result = self._result_from_response(output_data)
+            result.execution_time_ms = output_data.get('time_ms', 0)
+            results.append(result)
+        return results
+    
     def _execute_with_nodejs(self, script_code: str, context: Dict[str, Any], 
                            timeout_ms: int) -> ScriptExecutionResult:
-        """Execute JavaScript using Node.js."""
+        """Execute JavaScript on a persistent Node.js worker."""
         result = ScriptExecutionResult()
         
-        # Create temporary files for script and context
-        with tempfile.TemporaryDirectory() as temp_dir:
-            script_file = Path(temp_dir) / "script.js"
-            context_file = Path(temp_dir) / "context.json"
-            output_file = Path(temp_dir) / "output.json"
-            
-            # Prepare context
-            safe_context = self._prepare_context(context)
-            
-            # Write context to file
-            with open(context_file, 'w', encoding='utf-8') as f:
-                json.dump(safe_context, f)
-            
-            # Create wrapper script
-            wrapper_script = self._create_wrapper_script(script_code, context_file, output_file)
-            
-            # Write script to file
-            with open(script_file, 'w', encoding='utf-8') as f:
-                f.write(wrapper_script)
-            
-            try:
-                # Execute script
-                process = subprocess.run(
-                    ['node', str(script_file)],
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout_ms / 1000,
-                    cwd=temp_dir
-                )
-                
-                # Read results
-                if output_file.exists():
-                    with open(output_file, 'r', encoding='utf-8') as f:
-                        output_data = json.load(f)
-                    
-                    result.success = output_data.get('success', False)
-                    result.result = output_data.get('result')
-                    result.error = output_data.get('error')
-                    result.console_logs = output_data.get('console_logs', [])
-                    result.variables_set = output_data.get('variables_set', {})
-                else:
-                    result.success = False
-                    result.error = "No output file generated"
-                
-                # Handle stderr
-                if process.stderr:
-                    if not result.error:
-                        result.error = process.stderr
-                    result.console_logs.append(f"stderr: {process.stderr}")
-            
-            except subprocess.TimeoutExpired:
-                result.success = False
-                result.error = "Script execution timed out"
-                result.timeout_occurred = True
-            
-            except Exception as e:
-                result.success = False
-                result.error = f"Node.js execution error: {str(e)}"
+        try:
+            pool = get_worker_pool(self.max_memory_mb)
+            output_data = pool.run(script_code, self._prepare_context(context), timeout_ms)
+        except Exception as e:
+            result.success = False
+            result.error = f"Node.js execution error: {str(e)}"
+            return result
         
-        return result
+        return self._result_from_response(output_data)
     
     def _execute_with_fallback(self, script_code: str, context: Dict[str, Any], 
                              timeout_ms: int) -> ScriptExecutionResult:
-        """Fallback execution using Python (limited JavaScript support)."""
+        """Fallback execution using Python (limited JavaScript support).
+        
+        Scripts run on a worker process that stops them after timeout_ms and
+        limits their memory, so a runaway script cannot keep burning CPU in
+        the editor.
+        """
+        if not self.fallback_workers_enabled:
+            return self._execute_in_process(script_code, context, timeout_ms)
+        
+        result = ScriptExecutionResult()
+        
+        try:
+            pool = get_python_worker_pool(self.max_memory_mb)
+            output_data = pool.run(self._convert_fallback(script_code), self._prepare_context(context), timeout_ms)
+        except Exception as e:
+            result.success = False
+            result.error = f"Fallback execution error: {str(e)}"
+            return result
+        
+        return self._result_from_response(output_data)
+    
+    def _result_from_response(self, output_data: Dict[str, Any]) -> ScriptExecutionResult:
+        """Convert a worker response to an execution result."""
+        result = ScriptExecutionResult()
+        result.success = output_data.get('success', False)
+        result.result = output_data.get('result')
+        result.error = output_data.get('error')
+        result.console_logs = output_data.get('console_logs', [])
+        result.variables_set = output_data.get('variables_set', {})
+        if output_data.get('timed_out'):
+            result.error = "Script execution timed out"
+            result.timeout_occurred = True
+        
+        return result
+    
+    def _execute_in_process(self, script_code: str, context: Dict[str, Any], 
+                            timeout_ms: int) -> ScriptExecutionResult:
+        """Fallback execution on a thread of this process.
+        
+        Only used where worker processes cannot be started; a script that
+        times out is reported but keeps running.
+        """
         result = ScriptExecutionResult()
         
         try:
@@ -196,8 +230,8 @@ class ScriptEngine:
                 **context
             }
             
-            # Simple JavaScript to Python conversion
-            python_code = self._convert_js_to_python(script_code)
+            # Simple JavaScript to Python conversion, compiled once per script
+            python_code = self._compile_fallback(script_code)
             
             # Execute with timeout
             if timeout_ms > 0:
@@ -212,7 +246,7 @@ class ScriptEngine:
                     except Exception as e:
                         exec_result[1] = str(e)
                 
-                thread = threading.Thread(target=execute)
+                thread = threading.Thread(target=execute, daemon=True)
                 thread.start()
                 thread.join(timeout=timeout_ms / 1000)
                 
@@ -240,6 +274,27 @@ class ScriptEngine:
         
         return result
     
+    def _convert_fallback(self, script_code: str) -> str:
+        """Convert a script to Python for fallback execution, cached by source hash."""
+        key = script_hash(script_code)
+        python_code = self._converted_scripts.get(key)
+        if python_code is None:
+            if len(self._converted_scripts) >= SCRIPT_CACHE_SIZE:
+                self._converted_scripts.clear()
+            python_code = self._converted_scripts[key] = self._convert_js_to_python(script_code)
+        return python_code
+    
+    def _compile_fallback(self, script_code: str):
+        """Convert and compile a script for in-process execution, cached by source hash."""
+        key = script_hash(script_code)
+        code = self._compiled_scripts.get(key)
+        if code is None:
+            if len(self._compiled_scripts) >= SCRIPT_CACHE_SIZE:
+                self._compiled_scripts.clear()
+            code = compile(self._convert_fallback(script_code), '<script>', 'exec')
+            self._compiled_scripts[key] = code
+        return code
+    
     def _prepare_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare context for safe execution."""
         safe_context = {}
@@ -263,108 +318,6 @@ class ScriptEngine:
         
         return safe_context
     
-    def _create_wrapper_script(self, user_script: str, context_file: str, 
-                             output_file: str) -> str:
-        """Create a wrapper script for safe execution."""
-        # Convert Windows paths to use forward slashes for JavaScript
-        context_file_js = context_file.replace('\\', '/')
-        output_file_js = output_file.replace('\\', '/')
-        
-        return f'''
-const fs = require('fs');
-const path = require('path');
-
-// Execution result
-const result = {{
-    success: false,
-    result: null,
-    error: null,
-    console_logs: [],
-    variables_set: {{}}
-}};
-
-// Override console.log to capture output
-const originalLog = console.log;
-console.log = function(...args) {{
-    result.console_logs.push(args.map(arg => String(arg)).join(' '));
-}};
-
-// Load context
-let context = {{}};
-try {{
-    const contextData = fs.readFileSync('{context_file_js}', 'utf8');
-    context = JSON.parse(contextData);
-}} catch (e) {{
-    result.error = 'Failed to load context: ' + e.message;
-}}
-
-// DVGE API functions
-const DVGE = {{
-    setVariable: function(name, value) {{
-        context[name] = value;
-        result.variables_set[name] = value;
-    }},
-    getVariable: function(name) {{
-        return context[name];
-    }},
-    setFlag: function(name, value) {{
-        context[name] = Boolean(value);
-        result.variables_set[name] = Boolean(value);
-    }},
-    getFlag: function(name) {{
-        return Boolean(context[name]);
-    }},
-    log: function(...args) {{
-        console.log(...args);
-    }},
-    random: function() {{
-        return Math.random();
-    }},
-    randomInt: function(min, max) {{
-        return Math.floor(Math.random() * (max - min + 1)) + min;
-    }},
-    randomChoice: function(array) {{
-        return array[Math.floor(Math.random() * array.length)];
-    }},
-    formatText: function(template, ...args) {{
-        return template.replace(/\\{{(\\d+)\\}}/g, (match, index) => {{
-            return args[parseInt(index)] || match;
-        }});
-    }}
-}};
-
-// Make context variables globally available
-Object.assign(global, context);
-global.DVGE = DVGE;
-
-// Disable dangerous functions
-global.eval = undefined;
-global.Function = undefined;
-global.require = function(module) {{
-    throw new Error('require() is not allowed in sandbox');
-}};
-
-try {{
-    // Execute user script
-    const userResult = (function() {{
-        {user_script}
-    }})();
-    
-    result.success = true;
-    result.result = userResult;
-}} catch (e) {{
-    result.success = false;
-    result.error = e.message;
-}}
-
-// Write result to output file
-try {{
-    fs.writeFileSync('{output_file_js}', JSON.stringify(result, null, 2));
-}} catch (e) {{
-    console.error('Failed to write output:', e.message);
-}}
-'''
-    
     def _convert_js_to_python(self, js_code: str) -> str:
         """Convert simple JavaScript to Python (very basic conversion)."""
         # This is a very simplified converter for basic cases
@@ -433,33 +386,9 @@ try {{
         # Try basic syntax validation if Node.js is available
         if self.nodejs_available:
             try:
-                # Create a simple syntax check script
-                test_script = f'''
-try {{
-    // Wrap in function to check syntax
-    (function() {{
-        {script_code}
-    }});
-    console.log(JSON.stringify({{success: true}}));
-}} catch (e) {{
-    console.log(JSON.stringify({{success: false, error: e.message}}));
-}}
-'''
-                result = subprocess.run(
-                    ['node', '-e', test_script],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                if result.stdout:
-                    try:
-                        syntax_result = json.loads(result.stdout.strip())
-                        if not syntax_result.get('success'):
-                            errors.append(f"Syntax error: {syntax_result.get('error')}")
-                    except json.JSONDecodeError:
-                        warnings.append("Could not parse syntax check result")
-            
+                syntax_error = get_worker_pool(self.max_memory_mb).check_syntax(script_code)
+                if syntax_error:
+                    errors.append(f"Syntax error: {syntax_error}")
             except Exception as e:
                 warnings.append(f"Syntax validation failed: {str(e)}")
         
@@ -0,0 +1,258 @@
+# dvge/core/script_fallback_worker.py
+
+"""Worker process running fallback (JavaScript converted to Python) scripts.
+
+Started by PythonWorkerPool when Node.js is not installed. It speaks the
+same line-delimited JSON protocol as script_worker.js, except that the
+sources it is sent are already converted to Python. The file is run
+directly and imports nothing from dvge.
+
+Each call is stopped after its timeout by a wall-clock alarm and by a CPU
+time limit (RLIMIT_CPU); the process also runs under an address space limit
+(RLIMIT_AS) so a runaway allocation fails with MemoryError instead of
+taking the editor down. The limits need the Unix `resource` and `signal`
+facilities; elsewhere only the pool's own kill timeout applies.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+try:
+    import signal
+    ALARM_AVAILABLE = hasattr(signal, 'setitimer') and hasattr(signal, 'SIGXCPU')
+except ImportError:
+    ALARM_AVAILABLE = False
+
+
+# Compiled scripts a worker keeps; must match SCRIPT_CACHE_SIZE in script_worker_pool.py
+SCRIPT_CACHE_SIZE = 1024
+
+# Longest a script may wait through DVGE.wait()
+MAX_WAIT_SECONDS = 5.0
+
+
+class ScriptTimeout(BaseException):
+    """Raised inside a script that ran out of time; not catchable as Exception."""
+
+
+def _raise_timeout(signum, frame):
+    raise ScriptTimeout()
+
+
+def limit_memory(max_memory_mb):
+    """Limits the address space to what the interpreter uses now plus max_memory_mb."""
+    if not RESOURCE_AVAILABLE or not max_memory_mb:
+        return
+    try:
+        with open('/proc/self/statm') as statm:
+            in_use = int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        in_use = 0
+    limit = in_use + int(max_memory_mb) * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+    except (ValueError, OSError):
+        pass
+
+
+class _Limits:
+    """Arms the wall-clock alarm and CPU limit around one call."""
+
+    def __init__(self, timeout_ms):
+        self.seconds = timeout_ms / 1000 if timeout_ms and timeout_ms > 0 else 0
+        self.cpu_limit = None
+
+    def __enter__(self):
+        if not self.seconds:
+            return self
+        if ALARM_AVAILABLE:
+            signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        if RESOURCE_AVAILABLE and ALARM_AVAILABLE:
+            self.cpu_limit = resource.getrlimit(resource.RLIMIT_CPU)
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            # Whole seconds only; SIGXCPU is the backstop for code the alarm cannot interrupt
+            soft = int(usage.ru_utime + usage.ru_stime + self.seconds) + 2
+            hard = self.cpu_limit[1]
+            if hard == resource.RLIM_INFINITY or soft < hard:
+                try:
+                    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+                except (ValueError, OSError):
+                    self.cpu_limit = None
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.seconds and ALARM_AVAILABLE:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if self.cpu_limit is not None:
+            try:
+                resource.setrlimit(resource.RLIMIT_CPU, self.cpu_limit)
+            except (ValueError, OSError):
+                pass
+        return False
+
+
+def _format_text(template, *args):
+    try:
+        return str(template).format(*args)
+    except (IndexError, KeyError, ValueError):
+        return template
+
+
+def _build_namespace(variables, output):
+    """Returns the globals a script runs with."""
+    def log(*args):
+        output['console_logs'].append(' '.join(map(str, args)))
+
+    def set_variable(name, value):
+        variables[name] = value
+        output['variables_set'][name] = value
+
+    def set_flag(name, value):
+        variables[name] = bool(value)
+        output['variables_set'][name] = bool(value)
+
+    api = {
+        'setVariable': set_variable,
+        'getVariable': variables.get,
+        'setFlag': set_flag,
+        'getFlag': lambda name: bool(variables.get(name)),
+        'log': log,
+        'random': random.random,
+        'randomInt': random.randint,
+        'randomChoice': lambda choices: random.choice(choices) if choices else None,
+        'formatText': _format_text,
+        'wait': lambda seconds: time.sleep(min(seconds, MAX_WAIT_SECONDS)),
+        'showMessage': lambda message: log(f"MESSAGE: {message}"),
+    }
+    return {
+        '__builtins__': {},
+        'console': SimpleNamespace(log=log),
+        'Math': SimpleNamespace(
+            random=random.random, floor=math.floor, ceil=math.ceil, round=round,
+            abs=abs, max=max, min=min, pow=pow, sqrt=math.sqrt
+        ),
+        'JSON': SimpleNamespace(stringify=json.dumps, parse=json.loads),
+        'DVGE': SimpleNamespace(**api),
+        **api,
+        **variables,
+    }
+
+
+class FallbackWorker:
+    """Executes requests of the worker protocol."""
+
+    def __init__(self):
+        self.scripts = {}
+
+    def get_script(self, digest, sources):
+        code = self.scripts.get(digest)
+        if code is None:
+            source = (sources or {}).get(digest)
+            if source is None:
+                return None
+            # Syntax errors propagate to the caller and are not cached
+            code = compile(source, '<script>', 'exec')
+            if len(self.scripts) >= SCRIPT_CACHE_SIZE:
+                self.scripts.clear()
+            self.scripts[digest] = code
+        return code
+
+    def execute(self, digest, sources, variables, timeout_ms):
+        started = time.perf_counter()
+        response = {'success': False, 'result': None, 'error': None, 'console_logs': [],
+                    'variables_set': {}, 'timed_out': False}
+        try:
+            code = self.get_script(digest, sources)
+            if code is None:
+                response['error'] = f"Unknown script: {digest}"
+                response['missing_script'] = True
+            else:
+                namespace = _build_namespace(dict(variables or {}), response)
+                local_context = {}
+                with _Limits(timeout_ms):
+                    exec(code, namespace, local_context)
+                response['success'] = True
+                response['result'] = local_context.get('result', True)
+        except ScriptTimeout:
+            response['error'] = "Script execution timed out"
+            response['timed_out'] = True
+        except MemoryError:
+            response['error'] = "Script exceeded the memory limit"
+        except Exception as e:
+            response['error'] = str(e)
+        response['time_ms'] = (time.perf_counter() - started) * 1000
+        return response
+
+    def handle(self, request):
+        op = request.get('op', 'run')
+        if op == 'run':
+            response = self.execute(request.get('hash'), request.get('scripts'),
+                                    request.get('context'), request.get('timeout_ms'))
+        elif op == 'batch':
+            response = {'success': True, 'results': [
+                self.execute(call.get('hash'), request.get('scripts'), call.get('context'),
+                             request.get('timeout_ms'))
+                for call in request.get('calls', ())
+            ]}
+        elif op == 'check':
+            try:
+                compile(request.get('code', ''), '<script>', 'exec')
+                response = {'success': True, 'error': None}
+            except SyntaxError as e:
+                response = {'success': False, 'error': str(e)}
+        else:
+            response = {'success': False, 'error': f"Unknown operation: {op}"}
+        response['id'] = request.get('id')
+        return response
+
+
+def _serialize(response):
+    try:
+        return json.dumps(response)
+    except (TypeError, ValueError):
+        # Results that cannot be serialized are sent as text
+        results = response.get('results', [response])
+        for result in results:
+            result['result'] = str(result.get('result'))
+            result['variables_set'] = {}
+        return json.dumps(response, default=str)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DVGE fallback script worker.")
+    parser.add_argument("--max-memory-mb", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if ALARM_AVAILABLE:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.signal(signal.SIGXCPU, _raise_timeout)
+    limit_memory(args.max_memory_mb)
+
+    worker = FallbackWorker()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {'id': None, 'success': False, 'error': f"Invalid request: {e}"}
+        else:
+            response = worker.handle(request)
+        sys.stdout.write(_serialize(response) + '\n')
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+// dvge/core/script_worker.js
+//
+// Long-lived Node.js worker for ScriptEngine.
+//
+// Reads one JSON request per line from stdin and writes one JSON response
+// per line to stdout:
+//
+//   {"id": 1, "op": "run", "hash": "9f2c", "scripts": {"9f2c": "return x + 1;"},
+//    "context": {"x": 1}, "timeout_ms": 5000}
+//   {"id": 1, "success": true, "result": 2, "error": null, "console_logs": [],
+//    "variables_set": {}, "timed_out": false, "time_ms": 0.02}
+//
+//   {"id": 2, "op": "batch", "scripts": {}, "timeout_ms": 5000,
+//    "calls": [{"hash": "9f2c", "context": {"x": 1}}, {"hash": "9f2c", "context": {"x": 2}}]}
+//   {"id": 2, "success": true, "results": [{...}, {...}]}
+//
+//   {"id": 3, "op": "check", "code": "return (;"}
+//   {"id": 3, "success": false, "error": "Unexpected token ';'"}
+//
+// Scripts are compiled once and cached by the hash the caller gives them;
+// source only needs to be sent ("scripts") the first time a worker sees a
+// hash. A call naming a hash the worker does not know is answered with
+// "missing_script" so the caller can resend the source.
+//
+// All scripts of a worker run in one vm context, which is much cheaper than
+// creating a context per call. The context is prepared so that calls cannot
+// affect each other or reach the worker: string code generation (eval,
+// Function) is disabled, built-in objects are frozen, promise callbacks run
+// before the call returns and count towards its timeout, globals a script
+// creates are deleted after the call (and its promise callbacks), and each
+// call's variables, DVGE API and
+// console are built inside the context from JSON, so no object of the worker
+// itself is reachable from a script.
+
+'use strict';
+
+const readline = require('readline');
+const vm = require('vm');
+
+// Runs once inside the context. Defines the frozen global __dvge with run()
+// and reset() and returns the object through which the worker passes each
+// call's script function and variables.
+const PRELUDE = `(function() {
+    const call = { fn: null, variables: null };
+    const getDescriptor = Object.getOwnPropertyDescriptor;
+    const defineProperty = Object.defineProperty;
+    const ownKeys = Reflect.ownKeys;
+    const stringify = JSON.stringify;
+    const parse = JSON.parse;
+
+    function freeze(value, seen) {
+        if ((typeof value !== 'object' && typeof value !== 'function') || value === null || seen.has(value)) {
+            return;
+        }
+        seen.add(value);
+        try {
+            Object.freeze(value);
+        } catch (e) {
+            // Some host objects cannot be frozen
+        }
+        for (const key of ownKeys(value)) {
+            const descriptor = getDescriptor(value, key);
+            if (descriptor) {
+                freeze(descriptor.value, seen);
+                freeze(descriptor.get, seen);
+                freeze(descriptor.set, seen);
+            }
+        }
+    }
+
+    function formatText(template, ...args) {
+        return String(template).replace(/\\{(\\d+)\\}/g, (match, index) => {
+            return args[parseInt(index)] || match;
+        });
+    }
+
+    const baseline = new Set(ownKeys(globalThis));
+
+    function reset() {
+        for (const key of ownKeys(globalThis)) {
+            if (!baseline.has(key)) {
+                delete globalThis[key];
+            }
+        }
+    }
+
+    function run() {
+        const output = { success: false, result: null, error: null, console_logs: [], variables_set: {} };
+        const variables = parse(call.variables);
+        const log = (...args) => {
+            output.console_logs.push(args.map(arg => String(arg)).join(' '));
+        };
+        const DVGE = {
+            setVariable(name, value) {
+                variables[name] = value;
+                output.variables_set[name] = value;
+            },
+            getVariable(name) {
+                return variables[name];
+            },
+            setFlag(name, value) {
+                variables[name] = Boolean(value);
+                output.variables_set[name] = Boolean(value);
+            },
+            getFlag(name) {
+                return Boolean(variables[name]);
+            },
+            log: log,
+            random() {
+                return Math.random();
+            },
+            randomInt(min, max) {
+                return Math.floor(Math.random() * (max - min + 1)) + min;
+            },
+            randomChoice(array) {
+                return array[Math.floor(Math.random() * array.length)];
+            },
+            formatText: formatText
+        };
+        const scope = Object.assign(Object.create(null), variables, { DVGE: DVGE, console: { log: log } });
+        try {
+            const result = call.fn(scope);
+            output.result = result === undefined ? null : result;
+            output.success = true;
+        } catch (e) {
+            output.error = e && e.message ? String(e.message) : String(e);
+        }
+        try {
+            return stringify(output);
+        } catch (e) {
+            // Results that cannot be serialized (e.g. cyclic objects) are sent as text
+            output.result = String(output.result);
+            output.variables_set = {};
+            return stringify(output);
+        }
+    }
+
+    const seen = new Set([call]);
+    for (const key of baseline) {
+        const descriptor = getDescriptor(globalThis, key);
+        if (!descriptor || !('value' in descriptor)) {
+            continue;
+        }
+        freeze(descriptor.value, seen);
+        try {
+            defineProperty(globalThis, key, {
+                value: descriptor.value, writable: false,
+                enumerable: descriptor.enumerable, configurable: false
+            });
+        } catch (e) {
+            // Leave properties the context does not allow to be redefined
+        }
+    }
+    defineProperty(globalThis, '__dvge', { value: Object.freeze({ run: run, reset: reset }) });
+    return call;
+})()`;
+
+// Scripts run inside a with statement over their variables, so that they can
+// use them as plain names
+function wrap(code) {
+    return '(function(__scope) { with (__scope) { return (function() {\n' + code + '\n})(); } })';
+}
+
+// With 'afterEvaluate' the context has its own microtask queue, drained at
+// the end of each runInContext() within its timeout; otherwise promise
+// callbacks would run later on the worker's queue, past the timeout and the
+// reset of globals
+const CONTEXT_OPTIONS = { codeGeneration: { strings: false, wasm: false }, microtaskMode: 'afterEvaluate' };
+
+// A null-prototype sandbox keeps the worker's own Object out of the context
+const sandbox = vm.createContext(Object.create(null), CONTEXT_OPTIONS);
+const call = vm.runInContext(PRELUDE, sandbox);
+const runCall = new vm.Script('__dvge.run()');
+const resetCall = new vm.Script('__dvge.reset()');
+
+// Compiled script functions by hash; cleared when full
+const SCRIPT_CACHE_SIZE = 1024;
+const scripts = new Map();
+
+function getScript(hash, sources) {
+    let fn = scripts.get(hash);
+    if (fn === undefined) {
+        const code = sources ? sources[hash] : undefined;
+        if (code === undefined) {
+            return null;
+        }
+        // Syntax errors are thrown to the caller and not cached
+        fn = new vm.Script(wrap(code), { filename: 'script.js' }).runInContext(sandbox);
+        if (scripts.size >= SCRIPT_CACHE_SIZE) {
+            scripts.clear();
+        }
+        scripts.set(hash, fn);
+    }
+    return fn;
+}
+
+function execute(hash, sources, variables, timeout_ms) {
+    const started = process.hrtime.bigint();
+    let response;
+    try {
+        const fn = getScript(hash, sources);
+        if (fn === null) {
+            response = { success: false, error: 'Unknown script: ' + hash, missing_script: true };
+        } else {
+            call.fn = fn;
+            call.variables = JSON.stringify(variables || {});
+            response = JSON.parse(runCall.runInContext(sandbox, timeout_ms > 0 ? { timeout: timeout_ms } : {}));
+        }
+    } catch (e) {
+        response = { success: false, error: e && e.message ? e.message : String(e) };
+        response.timed_out = Boolean(e && e.code === 'ERR_SCRIPT_EXECUTION_TIMEOUT');
+    } finally {
+        call.fn = null;
+        call.variables = null;
+    }
+    // Runs separately, after the call's promise callbacks have run or timed out
+    resetCall.runInContext(sandbox);
+    return Object.assign({
+        success: false,
+        result: null,
+        error: null,
+        console_logs: [],
+        variables_set: {},
+        timed_out: false
+    }, response, { time_ms: Number(process.hrtime.bigint() - started) / 1e6 });
+}
+
+function run(request) {
+    const response = execute(request.hash, request.scripts, request.context, request.timeout_ms);
+    response.id = request.id;
+    return response;
+}
+
+function batch(request) {
+    const results = (request.calls || []).map(item => {
+        return execute(item.hash, request.scripts, item.context, request.timeout_ms);
+    });
+    return { id: request.id, success: true, results: results };
+}
+
+function check(request) {
+    try {
+        new vm.Script(wrap(request.code || ''), { filename: 'script.js' });
+        return { id: request.id, success: true, error: null };
+    } catch (e) {
+        return { id: request.id, success: false, error: e.message };
+    }
+}
+
+const handlers = { run: run, batch: batch, check: check };
+
+const input = readline.createInterface({ input: process.stdin, terminal: false });
+input.on('line', (line) => {
+    if (!line.trim()) {
+        return;
+    }
+    let request;
+    try {
+        request = JSON.parse(line);
+    } catch (e) {
+        process.stdout.write(JSON.stringify({ id: null, success: false, error: 'Invalid request: ' + e.message }) + '\n');
+        return;
+    }
+    const handler = handlers[request.op || 'run'];
+    const response = handler
+        ? handler(request)
+        : { id: request.id, success: false, error: 'Unknown operation: ' + request.op };
+    process.stdout.write(JSON.stringify(response) + '\n');
+});
+input.on('close', () => process.exit(0));
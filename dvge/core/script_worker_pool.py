@@ -0,0 +1,364 @@
+# dvge/core/script_worker_pool.py
+
+"""Pools of long-lived worker processes executing DVGE scripts.
+
+Starting Node for every script costs far more than running it, so scripts
+are sent to a few persistent workers (script_worker.js) as one JSON line
+per request and answered with one JSON line per response. Workers compile
+each script once and cache it by the hash of its source, which is only sent
+to a worker that has not seen it yet; run_batch() sends many calls in one
+round-trip. Each call runs in an isolated sandbox with its own timeout; in
+addition the pool kills a worker that does not answer in time, starts
+workers with a V8 heap limit and replaces them after a number of calls, so
+leaks and crashes stay contained.
+
+PythonWorkerPool runs the Python fallback used without Node.js the same
+way, on script_fallback_worker.py processes with CPU time and memory
+rlimits.
+"""
+
+import atexit
+import hashlib
+import itertools
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+from functools import lru_cache
+
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), 'script_worker.js')
+FALLBACK_WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), 'script_fallback_worker.py')
+
+# Default number of worker processes
+DEFAULT_POOL_SIZE = 2
+
+# Calls after which a worker is replaced
+MAX_CALLS_PER_WORKER = 5000
+
+# Compiled scripts a worker keeps; must match SCRIPT_CACHE_SIZE in both worker scripts
+SCRIPT_CACHE_SIZE = 1024
+
+# Extra seconds the pool waits beyond a script's own timeout before killing the worker
+KILL_GRACE_SECONDS = 1.0
+
+
+@lru_cache(maxsize=None)
+def nodejs_available() -> bool:
+    """Returns True if Node.js can be run; checked once per process."""
+    if shutil.which('node') is None:
+        return False
+    try:
+        result = subprocess.run(['node', '--version'], capture_output=True, text=True, timeout=5)
+        return result.returncode == 0
+    except (subprocess.TimeoutExpired, OSError):
+        return False
+
+
+def python_workers_available() -> bool:
+    """Returns True if fallback scripts can run in worker processes.
+
+    Frozen builds have no Python interpreter to start workers with.
+    """
+    return not getattr(sys, 'frozen', False) and bool(sys.executable)
+
+
+def script_hash(code: str) -> str:
+    """Returns the key under which workers cache a compiled script."""
+    return hashlib.blake2b(code.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _error_response(error, timed_out=False):
+    return {'success': False, 'result': None, 'error': error, 'console_logs': [],
+            'variables_set': {}, 'timed_out': timed_out}
+
+
+def _missing_scripts(response):
+    return response.get('missing_script') or any(
+        result.get('missing_script') for result in response.get('results', ())
+    )
+
+
+class WorkerError(Exception):
+    """Raised when a worker process cannot be started or dies."""
+
+
+class WorkerTimeout(WorkerError):
+    """Raised when a worker does not answer in time."""
+
+
+class _Worker:
+    """One worker process speaking the line-delimited JSON protocol."""
+
+    def __init__(self, command):
+        self.process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding='utf-8', bufsize=1
+        )
+        self.calls = 0
+        self.known_scripts = set()   # hashes this worker has been sent the source of
+        self._responses = queue.Queue()
+        self._reader = threading.Thread(target=self._read_responses, daemon=True)
+        self._reader.start()
+
+    def _read_responses(self):
+        for line in self.process.stdout:
+            self._responses.put(line)
+        self._responses.put(None)  # Process exited
+
+    def request(self, message, timeout, calls=1):
+        """Sends a request and waits for its response."""
+        self.calls += calls
+        try:
+            self.process.stdin.write(json.dumps(message) + '\n')
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise WorkerError(f"Script worker is not running: {e}")
+        while True:
+            try:
+                line = self._responses.get(timeout=timeout)
+            except queue.Empty:
+                raise WorkerTimeout("Script execution timed out") from None
+            if line is None:
+                raise WorkerError("Script worker exited")
+            try:
+                response = json.loads(line)
+            except ValueError:
+                response = None
+            if not isinstance(response, dict):
+                raise WorkerError(f"Script worker sent an invalid response: {line.strip()[:100]!r}")
+            # Skip answers to earlier requests that were given up on
+            if response.get('id') == message['id']:
+                return response
+
+    def remember(self, hashes):
+        """Records scripts sent to the worker, mirroring the worker's own cache."""
+        for digest in hashes:
+            if digest not in self.known_scripts:
+                if len(self.known_scripts) >= SCRIPT_CACHE_SIZE:
+                    self.known_scripts.clear()
+                self.known_scripts.add(digest)
+
+    @property
+    def alive(self):
+        return self.process.poll() is None
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+
+class ScriptWorkerPool:
+    """Runs scripts on a fixed number of persistent worker processes.
+
+    Thread-safe; workers are started on first use. Subclasses provide the
+    command that starts a worker.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, max_memory_mb=None, max_calls_per_worker=MAX_CALLS_PER_WORKER):
+        self.size = size
+        self.max_memory_mb = max_memory_mb
+        self.max_calls_per_worker = max_calls_per_worker
+        self._idle = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._workers = []
+        self._closed = False
+
+    def run(self, code, context=None, timeout_ms=5000):
+        """Runs a script and returns the worker's response dictionary.
+
+        A script that runs past timeout_ms is stopped by its worker; if the
+        worker itself stops answering it is killed and replaced, and the
+        response has timed_out set either way.
+        """
+        digest = script_hash(code)
+        message = {'op': 'run', 'hash': digest, 'context': context or {}, 'timeout_ms': timeout_ms}
+        try:
+            return self._request(message, self._wait(timeout_ms), {digest: code})
+        except WorkerError as e:
+            return _error_response(str(e), isinstance(e, WorkerTimeout))
+
+    def run_batch(self, calls, timeout_ms=5000):
+        """Runs many (code, context) calls in one round-trip to a worker.
+
+        Returns one response dictionary per call, in order. Each call has its
+        own timeout_ms; if the worker stops answering altogether every call
+        gets the same error.
+        """
+        sources = {}
+        requests = []
+        for code, context in calls:
+            digest = script_hash(code)
+            sources[digest] = code
+            requests.append({'hash': digest, 'context': context or {}})
+        if not requests:
+            return []
+        message = {'op': 'batch', 'calls': requests, 'timeout_ms': timeout_ms}
+        wait = self._wait(timeout_ms)
+        try:
+            return self._request(message, wait and wait * len(requests), sources)['results']
+        except WorkerError as e:
+            return [_error_response(str(e), isinstance(e, WorkerTimeout)) for _ in requests]
+
+    def check_syntax(self, code):
+        """Returns None if the script compiles, else the syntax error message."""
+        response = self._request({'op': 'check', 'code': code}, 5)
+        return None if response.get('success') else response.get('error')
+
+    def shutdown(self):
+        """Stops all workers."""
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+            self._started = 0
+        for worker in workers:
+            worker.close()
+        self._idle = queue.Queue()
+
+    def worker_command(self):
+        """Returns the command line that starts one worker."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _wait(timeout_ms):
+        return timeout_ms / 1000 + KILL_GRACE_SECONDS if timeout_ms and timeout_ms > 0 else None
+
+    def _request(self, message, wait, sources=None):
+        worker = self._acquire()
+        try:
+            response = self._send(worker, message, wait, sources)
+        except WorkerError:
+            self._discard(worker)
+            raise
+        self._release(worker)
+        return response
+
+    def _send(self, worker, message, wait, sources):
+        calls = len(message.get('calls', ())) or 1
+        message['id'] = next(self._ids)
+        if sources is None:
+            return worker.request(message, wait, calls)
+
+        message['scripts'] = {digest: code for digest, code in sources.items()
+                              if digest not in worker.known_scripts}
+        response = worker.request(message, wait, calls)
+        if _missing_scripts(response):
+            # The worker dropped scripts from its cache; send all of them again
+            worker.known_scripts.clear()
+            message['id'] = next(self._ids)
+            message['scripts'] = dict(sources)
+            response = worker.request(message, wait, calls)
+        worker.remember(sources)
+        return response
+
+    def _acquire(self):
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise WorkerError("Script worker pool is shut down")
+                start_new = self._idle.empty() and self._started < self.size
+                if start_new:
+                    self._started += 1
+            if start_new:
+                try:
+                    worker = _Worker(self.worker_command())
+                except OSError as e:
+                    with self._lock:
+                        self._started -= 1
+                    raise WorkerError(f"Could not start script worker: {e}")
+                with self._lock:
+                    self._workers.append(worker)
+                return worker
+            try:
+                # Time out now and then in case a busy worker was discarded
+                return self._idle.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    def _release(self, worker):
+        if not worker.alive or worker.calls >= self.max_calls_per_worker:
+            # Recycle the worker; a fresh one is started on demand
+            self._discard(worker)
+        else:
+            self._idle.put(worker)
+
+    def _discard(self, worker):
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+                self._started -= 1
+
+
+class NodeWorkerPool(ScriptWorkerPool):
+    """Runs JavaScript on Node.js processes with a V8 heap limit."""
+
+    def worker_command(self):
+        command = ['node']
+        if self.max_memory_mb:
+            command.append(f'--max-old-space-size={int(self.max_memory_mb)}')
+        command.append(WORKER_SCRIPT)
+        return command
+
+
+class PythonWorkerPool(ScriptWorkerPool):
+    """Runs fallback scripts, already converted to Python, on Python processes.
+
+    Workers limit their CPU time per call and their memory with rlimits
+    where the platform supports them.
+    """
+
+    def worker_command(self):
+        command = [sys.executable, '-I', FALLBACK_WORKER_SCRIPT]
+        if self.max_memory_mb:
+            command += ['--max-memory-mb', str(int(self.max_memory_mb))]
+        return command
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(pool_class, max_memory_mb):
+    with _pools_lock:
+        pool = _pools.get((pool_class, max_memory_mb))
+        if pool is None:
+            pool = _pools[(pool_class, max_memory_mb)] = pool_class(max_memory_mb=max_memory_mb)
+        return pool
+
+
+def get_worker_pool(max_memory_mb=None):
+    """Returns the shared Node.js pool for a memory limit, creating it on first use."""
+    return _get_pool(NodeWorkerPool, max_memory_mb)
+
+
+def get_python_worker_pool(max_memory_mb=None):
+    """Returns the shared fallback pool for a memory limit, creating it on first use."""
+    return _get_pool(PythonWorkerPool, max_memory_mb)
+
+
+@atexit.register
+def _shutdown_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
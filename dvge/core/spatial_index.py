@@ -0,0 +1,252 @@
+# dvge/core/spatial_index.py
+
+"""Spatial index of the areas nodes cover on the canvas."""
+
+from ..constants import (
+    NODE_WIDTH, NODE_HEADER_HEIGHT, NODE_BASE_BODY_HEIGHT, NODE_FOOTER_HEIGHT
+)
+
+
+# Side of the square grid cells, in node coordinates; about one node wide
+DEFAULT_CELL_SIZE = 400
+
+# Height assumed for nodes that have not been built yet
+DEFAULT_NODE_HEIGHT = NODE_HEADER_HEIGHT + NODE_BASE_BODY_HEIGHT + NODE_FOOTER_HEIGHT
+
+
+def node_bounds(node):
+    """Returns the (x1, y1, x2, y2) area a node object covers."""
+    return node.x, node.y, node.x + NODE_WIDTH, node.y + node.get_height()
+
+
+class SpatialIndex:
+    """Rectangles bucketed into a uniform grid for area and point queries.
+
+    Each key has one (x1, y1, x2, y2) rectangle, registered in every grid
+    cell it overlaps. Queries only look at the cells they overlap, so their
+    cost depends on how many rectangles are nearby rather than on the total.
+    The bounding box and mean center of all rectangles are kept up to date
+    as rectangles come and go.
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._rects = {}   # key -> (x1, y1, x2, y2)
+        self._cells = {}   # (column, row) -> {key}
+        self._order = {}   # key -> insertion number, later ones are on top
+        self._next_order = 0
+        self._center_sum = [0.0, 0.0]
+        self._bounds = None
+        self._bounds_stale = False
+
+    def __len__(self):
+        return len(self._rects)
+
+    def __contains__(self, key):
+        return key in self._rects
+
+    def __iter__(self):
+        return iter(self._rects)
+
+    def rect(self, key):
+        """Returns the rectangle of a key, or None."""
+        return self._rects.get(key)
+
+    def insert(self, key, rect):
+        """Adds a rectangle or moves the existing one of the key."""
+        rect = tuple(rect)
+        old = self._rects.get(key)
+        if old == rect:
+            return
+        if old is not None:
+            self._unlink(key)
+        else:
+            self._order[key] = self._next_order
+            self._next_order += 1
+
+        self._rects[key] = rect
+        for cell in self._cells_of(rect):
+            self._cells.setdefault(cell, set()).add(key)
+        self._center_sum[0] += (rect[0] + rect[2]) / 2
+        self._center_sum[1] += (rect[1] + rect[3]) / 2
+        if not self._bounds_stale:
+            self._bounds = rect if self._bounds is None else self._union((self._bounds, rect))
+
+    def remove(self, key):
+        """Removes the rectangle of a key, if any."""
+        if key in self._rects:
+            self._unlink(key)
+            del self._order[key]
+            if not self._rects:
+                self.clear()
+
+    def clear(self):
+        """Empties the index."""
+        self._rects.clear()
+        self._cells.clear()
+        self._order.clear()
+        self._center_sum = [0.0, 0.0]
+        self._bounds = None
+        self._bounds_stale = False
+
+    def _unlink(self, key):
+        rect = self._rects.pop(key)
+        for cell in self._cells_of(rect):
+            keys = self._cells.get(cell)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._cells[cell]
+        self._center_sum[0] -= (rect[0] + rect[2]) / 2
+        self._center_sum[1] -= (rect[1] + rect[3]) / 2
+        # Only a rectangle on the edge of the bounds can shrink them
+        bounds = self._bounds
+        if bounds is not None and (rect[0] <= bounds[0] or rect[1] <= bounds[1]
+                                   or rect[2] >= bounds[2] or rect[3] >= bounds[3]):
+            self._bounds_stale = True
+
+    # Queries
+
+    def query(self, rect, enclosed=False):
+        """Returns the keys whose rectangles overlap an area, in insertion order.
+
+        With enclosed=True only rectangles lying completely inside the area
+        are returned.
+        """
+        x1, y1, x2, y2 = rect
+        if x1 > x2:
+            x1, x2 = x2, x1
+        if y1 > y2:
+            y1, y2 = y2, y1
+        column1, row1 = self._cell(x1, y1)
+        column2, row2 = self._cell(x2, y2)
+        if (column2 - column1 + 1) * (row2 - row1 + 1) > len(self._cells):
+            # An area larger than the occupied part of the grid; visit only that
+            cells = [(c, r) for c, r in self._cells
+                     if column1 <= c <= column2 and row1 <= r <= row2]
+        else:
+            cells = self._cells_of((x1, y1, x2, y2))
+        candidates = set()
+        for cell in cells:
+            candidates.update(self._cells.get(cell, ()))
+
+        found = []
+        for key in candidates:
+            kx1, ky1, kx2, ky2 = self._rects[key]
+            if enclosed:
+                if x1 <= kx1 and y1 <= ky1 and kx2 <= x2 and ky2 <= y2:
+                    found.append(key)
+            elif kx1 <= x2 and x1 <= kx2 and ky1 <= y2 and y1 <= ky2:
+                found.append(key)
+        found.sort(key=self._order.__getitem__)
+        return found
+
+    def at_point(self, x, y):
+        """Returns the key of the last inserted rectangle containing a point, or None.
+
+        Later rectangles are drawn on top of earlier ones, so this is the
+        one a click at the point hits.
+        """
+        hit = None
+        for key in self._cells.get(self._cell(x, y), ()):
+            x1, y1, x2, y2 = self._rects[key]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                if hit is None or self._order[key] > self._order[hit]:
+                    hit = key
+        return hit
+
+    def bounds(self, keys=None):
+        """Returns the (x1, y1, x2, y2) box around all or the given rectangles, or None."""
+        if keys is not None:
+            rects = [self._rects[key] for key in keys if key in self._rects]
+            return self._union(rects)
+        if self._bounds_stale:
+            self._bounds = self._union(self._rects.values())
+            self._bounds_stale = False
+        return self._bounds
+
+    def mean_center(self):
+        """Returns the average center point of all rectangles, or None."""
+        if not self._rects:
+            return None
+        count = len(self._rects)
+        return self._center_sum[0] / count, self._center_sum[1] / count
+
+    @staticmethod
+    def _union(rects):
+        rects = list(rects)
+        if not rects:
+            return None
+        return (min(r[0] for r in rects), min(r[1] for r in rects),
+                max(r[2] for r in rects), max(r[3] for r in rects))
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def _cells_of(self, rect):
+        column1, row1 = self._cell(rect[0], rect[1])
+        column2, row2 = self._cell(rect[2], rect[3])
+        return [(column, row)
+                for column in range(column1, column2 + 1)
+                for row in range(row1, row2 + 1)]
+
+
+class NodeSpatialIndex(SpatialIndex):
+    """Spatial index of node IDs by the area each node covers.
+
+    sync() brings the index up to date with a node mapping, re-measuring
+    only nodes that were added, replaced, touched (their revision changed)
+    or re-rendered at another text height since the previous sync. Nodes of
+    a lazily loaded project that have not been built yet are indexed at
+    their stored position with DEFAULT_NODE_HEIGHT and are not built.
+    Editors that move a node call update_node() right away instead of
+    waiting for the next sync.
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        super().__init__(cell_size)
+        self._versions = {}  # node_id -> (node or raw dict, revision, text height)
+
+    def sync(self, nodes):
+        """Updates the index for changed nodes and returns the IDs re-measured."""
+        peek_raw = getattr(nodes, 'peek_raw', None)
+        updated = []
+
+        for node_id in nodes:
+            raw = peek_raw(node_id) if peek_raw else None
+            if raw is not None:
+                if self._versions.get(node_id, (None,))[0] is not raw:
+                    x, y = nodes.peek_position(node_id)
+                    self.insert(node_id, (x, y, x + NODE_WIDTH, y + DEFAULT_NODE_HEIGHT))
+                    self._versions[node_id] = (raw, None, None)
+                    updated.append(node_id)
+                continue
+
+            node = nodes[node_id]
+            version = self._versions.get(node_id)
+            if (version is None or version[0] is not node
+                    or version[1] != getattr(node, 'revision', 0)
+                    or version[2] != getattr(node, 'calculated_text_height', 0)):
+                self.update_node(node)
+                updated.append(node_id)
+
+        if len(self._versions) != len(nodes):
+            for node_id in [nid for nid in self._versions if nid not in nodes]:
+                self.remove(node_id)
+                updated.append(node_id)
+        return updated
+
+    def update_node(self, node):
+        """Re-measures one node, e.g. after it was moved or redrawn."""
+        self.insert(node.id, node_bounds(node))
+        self._versions[node.id] = (
+            node, getattr(node, 'revision', 0), getattr(node, 'calculated_text_height', 0)
+        )
+
+    def remove(self, key):
+        super().remove(key)
+        self._versions.pop(key, None)
+
+    def clear(self):
+        super().clear()
+        self._versions.clear()
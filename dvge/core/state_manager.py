@@ -1,111 +1,245 @@
 # dvge/core/state_manager.py
 
-"""State management for undo/redo functionality."""
+"""State management for undo/redo functionality.
+
+Snapshots share structure: each snapshot maps node IDs to serialized node
+dictionaries, and a node that did not change since the previous snapshot
+reuses the very same dictionary. Snapshot dictionaries are never mutated
+after creation, so saving, undoing and redoing only serialize or rebuild
+the nodes that actually changed.
+"""
 
 import copy
 from tkinter import messagebox
+from .node_map import iter_materialized
 
 
 class StateManager:
     """Handles undo/redo functionality and state snapshots."""
-    
+
     def __init__(self, app):
         self.app = app
         self.undo_stack = []
         self.redo_stack = []
         self.max_undo_states = 50
-    
+
+        # (node object, revision) of every node as of the last snapshot
+        self._node_versions = {}
+        # Nodes that may be edited in place after the last snapshot
+        self._pending_node_ids = set()
+        # Callables receiving each snapshot that becomes the current state
+        self.snapshot_listeners = []
+
     def save_state(self, action_name=""):
         """Saves a snapshot of the current project state for the undo stack."""
         try:
-            state = self._create_state_snapshot()
+            state = self._create_state_snapshot(action_name)
             self.undo_stack.append(state)
             self.redo_stack.clear()
-            
+
             # Limit undo stack size
             if len(self.undo_stack) > self.max_undo_states:
                 self.undo_stack.pop(0)
-                
+            
+            self._notify_listeners(state)
+
         except Exception as e:
             print(f"Error saving state for undo: {e}")
-    
+
+    def mark_dirty(self, *node_ids):
+        """Flags nodes edited in place so the next snapshot re-serializes them."""
+        self._pending_node_ids.update(node_ids)
+
     def undo(self):
         """Undo the last action."""
         if len(self.undo_stack) > 1:
             current_state = self.undo_stack.pop()
             self.redo_stack.append(current_state)
             previous_state = self.undo_stack[-1]
-            self._restore_state(copy.deepcopy(previous_state))
+            self._restore_state(previous_state, current_state['changed_node_ids'])
+            self._notify_listeners(previous_state)
             return True
         return False
-    
+
     def redo(self):
         """Redo the last undone action."""
         if self.redo_stack:
             state_to_restore = self.redo_stack.pop()
             self.undo_stack.append(state_to_restore)
-            self._restore_state(copy.deepcopy(state_to_restore))
+            self._restore_state(state_to_restore, state_to_restore['changed_node_ids'])
+            self._notify_listeners(state_to_restore)
             return True
         return False
-    
+
+    def _notify_listeners(self, state):
+        """Passes the now-current snapshot to listeners such as the autosave journal."""
+        for listener in self.snapshot_listeners:
+            try:
+                listener(state)
+            except Exception as e:
+                print(f"Error in state listener: {e}")
+
     def clear_history(self):
         """Clears the undo/redo history."""
         self.undo_stack.clear()
         self.redo_stack.clear()
-    
-    def _create_state_snapshot(self):
-        """Creates a complete snapshot of the current application state."""
+        self._node_versions.clear()
+        self._pending_node_ids.clear()
+
+    def _create_state_snapshot(self, action_name=""):
+        """Creates a snapshot of the current state, sharing unchanged data."""
+        previous = self.undo_stack[-1] if self.undo_stack else None
+        previous_nodes = previous['nodes'] if previous else {}
+        suspects = self._pending_node_ids | self._selection_ids()
+
+        nodes = {}
+        changed = set()
+        peek_raw = getattr(self.app.nodes, 'peek_raw', None)
+        for node_id in self.app.nodes:
+            raw = peek_raw(node_id) if peek_raw else None
+            old_data = previous_nodes.get(node_id)
+            if raw is not None:
+                # Never built since loading, so the loaded data is still current
+                nodes[node_id] = raw
+                if old_data is not raw:
+                    changed.add(node_id)
+                continue
+
+            node = self.app.nodes[node_id]
+            clean = self._is_clean(node_id, node)
+            if old_data is not None and clean and node_id not in suspects:
+                nodes[node_id] = old_data
+                continue
+
+            data = copy.deepcopy(node.to_dict())
+            if old_data is not None and data == old_data:
+                nodes[node_id] = old_data
+            else:
+                nodes[node_id] = data
+                changed.add(node_id)
+                if clean:
+                    # Edited in place: let other revision watchers notice too
+                    node.touch()
+            self._node_versions[node_id] = (node, getattr(node, 'revision', 0))
+
+        removed = [nid for nid in previous_nodes if nid not in nodes]
+        changed.update(removed)
+        for node_id in removed:
+            self._node_versions.pop(node_id, None)
+
+        self._pending_node_ids = self._selection_ids()
+
         return {
-            'nodes': {nid: n.to_dict() for nid, n in self.app.nodes.items()},
-            'player_stats': copy.deepcopy(self.app.player_stats),
-            'player_inventory': copy.deepcopy(self.app.player_inventory),
-            'story_flags': copy.deepcopy(self.app.story_flags),
-            'quests': {qid: q.to_dict() for qid, q in self.app.quests.items()},
-            'variables': copy.deepcopy(getattr(self.app, 'variables', {})),
-            'enemies': {eid: e.to_dict() for eid, e in getattr(self.app, 'enemies', {}).items()},
-            'timers': {tid: t.to_dict() for tid, t in getattr(self.app, 'timers', {}).items()},
+            'action_name': action_name,
+            'nodes': nodes,
+            'changed_node_ids': frozenset(changed),
+            'player_stats': self._share(previous, 'player_stats', self.app.player_stats),
+            'player_inventory': self._share(previous, 'player_inventory', self.app.player_inventory),
+            'story_flags': self._share(previous, 'story_flags', self.app.story_flags),
+            'quests': self._share(previous, 'quests', {qid: q.to_dict() for qid, q in self.app.quests.items()}),
+            'variables': self._share(previous, 'variables', getattr(self.app, 'variables', {})),
+            'enemies': self._share(previous, 'enemies', {eid: e.to_dict() for eid, e in getattr(self.app, 'enemies', {}).items()}),
+            'timers': self._share(previous, 'timers', {tid: t.to_dict() for tid, t in getattr(self.app, 'timers', {}).items()}),
             'node_id_counter': self.app.node_id_counter,
-            'project_settings': copy.deepcopy(self.app.project_settings),
+            'project_settings': self._share(previous, 'project_settings', self.app.project_settings),
             'active_node_id': self.app.active_node_id,
-            'selected_node_ids': copy.deepcopy(self.app.selected_node_ids)
+            'selected_node_ids': self._share(previous, 'selected_node_ids', self.app.selected_node_ids)
         }
-    
-    def _restore_state(self, state):
-        """Restores the project to a given state from the undo/redo stack."""
+
+    def _share(self, previous, key, value):
+        """Reuses the previous snapshot's copy of a value when it is unchanged."""
+        if previous is not None and previous.get(key) == value:
+            return previous[key]
+        return copy.deepcopy(value)
+
+    def _is_clean(self, node_id, node):
+        """Checks whether a node is the same, unedited object as at the last snapshot."""
+        version = self._node_versions.get(node_id)
+        if version is None:
+            # Built lazily from data the snapshots already share
+            unchanged = getattr(self.app.nodes, 'is_unchanged_since_load', None)
+            return bool(unchanged and unchanged(node_id))
+        return (version[0] is node
+                and version[1] == getattr(node, 'revision', 0))
+
+    def _selection_ids(self):
+        """Returns the nodes the user is currently working on."""
+        ids = set(self.app.selected_node_ids or [])
+        if self.app.active_node_id:
+            ids.add(self.app.active_node_id)
+        return ids
+
+    def _live_changed_node_ids(self):
+        """Finds nodes added, removed or edited since the last snapshot."""
+        ids = set(self._pending_node_ids)
+        for node_id, node in iter_materialized(self.app.nodes):
+            if not self._is_clean(node_id, node):
+                ids.add(node_id)
+        ids.update(nid for nid in self._node_versions if nid not in self.app.nodes)
+        return ids
+
+    def _restore_state(self, state, changed_node_ids=None):
+        """Restores the project to a given state from the undo/redo stack.
+
+        Only nodes that differ between the live project and the target state
+        are rebuilt; pass ``changed_node_ids=None`` to rebuild every node.
+        Returns the sets of added, removed and changed node IDs.
+        """
         try:
             from ..models import create_node_from_dict, Quest, GameTimer, Enemy
-            
-            # Clear current state
-            self.app.nodes.clear()
+
+            target_nodes = state['nodes']
+            previous_selection = list(self.app.selected_node_ids or [])
+            if changed_node_ids is None:
+                candidates = set(self.app.nodes) | set(target_nodes)
+            else:
+                candidates = set(changed_node_ids) | self._live_changed_node_ids()
+
+            added, removed, changed = set(), set(), set()
+            for node_id in candidates:
+                node_data = target_nodes.get(node_id)
+                if node_data is None:
+                    if self.app.nodes.pop(node_id, None) is not None:
+                        removed.add(node_id)
+                    self._node_versions.pop(node_id, None)
+                    continue
+
+                (changed if node_id in self.app.nodes else added).add(node_id)
+                # Snapshot data is shared and must never alias live node data
+                node = create_node_from_dict(copy.deepcopy(node_data))
+                self.app.nodes[node_id] = node
+                self._node_versions[node_id] = (node, getattr(node, 'revision', 0))
+
+            # Restore other data
             self.app.quests.clear()
             self.app.enemies.clear()
             self.app.timers.clear()
-            
-            # Restore nodes
-            for node_id, node_data in state['nodes'].items():
-                self.app.nodes[node_id] = create_node_from_dict(node_data)
-            
-            # Restore other data
             for qid, qdata in state.get('quests', {}).items():
-                self.app.quests[qid] = Quest.from_dict(qdata)
+                self.app.quests[qid] = Quest.from_dict(copy.deepcopy(qdata))
             for eid, edata in state.get('enemies', {}).items():
-                self.app.enemies[eid] = Enemy.from_dict(edata)
+                self.app.enemies[eid] = Enemy.from_dict(copy.deepcopy(edata))
             for tid, tdata in state.get('timers', {}).items():
-                self.app.timers[tid] = GameTimer.from_dict(tdata)
+                self.app.timers[tid] = GameTimer.from_dict(copy.deepcopy(tdata))
 
-            self.app.player_stats = state['player_stats']
-            self.app.player_inventory = state['player_inventory']
-            self.app.story_flags = state['story_flags']
-            self.app.variables = state.get('variables', {})
+            self.app.player_stats = copy.deepcopy(state['player_stats'])
+            self.app.player_inventory = copy.deepcopy(state['player_inventory'])
+            self.app.story_flags = copy.deepcopy(state['story_flags'])
+            self.app.variables = copy.deepcopy(state.get('variables', {}))
             self.app.node_id_counter = state['node_id_counter']
-            self.app.project_settings = state['project_settings']
+            self.app.project_settings = copy.deepcopy(state['project_settings'])
             self.app.active_node_id = state.get('active_node_id')
-            self.app.selected_node_ids = state.get('selected_node_ids', [])
-            
-            # Update UI
-            self.app.canvas_manager.redraw_all_nodes()
+            self.app.selected_node_ids = list(state.get('selected_node_ids', []))
+            self._pending_node_ids = self._selection_ids()
+
+            # Update UI, redrawing only what changed when the delta is known
+            if changed_node_ids is None:
+                self.app.canvas_manager.redraw_all_nodes()
+            else:
+                self.app.canvas_manager.refresh_nodes(added, removed, changed, previous_selection)
             self.app.properties_panel.update_all_panels()
-            
+
+            return added, removed, changed
+
         except Exception as e:
             print(f"Error restoring state: {e}")
-            messagebox.showerror("Error", f"Failed to restore state: {e}")
\ No newline at end of file
+            messagebox.showerror("Error", f"Failed to restore state: {e}")
@@ -4,8 +4,106 @@
 
 import re
 import random
+from functools import lru_cache
 from typing import Dict, Any, Union
 
+from .expression_engine import (
+    PLACEHOLDER_BRACES, ExpressionError, compile_expression, mapping_lookup
+)
+
+
+# Number of distinct texts whose compiled templates are kept
+TEMPLATE_CACHE_SIZE = 16384
+
+# Placeholders: {= math}, {condition ? true_text : false_text} and {name}.
+# Math and conditionals may contain one level of nested placeholders, which
+# are substituted before they are evaluated.
+_NESTED = r'\{[^{}]*\}'
+_PLACEHOLDER_PATTERN = re.compile(
+    r'\{=(?P<math>(?:[^{}]|' + _NESTED + r')+)\}'
+    r'|\{(?P<condition>(?:[^?{}]|' + _NESTED + r')+)\?'
+    r'(?P<true_text>(?:[^:{}]|' + _NESTED + r')*):'
+    r'(?P<false_text>(?:[^{}]|' + _NESTED + r')*)\}'
+    r'|\{(?P<name>[^{}]*)\}'
+)
+
+# Kinds of template parts
+_LITERAL, _SLOT, _MATH, _CONDITIONAL = range(4)
+
+# Functions available in {= ...} math
+MATH_FUNCTIONS = {
+    "random": lambda low, high: random.randint(int(low), int(high)),
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+}
+
+
+class CompiledTemplate:
+    """A text parsed once into literal parts and placeholder slots.
+
+    Rendering looks up only the placeholders the text actually contains,
+    in a single pass, instead of trying every variable and flag.
+    """
+
+    __slots__ = ('text', 'parts')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts = []
+        position = 0
+        for match in _PLACEHOLDER_PATTERN.finditer(text):
+            if match.start() > position:
+                self.parts.append((_LITERAL, text[position:match.start()]))
+            if match.group('math') is not None:
+                self.parts.append((_MATH, match.group('math')))
+            elif match.group('condition') is not None:
+                self.parts.append((_CONDITIONAL, (
+                    match.group('condition'),
+                    compile_template(match.group('true_text')),
+                    compile_template(match.group('false_text')))))
+            else:
+                self.parts.append((_SLOT, match.group('name')))
+            position = match.end()
+        if position < len(text):
+            self.parts.append((_LITERAL, text[position:]))
+
+    def render(self, var_system: 'VariableSystem') -> str:
+        """Returns the text with every placeholder substituted."""
+        if len(self.parts) == 1 and self.parts[0][0] == _LITERAL:
+            return self.text
+
+        variables = var_system.variables
+        flags = var_system.flags
+        output = []
+        for kind, value in self.parts:
+            if kind == _LITERAL:
+                output.append(value)
+            elif kind == _SLOT:
+                if value in variables:
+                    output.append(str(variables[value]))
+                elif value in flags:
+                    output.append("true" if flags[value] else "false")
+                else:
+                    output.append("{" + value + "}")
+            elif kind == _MATH:
+                result = var_system.evaluate_math_expression(value)
+                output.append(str(int(result)) if isinstance(result, float) and result.is_integer() else str(result))
+            else:
+                condition, true_text, false_text = value
+                if var_system._evaluate_condition(condition):
+                    output.append(true_text.render(var_system).strip())
+                else:
+                    output.append(false_text.render(var_system).strip())
+        return "".join(output)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(text: str) -> CompiledTemplate:
+    """Parses a text into a CompiledTemplate; results are cached per text."""
+    return CompiledTemplate(text)
+
 
 class VariableSystem:
     """Handles advanced variable operations and text substitution."""
@@ -23,99 +121,35 @@ class VariableSystem:
         self.flags = flags_dict
     
     def evaluate_math_expression(self, expression: str) -> Union[int, float]:
-        """Safely evaluates mathematical expressions with variables."""
+        """Safely evaluates mathematical expressions with variables.
+        
+        Variables are written as {name}; the expression is compiled once and
+        cached, and anything that is not a number evaluates to 0.
+        """
         try:
-            # Replace variable names with their values
-            expr = expression
-            for var_name, value in self.variables.items():
-                expr = expr.replace(f"{{{var_name}}}", str(value))
-            
-            # Add support for random() function
-            expr = re.sub(r'random\((\d+),\s*(\d+)\)', 
-                         lambda m: str(random.randint(int(m.group(1)), int(m.group(2)))), 
-                         expr)
-            
-            # Safe evaluation (only allow basic math operations)
-            allowed_chars = set('0123456789+-*/.() ')
-            if all(c in allowed_chars for c in expr):
-                return eval(expr)
-            else:
-                return 0
-        except:
+            result = compile_expression(expression, PLACEHOLDER_BRACES).evaluate(
+                mapping_lookup(self.variables), MATH_FUNCTIONS)
+        except ExpressionError:
+            return 0
+        if isinstance(result, bool) or not isinstance(result, (int, float)):
             return 0
+        return result
     
     def substitute_text(self, text: str) -> str:
         """Substitutes variables and expressions in text using {variable} syntax."""
         if not text:
             return text
         
-        # Replace simple variables {variable_name}
-        for var_name, value in self.variables.items():
-            text = text.replace(f"{{{var_name}}}", str(value))
-        
-        # Replace flag references {flag_name}
-        for flag_name, value in self.flags.items():
-            text = text.replace(f"{{{flag_name}}}", "true" if value else "false")
-        
-        # Replace mathematical expressions {= expression}
-        math_pattern = r'\{=([^}]+)\}'
-        def replace_math(match):
-            expression = match.group(1)
-            result = self.evaluate_math_expression(expression)
-            return str(int(result)) if isinstance(result, float) and result.is_integer() else str(result)
-        
-        text = re.sub(math_pattern, replace_math, text)
-        
-        # Replace conditional text {condition ? true_text : false_text}
-        conditional_pattern = r'\{([^?}]+)\?([^:}]*):([^}]*)\}'
-        def replace_conditional(match):
-            condition = match.group(1).strip()
-            true_text = match.group(2).strip()
-            false_text = match.group(3).strip()
-            
-            # Evaluate condition
-            condition_result = self._evaluate_condition(condition)
-            return true_text if condition_result else false_text
-        
-        text = re.sub(conditional_pattern, replace_conditional, text)
-        
-        return text
+        # The text is parsed once into a template with a slot per placeholder,
+        # so only the variables and flags it mentions are looked up
+        return compile_template(text).render(self)
     
     def _evaluate_condition(self, condition: str) -> bool:
-        """Evaluates a condition string."""
+        """Evaluates a condition string such as "gold >= 10 and has_key"."""
         try:
-            # Handle variable comparisons
-            for var_name, value in self.variables.items():
-                condition = condition.replace(f"{var_name}", str(value))
-            
-            # Handle flag references
-            for flag_name, value in self.flags.items():
-                condition = condition.replace(f"{flag_name}", str(value).lower())
-            
-            # Simple condition evaluation
-            if '>=' in condition:
-                left, right = condition.split('>=')
-                return float(left.strip()) >= float(right.strip())
-            elif '<=' in condition:
-                left, right = condition.split('<=')
-                return float(left.strip()) <= float(right.strip())
-            elif '>' in condition:
-                left, right = condition.split('>')
-                return float(left.strip()) > float(right.strip())
-            elif '<' in condition:
-                left, right = condition.split('<')
-                return float(left.strip()) < float(right.strip())
-            elif '==' in condition:
-                left, right = condition.split('==')
-                return left.strip() == right.strip()
-            elif '!=' in condition:
-                left, right = condition.split('!=')
-                return left.strip() != right.strip()
-            
-            # If it's just a flag name or true/false
-            condition = condition.strip().lower()
-            return condition in ['true', '1'] or condition in self.flags and self.flags[condition]
-        except:
+            return bool(compile_expression(condition, PLACEHOLDER_BRACES, lenient=True).evaluate(
+                mapping_lookup(self.variables, self.flags)))
+        except ExpressionError:
             return False
     
     def apply_variable_effect(self, var_name: str, operation: str, value: Union[str, int, float]):
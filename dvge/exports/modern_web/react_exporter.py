@@ -2,12 +2,12 @@
 
 import json
 import os
-import base64
 from pathlib import Path
 from tkinter import filedialog, messagebox
 from typing import Dict, Any, Optional, List
 
 from ...core.variable_system import VariableSystem
+from ...core.asset_pipeline import AssetPipeline, ExportCancelled, data_uri_prefix
 
 
 class ReactExporter:
@@ -21,6 +21,9 @@ class ReactExporter:
         # Get the template directory
         self.template_dir = Path(__file__).parent / "templates"
         
+        # Data URIs encoded ahead of time for the current export, by file path
+        self._encoded_assets = {}
+        
     def export_game(self, export_type: str = "pwa") -> bool:
         """Export the current project as a modern web app.
         
@@ -40,8 +43,8 @@ class ReactExporter:
             return False
             
         try:
-            # Process all game data
-            game_data = self._process_game_data()
+            # Process all game data, encoding media in the background
+            game_data = self._process_game_data_with_progress()
             
             # Choose output directory
             output_dir = filedialog.askdirectory(title="Choose Export Directory")
@@ -61,6 +64,8 @@ class ReactExporter:
             )
             return True
             
+        except ExportCancelled:
+            return False
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export game: {e}")
             return False
@@ -85,8 +90,23 @@ class ReactExporter:
                 
         return True
         
-    def _process_game_data(self) -> Dict[str, Any]:
+    def _process_game_data_with_progress(self) -> Dict[str, Any]:
+        """Process game data while showing a cancellable progress dialog for media encoding."""
+        from ...ui.dialogs.export_progress_dialog import ExportProgressDialog
+        
+        pipeline = AssetPipeline()
+        progress_dialog = ExportProgressDialog(self.app, "Exporting Game", on_cancel=pipeline.cancel)
+        try:
+            return self._process_game_data(pipeline, progress_dialog.update_progress)
+        finally:
+            progress_dialog.destroy()
+        
+    def _process_game_data(self, pipeline: Optional[AssetPipeline] = None,
+                           progress_callback=None) -> Dict[str, Any]:
         """Process all game data for React export."""
+        # Encode every media file concurrently before walking the nodes
+        self._encoded_assets = self._encode_media_files(pipeline or AssetPipeline(), progress_callback)
+        
         # Initialize variable system
         temp_var_system = VariableSystem()
         temp_var_system.set_variables_ref(getattr(self.app, 'variables', {}))
@@ -106,6 +126,7 @@ class ReactExporter:
             media_assets.update(node_assets)
             
             nodes_data[node_id] = game_data
+        self._encoded_assets = {}
             
         # Compile complete game data
         return {
@@ -169,27 +190,39 @@ class ReactExporter:
             
         return game_data, assets
         
+    def _encode_media_files(self, pipeline: AssetPipeline, progress_callback=None) -> Dict[str, str]:
+        """Encode the media files of all nodes concurrently, returning data URIs by path."""
+        jobs = {}
+        for node in self.app.nodes.values():
+            for field in ('backgroundImage', 'audio', 'music'):
+                file_path = getattr(node, field, "")
+                if file_path and file_path not in jobs and os.path.exists(file_path):
+                    jobs[file_path] = (file_path, data_uri_prefix(self._get_mime_type(file_path)))
+        return {path: data_uri for path, (_, data_uri) in pipeline.encode_files(jobs, progress_callback).items()}
+        
     def _encode_asset(self, file_path: str) -> str:
         """Encode a media asset as base64 data URI."""
+        if file_path in self._encoded_assets:
+            return self._encoded_assets[file_path]
         try:
-            with open(file_path, "rb") as f:
-                encoded_string = base64.b64encode(f.read()).decode('utf-8')
-                
-            ext = os.path.splitext(file_path)[1].lower()
-            mime_types = {
-                '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg',
-                '.png': 'image/png', '.gif': 'image/gif',
-                '.mp3': 'audio/mpeg', '.wav': 'audio/wav',
-                '.ogg': 'audio/ogg', '.m4a': 'audio/mp4'
-            }
-            
-            mime_type = mime_types.get(ext, 'application/octet-stream')
-            return f"data:{mime_type};base64,{encoded_string}"
+            _, data_uri = AssetPipeline().encode_file(file_path, data_uri_prefix(self._get_mime_type(file_path)))
+            return data_uri
             
         except Exception as e:
             print(f"Could not encode asset {file_path}: {e}")
             return ""
             
+    def _get_mime_type(self, file_path: str) -> str:
+        """Get the MIME type of a media file from its extension."""
+        ext = os.path.splitext(file_path)[1].lower()
+        mime_types = {
+            '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg',
+            '.png': 'image/png', '.gif': 'image/gif',
+            '.mp3': 'audio/mpeg', '.wav': 'audio/wav',
+            '.ogg': 'audio/ogg', '.m4a': 'audio/mp4'
+        }
+        return mime_types.get(ext, 'application/octet-stream')
+            
     def _find_starting_node(self) -> str:
         """Find the starting node ID."""
         # Look for node with no incoming connections or explicit start marker
@@ -4,7 +4,6 @@
 
 import os
 import json
-import base64
 import mimetypes
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
@@ -260,35 +259,44 @@ class MediaLibrary:
         }
         self.asset_counter = data.get('asset_counter', 0)
 
-    def encode_asset_for_export(self, asset: MediaAsset) -> Optional[str]:
-        """Encode asset as base64 for HTML export."""
+    def get_export_mime_type(self, asset: MediaAsset) -> str:
+        """Get the MIME type used when embedding an asset in an export."""
+        mime_type, _ = mimetypes.guess_type(asset.file_path)
+        if not mime_type:
+            # Fallback MIME types
+            ext = os.path.splitext(asset.file_path)[1].lower()
+            mime_map = {
+                '.mp4': 'video/mp4',
+                '.webm': 'video/webm',
+                '.ogg': 'video/ogg',
+                '.png': 'image/png',
+                '.jpg': 'image/jpeg',
+                '.jpeg': 'image/jpeg',
+                '.gif': 'image/gif',
+                '.mp3': 'audio/mpeg',
+                '.wav': 'audio/wav'
+            }
+            mime_type = mime_map.get(ext, 'application/octet-stream')
+        return mime_type
+
+    def encode_asset_for_export(self, asset: MediaAsset, pipeline=None) -> Optional[str]:
+        """Encode asset as base64 for HTML export.
+
+        The file is encoded in chunks; pass an AssetPipeline to make the
+        encoding cancellable.
+        """
+        from ..core.asset_pipeline import AssetPipeline, ExportCancelled, data_uri_prefix
+
         try:
             if not os.path.exists(asset.file_path):
                 return None
 
-            with open(asset.file_path, 'rb') as f:
-                content = f.read()
-                encoded = base64.b64encode(content).decode('utf-8')
-
-                # Get MIME type
-                mime_type, _ = mimetypes.guess_type(asset.file_path)
-                if not mime_type:
-                    # Fallback MIME types
-                    ext = os.path.splitext(asset.file_path)[1].lower()
-                    mime_map = {
-                        '.mp4': 'video/mp4',
-                        '.webm': 'video/webm',
-                        '.ogg': 'video/ogg',
-                        '.png': 'image/png',
-                        '.jpg': 'image/jpeg',
-                        '.jpeg': 'image/jpeg',
-                        '.gif': 'image/gif',
-                        '.mp3': 'audio/mpeg',
-                        '.wav': 'audio/wav'
-                    }
-                    mime_type = mime_map.get(ext, 'application/octet-stream')
-
-                return f"data:{mime_type};base64,{encoded}"
+            pipeline = pipeline or AssetPipeline()
+            _, data_uri = pipeline.encode_file(asset.file_path,
+                                               data_uri_prefix(self.get_export_mime_type(asset)))
+            return data_uri
+        except ExportCancelled:
+            raise
         except Exception as e:
             print(f"Error encoding asset {asset.asset_id}: {e}")
             return None
@@ -9,7 +9,6 @@ import hashlib
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
-import base64
 
 
 @dataclass
@@ -367,8 +366,14 @@ class VoiceManager:
         
         return results
     
-    def export_voice_data_for_html(self) -> Dict[str, Any]:
-        """Export voice data for HTML game export."""
+    def export_voice_data_for_html(self, pipeline=None) -> Dict[str, Any]:
+        """Export voice data for HTML game export.
+
+        Audio files are encoded concurrently, in chunks, with the given
+        AssetPipeline (a new one if not given).
+        """
+        from ..core.asset_pipeline import AssetPipeline
+
         export_data = {
             "voice_profiles": {
                 pid: profile.to_dict() 
@@ -379,16 +384,18 @@ class VoiceManager:
         }
         
         # Include base64-encoded audio data for assets
-        for asset_id, asset in self.voice_assets.items():
+        jobs = {
+            asset_id: (str(asset.file_path), "")
+            for asset_id, asset in self.voice_assets.items()
+            if Path(asset.file_path).exists()
+        }
+        encoded = (pipeline or AssetPipeline()).encode_files(jobs)
+        for asset_id, (_, audio_data) in encoded.items():
             try:
-                file_path = Path(asset.file_path)
-                if file_path.exists():
-                    with open(file_path, 'rb') as f:
-                        audio_data = base64.b64encode(f.read()).decode('utf-8')
-                        export_data["voice_assets"][asset_id] = {
-                            **asset.to_dict(),
-                            "audio_data": audio_data
-                        }
+                export_data["voice_assets"][asset_id] = {
+                    **self.voice_assets[asset_id].to_dict(),
+                    "audio_data": audio_data
+                }
             except Exception as e:
                 print(f"Error encoding voice asset {asset_id}: {e}")
         
@@ -10,6 +10,11 @@ class BaseNode:
     
     NODE_TYPE = "Base"
     
+    # Editor bookkeeping that is never saved and does not count as an edit
+    TRANSIENT_ATTRIBUTES = frozenset({
+        'canvas_item_ids', 'drag_data', 'calculated_text_height', 'revision'
+    })
+    
     def __init__(self, x, y, node_id, npc="Narrator", text="", theme="", 
                  chapter="", color=NODE_DEFAULT_COLOR, backgroundImage="", 
                  audio="", music="", auto_advance=False, auto_advance_delay=0):
@@ -50,6 +55,16 @@ class BaseNode:
         self.media_enabled = True  # Whether to use advanced media system
         self.legacy_mode = False  # Use simple background/audio only
     
+    def __setattr__(self, name, value):
+        """Sets an attribute, bumping the node revision for saved data."""
+        object.__setattr__(self, name, value)
+        if name not in self.TRANSIENT_ATTRIBUTES:
+            self.touch()
+    
+    def touch(self):
+        """Marks the node as changed, e.g. after editing its options in place."""
+        self.__dict__['revision'] = self.__dict__.get('revision', 0) + 1
+    
     def to_dict(self):
         """Serializes the node's data into a dictionary format."""
         return {
@@ -3,6 +3,17 @@
 from typing import Dict, List, Any, Optional, Union
 from .base_node import BaseNode
 
+# Engine shared by script nodes executed without one
+_script_engine = None
+
+
+def _get_script_engine():
+    global _script_engine
+    if _script_engine is None:
+        from ..core.script_engine import ScriptEngine
+        _script_engine = ScriptEngine()
+    return _script_engine
+
 
 class ScriptNode(BaseNode):
     """Node that executes custom scripts."""
@@ -54,10 +65,29 @@ class ScriptNode(BaseNode):
         
         return base_height + script_height + io_height + 40
     
-    def execute_script(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute the script with given context. To be implemented by script engine."""
-        # This will be implemented by the script execution engine
-        return {"success": True, "result": None, "error": None}
+    def execute_script(self, context: Dict[str, Any], engine=None) -> Dict[str, Any]:
+        """Execute the script with given context.
+        
+        Uses `engine` (a ScriptEngine) or an engine shared by all script nodes,
+        which compiles each script once. Only input_variables are passed when
+        any are listed, and only output_variables are returned when any are.
+        """
+        engine = engine or _get_script_engine()
+        if self.input_variables:
+            context = {name: context[name] for name in self.input_variables if name in context}
+        
+        execution = engine.execute_script(self.script_code, context, self.timeout_ms)
+        variables = execution.variables_set
+        if self.output_variables:
+            variables = {name: value for name, value in variables.items() if name in self.output_variables}
+        
+        return {
+            "success": execution.success,
+            "result": execution.result,
+            "error": execution.error,
+            "variables": variables,
+            "timeout_occurred": execution.timeout_occurred
+        }
     
     def get_script_preview(self, max_lines: int = 3) -> str:
         """Get a preview of the script code."""
@@ -69,9 +99,9 @@ class ScriptNode(BaseNode):
         
         return '\n'.join(preview_lines)
     
-    def validate_script(self) -> Dict[str, Any]:
-        """Validate the script syntax. To be implemented by script engine."""
-        return {"valid": True, "errors": [], "warnings": []}
+    def validate_script(self, engine=None) -> Dict[str, Any]:
+        """Validate the script syntax."""
+        return (engine or _get_script_engine()).validate_script(self.script_code)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -168,6 +198,7 @@ class ConditionalNode(BaseNode):
             "description": description
         }
         self.branches.append(branch)
+        self.touch()
     
     def evaluate_conditions(self, context: Dict[str, Any]) -> bool:
         """Evaluate all conditions. To be implemented by condition evaluator."""
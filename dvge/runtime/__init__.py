@@ -0,0 +1,33 @@
+# dvge/runtime/__init__.py
+
+"""Headless story runtime.
+
+Runs projects without the editor or Tk: load a .dvgproj file, then step
+through it with the same node, condition and effect semantics as the
+editor preview. Intended for simulations, tests and servers.
+"""
+
+from .project import StoryProject, load_project
+from .state import END_GAME, START_NODE, RuntimeState
+from .story_runtime import (
+    ACTION_COMBAT, ACTION_NAVIGATE, ACTION_RANDOM_EVENT, ACTION_ROLL_DICE, ACTION_WAIT,
+    RUN_DEAD_END, RUN_ENDED, RUN_MAX_STEPS, Choice, StoryRuntime
+)
+
+__all__ = [
+    'StoryProject',
+    'load_project',
+    'RuntimeState',
+    'START_NODE',
+    'END_GAME',
+    'StoryRuntime',
+    'Choice',
+    'ACTION_NAVIGATE',
+    'ACTION_ROLL_DICE',
+    'ACTION_COMBAT',
+    'ACTION_RANDOM_EVENT',
+    'ACTION_WAIT',
+    'RUN_ENDED',
+    'RUN_DEAD_END',
+    'RUN_MAX_STEPS'
+]
@@ -0,0 +1,258 @@
+# dvge/runtime/explorer.py
+
+"""Exhaustive exploration of the reachable game states of a project.
+
+Graph reachability (ProjectValidator) ignores conditions and effects: a
+node behind a condition no playthrough can satisfy still counts as
+reachable. StateExplorer instead walks game states, each a current node
+plus stats, flags, variables, inventory and quest states, applying
+options, effects and conditions exactly as StoryRuntime does, and taking
+every possible outcome of dice rolls, combat and random events.
+
+Visited states are remembered as 8-byte digests rather than whole states.
+Numeric stats and variables can be abstracted (bucketed or clamped) before
+hashing so that stories with counters still have a finite state space;
+states that differ only within a bucket are then explored once, which can
+hide nodes that need an exact value. Exploration also stops after
+max_states states.
+
+Usage: python -m dvge.runtime.explorer story.dvgproj --bucket 10
+"""
+
+import argparse
+import hashlib
+import math
+from collections import Counter, deque
+from typing import Callable, Iterable, List, Optional
+
+from ..core.graph_index import GraphIndex
+from .project import load_project
+from .rules import COMBAT_RANDOM_RANGE, COMBAT_VICTORY_POWER, combat_power
+from .state import END_GAME, START_NODE, RuntimeState
+from .story_runtime import (
+    ACTION_COMBAT, ACTION_NAVIGATE, ACTION_RANDOM_EVENT, ACTION_ROLL_DICE, StoryRuntime
+)
+
+# Default limit on the number of distinct states explored
+MAX_STATES = 1_000_000
+
+# Dead-end states kept as examples in the result
+MAX_DEAD_END_EXAMPLES = 20
+
+_DIGEST_SIZE = 8
+
+
+def exact_values(name, value):
+    """Keeps numeric values, treating 3.0 and 3 as the same value."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def bucketed(size: float, names: Optional[Iterable[str]] = None) -> Callable:
+    """Abstraction grouping numeric values into buckets of the given size.
+
+    Args:
+        size: Width of a bucket, e.g. 10 makes 0-9, 10-19, ... equal.
+        names: Only abstract these stats/variables; None abstracts all.
+    """
+    names = set(names) if names is not None else None
+
+    def abstract(name, value):
+        if (names is None or name in names) and _is_number(value):
+            return math.floor(value / size)
+        return exact_values(name, value)
+    return abstract
+
+
+def clamped(low: float, high: float, names: Optional[Iterable[str]] = None) -> Callable:
+    """Abstraction treating values below `low` or above `high` as equal to the bound."""
+    names = set(names) if names is not None else None
+
+    def abstract(name, value):
+        if (names is None or name in names) and _is_number(value):
+            value = min(max(value, low), high)
+        return exact_values(name, value)
+    return abstract
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class ExplorationResult:
+    """What an exploration found."""
+
+    def __init__(self):
+        self.states = 0                      # distinct states explored
+        self.complete = True                 # False if max_states was reached
+        self.reachable_nodes = set()         # nodes entered in some state
+        self.graph_reachable_nodes = set()   # nodes reachable ignoring conditions
+        self.endings = set()                 # nodes from which [End Game] is reached
+        self.dead_ends = Counter()           # node_id -> dead-end states at that node
+        self.dead_end_examples = []          # saved-game dicts of some dead-end states
+        self.options_available = set()       # (node_id, option index) available in some state
+
+    @property
+    def conditionally_unreachable(self) -> List[str]:
+        """Nodes linked from the start but never entered because of conditions or effects."""
+        return sorted(self.graph_reachable_nodes - self.reachable_nodes)
+
+    def unavailable_choices(self, project) -> List[tuple]:
+        """Options of reachable nodes that are never available."""
+        unavailable = []
+        for node_id in sorted(self.reachable_nodes):
+            node = project.nodes.get(node_id)
+            for index in range(len(getattr(node, 'options', None) or [])):
+                if (node_id, index) not in self.options_available:
+                    unavailable.append((node_id, index))
+        return unavailable
+
+
+class StateExplorer:
+    """Breadth-first search over the game states of a project."""
+
+    def __init__(self, project, abstraction: Callable = exact_values, max_states: int = MAX_STATES,
+                 start_node: str = START_NODE):
+        """
+        Args:
+            project: A StoryProject.
+            abstraction: Function (name, value) -> value applied to stats and
+                variables before states are compared; see bucketed() and clamped().
+            max_states: Number of distinct states after which exploration stops.
+            start_node: Node the story starts at.
+        """
+        self.project = project
+        self.abstraction = abstraction
+        self.max_states = max_states
+        self.start_node = start_node
+        self.runtime = StoryRuntime(project, start_node=start_node, record_history=False)
+
+    def explore(self) -> ExplorationResult:
+        """Explores every reachable state, up to max_states."""
+        result = ExplorationResult()
+        graph_index = GraphIndex()
+        graph_index.sync(self.project.nodes)
+        result.graph_reachable_nodes = graph_index.reachable_from(self.start_node) & set(self.project.nodes)
+
+        start = RuntimeState.from_project(self.project, self.start_node)
+        seen = {self.state_digest(start)}
+        queue = deque([start])
+        while queue:
+            if result.states >= self.max_states:
+                result.complete = False
+                break
+            state = queue.popleft()
+            result.states += 1
+            for next_state in self._successors(state, result):
+                digest = self.state_digest(next_state)
+                if digest not in seen:
+                    seen.add(digest)
+                    queue.append(next_state)
+        return result
+
+    def state_digest(self, state: RuntimeState) -> bytes:
+        """Returns a compact hash of everything conditions can tell apart."""
+        abstract = self.abstraction
+        key = (
+            state.current_node_id,
+            sorted((name, abstract(name, value)) for name, value in state.player_stats.items()),
+            sorted((name, abstract(name, value)) for name, value in state.variables.items()),
+            # A false flag behaves like a missing one
+            sorted((name, value) for name, value in state.story_flags.items() if value != False),
+            sorted({str(item.get('name')) for item in state.player_inventory}),
+            sorted((quest_id, quest.get('state')) for quest_id, quest in state.quests.items()),
+        )
+        return hashlib.blake2b(repr(key).encode('utf-8'), digest_size=_DIGEST_SIZE).digest()
+
+    def _successors(self, state: RuntimeState, result: ExplorationResult):
+        """Yields the states that follow a state, recording what was found."""
+        node_id = state.current_node_id
+        if node_id == END_GAME:
+            return
+        runtime = self.runtime
+        runtime.reset(state=state)
+        node = runtime.current_node
+        if node is not None:
+            result.reachable_nodes.add(node_id)
+        choices = runtime.choices()
+        if not choices:
+            result.dead_ends[node_id] += 1
+            if len(result.dead_end_examples) < MAX_DEAD_END_EXAMPLES:
+                result.dead_end_examples.append(state.to_dict())
+            return
+
+        has_options = bool(getattr(node, 'options', None))
+        for choice in choices:
+            if choice.action == ACTION_NAVIGATE:
+                if has_options:
+                    result.options_available.add((node_id, choice.index))
+                next_state = state.copy()
+                runtime.reset(state=next_state)
+                runtime.step(choice)
+                targets = [next_state.current_node_id]
+            else:
+                next_state = state
+                targets = self._outcome_targets(node, choice, state)
+
+            for target in targets:
+                if not target or (target == node_id and next_state is state):
+                    continue
+                if target == END_GAME:
+                    result.endings.add(node_id)
+                if next_state is state:
+                    successor = state.copy()
+                    successor.current_node_id = target
+                    yield successor
+                else:
+                    yield next_state
+
+    def _outcome_targets(self, node, choice, state) -> List[str]:
+        """Returns every node a dice roll, combat or random event can lead to."""
+        if choice.action == ACTION_ROLL_DICE:
+            lowest, highest = node.num_dice, node.num_dice * node.num_sides
+            targets = []
+            if highest >= node.success_threshold:
+                targets.append(node.success_node)
+            if lowest < node.success_threshold:
+                targets.append(node.failure_node)
+            return targets
+        if choice.action == ACTION_COMBAT:
+            power = combat_power(state.player_stats)
+            low_factor, high_factor = COMBAT_RANDOM_RANGE
+            targets = []
+            if power * high_factor > COMBAT_VICTORY_POWER:
+                targets.append(node.successNode)
+            if power * low_factor <= COMBAT_VICTORY_POWER:
+                targets.append(node.failNode)
+            return targets
+        if choice.action == ACTION_RANDOM_EVENT:
+            return [outcome.get('next_node') for outcome in node.random_outcomes
+                    if outcome.get('weight', 1) > 0]
+        return [choice.next_node]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Explore the reachable game states of a DVGE project.")
+    parser.add_argument("project", help=".dvgproj file or project container")
+    parser.add_argument("--bucket", type=float, default=0,
+                        help="group numeric stats and variables into buckets of this size")
+    parser.add_argument("--max-states", type=int, default=MAX_STATES)
+    args = parser.parse_args(argv)
+
+    project = load_project(args.project)
+    abstraction = bucketed(args.bucket) if args.bucket else exact_values
+    result = StateExplorer(project, abstraction, args.max_states).explore()
+
+    print(f"{result.states} states explored{'' if result.complete else ' (limit reached, results are partial)'}")
+    print(f"{len(result.reachable_nodes)} of {len(project.nodes)} nodes reachable")
+    for node_id in result.conditionally_unreachable:
+        print(f"Linked but never reachable: {node_id}")
+    for node_id, count in result.dead_ends.most_common():
+        print(f"Dead end: {node_id} ({count} states)")
+    for node_id, index in result.unavailable_choices(project):
+        print(f"Never available: option {index + 1} of {node_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# dvge/runtime/project.py
+
+"""Loading projects without the editor."""
+
+from ..core.project_container import read_project_file
+from ..models import create_node_from_dict
+
+
+class StoryProject:
+    """The nodes and initial game state of a project."""
+
+    def __init__(self, nodes=None, player_stats=None, player_inventory=None,
+                 story_flags=None, quests=None, variables=None, project_settings=None):
+        self.nodes = nodes if nodes is not None else {}
+        self.player_stats = player_stats if player_stats is not None else {}
+        self.player_inventory = player_inventory if player_inventory is not None else []
+        self.story_flags = story_flags if story_flags is not None else {}
+        self.quests = quests if quests is not None else {}   # quest_id -> quest dict
+        self.variables = variables if variables is not None else {}
+        self.project_settings = project_settings if project_settings is not None else {}
+
+    @classmethod
+    def from_dict(cls, project_data):
+        """Creates a project from the dictionary stored in a .dvgproj file."""
+        nodes = {}
+        for node_data in project_data.get("nodes", {}).values():
+            node = create_node_from_dict(node_data)
+            nodes[node.id] = node
+        return cls(
+            nodes,
+            project_data.get("player_stats", {}),
+            project_data.get("player_inventory", []),
+            project_data.get("story_flags", {}),
+            dict(project_data.get("quests", {})),
+            project_data.get("variables", {}),
+            project_data.get("project_settings", {}),
+        )
+
+    @classmethod
+    def from_app(cls, app):
+        """Creates a project sharing the nodes and state of an open editor."""
+        return cls(
+            app.nodes,
+            app.player_stats,
+            app.player_inventory,
+            app.story_flags,
+            {quest_id: quest.to_dict() for quest_id, quest in app.quests.items()},
+            getattr(app, 'variables', {}),
+            getattr(app, 'project_settings', {}),
+        )
+
+
+def load_project(filepath):
+    """Loads a .dvgproj file or project container."""
+    return StoryProject.from_dict(read_project_file(filepath))
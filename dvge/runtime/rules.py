@@ -0,0 +1,170 @@
+# dvge/runtime/rules.py
+
+"""Game rules shared by the editor preview and the headless runtime.
+
+Each function works on any state object with the attributes player_stats,
+player_inventory, story_flags, quests, variables and var_system, which both
+EnhancedPreviewGameEngine and RuntimeState provide. Randomness comes from
+the `rng` argument (the random module by default), so simulations can be
+seeded.
+"""
+
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+# Combat power needed to win a simple combat
+COMBAT_VICTORY_POWER = 50
+
+# Range of the random factor applied to combat power
+COMBAT_RANDOM_RANGE = (0.8, 1.2)
+
+
+def apply_effects(state, effects: List[Dict[str, Any]]):
+    """Applies a list of option effects to a state."""
+    for effect in effects:
+        apply_effect(state, effect)
+
+
+def apply_effect(state, effect: Dict[str, Any]):
+    """Applies a single effect to a state."""
+    effect_type = effect.get('type', 'stat')
+    subject = effect.get('subject', '')
+    operator = effect.get('operator', '+=')
+    value = effect.get('value', 0)
+
+    if effect_type == 'stat':
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            value = 0
+
+        if subject not in state.player_stats:
+            state.player_stats[subject] = 0
+
+        current = state.player_stats[subject]
+        if operator == '=':
+            state.player_stats[subject] = value
+        elif operator == '+=':
+            state.player_stats[subject] = current + value
+        elif operator == '-=':
+            state.player_stats[subject] = current - value
+
+    elif effect_type == 'item':
+        if operator == 'add':
+            if not any(item.get('name') == subject for item in state.player_inventory):
+                state.player_inventory.append({'name': subject, 'description': ''})
+        elif operator == 'remove':
+            state.player_inventory = [
+                item for item in state.player_inventory
+                if item.get('name') != subject
+            ]
+
+    elif effect_type == 'flag':
+        bool_value = (str(value).lower() == 'true')
+        state.story_flags[subject] = bool_value
+
+    elif effect_type == 'quest':
+        if subject in state.quests:
+            state.quests[subject]['state'] = value
+
+    elif effect_type == 'variable':
+        try:
+            # Handle expressions in value
+            if isinstance(value, str) and ('{' in value or any(op in value for op in ['+', '-', '*', '/'])):
+                value = state.var_system.evaluate_math_expression(value)
+            else:
+                value = float(value)
+        except (ValueError, TypeError):
+            value = 0
+
+        if subject not in state.variables:
+            state.variables[subject] = 0
+
+        state.var_system.apply_variable_effect(subject, operator, value)
+
+
+def roll_dice(num_dice: int, num_sides: int, rng=random) -> Tuple[int, List[int]]:
+    """Rolls dice and returns (total, individual rolls)."""
+    rolls = [rng.randint(1, num_sides) for _ in range(num_dice)]
+    return sum(rolls), rolls
+
+
+def combat_power(player_stats: Dict[str, Any]) -> float:
+    """Returns the player's combat power before the random factor."""
+    return (
+        player_stats.get('strength', 10) +
+        player_stats.get('defense', 5) +
+        (player_stats.get('health', 100) / 10)
+    )
+
+
+def resolve_combat(player_stats: Dict[str, Any], rng=random) -> Tuple[float, bool]:
+    """Resolves a simple combat and returns (combat power, victory)."""
+    # Add some randomness
+    final_power = combat_power(player_stats) * rng.uniform(*COMBAT_RANDOM_RANGE)
+    return final_power, final_power > COMBAT_VICTORY_POWER
+
+
+def choose_random_outcome(outcomes: List[Dict[str, Any]], rng=random) -> Optional[Dict[str, Any]]:
+    """Picks one outcome of a random event by weight, or None if there are none."""
+    if not outcomes:
+        return None
+
+    total_weight = sum(outcome.get('weight', 1) for outcome in outcomes)
+    random_value = rng.random() * total_weight
+
+    current_weight = 0
+    for outcome in outcomes:
+        current_weight += outcome.get('weight', 1)
+        if random_value <= current_weight:
+            return outcome
+    return None
+
+
+def buy_item(state, item_name: str, price, currency_var: str) -> bool:
+    """Buys an item with a currency variable; returns False if it cannot be afforded."""
+    current_currency = state.variables.get(currency_var, 0)
+    if current_currency < price:
+        return False
+
+    state.variables[currency_var] = current_currency - price
+    state.player_inventory.append({
+        'name': item_name,
+        'description': f'Purchased from shop for {price} {currency_var}'
+    })
+    return True
+
+
+def sell_item(state, item_name: str, price, currency_var: str) -> bool:
+    """Sells an item for a currency variable; returns False if it is not in the inventory."""
+    item_index = next((i for i, item in enumerate(state.player_inventory)
+                       if item.get('name') == item_name), -1)
+    if item_index < 0:
+        return False
+
+    del state.player_inventory[item_index]
+    state.variables[currency_var] = state.variables.get(currency_var, 0) + price
+    return True
+
+
+def craft_item(state, recipe_name: str, ingredients: List[str], result: str) -> List[str]:
+    """Crafts an item from inventory ingredients.
+
+    Returns the missing ingredients; the inventory is only changed if none are missing.
+    """
+    inventory_items = {item.get('name') for item in state.player_inventory}
+    missing_ingredients = [ingredient for ingredient in ingredients if ingredient not in inventory_items]
+    if missing_ingredients:
+        return missing_ingredients
+
+    for ingredient in ingredients:
+        item_index = next((i for i, item in enumerate(state.player_inventory)
+                           if item.get('name') == ingredient), -1)
+        if item_index >= 0:
+            del state.player_inventory[item_index]
+
+    state.player_inventory.append({
+        'name': result,
+        'description': f'Crafted using {recipe_name}'
+    })
+    return []
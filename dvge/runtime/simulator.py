@@ -0,0 +1,264 @@
+# dvge/runtime/simulator.py
+
+"""Monte Carlo playthroughs for coverage and balance testing.
+
+Runs many randomized (or policy-driven) playthroughs of a project with
+StoryRuntime, spread over a pool of worker processes, and collects:
+
+    node visits           how often each node was entered
+    endings               which node led to [End Game]
+    soft-locks            nodes where a playthrough got stuck
+    step-limit stops      playthroughs that never ended (usually loops)
+    stat/variable values  histograms of the final values
+    option availability   how often each dialogue option was offered and taken
+
+Usage: python -m dvge.runtime.simulator story.dvgproj --runs 10000
+"""
+
+import argparse
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .project import load_project
+from .state import END_GAME
+from .story_runtime import ACTION_NAVIGATE, RUN_DEAD_END, RUN_ENDED, RUN_MAX_STEPS, StoryRuntime
+
+# Playthroughs sent to a worker process at a time
+BATCH_SIZE = 250
+
+
+def random_policy(runtime, choices):
+    """Takes a uniformly random choice."""
+    return runtime.rng.choice(choices)
+
+
+def first_choice_policy(runtime, choices):
+    """Always takes the first available choice."""
+    return choices[0]
+
+
+class SimulationReport:
+    """Statistics gathered over many playthroughs; reports can be merged."""
+
+    def __init__(self, bin_width: float = 0):
+        self.bin_width = bin_width   # width of histogram bins; 0 keeps exact values
+        self.runs = 0
+        self.total_steps = 0
+        self.outcomes = Counter()           # RUN_ENDED / RUN_DEAD_END / RUN_MAX_STEPS
+        self.node_visits = Counter()        # node_id -> times entered
+        self.endings = Counter()            # node_id that led to [End Game] -> runs
+        self.soft_locks = Counter()         # node_id with no way on -> runs
+        self.step_limit_nodes = Counter()   # node_id where max_steps was reached -> runs
+        self.stat_histograms = {}           # stat -> Counter of final values
+        self.variable_histograms = {}       # variable -> Counter of final values
+        self.options_offered = Counter()    # (node_id, option index) -> times available
+        self.options_taken = Counter()      # (node_id, option index) -> times chosen
+
+    def record(self, runtime, outcome, last_node_id):
+        """Adds the result of one finished playthrough."""
+        self.runs += 1
+        self.total_steps += runtime.steps
+        self.outcomes[outcome] += 1
+        if outcome == RUN_ENDED:
+            self.endings[last_node_id] += 1
+        elif outcome == RUN_DEAD_END:
+            self.soft_locks[runtime.current_node_id] += 1
+        else:
+            self.step_limit_nodes[runtime.current_node_id] += 1
+        self._add_values(self.stat_histograms, runtime.state.player_stats)
+        self._add_values(self.variable_histograms, runtime.state.variables)
+
+    def merge(self, other: 'SimulationReport'):
+        """Adds the statistics of another report."""
+        self.runs += other.runs
+        self.total_steps += other.total_steps
+        for name in ('outcomes', 'node_visits', 'endings', 'soft_locks', 'step_limit_nodes',
+                     'options_offered', 'options_taken'):
+            getattr(self, name).update(getattr(other, name))
+        for name in ('stat_histograms', 'variable_histograms'):
+            histograms = getattr(self, name)
+            for key, counts in getattr(other, name).items():
+                histograms.setdefault(key, Counter()).update(counts)
+
+    def unvisited_nodes(self, project) -> List[str]:
+        """Nodes no playthrough entered."""
+        return [node_id for node_id in project.nodes if node_id not in self.node_visits]
+
+    def unreachable_choices(self, project) -> List[Tuple[str, int]]:
+        """Options of visited nodes that were never available in any playthrough."""
+        unreachable = []
+        for node_id in self.node_visits:
+            node = project.nodes.get(node_id)
+            for index in range(len(getattr(node, 'options', None) or [])):
+                if (node_id, index) not in self.options_offered:
+                    unreachable.append((node_id, index))
+        return unreachable
+
+    def to_dict(self, project=None) -> Dict:
+        """Returns the report as JSON-serializable data."""
+        data = {
+            'runs': self.runs,
+            'average_steps': self.total_steps / self.runs if self.runs else 0,
+            'outcomes': dict(self.outcomes),
+            'node_visits': dict(self.node_visits),
+            'endings': dict(self.endings),
+            'soft_locks': dict(self.soft_locks),
+            'step_limit_nodes': dict(self.step_limit_nodes),
+            'stat_histograms': {k: dict(v) for k, v in self.stat_histograms.items()},
+            'variable_histograms': {k: dict(v) for k, v in self.variable_histograms.items()},
+            'options': [
+                {'node': node_id, 'index': index, 'offered': offered,
+                 'taken': self.options_taken.get((node_id, index), 0)}
+                for (node_id, index), offered in sorted(self.options_offered.items())
+            ],
+        }
+        if project is not None:
+            data['unvisited_nodes'] = self.unvisited_nodes(project)
+            data['unreachable_choices'] = [list(choice) for choice in self.unreachable_choices(project)]
+        return data
+
+    def _add_values(self, histograms, values):
+        for name, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if self.bin_width:
+                value = (value // self.bin_width) * self.bin_width
+            histograms.setdefault(name, Counter())[value] += 1
+
+
+def play(runtime: StoryRuntime, report: SimulationReport, policy: Callable = random_policy,
+         max_steps: int = 1000) -> str:
+    """Plays one playthrough from the runtime's current state into a report."""
+    report.node_visits[runtime.current_node_id] += 1
+    last_node_id = runtime.current_node_id
+    outcome = RUN_MAX_STEPS
+    for _ in range(max_steps):
+        if runtime.is_game_over:
+            outcome = RUN_ENDED
+            break
+        choices = runtime.choices()
+        if not choices:
+            outcome = RUN_DEAD_END
+            break
+
+        node_id = runtime.current_node_id
+        # Only dialogue options count; "continue" choices of shops and inventories do not
+        has_options = bool(getattr(runtime.current_node, 'options', None))
+        if has_options:
+            for choice in choices:
+                if choice.action == ACTION_NAVIGATE:
+                    report.options_offered[(node_id, choice.index)] += 1
+        choice = policy(runtime, choices)
+        if has_options and choice.action == ACTION_NAVIGATE:
+            report.options_taken[(node_id, choice.index)] += 1
+
+        last_node_id = node_id
+        runtime.step(choice)
+        if runtime.current_node_id != END_GAME:
+            report.node_visits[runtime.current_node_id] += 1
+    else:
+        if runtime.is_game_over:
+            outcome = RUN_ENDED
+
+    report.record(runtime, outcome, last_node_id)
+    return outcome
+
+
+def run_batch(project, runs: int, seed: Optional[int] = None, policy: Callable = random_policy,
+              max_steps: int = 1000, bin_width: float = 0) -> SimulationReport:
+    """Runs playthroughs in this process and returns their report."""
+    runtime = StoryRuntime(project, rng=random.Random(seed), record_history=False)
+    report = SimulationReport(bin_width)
+    for i in range(runs):
+        if i:
+            runtime.reset()
+        play(runtime, report, policy, max_steps)
+    return report
+
+
+# Project loaded once per worker process
+_worker_project = None
+
+
+def _init_worker(project):
+    global _worker_project
+    _worker_project = project
+
+
+def _run_worker_batch(runs, seed, policy, max_steps, bin_width):
+    return run_batch(_worker_project, runs, seed, policy, max_steps, bin_width)
+
+
+def simulate(project, runs: int = 1000, policy: Callable = random_policy, seed: Optional[int] = None,
+             workers: Optional[int] = None, max_steps: int = 1000, bin_width: float = 0,
+             progress_callback: Optional[Callable[[int, int], None]] = None) -> SimulationReport:
+    """Runs many playthroughs, on worker processes when there are enough of them.
+
+    Args:
+        project: A StoryProject.
+        runs: Number of playthroughs.
+        policy: Function (runtime, choices) -> choice; must be a module-level
+            function so it can be sent to worker processes.
+        seed: Makes the whole simulation reproducible for a given batch size.
+        workers: Worker processes; None uses the CPU count, 1 runs in this process.
+        max_steps: Choices after which a playthrough is stopped.
+        bin_width: Width of stat/variable histogram bins; 0 keeps exact values.
+        progress_callback: Called with (finished runs, total runs).
+    """
+    batches = [min(BATCH_SIZE, runs - start) for start in range(0, runs, BATCH_SIZE)]
+    seeds = [None if seed is None else seed + i for i in range(len(batches))]
+    report = SimulationReport(bin_width)
+
+    if workers == 1 or len(batches) <= 1:
+        for batch_runs, batch_seed in zip(batches, seeds):
+            report.merge(run_batch(project, batch_runs, batch_seed, policy, max_steps, bin_width))
+            if progress_callback:
+                progress_callback(report.runs, runs)
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(project,)) as executor:
+        futures = [executor.submit(_run_worker_batch, batch_runs, batch_seed, policy, max_steps, bin_width)
+                   for batch_runs, batch_seed in zip(batches, seeds)]
+        for future in as_completed(futures):
+            report.merge(future.result())
+            if progress_callback:
+                progress_callback(report.runs, runs)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate playthroughs of a DVGE project.")
+    parser.add_argument("project", help=".dvgproj file or project container")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--bin-width", type=float, default=0)
+    args = parser.parse_args(argv)
+
+    project = load_project(args.project)
+    report = simulate(project, args.runs, seed=args.seed, workers=args.workers,
+                      max_steps=args.max_steps, bin_width=args.bin_width)
+
+    print(f"{report.runs} playthroughs, {report.total_steps / max(report.runs, 1):.1f} choices on average")
+    for outcome, count in report.outcomes.most_common():
+        print(f"  {outcome}: {count}")
+    print("Endings:")
+    for node_id, count in report.endings.most_common():
+        print(f"  {node_id}: {count / report.runs:.1%}")
+    if report.soft_locks:
+        print("Soft-locks:")
+        for node_id, count in report.soft_locks.most_common():
+            print(f"  {node_id}: {count}")
+    unvisited = report.unvisited_nodes(project)
+    if unvisited:
+        print(f"Never visited: {', '.join(unvisited)}")
+    for node_id, index in report.unreachable_choices(project):
+        print(f"Never available: option {index + 1} of {node_id}")
+
+
+if __name__ == "__main__":
+    main()
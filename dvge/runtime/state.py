@@ -0,0 +1,72 @@
+# dvge/runtime/state.py
+
+"""Mutable game state of one playthrough."""
+
+import copy
+
+from ..core.variable_system import VariableSystem
+
+START_NODE = "intro"
+END_GAME = "[End Game]"
+
+
+class RuntimeState:
+    """Stats, inventory, flags, quests and variables of a playthrough.
+
+    The attribute names match EnhancedPreviewGameEngine, so the shared rules
+    and condition programs work on either.
+    """
+
+    __slots__ = ('player_stats', 'player_inventory', 'story_flags', 'quests',
+                 'variables', 'current_node_id', 'var_system')
+
+    def __init__(self, player_stats=None, player_inventory=None, story_flags=None,
+                 quests=None, variables=None, current_node_id=START_NODE):
+        self.player_stats = player_stats if player_stats is not None else {}
+        self.player_inventory = player_inventory if player_inventory is not None else []
+        self.story_flags = story_flags if story_flags is not None else {}
+        self.quests = quests if quests is not None else {}
+        self.variables = variables if variables is not None else {}
+        self.current_node_id = current_node_id
+
+        # Variable effects and {expression} values go through a variable
+        # system that shares this state's dictionaries
+        self.var_system = VariableSystem()
+        self.var_system.set_variables_ref(self.variables)
+        self.var_system.set_flags_ref(self.story_flags)
+
+    @classmethod
+    def from_project(cls, project, start_node=START_NODE):
+        """Returns the initial state of a project, independent of the project's data."""
+        return cls(copy.deepcopy(project.player_stats), copy.deepcopy(project.player_inventory),
+                   copy.deepcopy(project.story_flags), copy.deepcopy(project.quests),
+                   copy.deepcopy(project.variables), start_node)
+
+    def copy(self):
+        """Returns an independent copy, for branching simulations."""
+        return RuntimeState(
+            dict(self.player_stats),
+            [dict(item) for item in self.player_inventory],
+            dict(self.story_flags),
+            {quest_id: dict(quest) for quest_id, quest in self.quests.items()},
+            dict(self.variables),
+            self.current_node_id,
+        )
+
+    def to_dict(self):
+        """Serializes the state in the layout of a saved game."""
+        return {
+            'current_node': self.current_node_id,
+            'player_stats': copy.deepcopy(self.player_stats),
+            'player_inventory': copy.deepcopy(self.player_inventory),
+            'story_flags': copy.deepcopy(self.story_flags),
+            'quests': copy.deepcopy(self.quests),
+            'variables': copy.deepcopy(self.variables),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Creates a state from a dictionary written by to_dict()."""
+        return cls(copy.deepcopy(data.get('player_stats', {})), copy.deepcopy(data.get('player_inventory', [])),
+                   copy.deepcopy(data.get('story_flags', {})), copy.deepcopy(data.get('quests', {})),
+                   copy.deepcopy(data.get('variables', {})), data.get('current_node', START_NODE))
@@ -0,0 +1,180 @@
+# dvge/runtime/story_runtime.py
+
+"""Headless story execution with a step API."""
+
+import random
+from typing import Callable, List, NamedTuple, Optional, Union
+
+from ..core.condition_program import ConditionProgramCache, ConditionState
+from ..models import CombatNode, DiceRollNode, InventoryNode, RandomEventNode, ShopNode, TimerNode
+from .rules import apply_effects, choose_random_outcome, resolve_combat, roll_dice
+from .state import END_GAME, START_NODE, RuntimeState
+
+# Kinds of choices
+ACTION_NAVIGATE = "navigate"          # dialogue option or "continue"
+ACTION_ROLL_DICE = "roll_dice"        # DiceRollNode
+ACTION_COMBAT = "combat"              # CombatNode
+ACTION_RANDOM_EVENT = "random_event"  # RandomEventNode
+ACTION_WAIT = "wait"                  # TimerNode
+
+# Reasons a run() stops
+RUN_ENDED = "ended"            # reached [End Game]
+RUN_DEAD_END = "dead_end"      # no choice available
+RUN_MAX_STEPS = "max_steps"    # step limit reached
+
+
+class Choice(NamedTuple):
+    """Something the player can do at the current node."""
+    action: str
+    index: int       # option index for dialogue options, else 0
+    text: str
+    next_node: str   # target node, or "" when decided by a roll
+
+
+class StoryRuntime:
+    """Plays a project without the editor or any UI.
+
+    Nodes, conditions and effects behave as in the editor preview: options
+    are gated by the same compiled condition programs and effects, dice,
+    combat and random events use the shared rules. Randomness comes from
+    `rng`, so seeded runs are reproducible.
+
+    Typical use:
+
+        runtime = StoryRuntime(load_project("story.dvgproj"), rng=random.Random(1))
+        while runtime.choices():
+            runtime.step(0)
+    """
+
+    def __init__(self, project, rng: Optional[random.Random] = None, start_node: str = START_NODE,
+                 record_history: bool = True):
+        self.project = project
+        self.nodes = project.nodes
+        self.rng = rng or random.Random()
+        self.record_history = record_history
+        self.condition_programs = ConditionProgramCache()
+        self._option_choices = {}  # node_id -> ((text, nextNode) per option, [Choice per option])
+        self.reset(start_node)
+
+    def reset(self, start_node: str = START_NODE, state: Optional[RuntimeState] = None):
+        """Starts a new playthrough, from the project's initial state unless one is given."""
+        self.state = state if state is not None else RuntimeState.from_project(self.project, start_node)
+        self.history = []
+        self.steps = 0
+        self.is_game_over = False
+        self._choices = None
+        self._enter(self.state.current_node_id if state is not None else start_node)
+
+    @property
+    def current_node_id(self) -> str:
+        return self.state.current_node_id
+
+    @property
+    def current_node(self):
+        return self.nodes.get(self.state.current_node_id)
+
+    def choices(self) -> List[Choice]:
+        """Returns what the player can do at the current node; empty when stuck or ended."""
+        if self._choices is None:
+            self._choices = self._compute_choices()
+        return self._choices
+
+    def step(self, choice: Union[Choice, int]) -> str:
+        """Takes a choice (or its position in choices()) and returns the new node ID."""
+        if isinstance(choice, int):
+            choice = self.choices()[choice]
+        node = self.current_node
+        self.steps += 1
+        self._choices = None
+        action = choice.action
+
+        if action == ACTION_NAVIGATE:
+            if not isinstance(node, (ShopNode, InventoryNode)):
+                option = node.options[choice.index]
+                apply_effects(self.state, option.get('effects', []))
+            next_node = choice.next_node
+        elif action == ACTION_ROLL_DICE:
+            total, _ = roll_dice(node.num_dice, node.num_sides, self.rng)
+            next_node = node.success_node if total >= node.success_threshold else node.failure_node
+        elif action == ACTION_COMBAT:
+            _, victory = resolve_combat(self.state.player_stats, self.rng)
+            next_node = node.successNode if victory else node.failNode
+        elif action == ACTION_RANDOM_EVENT:
+            outcome = choose_random_outcome(node.random_outcomes, self.rng)
+            next_node = outcome.get('next_node') if outcome else None
+        else:
+            next_node = choice.next_node
+
+        if next_node:
+            self._enter(next_node)
+        return self.state.current_node_id
+
+    def run(self, policy: Optional[Callable[['StoryRuntime', List[Choice]], Choice]] = None,
+            max_steps: int = 1000) -> str:
+        """Plays until the story ends, gets stuck or max_steps choices were taken.
+
+        Args:
+            policy: Called with the runtime and the available choices, returns
+                the choice to take. Defaults to a uniformly random choice.
+
+        Returns:
+            RUN_ENDED, RUN_DEAD_END or RUN_MAX_STEPS.
+        """
+        for _ in range(max_steps):
+            if self.is_game_over:
+                return RUN_ENDED
+            choices = self.choices()
+            if not choices:
+                return RUN_DEAD_END
+            self.step(policy(self, choices) if policy else self.rng.choice(choices))
+        return RUN_ENDED if self.is_game_over else RUN_MAX_STEPS
+
+    def _enter(self, node_id: str):
+        self.state.current_node_id = node_id
+        self._choices = None
+        if node_id == END_GAME:
+            self.is_game_over = True
+        elif self.record_history and node_id in self.nodes:
+            if not self.history or self.history[-1] != node_id:
+                self.history.append(node_id)
+
+    def _compute_choices(self) -> List[Choice]:
+        if self.is_game_over:
+            return []
+        node = self.nodes.get(self.state.current_node_id)
+        if node is None:
+            return []
+
+        if isinstance(node, ShopNode):
+            return [Choice(ACTION_NAVIGATE, 1, "Continue on your way", node.continue_node)] if node.continue_node else []
+        if isinstance(node, InventoryNode):
+            return [Choice(ACTION_NAVIGATE, 0, "Continue", node.continue_node)] if node.continue_node else []
+        if isinstance(node, TimerNode):
+            return [Choice(ACTION_WAIT, 0, "Wait", node.next_node)] if node.next_node else []
+        if isinstance(node, RandomEventNode):
+            return [Choice(ACTION_RANDOM_EVENT, 0, "Trigger Random Event", "")] if node.random_outcomes else []
+
+        choices = []
+        if isinstance(node, DiceRollNode):
+            choices.append(Choice(ACTION_ROLL_DICE, 0, "Roll", ""))
+        elif isinstance(node, CombatNode):
+            choices.append(Choice(ACTION_COMBAT, 0, "Fight", ""))
+
+        options = getattr(node, 'options', None)
+        if options:
+            option_choices = self._get_option_choices(node)
+            available = self.condition_programs.get(node).evaluate(ConditionState.from_engine(self.state))
+            choices.extend(choice for choice, ok in zip(option_choices, available) if ok)
+        return choices
+
+    def _get_option_choices(self, node) -> List[Choice]:
+        """Returns a Choice for every option of a node, rebuilt when the options change."""
+        # Compared by content: editors change options in place without touching the node
+        signature = tuple((option.get('text', ''), option.get('nextNode', '')) for option in node.options)
+        known = self._option_choices.get(node.id)
+        if known and known[0] == signature:
+            return known[1]
+        option_choices = [Choice(ACTION_NAVIGATE, i, text, next_node)
+                          for i, (text, next_node) in enumerate(signature)]
+        self._option_choices[node.id] = (signature, option_choices)
+        return option_choices
@@ -2,6 +2,8 @@
 
 """Canvas management for the node editor."""
 
+import queue
+import tkinter as tk
 from tkinter import messagebox
 from ...constants import *
 from ...models import DialogueNode, DiceRollNode
@@ -10,6 +12,26 @@ from .enhanced_node_renderer import EnhancedNodeRenderer
 from .connection_renderer import ConnectionRenderer
 from .interaction_handler import InteractionHandler
 from .node_grouping import group_manager
+from .viewport import (
+    DETAIL_ZOOM_THRESHOLD, RENDER_FULL, RENDER_PLACEHOLDER, ViewTransform, intersects
+)
+from ...core.auto_layout import AutoLayoutJob, FORCE_DIRECTED, LAYERED, LayoutGraph
+from ...core.graph_index import get_graph_index, remove_links_to
+from ...core.redraw_scheduler import RedrawScheduler
+from ...core.spatial_index import NodeSpatialIndex
+
+
+# Nodes drawn per event-loop turn while a lazily loaded project is rendered
+PROGRESSIVE_DRAW_BATCH = 200
+
+# Hidden placeholder items kept for reuse while panning
+MAX_PLACEHOLDER_POOL = 2000
+
+# Milliseconds between connection updates while nodes are dragged, one display frame
+CONNECTION_UPDATE_INTERVAL = 16
+
+# Milliseconds between checks for positions streamed by a running auto-layout
+LAYOUT_POLL_INTERVAL = 50
 
 
 class CanvasManager:
@@ -20,10 +42,13 @@ class CanvasManager:
         self.canvas = app.canvas
         self.placeholder_id = None
         
+        # Maps node coordinates to canvas coordinates, changed by zooming
+        self.view = ViewTransform()
+        
         # Initialize components
         self.node_renderer = NodeRenderer(self.canvas)
         self.enhanced_node_renderer = EnhancedNodeRenderer(self.canvas)
-        self.connection_renderer = ConnectionRenderer(self.canvas)
+        self.connection_renderer = ConnectionRenderer(self.canvas, self.view)
         self.interaction_handler = InteractionHandler(app, self.canvas)
         
         # Visual enhancements - now stable with enhanced rendering
@@ -32,6 +57,29 @@ class CanvasManager:
         
         # Initialize group manager with canvas
         group_manager.canvas = self.canvas
+        
+        # Redraw requests are collected and performed once per idle turn
+        self.redraw_scheduler = RedrawScheduler(app, self._perform_redraw)
+        
+        # Incremented on every full redraw so stale progressive draws stop
+        self._redraw_generation = 0
+        
+        # Areas covered by the nodes, for culling, hit-testing and selection
+        self.spatial_index = NodeSpatialIndex()
+        
+        # Only nodes near the visible area have canvas items
+        self.culling_enabled = True
+        self.rendered_nodes = {}  # node_id -> RENDER_FULL or RENDER_PLACEHOLDER
+        self._placeholder_pool = []  # hidden placeholder items ready for reuse
+        self._viewport_update_pending = None
+        self._connection_update_pending = None
+        self._connection_update_nodes = set()
+        
+        # Running background layout, the nodes it arranges and the positions it has streamed so far
+        self._layout_job = None
+        self._layout_nodes = None
+        self._layout_updates = None
+        self.canvas.bind("<Configure>", lambda event: self.schedule_viewport_update(), add="+")
 
     def draw_grid(self):
         """Draws the background grid on the canvas."""
@@ -45,6 +93,7 @@ class CanvasManager:
                 [(0, i), (10000, i)], 
                 tag="grid_line", fill=COLOR_GRID_LINES, width=1
             )
+        self.view.apply(self.canvas, "grid_line")
         self.canvas.tag_lower("grid_line")
 
     def draw_placeholder_if_empty(self):
@@ -70,24 +119,120 @@ class CanvasManager:
             )
 
     def redraw_all_nodes(self):
-        """Clears and redraws the entire canvas, including grid, nodes, and connections."""
+        """Clears and redraws the entire canvas, including grid, nodes, and connections.
+
+        Use request_full_redraw() from code that may run many times per user action.
+        """
+        self._redraw_generation += 1
+        self.redraw_scheduler.discard_canvas_work()
         self.canvas.delete("all")
+        self.connection_renderer.clear()
+        self.rendered_nodes.clear()
+        self._placeholder_pool.clear()
+        self.spatial_index.sync(self.app.nodes)
         self.draw_grid()
         
+        if getattr(self.app.nodes, 'unmaterialized_count', 0):
+            self._redraw_progressively()
+            return
+        
         # Draw group backgrounds first (behind nodes)
         if self.show_node_groups:
             self._draw_node_groups()
         
         self.draw_placeholder_if_empty()
         
-        for node in self.app.nodes.values():
-            self.create_node_visual(node)
+        viewport = self.visible_rect()
+        node_ids = self.nodes_in_rect(viewport) if self.culling_enabled else list(self.app.nodes)
+        for node_id in node_ids:
+            self.create_node_visual(self.app.nodes[node_id], viewport)
         
-        self.update_selection_visuals()
-        self.draw_connections()
+        self._draw_selection_visuals(list(self.rendered_nodes))
+        self.connection_renderer.draw_connections(self.app.nodes)
+
+    def request_full_redraw(self):
+        """Redraws the entire canvas once pending events have been handled."""
+        self.redraw_scheduler.request_full_redraw()
+
+    def schedule_properties_update(self):
+        """Refreshes the properties panel once pending events have been handled."""
+        self.redraw_scheduler.request_properties()
+
+    def invalidate_region(self, rect):
+        """Redraws the nodes overlapping an area, in node coordinates, once pending events have been handled."""
+        self.redraw_scheduler.request_region(rect)
+
+    def flush_redraws(self):
+        """Performs pending redraw requests right away."""
+        self.redraw_scheduler.flush()
+
+    def _perform_redraw(self, batch):
+        """Performs the redraw work collected by the redraw scheduler."""
+        if batch.full:
+            self.redraw_all_nodes()
+        else:
+            node_ids = set(batch.nodes)
+            for rect in batch.regions:
+                node_ids.update(self.nodes_in_rect(rect))
+            for node_id in node_ids:
+                self._redraw_node_now(node_id)
+            
+            if batch.all_connections:
+                self.connection_renderer.draw_connections(self.app.nodes)
+            elif node_ids or batch.connection_nodes:
+                self.connection_renderer.draw_connections_for(
+                    self.app.nodes, node_ids | batch.connection_nodes, get_graph_index(self.app)
+                )
+            
+            if batch.all_selection:
+                self._draw_selection_visuals()
+            elif node_ids or batch.selection_nodes:
+                self._draw_selection_visuals(node_ids | batch.selection_nodes)
+        
+        if batch.properties:
+            self.app.properties_panel.update_properties_panel()
+
+    def _redraw_progressively(self):
+        """Draws a lazily loaded project, visible nodes first, the rest in batches.
+
+        Nodes are only built when their batch is drawn, so the editor becomes
+        usable before every node has been materialized.
+        """
+        self.draw_placeholder_if_empty()
+        
+        visible = self.nodes_in_rect(self.visible_rect())
+        shown_first = set(visible)
+        node_ids = visible + [node_id for node_id in self.app.nodes if node_id not in shown_first]
+        self._draw_node_batch(node_ids, self._redraw_generation)
+
+    def _draw_node_batch(self, node_ids, generation):
+        """Draws one batch of nodes and schedules the next."""
+        if generation != self._redraw_generation:
+            return
+        
+        batch = [node_id for node_id in node_ids[:PROGRESSIVE_DRAW_BATCH] if node_id in self.app.nodes]
+        viewport = self.visible_rect()
+        for node_id in batch:
+            self.create_node_visual(self.app.nodes[node_id], viewport)
+        self.connection_renderer.draw_connections_for(self.app.nodes, batch, get_graph_index(self.app))
+        self._draw_selection_visuals([node_id for node_id in batch if node_id in self.rendered_nodes])
+        
+        remaining = node_ids[PROGRESSIVE_DRAW_BATCH:]
+        if remaining:
+            self.app.after(1, self._draw_node_batch, remaining, generation)
+        elif self.show_node_groups:
+            self._draw_node_groups()
+            self._lower_group_visuals()
 
     def redraw_node(self, node_id):
-        """Redraws a single node, which is more efficient than redrawing everything."""
+        """Redraws a single node, which is more efficient than redrawing everything.
+
+        The node, its connections and its selection highlight are redrawn
+        once pending events have been handled, so repeated requests cost one redraw.
+        """
+        self.redraw_scheduler.request_nodes([node_id])
+
+    def _redraw_node_now(self, node_id):
         node = self.app.nodes.get(node_id)
         if not node:
             return
@@ -100,42 +245,360 @@ class CanvasManager:
         
         # Recreate visual elements
         self.create_node_visual(node)
-        self.update_selection_visuals()
-        self.draw_connections()
 
-    def create_node_visual(self, node):
-        """Creates all the visual components for a single node on the canvas."""
-        if self.use_enhanced_rendering:
+    def refresh_nodes(self, added=(), removed=(), changed=(), previous_selection=()):
+        """Redraws only the given nodes and their incident connections.
+
+        Used after undo/redo, where node objects are replaced but most of the
+        graph is untouched. Falls back to a full redraw when most nodes changed.
+        """
+        affected = set(added) | set(removed) | set(changed)
+        if len(affected) * 2 > max(len(self.app.nodes), 1):
+            self.redraw_all_nodes()
+            return
+
+        # Node items are tagged with the node ID, including untracked indicators
+        for node_id in set(removed) | set(changed):
+            self.canvas.delete(node_id)
+            self.rendered_nodes.pop(node_id, None)
+        for node_id in removed:
+            self.enhanced_node_renderer.node_states.pop(node_id, None)
+            if node_id not in self.app.nodes:
+                self.spatial_index.remove(node_id)
+
+        for node_id in set(added) | set(changed):
+            node = self.app.nodes.get(node_id)
+            if node:
+                node.canvas_item_ids.clear()
+                self.create_node_visual(node)
+
+        if affected:
+            if self.show_node_groups:
+                self._draw_node_groups()
+                self._lower_group_visuals()
+            self.connection_renderer.draw_connections_for(self.app.nodes, affected, get_graph_index(self.app))
+
+        selection_changed = set(previous_selection) ^ set(self.app.selected_node_ids)
+        self._draw_selection_visuals(affected | selection_changed)
+
+        if removed or added:
+            self.draw_placeholder_if_empty()
+
+    def _lower_group_visuals(self):
+        """Keeps redrawn group backgrounds behind the nodes."""
+        if not self.app.nodes:
+            return
+        try:
+            self.canvas.tag_lower("group_background", "node")
+            self.canvas.tag_lower("group_label", "node")
+        except tk.TclError:
+            pass
+
+    def show_validation_issues(self, changed_issues):
+        """Outlines nodes with validation errors or warnings.
+
+        Receives {node_id: issues} for the nodes whose issues changed. The
+        outline has its own state, so condition highlights do not erase it.
+        """
+        if not self.use_enhanced_rendering:
+            return
+        renderer = self.enhanced_node_renderer
+        for node_id, issues in changed_issues.items():
+            severities = {issue.severity for issue in issues}
+            color = COLOR_ERROR if "error" in severities else COLOR_WARNING if severities else ""
+            renderer.get_node_state(node_id).validation_color = color
+            
+            # Nodes without canvas items get the outline when they are drawn;
+            # looking them up would build lazily loaded nodes
+            if node_id not in self.rendered_nodes:
+                continue
+            node = self.app.nodes.get(node_id)
+            if node is None:
+                continue
+            
+            if 'border' in node.canvas_item_ids or 'placeholder' in node.canvas_item_ids or not color:
+                renderer.refresh_outline(node)
+            else:
+                # The theme draws no border for this node, so rebuild it with one
+                self.canvas.delete(node_id)
+                node.canvas_item_ids.clear()
+                self.create_node_visual(node)
+
+    def create_node_visual(self, node, viewport=None):
+        """Creates all the visual components for a single node on the canvas.
+
+        With culling enabled, nodes away from the visible area get no canvas
+        items until they are scrolled into view, and when zoomed out below
+        LOD_ZOOM_THRESHOLD nodes are drawn as plain placeholder rectangles.
+        Pass the visible_rect() when drawing many nodes at once.
+        """
+        self.spatial_index.update_node(node)
+        if not self.culling_enabled:
+            self._render_node(node, RENDER_FULL)
+            return
+        if viewport is None:
+            viewport = self.visible_rect()
+        if intersects(self.spatial_index.rect(node.id), viewport):
+            self._render_node(node, self.view.render_mode())
+        elif node.id in self.rendered_nodes:
+            self._release_node_visual(node)
+
+    def _render_node(self, node, mode):
+        """Replaces the canvas items of a node with a full or placeholder visual."""
+        if node.id in self.rendered_nodes or node.canvas_item_ids:
+            self._release_node_visual(node)
+        
+        if mode == RENDER_PLACEHOLDER:
+            item_id = self._placeholder_pool.pop() if self._placeholder_pool else None
+            self.enhanced_node_renderer.create_placeholder_visual(node, item_id)
+        elif self.use_enhanced_rendering:
             self.enhanced_node_renderer.create_node_visual(node)
         else:
             self.node_renderer.create_node_visual(node)
+        
+        self.view.apply(self.canvas, node.id)
+        if mode == RENDER_FULL and self.view.scale < DETAIL_ZOOM_THRESHOLD and 'dialogue_text' in node.canvas_item_ids:
+            self.canvas.itemconfig(node.canvas_item_ids['dialogue_text'], state='hidden')
+        self.rendered_nodes[node.id] = mode
+        # Drawing measures the dialogue text, which sets the node height
+        self.spatial_index.update_node(node)
+
+    def _release_node_visual(self, node):
+        """Removes the canvas items of a node, keeping its placeholder for reuse."""
+        self.rendered_nodes.pop(node.id, None)
+        placeholder = node.canvas_item_ids.get('placeholder')
+        if placeholder is not None and len(self._placeholder_pool) < MAX_PLACEHOLDER_POOL:
+            self.canvas.itemconfig(placeholder, tags=("placeholder_pool",), state="hidden")
+            self._placeholder_pool.append(placeholder)
+        self.canvas.delete(node.id)
+        node.canvas_item_ids.clear()
 
-    def update_selection_visuals(self):
-        """Updates the highlight state of all nodes based on the current selection."""
+    def visible_rect(self):
+        """Returns the area, in node coordinates, in which nodes are rendered."""
+        return self.view.visible_rect(self.canvas)
+
+    def nodes_in_rect(self, rect, enclosed=False):
+        """Returns the IDs of nodes overlapping an area given in node coordinates.
+
+        With enclosed=True only nodes lying completely inside the area are
+        returned. Nodes of a lazily loaded project that have not been built
+        yet are not built by this.
+        """
+        nodes = self.app.nodes
+        return [node_id for node_id in self.spatial_index.query(rect, enclosed) if node_id in nodes]
+
+    def node_at(self, canvas_x, canvas_y):
+        """Returns the ID of the node shown at a point in canvas coordinates, or None."""
+        node_id = self.spatial_index.at_point(*self.view.to_model(canvas_x, canvas_y))
+        return node_id if node_id in self.app.nodes else None
+
+    def schedule_viewport_update(self):
+        """Updates the rendered nodes once pending events have been handled."""
+        if self.culling_enabled and self._viewport_update_pending is None:
+            self._viewport_update_pending = self.app.after_idle(self.update_viewport)
+
+    def update_viewport(self):
+        """Renders nodes that came into view and releases those that left it.
+
+        Called after panning, zooming and resizing. Nodes that are already
+        drawn in the right level of detail are left alone.
+        """
+        self._viewport_update_pending = None
+        if not self.culling_enabled:
+            return
+        
+        mode = self.view.render_mode()
+        visible = set(self.nodes_in_rect(self.visible_rect()))
+        
+        for node_id in [node_id for node_id in self.rendered_nodes if node_id not in visible]:
+            if node_id in self.app.nodes:
+                self._release_node_visual(self.app.nodes[node_id])
+            else:
+                self.rendered_nodes.pop(node_id, None)
+        
+        shown = [node_id for node_id in visible if self.rendered_nodes.get(node_id) != mode]
+        resized = []
+        for node_id in shown:
+            node = self.app.nodes[node_id]
+            text_height = node.calculated_text_height
+            self._render_node(node, mode)
+            if node.calculated_text_height != text_height:
+                resized.append(node_id)
+        
+        # Connection points depend on the text height measured when a node is drawn
+        if resized:
+            self.connection_renderer.draw_connections_for(self.app.nodes, resized, get_graph_index(self.app))
+        if shown:
+            self._draw_selection_visuals(shown)
+
+    def zoom(self, factor, center_x, center_y):
+        """Scales the view by factor around a point in canvas coordinates."""
+        self.canvas.scale("all", center_x, center_y, factor, factor)
+        self.view.zoom(factor, center_x, center_y)
+        self.canvas.zoom_level = self.view.scale
+        self.schedule_viewport_update()
+
+    def update_selection_visuals(self, node_ids=None):
+        """Updates the highlight state of nodes based on the current selection.
+
+        Pass node_ids to update only those nodes instead of every node. The
+        update happens once pending events have been handled.
+        """
+        self.redraw_scheduler.request_selection(node_ids)
+
+    def _draw_selection_visuals(self, node_ids=None):
+        placeholders = [node_id for node_id, mode in self.rendered_nodes.items()
+                        if mode == RENDER_PLACEHOLDER and (node_ids is None or node_id in node_ids)]
+        for node_id in placeholders:
+            self.enhanced_node_renderer.get_node_state(node_id).is_selected = node_id in self.app.selected_node_ids
+            self.enhanced_node_renderer.refresh_placeholder(self.app.nodes[node_id])
+        
         if self.use_enhanced_rendering:
             # Update selection state for enhanced renderer
-            for node_id, node in self.app.nodes.items():
+            if node_ids is None:
+                node_ids = self.app.nodes.keys()
+            for node_id in node_ids:
+                if node_id not in self.app.nodes:
+                    continue
                 is_selected = node_id in self.app.selected_node_ids
                 self.enhanced_node_renderer.update_node_state(node_id, is_selected=is_selected)
         else:
             self.node_renderer.update_selection_visuals(self.app.nodes, self.app.selected_node_ids)
 
-    def draw_connections(self):
-        """Draws all the connection arrows between nodes."""
-        self.connection_renderer.draw_connections(self.app.nodes)
+    def draw_connections(self, node_ids=None):
+        """Draws all the connection arrows between nodes, or only those of node_ids.
+
+        The connections are drawn once pending events have been handled.
+        """
+        self.redraw_scheduler.request_connections(node_ids)
+
+    def schedule_connection_update(self, node_ids):
+        """Moves the connections of moved nodes, at most once per display frame.
+
+        Mouse motion events arrive faster than the screen refreshes, so the
+        nodes moved in the meantime are collected and their connections
+        updated together.
+        """
+        self._connection_update_nodes.update(node_ids)
+        if self._connection_update_pending is None:
+            self._connection_update_pending = self.app.after(
+                CONNECTION_UPDATE_INTERVAL, self.flush_connection_updates
+            )
+
+    def flush_connection_updates(self):
+        """Moves the connections of nodes passed to schedule_connection_update() now."""
+        if self._connection_update_pending is not None:
+            self.app.after_cancel(self._connection_update_pending)
+            self._connection_update_pending = None
+        node_ids, self._connection_update_nodes = self._connection_update_nodes, set()
+        if node_ids:
+            self.connection_renderer.update_connections_for(self.app.nodes, node_ids)
     
+    def move_nodes(self, positions):
+        """Moves nodes to {node_id: (x, y)} positions along with their canvas items and connections.
+
+        Returns the IDs of the nodes that moved. Nodes moved into or out of
+        view are rendered or released once pending events have been handled.
+        """
+        scale = self.view.scale
+        moved = []
+        for node_id, (x, y) in positions.items():
+            node = self.app.nodes.get(node_id)
+            if node is None or (node.x, node.y) == (x, y):
+                continue
+            move_dx, move_dy = x - node.x, y - node.y
+            for item_id in node.canvas_item_ids.values():
+                if self.canvas.find_withtag(item_id):
+                    self.canvas.move(item_id, move_dx * scale, move_dy * scale)
+            node.x, node.y = x, y
+            self.spatial_index.update_node(node)
+            moved.append(node_id)
+        
+        if moved:
+            self.connection_renderer.update_connections_for(self.app.nodes, moved)
+            self.schedule_viewport_update()
+        return moved
+
+    def auto_layout(self, algorithm=LAYERED, node_ids=None):
+        """Arranges all nodes, or only node_ids, on a background thread.
+
+        Intermediate positions of force-directed layouts are shown as they
+        arrive; the final positions are saved as one undoable step. A layout
+        that is still running is cancelled first. Returns the AutoLayoutJob,
+        or None when there is nothing to arrange.
+        """
+        self.cancel_auto_layout()
+        graph = LayoutGraph.from_nodes(
+            self.app.nodes, get_graph_index(self.app), node_ids,
+            include_neighbors=node_ids is not None and algorithm == FORCE_DIRECTED
+        )
+        if len(graph) == len(graph.fixed):
+            return None
+        
+        self._layout_nodes = self.app.nodes
+        self._layout_updates = queue.Queue()
+        self._layout_job = AutoLayoutJob(graph, algorithm, on_progress=self._layout_updates.put).start()
+        self.app.after(LAYOUT_POLL_INTERVAL, self._poll_auto_layout, self._layout_job)
+        return self._layout_job
+
+    def cancel_auto_layout(self):
+        """Stops a running auto-layout and moves its nodes back to where they started."""
+        job, self._layout_job = self._layout_job, None
+        if job is None:
+            return
+        job.cancel()
+        if self.app.nodes is self._layout_nodes:
+            self.move_nodes(job.graph.to_positions(job.graph.positions))
+
+    @property
+    def auto_layout_running(self):
+        return self._layout_job is not None
+
+    def _poll_auto_layout(self, job):
+        """Shows the latest streamed positions of a layout, or applies its result once done."""
+        if job is not self._layout_job:
+            return
+        if self.app.nodes is not self._layout_nodes:
+            # Another project was opened meanwhile
+            job.cancel()
+            self._layout_job = None
+            return
+        
+        # Only the most recent intermediate positions are worth drawing
+        positions = None
+        while True:
+            try:
+                positions = self._layout_updates.get_nowait()
+            except queue.Empty:
+                break
+        
+        if job.running:
+            if positions:
+                self.move_nodes(positions)
+            self.app.after(LAYOUT_POLL_INTERVAL, self._poll_auto_layout, job)
+            return
+        
+        self._layout_job = None
+        if job.error is not None:
+            self.move_nodes(job.graph.to_positions(job.graph.positions))
+            messagebox.showerror("Auto Layout", f"Could not arrange the nodes:\n{job.error}")
+            return
+        if job.result and self.move_nodes(job.result):
+            if self.show_node_groups:
+                self._draw_node_groups()
+                self._lower_group_visuals()
+            self.app._save_state_for_undo("Auto Layout")
+
     def _draw_node_groups(self):
         """Draw visual backgrounds for node groups."""
-        # Get node positions for group bounds calculation
-        node_positions = {}
-        for node_id, node in self.app.nodes.items():
-            node_positions[node_id] = (node.x, node.y)
-        
         # Auto-create chapter groups if they don't exist
         group_manager.auto_create_chapter_groups(self.app.nodes)
         
-        # Draw group backgrounds
-        group_manager.draw_group_backgrounds(node_positions)
+        # Draw group backgrounds around the areas the nodes cover
+        group_manager.draw_group_backgrounds(spatial_index=self.spatial_index)
+        for item_ids in group_manager.group_visuals.values():
+            for item_id in item_ids:
+                self.view.apply(self.canvas, item_id)
     
     def toggle_enhanced_rendering(self):
         """Toggle between enhanced and basic node rendering."""
@@ -269,17 +732,9 @@ class CanvasManager:
 
     def _clean_up_node_references(self, node_id):
         """Removes references to a node from all other nodes."""
-        for node in self.app.nodes.values():
-            # Clean up regular dialogue options
-            for option in getattr(node, 'options', []):
-                if option.get('nextNode') == node_id:
-                    option['nextNode'] = ""
-            
-            # Clean up special node types
-            if hasattr(node, 'success_node') and node.success_node == node_id:
-                node.success_node = ""
-            if hasattr(node, 'failure_node') and node.failure_node == node_id:
-                node.failure_node = ""
+        for source_id in get_graph_index(self.app).predecessors(node_id):
+            if source_id in self.app.nodes:
+                remove_links_to(self.app.nodes[source_id], node_id)
 
     def _remove_node_visual(self, node_id):
         """Removes the visual elements of a node from the canvas."""
@@ -288,6 +743,8 @@ class CanvasManager:
             for item_id in node_to_delete.canvas_item_ids.values():
                 if self.canvas.find_withtag(item_id):
                     self.canvas.delete(item_id)
+        self.rendered_nodes.pop(node_id, None)
+        self.spatial_index.remove(node_id)
 
     def pan_to_node(self, node_id):
         """Pans the main canvas to center on a specific node."""
@@ -301,11 +758,13 @@ class CanvasManager:
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
         
-        target_x = x - canvas_width / 2 + NODE_WIDTH / 2
-        target_y = y - canvas_height / 2 + node.get_height() / 2
+        center_x, center_y = self.view.to_canvas(x + NODE_WIDTH / 2, y + node.get_height() / 2)
+        target_x = center_x - canvas_width / 2
+        target_y = center_y - canvas_height / 2
         
         self.canvas.xview_moveto(target_x / 10000)
         self.canvas.yview_moveto(target_y / 10000)
+        self.schedule_viewport_update()
 
     def zoom_to_fit(self):
         """Zooms the canvas to fit all nodes."""
@@ -313,10 +772,10 @@ class CanvasManager:
             return
         
         # Find bounds of all nodes
-        min_x = min(node.x for node in self.app.nodes.values())
-        max_x = max(node.x + NODE_WIDTH for node in self.app.nodes.values())
-        min_y = min(node.y for node in self.app.nodes.values())
-        max_y = max(node.y + node.get_height() for node in self.app.nodes.values())
+        bounds = self.spatial_index.bounds()
+        if bounds is None:
+            return
+        min_x, min_y, max_x, max_y = bounds
         
         # Add padding
         padding = 100
@@ -342,7 +801,7 @@ class CanvasManager:
             center_y = (min_y + max_y) / 2
             
             # Scale all elements
-            self.canvas.scale("all", center_x, center_y, scale, scale)
+            self.zoom(scale, *self.view.to_canvas(center_x, center_y))
 
     def center_view(self):
         """Centers the canvas view on all nodes."""
@@ -350,14 +809,18 @@ class CanvasManager:
             return
         
         # Find center of all nodes
-        center_x = sum(node.x + NODE_WIDTH/2 for node in self.app.nodes.values()) / len(self.app.nodes)
-        center_y = sum(node.y + node.get_height()/2 for node in self.app.nodes.values()) / len(self.app.nodes)
+        center = self.spatial_index.mean_center()
+        if center is None:
+            return
+        center_x, center_y = center
         
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
         
+        center_x, center_y = self.view.to_canvas(center_x, center_y)
         target_x = center_x - canvas_width / 2
         target_y = center_y - canvas_height / 2
         
         self.canvas.xview_moveto(target_x / 10000)
-        self.canvas.yview_moveto(target_y / 10000)
\ No newline at end of file
+        self.canvas.yview_moveto(target_y / 10000)
+        self.schedule_viewport_update()
\ No newline at end of file
@@ -3,153 +3,201 @@ from ...constants import *
 from ...models import DiceRollNode, CombatNode, ShopNode, RandomEventNode, TimerNode, InventoryNode
 
 
+END_GAME = "[End Game]"
+
+
 class ConnectionRenderer:
-    """Handles rendering of connections between nodes."""
+    """Handles rendering of connections between nodes.
     
-    def __init__(self, canvas):
+    The canvas items of every drawn link are tracked per edge, keyed by
+    (source ID, option index), so moving nodes only needs the coordinates
+    of their own edges updated; see update_connections_for().
+    """
+    
+    def __init__(self, canvas, view=None):
         self.canvas = canvas
+        self.view = view  # ViewTransform from node to canvas coordinates, if zoomable
+        self._edges = {}      # (source_id, option_index) -> (target_id, canvas item IDs)
+        self._outgoing = {}   # source_id -> {edge key}
+        self._incoming = {}   # target_id -> {edge key}
     
     def draw_connections(self, nodes):
         """Draws all the connection arrows between nodes."""
         self.canvas.delete("connection")
+        self.clear()
         
         for node in nodes.values():
-            if isinstance(node, DiceRollNode):
-                self._draw_dice_roll_connections(node, nodes)
-            elif isinstance(node, CombatNode):
-                self._draw_combat_connections(node, nodes)
-            elif isinstance(node, ShopNode):
-                self._draw_shop_connections(node, nodes)
-            elif isinstance(node, RandomEventNode):
-                self._draw_random_event_connections(node, nodes)
-            elif isinstance(node, TimerNode):
-                self._draw_timer_connections(node, nodes)
-            elif isinstance(node, InventoryNode):
-                self._draw_inventory_connections(node, nodes)
-            elif hasattr(node, 'options'):
-                self._draw_dialogue_connections(node, nodes)
+            self._draw_links(node, nodes)
         
         # Ensure nodes are drawn on top of connections
         self.canvas.tag_raise("node")
 
-    def _draw_dice_roll_connections(self, node, nodes):
-        """Draws connections for dice roll nodes."""
-        if node.success_node and node.success_node in nodes:
-            self.draw_arrow(
-                node, nodes[node.success_node], 0, COLOR_SUCCESS
-            )
-        elif node.success_node == "[End Game]":
-            self._draw_end_game_indicator(node, 0, COLOR_SUCCESS)
+    def draw_connections_for(self, nodes, node_ids, graph_index):
+        """Redraws only the connections leaving or entering the given nodes.
+
+        graph_index is the GraphIndex synced with nodes; its predecessors
+        are the only other nodes whose links are redrawn.
+        """
+        node_ids = set(node_ids)
+        for node_id in node_ids:
+            for key in self._incident_edges(node_id):
+                self._forget_edge(key)
+            self.canvas.delete(f"conn_from_{node_id}")
+            self.canvas.delete(f"conn_to_{node_id}")
         
-        if node.failure_node and node.failure_node in nodes:
-            self.draw_arrow(
-                node, nodes[node.failure_node], 1, COLOR_ERROR
-            )
-        elif node.failure_node == "[End Game]":
-            self._draw_end_game_indicator(node, 1, COLOR_ERROR)
-
-    def _draw_combat_connections(self, node, nodes):
-        """Draws connections for combat nodes."""
-        if node.successNode and node.successNode in nodes:
-            self.draw_arrow(
-                node, nodes[node.successNode], 0, COLOR_SUCCESS
-            )
-        elif node.successNode == "[End Game]":
-            self._draw_end_game_indicator(node, 0, COLOR_SUCCESS)
+        for node_id in node_ids:
+            if node_id in nodes:
+                self._draw_links(nodes[node_id], nodes)
         
-        if node.failNode and node.failNode in nodes:
-            self.draw_arrow(
-                node, nodes[node.failNode], 1, COLOR_ERROR
-            )
-        elif node.failNode == "[End Game]":
-            self._draw_end_game_indicator(node, 1, COLOR_ERROR)
-
-    def _draw_shop_connections(self, node, nodes):
-        """Draws connections for shop nodes."""
-        if node.continue_node and node.continue_node in nodes:
-            self.draw_arrow(
-                node, nodes[node.continue_node], 0, COLOR_ACCENT
-            )
-        elif node.continue_node == "[End Game]":
-            self._draw_end_game_indicator(node, 0, COLOR_ACCENT)
-
-    def _draw_random_event_connections(self, node, nodes):
-        """Draws connections for random event nodes."""
-        for i, outcome in enumerate(node.random_outcomes):
-            next_node = outcome.get('next_node')
-            if next_node and next_node in nodes:
-                self.draw_arrow(
-                    node, nodes[next_node], i, COLOR_WARNING
-                )
-            elif next_node == "[End Game]":
-                self._draw_end_game_indicator(node, i, COLOR_WARNING)
-
-    def _draw_timer_connections(self, node, nodes):
-        """Draws connections for timer nodes."""
-        if node.next_node and node.next_node in nodes:
-            self.draw_arrow(
-                node, nodes[node.next_node], 0, COLOR_ACCENT
-            )
-        elif node.next_node == "[End Game]":
-            self._draw_end_game_indicator(node, 0, COLOR_ACCENT)
-
-    def _draw_inventory_connections(self, node, nodes):
-        """Draws connections for inventory nodes."""
-        if node.continue_node and node.continue_node in nodes:
-            self.draw_arrow(
-                node, nodes[node.continue_node], 0, COLOR_ACCENT
-            )
-        elif node.continue_node == "[End Game]":
-            self._draw_end_game_indicator(node, 0, COLOR_ACCENT)
-
-    def _draw_dialogue_connections(self, node, nodes):
-        """Draws connections for dialogue nodes."""
-        for i, option in enumerate(node.options):
-            target_id = option.get("nextNode")
+        # Incoming edges only; the other edges of these nodes are untouched.
+        # Nodes not built yet draw their own edges once they are rendered.
+        sources = set()
+        for node_id in node_ids:
+            sources.update(graph_index.predecessors(node_id))
+        peek_raw = getattr(nodes, 'peek_raw', None)
+        for source_id in sources - node_ids:
+            if source_id in nodes and not (peek_raw and peek_raw(source_id) is not None):
+                self._draw_links(nodes[source_id], nodes, only_targets=node_ids)
+        
+        self.canvas.tag_raise("node")
+
+    def clear(self):
+        """Forgets the tracked connection items, e.g. after the canvas was cleared."""
+        self._edges.clear()
+        self._outgoing.clear()
+        self._incoming.clear()
+
+    def update_connections_for(self, nodes, node_ids):
+        """Moves the drawn connections of the given nodes to their current positions.
+
+        Only the coordinates of existing items change, which makes this cheap
+        enough to call while nodes are dragged. Links that were added or
+        removed still need draw_connections_for().
+        """
+        keys = set()
+        for node_id in node_ids:
+            keys.update(self._incident_edges(node_id))
+        
+        for key in keys:
+            source_id, option_index = key
+            target_id, item_ids = self._edges[key]
+            source = nodes.get(source_id)
+            if source is None:
+                continue
+            if target_id == END_GAME:
+                line_coords, text_position = self._end_game_coords(source, option_index)
+                self.canvas.coords(item_ids[0], *line_coords)
+                self.canvas.coords(item_ids[1], *text_position)
+            elif target_id in nodes:
+                self.canvas.coords(item_ids[0], *self._arrow_coords(source, nodes[target_id], option_index))
+
+    def _incident_edges(self, node_id):
+        return self._outgoing.get(node_id, set()) | self._incoming.get(node_id, set())
+
+    def _track_edge(self, source_id, option_index, target_id, item_ids):
+        key = (source_id, option_index)
+        if key in self._edges:
+            # Drawn again without being cleared first; drop the old items
+            for item_id in self._edges[key][1]:
+                self.canvas.delete(item_id)
+            self._forget_edge(key)
+        self._edges[key] = (target_id, item_ids)
+        self._outgoing.setdefault(source_id, set()).add(key)
+        self._incoming.setdefault(target_id, set()).add(key)
+
+    def _forget_edge(self, key):
+        edge = self._edges.pop(key, None)
+        if edge is None:
+            return
+        for node_id, edges in ((key[0], self._outgoing), (edge[0], self._incoming)):
+            keys = edges.get(node_id)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del edges[node_id]
+
+    def get_links(self, node):
+        """Returns (option index, target ID, color) for each outgoing link of a node."""
+        if isinstance(node, DiceRollNode):
+            return [(0, node.success_node, COLOR_SUCCESS), (1, node.failure_node, COLOR_ERROR)]
+        elif isinstance(node, CombatNode):
+            return [(0, node.successNode, COLOR_SUCCESS), (1, node.failNode, COLOR_ERROR)]
+        elif isinstance(node, (ShopNode, InventoryNode)):
+            return [(0, node.continue_node, COLOR_ACCENT)]
+        elif isinstance(node, RandomEventNode):
+            return [(i, outcome.get('next_node'), COLOR_WARNING)
+                    for i, outcome in enumerate(node.random_outcomes)]
+        elif isinstance(node, TimerNode):
+            return [(0, node.next_node, COLOR_ACCENT)]
+        elif hasattr(node, 'options'):
+            return [(i, option.get("nextNode"), NODE_CONNECTION_COLOR)
+                    for i, option in enumerate(node.options)]
+        return []
+
+    def _draw_links(self, node, nodes, only_targets=None):
+        """Draws the outgoing links of a node, optionally only those into some targets."""
+        for i, target_id, color in self.get_links(node):
+            if only_targets is not None and target_id not in only_targets:
+                continue
             if target_id and target_id in nodes:
-                self.draw_arrow(
-                    node, nodes[target_id], i, NODE_CONNECTION_COLOR
-                )
-            elif target_id == "[End Game]":
-                self._draw_end_game_indicator(node, i, NODE_CONNECTION_COLOR)
+                self.draw_arrow(node, nodes[target_id], i, color)
+            elif target_id == END_GAME:
+                self._draw_end_game_indicator(node, i, color)
 
     def _draw_end_game_indicator(self, node, option_index, color):
         """Draws an indicator for [End Game] connections."""
-        x1, y1 = node.get_connection_point_out(option_index)
-        x2, y2 = x1 + 60, y1
+        line_coords, text_position = self._end_game_coords(node, option_index)
         
         # Draw short arrow to indicate end game
-        self.canvas.create_line(
-            x1, y1, x2, y2,
+        line_id = self.canvas.create_line(
+            *line_coords,
             arrow=tk.LAST, fill=color, width=2.5,
-            tags="connection"
+            tags=("connection", f"conn_from_{node.id}")
         )
         
         # Draw "END" text
-        self.canvas.create_text(
-            x2 + 10, y2, text="END", 
+        text_id = self.canvas.create_text(
+            *text_position, text="END", 
             fill=color, font=("Arial", 10, "bold"),
-            anchor="w", tags="connection"
+            anchor="w", tags=("connection", f"conn_from_{node.id}")
         )
+        self._track_edge(node.id, option_index, END_GAME, (line_id, text_id))
+
+    def _end_game_coords(self, node, option_index):
+        """Returns the line coordinates and text position of an [End Game] indicator."""
+        x1, y1 = self._to_canvas(*node.get_connection_point_out(option_index))
+        x2, y2 = x1 + 60 * self._scale(), y1
+        return (x1, y1, x2, y2), (x2 + 10 * self._scale(), y2)
 
     def draw_arrow(self, source, target, opt_idx, color):
         """Draws a single Bezier curve arrow between two points."""
-        x1, y1 = source.get_connection_point_out(opt_idx)
-        x2, y2 = target.get_connection_point_in()
-        
-        # Calculate control points for smooth curve
-        ctrlx1, ctrly1 = x1 + 70, y1
-        ctrlx2, ctrly2 = x2 - 70, y2
-        
         # Create the curved line with arrow
         line_id = self.canvas.create_line(
-            x1, y1, ctrlx1, ctrly1, ctrlx2, ctrly2, x2, y2, 
+            *self._arrow_coords(source, target, opt_idx), 
             smooth=True, arrow=tk.LAST, fill=color, width=2.5, 
-            tags="connection"
+            tags=("connection", f"conn_from_{source.id}", f"conn_to_{target.id}")
         )
         
         # Send connections to back
         self.canvas.tag_lower(line_id)
+        self._track_edge(source.id, opt_idx, target.id, (line_id,))
+
+    def _arrow_coords(self, source, target, opt_idx):
+        """Returns the points of the Bezier curve from an option of source to target."""
+        x1, y1 = self._to_canvas(*source.get_connection_point_out(opt_idx))
+        x2, y2 = self._to_canvas(*target.get_connection_point_in())
+        
+        # Calculate control points for smooth curve
+        bend = 70 * self._scale()
+        ctrlx1, ctrly1 = x1 + bend, y1
+        ctrlx2, ctrly2 = x2 - bend, y2
+        return x1, y1, ctrlx1, ctrly1, ctrlx2, ctrly2, x2, y2
+
+    def _to_canvas(self, x, y):
+        return self.view.to_canvas(x, y) if self.view else (x, y)
+
+    def _scale(self):
+        return self.view.scale if self.view else 1.0
 
     def draw_temporary_connection(self, start_pos, end_pos, color=COLOR_ACCENT):
         """Draws a temporary connection line during connection creation."""
@@ -52,6 +52,66 @@ class EnhancedNodeRenderer:
         # Apply visual effects
         self._apply_visual_effects(node, theme, state)
     
+    def create_placeholder_visual(self, node, item_id=None):
+        """Creates a plain rectangle standing in for a node at low zoom levels.
+        
+        Pass the ID of an unused placeholder item to reuse it instead of
+        creating a new one.
+        """
+        for existing_id in list(node.canvas_item_ids.values()):
+            if existing_id != item_id:
+                self.canvas.delete(existing_id)
+        node.canvas_item_ids.clear()
+        
+        theme = theme_manager.get_theme_for_node(node)
+        outline, width = self._placeholder_outline(theme, self.get_node_state(node.id))
+        coords = (node.x, node.y, node.x + NODE_WIDTH, node.y + node.get_height())
+        tags = ("node", node.id, "placeholder")
+        
+        if item_id is None:
+            item_id = self.canvas.create_rectangle(
+                *coords, fill=theme.header_color, outline=outline, width=width, tags=tags
+            )
+        else:
+            self.canvas.coords(item_id, *coords)
+            self.canvas.itemconfig(
+                item_id, fill=theme.header_color, outline=outline, width=width,
+                tags=tags, state="normal"
+            )
+        node.canvas_item_ids['placeholder'] = item_id
+    
+    def refresh_placeholder(self, node):
+        """Updates the outline of a node's placeholder to its visual state."""
+        item_id = node.canvas_item_ids.get('placeholder')
+        if item_id is None:
+            return
+        theme = theme_manager.get_theme_for_node(node)
+        outline, width = self._placeholder_outline(theme, self.get_node_state(node.id))
+        self.canvas.itemconfig(item_id, outline=outline, width=width)
+    
+    def _placeholder_outline(self, theme: NodeTheme, state: NodeVisualState):
+        """Returns the outline color and width of a placeholder."""
+        if state.is_selected:
+            return theme.selected_border_color, theme.selected_border_width
+        if state.is_highlighted and state.highlight_color:
+            return state.highlight_color, 2
+        if state.validation_color:
+            return state.validation_color, 2
+        return "", 0
+    
+    def _border_style(self, theme: NodeTheme, state: NodeVisualState):
+        """Returns the border color and width of a node.
+
+        Selection wins over highlights, and highlights over validation outlines.
+        """
+        if state.is_selected:
+            return theme.selected_border_color, theme.selected_border_width
+        if state.is_highlighted and state.highlight_color:
+            return state.highlight_color, max(theme.border_width, 2)
+        if state.validation_color:
+            return state.validation_color, max(theme.border_width, 2)
+        return theme.border_color, theme.border_width
+    
     def get_node_state(self, node_id: str) -> NodeVisualState:
         """Get or create visual state for a node."""
         if node_id not in self.node_states:
@@ -106,16 +166,7 @@ class EnhancedNodeRenderer:
     
     def _create_node_border(self, node, x, y, height, theme: NodeTheme, state: NodeVisualState, tags):
         """Create node border based on theme and state."""
-        border_color = theme.border_color
-        border_width = theme.border_width
-        
-        # Override for selection state
-        if state.is_selected:
-            border_color = theme.selected_border_color
-            border_width = theme.selected_border_width
-        elif state.is_highlighted and state.highlight_color:
-            border_color = state.highlight_color
-            border_width = max(border_width, 2)
+        border_color, border_width = self._border_style(theme, state)
         
         if border_width > 0 and border_color:
             node.canvas_item_ids['border'] = self._create_rounded_rectangle(
@@ -347,27 +398,25 @@ class EnhancedNodeRenderer:
         node = None
         try:
             if hasattr(self.canvas, 'master') and hasattr(self.canvas.master, 'app'):
-                for app_node in self.canvas.master.app.nodes.values():
-                    if app_node.id == node_id:
-                        node = app_node
-                        break
+                node = self.canvas.master.app.nodes.get(node_id)
         except (AttributeError, TypeError):
             # In test environment or different setup, skip the update
             return
         
-        if not node or 'border' not in node.canvas_item_ids:
+        if node:
+            self.refresh_outline(node)
+    
+    def refresh_outline(self, node):
+        """Updates the border or placeholder outline of a drawn node to its visual state."""
+        if 'placeholder' in node.canvas_item_ids:
+            self.refresh_placeholder(node)
+            return
+        if 'border' not in node.canvas_item_ids:
             return
-            
-        state = self.get_node_state(node_id)
-        theme = theme_manager.get_theme_for_node(node)
         
-        # Update border based on selection state
-        if state.is_selected:
-            border_color = theme.selected_border_color
-            border_width = theme.selected_border_width
-        else:
-            border_color = theme.border_color
-            border_width = theme.border_width
+        # Update border based on selection, highlight and validation state
+        theme = theme_manager.get_theme_for_node(node)
+        border_color, border_width = self._border_style(theme, self.get_node_state(node.id))
         
         # Update the border canvas item
         try:
@@ -4,6 +4,7 @@
 
 import tkinter as tk
 from ...constants import *
+from .viewport import DETAIL_ZOOM_THRESHOLD
 
 
 class InteractionHandler:
@@ -67,15 +68,8 @@ class InteractionHandler:
         self.context_menu.unpost()
         
         canvas_x, canvas_y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
-        item = self.canvas.find_closest(canvas_x, canvas_y)
-        tags = self.canvas.gettags(item[0]) if item else []
-        
-        # Find the node ID from tags
-        node_id = None
-        for tag in tags:
-            if tag in self.app.nodes:
-                node_id = tag
-                break
+        node_id = self.app.canvas_manager.node_at(canvas_x, canvas_y)
+        tags = self._node_item_tags_at(node_id, canvas_x, canvas_y) if node_id else ()
 
         # Check for handle click first (highest priority)
         if "handle" in tags and node_id:
@@ -87,6 +81,14 @@ class InteractionHandler:
         else:
             self._handle_empty_canvas_click(event, canvas_x, canvas_y)
 
+    def _node_item_tags_at(self, node_id, canvas_x, canvas_y):
+        """Returns the tags of the topmost item of a node at a point, e.g. to find handles."""
+        for item in reversed(self.canvas.find_overlapping(canvas_x, canvas_y, canvas_x, canvas_y)):
+            tags = self.canvas.gettags(item)
+            if node_id in tags:
+                return tags
+        return ()
+
     def _handle_connection_start(self, tags, node_id, canvas_x, canvas_y):
         """Handles starting a connection from an option handle."""
         # Find the option index from the tags
@@ -113,7 +115,7 @@ class InteractionHandler:
         self.connection_start_info = {'node_id': node_id, 'option_index': opt_index}
         
         # Get the connection start point
-        x1, y1 = node.get_connection_point_out(opt_index)
+        x1, y1 = self.app.canvas_manager.view.to_canvas(*node.get_connection_point_out(opt_index))
         self.temp_connection_line = self.canvas.create_line(
             x1, y1, canvas_x, canvas_y, fill=COLOR_ACCENT, 
             width=2.5, dash=(5, 5), tags="temp_connection"
@@ -124,7 +126,7 @@ class InteractionHandler:
         self.app.set_selection([node_id], node_id)
         if self.app.properties_panel.add_option_to_node(node_id):
             self.app.canvas_manager.redraw_node(node_id)
-            self.app.properties_panel.update_properties_panel()
+            self.app.canvas_manager.schedule_properties_update()
 
     def _handle_node_selection(self, node_id, event, canvas_x, canvas_y):
         """Handles node selection and drag preparation."""
@@ -177,7 +179,9 @@ class InteractionHandler:
         opt_index = self.connection_start_info['option_index']
         
         if node_id in self.app.nodes:
-            x1, y1 = self.app.nodes[node_id].get_connection_point_out(opt_index)
+            x1, y1 = self.app.canvas_manager.view.to_canvas(
+                *self.app.nodes[node_id].get_connection_point_out(opt_index)
+            )
             self.canvas.coords(self.temp_connection_line, x1, y1, canvas_x, canvas_y)
 
     def _update_selection_rectangle(self, canvas_x, canvas_y):
@@ -190,11 +194,14 @@ class InteractionHandler:
         if not self.is_dragging:
             self.is_dragging = True
         
+        # Mouse movement is in canvas coordinates, node positions are not when zoomed
+        scale = self.app.canvas_manager.view.scale
         mouse_start_x, mouse_start_y = self.drag_start_pos['mouse']
-        dx = canvas_x - mouse_start_x
-        dy = canvas_y - mouse_start_y
+        dx = (canvas_x - mouse_start_x) / scale
+        dy = (canvas_y - mouse_start_y) / scale
         
         # Update node positions and move visual elements
+        moved = []
         for node_id in self.app.selected_node_ids:
             if node_id not in self.app.nodes:
                 continue
@@ -209,12 +216,15 @@ class InteractionHandler:
                 # Move all visual elements for this node
                 for item_id in node.canvas_item_ids.values():
                     if self.canvas.find_withtag(item_id):
-                        self.canvas.move(item_id, move_dx, move_dy)
+                        self.canvas.move(item_id, move_dx * scale, move_dy * scale)
                 # Update node position in data model
                 node.x, node.y = new_x, new_y
+                self.app.canvas_manager.spatial_index.update_node(node)
+                moved.append(node_id)
         
-        # Redraw connections during drag to show live updates
-        self.app.canvas_manager.draw_connections()
+        # Move the connections of the dragged nodes to show live updates
+        if moved:
+            self.app.canvas_manager.schedule_connection_update(moved)
 
     def on_canvas_release(self, event):
         """Handles the release of the left mouse button."""
@@ -238,52 +248,38 @@ class InteractionHandler:
             self.canvas.delete(self.temp_connection_line)
         
         canvas_x, canvas_y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
-        target_item = self.canvas.find_closest(canvas_x, canvas_y)
+        target_node_id = self.app.canvas_manager.node_at(canvas_x, canvas_y)
         
-        if target_item:
-            target_tags = self.canvas.gettags(target_item[0])
-            
-            # Find target node ID from tags
-            target_node_id = None
-            for tag in target_tags:
-                if tag in self.app.nodes:
-                    target_node_id = tag
-                    break
+        if target_node_id and target_node_id != self.connection_start_info['node_id']:
+            self.app._save_state_for_undo("Create Connection")
+            source_node_id = self.connection_start_info['node_id']
+            opt_index = self.connection_start_info['option_index']
             
-            if target_node_id and target_node_id != self.connection_start_info['node_id']:
-                self.app._save_state_for_undo("Create Connection")
-                source_node_id = self.connection_start_info['node_id']
-                opt_index = self.connection_start_info['option_index']
+            # Ensure the source node and option still exist
+            source_node = self.app.nodes.get(source_node_id)
+            if (source_node and hasattr(source_node, 'options') and 
+                opt_index < len(source_node.options)):
+                source_node.options[opt_index]['nextNode'] = target_node_id
+                source_node.touch()
+                self.app.canvas_manager.draw_connections([source_node_id])
                 
-                # Ensure the source node and option still exist
-                source_node = self.app.nodes.get(source_node_id)
-                if (source_node and hasattr(source_node, 'options') and 
-                    opt_index < len(source_node.options)):
-                    source_node.options[opt_index]['nextNode'] = target_node_id
-                    self.app.canvas_manager.draw_connections()
-                    
-                    if self.app.active_node_id == source_node_id:
-                        self.app.properties_panel.update_properties_panel()
+                if self.app.active_node_id == source_node_id:
+                    self.app.canvas_manager.schedule_properties_update()
 
     def _handle_selection_completion(self):
         """Handles completion of rectangle selection."""
         if not self.selection_rectangle:
             return
             
-        bbox = self.canvas.bbox(self.selection_rectangle)
-        if bbox:
-            x1, y1, x2, y2 = bbox
-            enclosed_items = self.canvas.find_enclosed(x1, y1, x2, y2)
+        coords = self.canvas.coords(self.selection_rectangle)
+        if len(coords) == 4:
+            # Selects nodes the rectangle touches, including ones scrolled out of view
+            view = self.app.canvas_manager.view
+            area = (*view.to_model(coords[0], coords[1]), *view.to_model(coords[2], coords[3]))
             
             newly_selected_ids = self.app.selected_node_ids.copy()
-            for item in enclosed_items:
-                tags = self.canvas.gettags(item)
-                node_id = None
-                for tag in tags:
-                    if tag in self.app.nodes:
-                        node_id = tag
-                        break
-                if node_id and node_id not in newly_selected_ids:
+            for node_id in self.app.canvas_manager.nodes_in_rect(area):
+                if node_id not in newly_selected_ids:
                     newly_selected_ids.append(node_id)
             
             self.app.set_selection(newly_selected_ids)
@@ -292,6 +288,7 @@ class InteractionHandler:
 
     def _handle_drag_completion(self):
         """Handles completion of node dragging with grid snapping."""
+        scale = self.app.canvas_manager.view.scale
         for node_id in self.app.selected_node_ids:
             if node_id not in self.app.nodes:
                 continue
@@ -305,12 +302,15 @@ class InteractionHandler:
                 # Move visual elements to snapped position
                 for item_id in node.canvas_item_ids.values():
                     if self.canvas.find_withtag(item_id):
-                        self.canvas.move(item_id, move_dx, move_dy)
+                        self.canvas.move(item_id, move_dx * scale, move_dy * scale)
                 # Update node position to snapped coordinates
                 node.x, node.y = snapped_x, snapped_y
+                self.app.canvas_manager.spatial_index.update_node(node)
         
-        # Final redraw of connections with correct positions
-        self.app.canvas_manager.draw_connections()
+        # Final update of connections with correct positions
+        self.app.canvas_manager.schedule_connection_update(self.app.selected_node_ids)
+        self.app.canvas_manager.flush_connection_updates()
+        self.app.canvas_manager.schedule_viewport_update()
 
     def _reset_interaction_state(self):
         """Resets all interaction state variables."""
@@ -326,15 +326,7 @@ class InteractionHandler:
         self.right_click_pos = (self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
         
         canvas_x, canvas_y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
-        item = self.canvas.find_closest(canvas_x, canvas_y)
-        tags = self.canvas.gettags(item[0]) if item else []
-        
-        # Find node ID from tags
-        node_id = None
-        for tag in tags:
-            if tag in self.app.nodes:
-                node_id = tag
-                break
+        node_id = self.app.canvas_manager.node_at(canvas_x, canvas_y)
         
         is_node_selected = bool(self.app.selected_node_ids)
         self.context_menu.entryconfig(
@@ -376,6 +368,7 @@ class InteractionHandler:
     def on_pan_move(self, event):
         """Handles canvas panning movement."""
         self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.app.canvas_manager.schedule_viewport_update()
         
     def on_zoom(self, event):
         """Handles canvas zooming with mouse wheel and maintains text readability."""
@@ -394,11 +387,11 @@ class InteractionHandler:
         # Update zoom level
         self.canvas.zoom_level = new_zoom
         
-        # Standard scaling for most elements
-        self.canvas.scale("all", self.canvas.canvasx(event.x), self.canvas.canvasy(event.y), factor, factor)
+        # Standard scaling for most elements; also brings nodes in and out of view
+        self.app.canvas_manager.zoom(factor, self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
         
         # For very small zoom levels, trigger node text optimization
-        if new_zoom < 0.6:
+        if new_zoom < DETAIL_ZOOM_THRESHOLD:
             self._optimize_nodes_for_small_zoom()
         elif hasattr(self, '_zoom_optimized') and self._zoom_optimized:
             # Restore normal view when zooming back in
@@ -410,7 +403,7 @@ class InteractionHandler:
             return
             
         # Hide detailed text and show only essential info
-        for node in self.app.nodes.values():
+        for node in self._rendered_nodes():
             if 'dialogue_text' in node.canvas_item_ids:
                 # Hide dialogue text when zoomed out
                 self.canvas.itemconfig(node.canvas_item_ids['dialogue_text'], state='hidden')
@@ -419,9 +412,14 @@ class InteractionHandler:
     
     def _restore_normal_node_view(self):
         """Restores normal node view when zooming back in."""
-        for node in self.app.nodes.values():
+        for node in self._rendered_nodes():
             if 'dialogue_text' in node.canvas_item_ids:
                 # Show dialogue text when zoomed in
                 self.canvas.itemconfig(node.canvas_item_ids['dialogue_text'], state='normal')
                 
-        self._zoom_optimized = False
\ No newline at end of file
+        self._zoom_optimized = False
+
+    def _rendered_nodes(self):
+        """Returns the nodes that currently have canvas items."""
+        nodes = self.app.nodes
+        return [nodes[node_id] for node_id in self.app.canvas_manager.rendered_nodes if node_id in nodes]
@@ -57,11 +57,24 @@ class NodeGroup:
         """Check if this group contains a node."""
         return node_id in self.nodes
     
-    def get_bounds(self, node_positions: Dict[str, Tuple[float, float]]) -> Tuple[float, float, float, float]:
-        """Calculate the bounding box of all nodes in this group."""
+    def get_bounds(self, node_positions: Optional[Dict[str, Tuple[float, float]]] = None,
+                   spatial_index=None) -> Tuple[float, float, float, float]:
+        """Calculate the bounding box of all nodes in this group.
+        
+        With a spatial index of the nodes the areas the nodes actually cover
+        are used; otherwise node_positions maps node IDs to their positions.
+        """
         if not self.nodes:
             return 0, 0, 0, 0
         
+        if spatial_index is not None:
+            bounds = spatial_index.bounds(self.nodes)
+            if bounds is None:
+                return 0, 0, 0, 0
+            return (bounds[0] - self.padding, bounds[1] - self.padding,
+                    bounds[2] + self.padding, bounds[3] + self.padding)
+        
+        node_positions = node_positions or {}
         positions = [node_positions[node_id] for node_id in self.nodes if node_id in node_positions]
         if not positions:
             return 0, 0, 0, 0
@@ -260,7 +273,8 @@ class NodeGroupManager:
         ]
         return colors[(chapter_num - 1) % len(colors)]
     
-    def draw_group_backgrounds(self, node_positions: Dict[str, Tuple[float, float]]):
+    def draw_group_backgrounds(self, node_positions: Optional[Dict[str, Tuple[float, float]]] = None,
+                               spatial_index=None):
         """Draw background visuals for all groups."""
         if not self.canvas or not self.show_group_backgrounds:
             return
@@ -270,11 +284,12 @@ class NodeGroupManager:
         
         for group in sorted_groups:
             if group.show_background and group.nodes:
-                self._draw_group_background(group, node_positions)
+                self._draw_group_background(group, node_positions, spatial_index)
     
-    def _draw_group_background(self, group: NodeGroup, node_positions: Dict[str, Tuple[float, float]]):
+    def _draw_group_background(self, group: NodeGroup, node_positions: Optional[Dict[str, Tuple[float, float]]],
+                               spatial_index=None):
         """Draw background for a single group."""
-        bounds = group.get_bounds(node_positions)
+        bounds = group.get_bounds(node_positions, spatial_index)
         if bounds == (0, 0, 0, 0):
             return
         
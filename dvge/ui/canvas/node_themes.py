@@ -49,6 +49,7 @@ class NodeVisualState:
     is_disabled: bool = False
     is_highlighted: bool = False
     highlight_color: str = ""
+    validation_color: str = ""  # outline for validation issues, kept apart from highlights
     custom_properties: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -0,0 +1,77 @@
+# dvge/ui/canvas/viewport.py
+
+"""Viewport tracking for the node canvas.
+
+Zooming scales the canvas items in place, so after a zoom, canvas
+coordinates no longer equal node (model) coordinates. ViewTransform keeps
+track of the mapping so that items created later can be placed consistently
+and the visible area can be expressed in node coordinates for culling.
+"""
+
+# Canvas pixels around the visible area in which nodes are still rendered
+CULL_MARGIN = 300
+
+# Below this zoom level nodes are drawn as plain rectangles
+LOD_ZOOM_THRESHOLD = 0.5
+
+# Below this zoom level the dialogue text of nodes is hidden
+DETAIL_ZOOM_THRESHOLD = 0.6
+
+# How a node is currently drawn
+RENDER_FULL = "full"
+RENDER_PLACEHOLDER = "placeholder"
+
+
+class ViewTransform:
+    """Maps node coordinates to canvas coordinates: canvas = node * scale + offset."""
+
+    def __init__(self):
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+
+    @property
+    def is_identity(self):
+        return self.scale == 1.0 and self.offset_x == 0.0 and self.offset_y == 0.0
+
+    def zoom(self, factor, center_x, center_y):
+        """Records canvas.scale(..., center_x, center_y, factor, factor)."""
+        self.scale *= factor
+        self.offset_x = center_x + (self.offset_x - center_x) * factor
+        self.offset_y = center_y + (self.offset_y - center_y) * factor
+
+    def reset(self):
+        self.scale = 1.0
+        self.offset_x = self.offset_y = 0.0
+
+    def to_canvas(self, x, y):
+        return x * self.scale + self.offset_x, y * self.scale + self.offset_y
+
+    def to_model(self, x, y):
+        return (x - self.offset_x) / self.scale, (y - self.offset_y) / self.scale
+
+    def apply(self, canvas, tag_or_id):
+        """Moves items drawn at node coordinates to where the view shows them."""
+        if self.is_identity:
+            return
+        canvas.scale(tag_or_id, 0, 0, self.scale, self.scale)
+        canvas.move(tag_or_id, self.offset_x, self.offset_y)
+
+    def visible_rect(self, canvas, margin=CULL_MARGIN):
+        """Returns the (x1, y1, x2, y2) node-coordinate area shown by the canvas plus a margin."""
+        left = canvas.canvasx(0) - margin
+        top = canvas.canvasy(0) - margin
+        right = canvas.canvasx(canvas.winfo_width()) + margin
+        bottom = canvas.canvasy(canvas.winfo_height()) + margin
+        x1, y1 = self.to_model(left, top)
+        x2, y2 = self.to_model(right, bottom)
+        return x1, y1, x2, y2
+
+    def render_mode(self):
+        """Returns how nodes should be drawn at the current zoom level."""
+        return RENDER_PLACEHOLDER if self.scale < LOD_ZOOM_THRESHOLD else RENDER_FULL
+
+
+def intersects(rect, other):
+    """Returns True if two (x1, y1, x2, y2) rectangles overlap."""
+    return rect[0] <= other[2] and other[0] <= rect[2] and rect[1] <= other[3] and other[1] <= rect[3]
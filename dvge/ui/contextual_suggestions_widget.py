@@ -223,8 +223,8 @@ class ContextualSuggestionsWidget(ctk.CTkFrame):
                 node.game_data['text'] = enhanced_text
                 
                 # Refresh UI
-                self.app.properties_panel.update_properties_panel()
-                self.app.canvas_manager.redraw_all_nodes()
+                self.app.canvas_manager.schedule_properties_update()
+                self.app.canvas_manager.redraw_node(node_id)
                 
                 messagebox.showinfo("Enhancement Applied", "Dialogue has been enhanced!")
             else:
@@ -250,9 +250,11 @@ class ContextualSuggestionsWidget(ctk.CTkFrame):
                         'nextNode': '',
                         'conditions': []
                     })
+                node.touch()
                 
                 # Refresh UI
-                self.app.properties_panel.update_properties_panel()
+                self.app.canvas_manager.schedule_properties_update()
+                self.app.canvas_manager.redraw_node(node_id)
                 
                 messagebox.showinfo("Choices Added", f"Added {len(new_choices)} new choice options!")
             else:
@@ -1,10 +1,26 @@
 """Batch AI Operations Dialog for DVGE."""
 
 import customtkinter as ctk
+import tkinter as tk
 from tkinter import messagebox
 import threading
 from typing import Dict, Any, List, Set
-import time
+
+from ...ai.batch_executor import AIBatchExecutor
+from ...ai.enhanced_generators import get_node_game_data
+
+
+# Improvement requested for each dialogue operation
+IMPROVEMENT_TYPES = {
+    "Enhance Dialogue": "engaging, clear and emotionally impactful",
+    "Fix Grammar & Style": "grammatically correct and consistent in style",
+    "Add Emotional Subtext": "emotionally layered, with meaningful subtext",
+    "Generate Character Voice": "distinctive and true to the speaker's voice",
+    "Improve Flow & Pacing": "natural in flow and well paced",
+}
+
+# Choices a node should have after "Add Missing Choices"
+MIN_CHOICES = 2
 
 
 class BatchAIDialog(ctk.CTkToplevel):
@@ -16,6 +32,8 @@ class BatchAIDialog(ctk.CTkToplevel):
         self.selected_nodes = set()
         self.operation_results = []
         self.operation_in_progress = False
+        self.executor = None
+        self.operation_total = 0
         
         # Window configuration
         self.title("Batch AI Operations")
@@ -270,7 +288,7 @@ class BatchAIDialog(ctk.CTkToplevel):
         
         # Add nodes with dialogue text
         for node_id, node in self.app.nodes.items():
-            if hasattr(node, 'game_data') and node.game_data.get('text', '').strip():
+            if str(get_node_game_data(node).get('text') or '').strip():
                 self.add_node_checkbox(node_id, node)
         
         # Update selection count
@@ -294,7 +312,7 @@ class BatchAIDialog(ctk.CTkToplevel):
         checkbox.grid(row=0, column=0, padx=(5, 10), pady=5)
         
         # Node info
-        node_text = node.game_data.get('text', '')[:100]
+        node_text = str(get_node_game_data(node).get('text', ''))[:100]
         if len(node_text) == 100:
             node_text += "..."
         
@@ -325,7 +343,8 @@ class BatchAIDialog(ctk.CTkToplevel):
         self.selection_count_label.configure(text=f"{count} nodes selected")
         
         # Enable/disable run button
-        self.run_button.configure(state="normal" if count > 0 else "disabled")
+        if not self.operation_in_progress:
+            self.run_button.configure(state="normal" if count > 0 else "disabled")
     
     def select_all_nodes(self):
         """Select all nodes."""
@@ -392,9 +411,23 @@ class BatchAIDialog(ctk.CTkToplevel):
         if not response:
             return
         
+        if not hasattr(self.app, 'ai_service') or not self.app.ai_service:
+            messagebox.showerror("Operation Error", "AI service is not available")
+            return
+        
+        if not self.app.ai_service.is_enhanced_ai_available():
+            messagebox.showerror("Operation Error", "Enhanced AI features are not available")
+            return
+        
+        # Save state for undo
+        self.app.state_manager.save_state(f"Batch AI: {operation}")
+        
         # Start operation
         self.operation_in_progress = True
-        self.run_button.configure(text="⚡ Running...", state="disabled")
+        self.operation_results = []
+        self.operation_total = count
+        self.executor = AIBatchExecutor(self.app.ai_service)
+        self.run_button.configure(text="⏹ Cancel", command=self.cancel_batch_operation, state="normal")
         
         # Clear results
         self.results_text.configure(state="normal")
@@ -402,80 +435,99 @@ class BatchAIDialog(ctk.CTkToplevel):
         self.results_text.insert("1.0", f"Starting {operation} on {count} nodes...\n\n")
         self.results_text.configure(state="disabled")
         
-        # Run in background
+        # Run in background; results are applied as they arrive
+        nodes = {node_id: self.app.nodes[node_id] for node_id in self.selected_nodes if node_id in self.app.nodes}
+        executor = self.executor
+        
         def operation_worker():
             try:
-                self._run_batch_operation()
-                self.after(0, self._on_operation_complete)
+                self._run_batch_operation(operation, nodes, executor)
+                self._post(self._on_operation_complete)
             except Exception as e:
-                self.after(0, lambda: self._on_operation_error(str(e)))
+                self._post(lambda: self._on_operation_error(str(e)))
         
         thread = threading.Thread(target=operation_worker, daemon=True)
         thread.start()
     
-    def _run_batch_operation(self):
+    def cancel_batch_operation(self):
+        """Cancel the running batch operation; results already applied are kept."""
+        if self.executor:
+            self.executor.cancel()
+            self.run_button.configure(text="⏹ Cancelling...", state="disabled")
+    
+    def destroy(self):
+        """Cancel any running operation when the dialog is closed."""
+        if self.executor:
+            self.executor.cancel()
+        super().destroy()
+    
+    def _post(self, callback):
+        """Run a callback on the UI thread, unless the dialog is gone."""
+        try:
+            self.after(0, callback)
+        except (RuntimeError, tk.TclError):
+            pass
+    
+    def _run_batch_operation(self, operation: str, nodes: Dict[str, Any], executor: AIBatchExecutor):
         """Run the actual batch operation."""
-        if not hasattr(self.app, 'ai_service') or not self.app.ai_service:
-            raise Exception("AI service is not available")
-        
-        if not self.app.ai_service.is_enhanced_ai_available():
-            raise Exception("Enhanced AI features are not available")
-        
-        # Get batch operations system
-        batch_system = self.app.ai_service.enhanced_systems.batch_operations
+        batch_system = self.app.ai_service.enhanced_systems.get('batch_operations')
         if not batch_system:
             raise Exception("Batch operations system not available")
         
-        # Prepare operation parameters
-        operation_type = self.operation_var.get().lower().replace(" ", "_").replace("&", "and")
-        
-        # Save state for undo
-        self.app.state_manager.save_state(f"Batch AI: {self.operation_var.get()}")
-        
-        # Run batch operation
-        self.operation_results = []
-        total_nodes = len(self.selected_nodes)
-        
-        for i, node_id in enumerate(self.selected_nodes, 1):
-            if node_id in self.app.nodes:
-                node = self.app.nodes[node_id]
-                
-                # Update progress
-                progress_msg = f"Processing node {i}/{total_nodes}: {node_id}\n"
-                self.after(0, lambda msg=progress_msg: self._update_progress(msg))
-                
-                try:
-                    # Apply operation based on type
-                    result = self._apply_operation_to_node(batch_system, operation_type, node_id, node)
-                    self.operation_results.append(result)
-                    
-                    # Brief delay to prevent overwhelming the AI service
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    error_result = {
-                        'node_id': node_id,
-                        'success': False,
-                        'error': str(e)
-                    }
-                    self.operation_results.append(error_result)
+        def on_result(node_id, result, error):
+            self._post(lambda: self._on_node_result(operation, node_id, result, error))
+        
+        if operation == "Add Missing Choices":
+            batch_system.batch_generate_missing_choices(
+                nodes, MIN_CHOICES, on_result=on_result, executor=executor
+            )
+        elif operation in IMPROVEMENT_TYPES:
+            batch_system.batch_improve_dialogue(
+                nodes, IMPROVEMENT_TYPES[operation], on_result=on_result, executor=executor
+            )
+        else:
+            raise Exception(f"Unknown operation type: {operation}")
     
-    def _apply_operation_to_node(self, batch_system, operation_type: str, node_id: str, node: Any) -> Dict[str, Any]:
-        """Apply the operation to a single node."""
-        if operation_type == "enhance_dialogue":
-            return batch_system.enhance_dialogue_batch([node_id])[0]
-        elif operation_type == "fix_grammar_and_style":
-            return batch_system.fix_grammar_batch([node_id])[0]
-        elif operation_type == "add_emotional_subtext":
-            return batch_system.add_emotional_subtext_batch([node_id])[0]
-        elif operation_type == "generate_character_voice":
-            return batch_system.improve_character_voice_batch([node_id])[0]
-        elif operation_type == "improve_flow_and_pacing":
-            return batch_system.improve_pacing_batch([node_id])[0]
-        elif operation_type == "add_missing_choices":
-            return batch_system.generate_choices_batch([node_id])[0]
+    def _on_node_result(self, operation: str, node_id: str, result: Any, error: Exception):
+        """Apply the result of one node as soon as it arrives."""
+        node = self.app.nodes.get(node_id)
+        if error is not None or node is None:
+            self.operation_results.append({
+                'node_id': node_id,
+                'success': False,
+                'error': str(error) if error is not None else "Node no longer exists"
+            })
         else:
-            raise Exception(f"Unknown operation type: {operation_type}")
+            if operation == "Add Missing Choices":
+                self._add_choices(node, result or [])
+            elif result:
+                self._set_text(node, result["improved"])
+            self.operation_results.append({'node_id': node_id, 'success': True, 'changed': bool(result)})
+            if result:
+                self.app.canvas_manager.redraw_node(node_id)
+        
+        self._update_progress(f"Processed node {len(self.operation_results)}/{self.operation_total}: {node_id}\n")
+    
+    def _set_text(self, node: Any, text: str):
+        """Replace the dialogue text of a node."""
+        if isinstance(getattr(node, 'game_data', None), dict):
+            node.game_data['text'] = text
+        else:
+            node.text = text
+        if hasattr(node, 'touch'):
+            node.touch()
+    
+    def _add_choices(self, node: Any, choices: List[str]):
+        """Append generated choices to a node."""
+        if not choices or not hasattr(node, 'options'):
+            return
+        for choice_text in choices:
+            node.options.append({
+                'text': choice_text,
+                'nextNode': '',
+                'conditions': []
+            })
+        node.touch()
     
     def _update_progress(self, message: str):
         """Update progress in results text."""
@@ -483,31 +535,35 @@ class BatchAIDialog(ctk.CTkToplevel):
         self.results_text.insert("end", message)
         self.results_text.see("end")
         self.results_text.configure(state="disabled")
-        self.update()
+    
+    def _finish_operation(self):
+        """Return the dialog to its idle state."""
+        self.operation_in_progress = False
+        self.executor = None
+        self.run_button.configure(text="⚡ Run Operation", command=self.run_batch_operation)
+        self.update_selection_count()
     
     def _on_operation_complete(self):
         """Handle completed operation."""
-        self.operation_in_progress = False
-        self.run_button.configure(text="⚡ Run Operation", state="normal")
+        cancelled = self.executor is not None and self.executor.cancelled
+        self._finish_operation()
         
         # Display results
         self._display_operation_results()
         
-        # Refresh UI
-        self.app.properties_panel.update_properties_panel()
-        self.app.canvas_manager.redraw_all_nodes()
+        # Refresh UI; changed nodes were redrawn as their results arrived
+        self.app.canvas_manager.schedule_properties_update()
         
         messagebox.showinfo(
-            "Operation Complete",
-            f"Batch operation completed!\n\n" + 
-            f"Processed {len(self.operation_results)} nodes.\n" +
+            "Operation Cancelled" if cancelled else "Operation Complete",
+            f"Batch operation {'cancelled' if cancelled else 'completed'}!\n\n" + 
+            f"Processed {len(self.operation_results)} of {self.operation_total} nodes.\n" +
             "Check the results section for details."
         )
     
     def _on_operation_error(self, error_message: str):
         """Handle operation error."""
-        self.operation_in_progress = False
-        self.run_button.configure(text="⚡ Run Operation", state="normal")
+        self._finish_operation()
         
         error_msg = f"\n❌ Operation failed: {error_message}\n"
         self.results_text.configure(state="normal")
@@ -535,7 +591,8 @@ class BatchAIDialog(ctk.CTkToplevel):
         for result in self.operation_results:
             node_id = result.get('node_id', 'Unknown')
             if result.get('success', False):
-                self.results_text.insert("end", f"✅ Node {node_id}: Enhanced successfully\n")
+                outcome = "Enhanced successfully" if result.get('changed') else "No changes needed"
+                self.results_text.insert("end", f"✅ Node {node_id}: {outcome}\n")
             else:
                 error = result.get('error', 'Unknown error')
                 self.results_text.insert("end", f"❌ Node {node_id}: {error}\n")
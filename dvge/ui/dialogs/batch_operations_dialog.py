@@ -352,7 +352,7 @@ class BatchOperationsDialog(ctk.CTkToplevel):
         
         # Redraw nodes to show color changes
         if hasattr(self.app, 'canvas_manager'):
-            self.app.canvas_manager.redraw_all_nodes()
+            self.app.canvas_manager.request_full_redraw()
     
     def quick_fix_empty(self):
         """Quick fix empty dialogue."""
@@ -416,7 +416,7 @@ class BatchOperationsDialog(ctk.CTkToplevel):
         
         # Redraw nodes to show position changes
         if hasattr(self.app, 'canvas_manager'):
-            self.app.canvas_manager.redraw_all_nodes()
+            self.app.canvas_manager.request_full_redraw()
     
     def execute_advanced_operation(self):
         """Execute the configured advanced operation."""
@@ -443,7 +443,7 @@ class BatchOperationsDialog(ctk.CTkToplevel):
                 op in self.operation_var.get() 
                 for op in ['color', 'arrange', 'theme']
             ):
-                self.app.canvas_manager.redraw_all_nodes()
+                self.app.canvas_manager.request_full_redraw()
                 
         except Exception as e:
             messagebox.showerror("Operation Error", f"Failed to execute operation:\n{str(e)}")
@@ -0,0 +1,45 @@
+# dvge/ui/dialogs/export_progress_dialog.py
+
+"""Progress dialog shown while an export encodes its media."""
+
+import customtkinter as ctk
+from ...constants import *
+
+
+class ExportProgressDialog(ctk.CTkToplevel):
+    """Progress bar with a Cancel button for long-running exports."""
+
+    def __init__(self, parent, title, on_cancel=None):
+        super().__init__(parent)
+        self.title(title)
+        self.geometry("400x170")
+        self.transient(parent)
+        self.grab_set()
+
+        self.on_cancel = on_cancel
+        self.protocol("WM_DELETE_WINDOW", self._cancel)
+
+        main_frame = ctk.CTkFrame(self, fg_color=COLOR_PRIMARY_FRAME)
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+
+        self.status_label = ctk.CTkLabel(main_frame, text="Encoding media...", font=FONT_SUBTITLE_SMALL)
+        self.status_label.pack(pady=(10, 10))
+
+        self.progress_bar = ctk.CTkProgressBar(main_frame)
+        self.progress_bar.pack(fill="x", padx=20, pady=5)
+        self.progress_bar.set(0)
+
+        self.cancel_button = ctk.CTkButton(main_frame, text="Cancel", width=100, command=self._cancel)
+        self.cancel_button.pack(pady=(10, 5))
+
+    def update_progress(self, done, total):
+        """Shows how many media files are encoded and processes pending events."""
+        self.progress_bar.set(done / total if total else 1)
+        self.status_label.configure(text=f"Encoding media... {done}/{total} files")
+        self.update()  # Keeps the Cancel button responsive
+
+    def _cancel(self):
+        """Requests cancellation of the export."""
+        self.cancel_button.configure(state="disabled", text="Cancelling...")
+        if self.on_cancel:
+            self.on_cancel()
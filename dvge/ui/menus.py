@@ -96,6 +96,31 @@ def create_menu(app):
         command=lambda: _center_view(app)
     )
     view_menu.add_separator()
+    layout_menu = tk.Menu(view_menu, tearoff=0)
+    layout_menu.add_command(
+        label="Layered (All Nodes)",
+        command=lambda: _auto_layout(app, "layered")
+    )
+    layout_menu.add_command(
+        label="Force-Directed (All Nodes)",
+        command=lambda: _auto_layout(app, "force_directed")
+    )
+    layout_menu.add_separator()
+    layout_menu.add_command(
+        label="Layered (Selected Nodes)",
+        command=lambda: _auto_layout(app, "layered", selected_only=True)
+    )
+    layout_menu.add_command(
+        label="Tidy Selected Nodes",
+        command=lambda: _auto_layout(app, "force_directed", selected_only=True)
+    )
+    layout_menu.add_separator()
+    layout_menu.add_command(
+        label="Stop Auto Layout",
+        command=lambda: _stop_auto_layout(app)
+    )
+    view_menu.add_cascade(label="Auto Layout", menu=layout_menu)
+    view_menu.add_separator()
     view_menu.add_command(
         label="Live Preview",
         command=lambda: _open_live_preview(app),
@@ -218,6 +243,26 @@ def _center_view(app):
         app.canvas_manager.center_view()
 
 
+def _auto_layout(app, algorithm, selected_only=False):
+    """Arranges all nodes, or only the selected ones, in the background."""
+    if not hasattr(app, 'canvas_manager'):
+        return
+    node_ids = None
+    if selected_only:
+        node_ids = list(app.selected_node_ids)
+        if not node_ids:
+            from ..core.utils import show_info
+            show_info("Auto Layout", "Select the nodes to arrange first.")
+            return
+    app.canvas_manager.auto_layout(algorithm, node_ids)
+
+
+def _stop_auto_layout(app):
+    """Stops a running auto layout, leaving the nodes where they were."""
+    if hasattr(app, 'canvas_manager'):
+        app.canvas_manager.cancel_auto_layout()
+
+
 def _open_live_preview(app):
     """Opens live preview from menu."""
     if hasattr(app, 'preview_toolbar'):
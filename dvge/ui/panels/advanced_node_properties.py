@@ -845,12 +845,14 @@ class AdvancedNodePropertiesTab:
                     node.random_outcomes[index][prop] = 1
             else:
                 node.random_outcomes[index][prop] = value
+            node.touch()
 
     def _add_outcome(self, node):
         """Adds a new random outcome."""
         self.app._save_state_for_undo("Add Random Outcome")
         new_outcome = {'weight': 1, 'next_node': '', 'description': 'New outcome'}
         node.random_outcomes.append(new_outcome)
+        node.touch()
         self.update_panel()
 
     def _remove_outcome(self, node, index):
@@ -858,6 +860,7 @@ class AdvancedNodePropertiesTab:
         self.app._save_state_for_undo("Remove Random Outcome")
         if index < len(node.random_outcomes):
             del node.random_outcomes[index]
+            node.touch()
         self.update_panel()
 
     # Update methods for timer nodes
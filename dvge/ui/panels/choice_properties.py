@@ -505,7 +505,7 @@ class ChoicePropertiesTab:
             except ValueError:
                 pass
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
-            self.app.canvas_manager.draw_connections()
+            self.app.canvas_manager.draw_connections([self.app.active_node_id])
 
     # Event handlers for combat nodes
     def _on_combat_prop_change(self, key, value):
@@ -518,7 +518,7 @@ class ChoicePropertiesTab:
             self.app._save_state_for_undo("Change Combat Property")
             setattr(node, key, value)
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
-            self.app.canvas_manager.draw_connections()
+            self.app.canvas_manager.draw_connections([self.app.active_node_id])
 
     # Event handlers for shop nodes
     def _on_shop_prop_change(self, key, value):
@@ -531,7 +531,7 @@ class ChoicePropertiesTab:
             self.app._save_state_for_undo("Change Shop Property")
             setattr(node, key, value)
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
-            self.app.canvas_manager.draw_connections()
+            self.app.canvas_manager.draw_connections([self.app.active_node_id])
 
     # Event handlers for random event nodes
     def _on_random_prop_change(self, key, value):
@@ -559,10 +559,11 @@ class ChoicePropertiesTab:
                     node.random_outcomes[index][key] = 1
             else:
                 node.random_outcomes[index][key] = value
+            node.touch()
             
             # Redraw connections if next_node changed
             if key == 'next_node':
-                self.app.canvas_manager.draw_connections()
+                self.app.canvas_manager.draw_connections([self.app.active_node_id])
 
     def _add_outcome(self):
         """Adds a new random outcome."""
@@ -577,6 +578,7 @@ class ChoicePropertiesTab:
                 'description': 'New outcome',
                 'next_node': ''
             })
+            node.touch()
             self.update_panel()
 
     def _remove_outcome(self, index):
@@ -588,8 +590,9 @@ class ChoicePropertiesTab:
         if isinstance(node, RandomEventNode) and index < len(node.random_outcomes):
             self.app._save_state_for_undo("Remove Outcome")
             del node.random_outcomes[index]
+            node.touch()
             self.update_panel()
-            self.app.canvas_manager.draw_connections()
+            self.app.canvas_manager.draw_connections([self.app.active_node_id])
 
     # Event handlers for timer nodes
     def _on_timer_prop_change(self, key, value):
@@ -601,7 +604,7 @@ class ChoicePropertiesTab:
         if isinstance(node, TimerNode):
             self.app._save_state_for_undo("Change Timer Property")
             setattr(node, key, value)
-            self.app.canvas_manager.draw_connections()
+            self.app.canvas_manager.draw_connections([self.app.active_node_id])
 
     # Event handlers for inventory nodes
     def _on_inventory_prop_change(self, key, value):
@@ -613,7 +616,7 @@ class ChoicePropertiesTab:
         if isinstance(node, InventoryNode):
             self.app._save_state_for_undo("Change Inventory Property")
             setattr(node, key, value)
-            self.app.canvas_manager.draw_connections()
+            self.app.canvas_manager.draw_connections([self.app.active_node_id])
 
     # Standard dialogue option handlers
     def _on_option_prop_change(self, index, key, value):
@@ -625,11 +628,12 @@ class ChoicePropertiesTab:
         if hasattr(node, 'options') and index < len(node.options):
             self.app._save_state_for_undo("Change Option Property")
             node.options[index][key] = value
+            node.touch()
             
             if key == 'text':
                 self.app.canvas_manager.redraw_node(self.app.active_node_id)
             elif 'Node' in key:
-                self.app.canvas_manager.draw_connections()
+                self.app.canvas_manager.draw_connections([self.app.active_node_id])
 
     def _add_condition(self, opt_idx):
         """Adds a new condition to an option."""
@@ -642,6 +646,7 @@ class ChoicePropertiesTab:
             node.options[opt_idx]["conditions"].append({
                 'type': 'stat', 'subject': '', 'operator': '>=', 'value': 10
             })
+            node.touch()
             self.update_panel()
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
 
@@ -656,6 +661,7 @@ class ChoicePropertiesTab:
             node.options[opt_idx]["effects"].append({
                 'type': 'stat', 'subject': '', 'operator': '+=', 'value': 1
             })
+            node.touch()
             self.update_panel()
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
 
@@ -669,6 +675,7 @@ class ChoicePropertiesTab:
                 node.options.append({
                     "text": "New Option", "nextNode": "", "conditions": [], "effects": []
                 })
+                node.touch()
                 return True
         return False
 
@@ -690,6 +697,7 @@ class ChoicePropertiesTab:
         if hasattr(node, 'options') and index < len(node.options):
             self.app._save_state_for_undo("Remove Choice")
             del node.options[index]
+            node.touch()
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
             self.update_panel()
     
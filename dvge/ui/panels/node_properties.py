@@ -348,6 +348,7 @@ class NodePropertiesTab:
                 for opt in getattr(n, 'options', []):
                     if opt.get('nextNode') == old_id:
                         opt['nextNode'] = new_id
+                        n.touch()
                         
                 # Also update special node types
                 if hasattr(n, 'success_node') and n.success_node == old_id:
@@ -335,6 +335,7 @@ class ConditionEffectWidgets:
             
             self.app._save_state_for_undo("Change Condition")
             node.options[opt_idx]["conditions"][cond_idx][key] = value
+            node.touch()
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
 
     def _on_effect_prop_change(self, opt_idx, effect_idx, key, value):
@@ -348,6 +349,7 @@ class ConditionEffectWidgets:
             
             self.app._save_state_for_undo("Change Effect")
             node.options[opt_idx]["effects"][effect_idx][key] = value
+            node.touch()
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
 
     def _remove_condition(self, opt_idx, cond_idx, update_callback):
@@ -361,6 +363,7 @@ class ConditionEffectWidgets:
             
             self.app._save_state_for_undo("Remove Condition")
             del node.options[opt_idx]["conditions"][cond_idx]
+            node.touch()
             update_callback()
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
 
@@ -375,5 +378,6 @@ class ConditionEffectWidgets:
             
             self.app._save_state_for_undo("Remove Effect")
             del node.options[opt_idx]["effects"][effect_idx]
+            node.touch()
             update_callback()
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
\ No newline at end of file
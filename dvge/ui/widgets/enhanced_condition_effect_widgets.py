@@ -87,6 +87,7 @@ class EnhancedConditionEffectWidgets:
             
             self.app._save_state_for_undo("Change Condition")
             node.options[opt_idx]["conditions"][cond_idx][key] = value
+            node.touch()
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
 
     def _on_effect_prop_change(self, opt_idx, effect_idx, key, value):
@@ -100,4 +101,5 @@ class EnhancedConditionEffectWidgets:
             
             self.app._save_state_for_undo("Change Effect")
             node.options[opt_idx]["effects"][effect_idx][key] = value
+            node.touch()
             self.app.canvas_manager.redraw_node(self.app.active_node_id)
\ No newline at end of file
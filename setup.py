@@ -82,6 +82,7 @@ setup(
             "templates/*.json",
             "data/*",
             "constants/*.py",
+            "core/*.js",
         ],
     },
     keywords=[
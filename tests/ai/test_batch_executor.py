@@ -0,0 +1,240 @@
+"""Tests for concurrent batch AI operations."""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from dvge.ai.ai_service import AIService, AIProvider, AIRequest, AIResponse
+from dvge.ai.batch_executor import AIBatchExecutor
+from dvge.ai.enhanced_generators import BatchAIOperations, get_node_game_data
+
+
+class MockApp:
+    """Mock app for testing."""
+    def __init__(self):
+        self.nodes = {}
+
+
+class FastProvider(AIProvider):
+    """Provider answering after a short delay and recording concurrency."""
+
+    def __init__(self, name="fast", config=None, delay=0.02, window=60):
+        super().__init__(name, config)
+        self.delay = delay
+        self.window = window
+        self.active = 0
+        self.peak = 0
+        self.started = []
+
+    def validate_config(self):
+        return True
+
+    def check_rate_limit(self):
+        current_time = time.time()
+        if current_time > self.rate_limit_reset:
+            self.rate_limit_requests = 0
+            self.rate_limit_reset = current_time + self.window
+        return self.rate_limit_requests < self.config.get("max_requests_per_minute", 50)
+
+    async def generate_content(self, request):
+        self.started.append(time.time())
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            delay = request.context.get("delay", self.delay)
+            await asyncio.sleep(delay)
+        finally:
+            self.active -= 1
+        return AIResponse(content=f"Improved: {request.prompt[-40:]}", success=True)
+
+
+class Node:
+    """Node object with the attributes of the editor's nodes."""
+    def __init__(self, text, npc="Narrator", options=None):
+        self.text = text
+        self.npc = npc
+        self.options = options or []
+
+
+class TestAIBatchExecutor(unittest.TestCase):
+    """Test the concurrent batch executor."""
+
+    def setUp(self):
+        self.service = AIService(MockApp())
+        self.provider = FastProvider(config={"max_requests_per_minute": 1000})
+        self.service.add_provider(self.provider)
+        self.service.set_default_provider("fast")
+
+    def _jobs(self, executor, count, **context):
+        def make(index):
+            async def job():
+                request = AIRequest(prompt=f"Prompt {index}", context=dict(context))
+                return (await executor.generate(request)).content
+            return job
+        return {index: make(index) for index in range(count)}
+
+    def test_concurrency_is_bounded(self):
+        """Test that requests overlap but never exceed the concurrency limit."""
+        executor = AIBatchExecutor(self.service, max_concurrency=4)
+        results = executor.run(self._jobs(executor, 20))
+        self.assertEqual(len(results), 20)
+        self.assertEqual(self.provider.peak, 4)
+
+    def test_provider_concurrency_setting(self):
+        """Test that a provider can lower the concurrency."""
+        self.service.configure_provider("fast", {"max_concurrent_requests": 2})
+        executor = AIBatchExecutor(self.service, max_concurrency=8)
+        self.assertEqual(executor.concurrency, 2)
+        executor.run(self._jobs(executor, 10))
+        self.assertEqual(self.provider.peak, 2)
+
+    def test_rate_limit_waits_for_next_window(self):
+        """Test that requests over the rate limit wait instead of failing."""
+        self.provider.window = 0.3
+        self.provider.config["max_requests_per_minute"] = 3
+        executor = AIBatchExecutor(self.service, max_concurrency=8)
+        results = executor.run(self._jobs(executor, 7))
+        self.assertEqual(len(results), 7)
+        self.assertTrue(all(content.startswith("Improved") for content in results.values()))
+        started = sorted(self.provider.started)
+        self.assertGreaterEqual(started[3] - started[0], 0.25)
+
+    def test_results_stream_in_completion_order(self):
+        """Test that each result is reported as soon as it is done."""
+        executor = AIBatchExecutor(self.service)
+        order = []
+
+        def make(delay):
+            async def job():
+                await executor.generate(AIRequest(prompt=f"Wait {delay}", context={"delay": delay}))
+                return delay
+            return job
+
+        jobs = {"slow": make(0.2), "fast": make(0.01), "medium": make(0.1)}
+        results = executor.run(jobs, lambda key, result, error: order.append(key))
+        self.assertEqual(order, ["fast", "medium", "slow"])
+        self.assertEqual(results, {"slow": 0.2, "fast": 0.01, "medium": 0.1})
+
+    def test_job_errors_are_reported(self):
+        """Test that a failing job does not stop the others."""
+        executor = AIBatchExecutor(self.service)
+        reported = {}
+
+        async def failing():
+            raise ValueError("bad node")
+
+        jobs = self._jobs(executor, 2)
+        jobs["bad"] = failing
+        results = executor.run(jobs, lambda key, result, error: reported.setdefault(key, error))
+        self.assertEqual(set(results), {0, 1})
+        self.assertIsInstance(reported["bad"], ValueError)
+        self.assertIsNone(reported[0])
+
+    def test_cancel(self):
+        """Test that cancelling stops requests in flight and those not yet started."""
+        executor = AIBatchExecutor(self.service, max_concurrency=2)
+        reported = []
+
+        def on_result(key, result, error):
+            reported.append(key)
+            executor.cancel()
+
+        jobs = self._jobs(executor, 10, delay=0.05)
+        jobs["first"] = self._jobs(executor, 1, delay=0.001)[0]
+        started = time.time()
+        results = executor.run(jobs, on_result)
+        self.assertLess(time.time() - started, 1)
+        self.assertTrue(executor.cancelled)
+        self.assertLess(len(results), 11)
+        self.assertEqual(reported, list(results))
+
+    def test_cancel_from_another_thread(self):
+        """Test cancelling a running batch from another thread."""
+        executor = AIBatchExecutor(self.service, max_concurrency=1)
+        threading.Timer(0.1, executor.cancel).start()
+        results = executor.run(self._jobs(executor, 50, delay=0.05))
+        self.assertTrue(executor.cancelled)
+        self.assertLess(len(results), 50)
+        self.assertEqual(self.provider.active, 0)
+
+    def test_sync_requests_share_one_loop(self):
+        """Test that synchronous requests reuse the service's event loop."""
+        first = self.service.generate_content_sync(AIRequest(prompt="One"))
+        loop = self.service.get_event_loop()
+        second = self.service.generate_content_sync(AIRequest(prompt="Two"))
+        self.assertTrue(first.success and second.success)
+        self.assertIs(self.service.get_event_loop(), loop)
+
+        # Callers that already run an event loop are served as well
+        async def inside_loop():
+            return self.service.generate_content_sync(AIRequest(prompt="Three"))
+        self.assertTrue(asyncio.run(inside_loop()).success)
+
+
+class TestBatchAIOperations(unittest.TestCase):
+    """Test batch operations running concurrently."""
+
+    def setUp(self):
+        self.service = AIService(MockApp())
+        self.provider = FastProvider(config={"max_requests_per_minute": 1000})
+        self.service.add_provider(self.provider)
+        self.service.set_default_provider("fast")
+        self.batch = BatchAIOperations(self.service)
+
+    def test_node_game_data(self):
+        """Test game data of node dictionaries and node objects."""
+        self.assertEqual(get_node_game_data({'game_data': {'text': 'Hi'}}), {'text': 'Hi'})
+        data = get_node_game_data(Node("Hello", "Alice", [{'text': 'Go'}]))
+        self.assertEqual(data, {'text': 'Hello', 'character': 'Alice', 'choices': [{'text': 'Go'}]})
+
+    def test_batch_improve_dialogue(self):
+        """Test improving many nodes concurrently with streamed results."""
+        nodes = {f"node{i}": Node(f"This is the dialogue of node {i}.") for i in range(30)}
+        nodes["short"] = Node("Hi")
+        nodes["dict"] = {'game_data': {'text': "A node stored as a dictionary."}}
+        streamed = []
+
+        executor = AIBatchExecutor(self.service, max_concurrency=10)
+        started = time.time()
+        results = self.batch.batch_improve_dialogue(
+            nodes, "engaging",
+            on_result=lambda node_id, improvement, error: streamed.append(node_id),
+            executor=executor
+        )
+        # 31 requests of 20 ms each, 10 at a time
+        self.assertLess(time.time() - started, 0.5)
+        self.assertEqual(results["processed"], 31)
+        self.assertEqual(results["improved"], 31)
+        self.assertEqual(results["errors"], 0)
+        self.assertNotIn("short", results["improvements"])
+        self.assertEqual(sorted(streamed), sorted(results["improvements"]))
+        self.assertTrue(results["improvements"]["node3"]["improved"].startswith("Improved"))
+        self.assertFalse(results["cancelled"])
+
+    def test_batch_generate_missing_choices(self):
+        """Test choices generated only for nodes with too few."""
+        nodes = {
+            "none": Node("A fork in the road."),
+            "one": Node("A door.", options=[{'text': 'Open'}]),
+            "full": Node("A chest.", options=[{'text': 'Open'}, {'text': 'Leave'}]),
+        }
+        results = self.batch.batch_generate_missing_choices(nodes, min_choices=2)
+        self.assertEqual(results["nodes_processed"], 3)
+        self.assertEqual(set(results["new_choices"]), {"none", "one"})
+        self.assertEqual(len(results["new_choices"]["one"]), 1)
+
+    def test_batch_analyze_story_quality(self):
+        """Test that the analyses run concurrently."""
+        self.provider.delay = 0.2
+        nodes = {"intro": {'node_type': 'dialogue', 'game_data': {'text': 'Once upon a time.'}}}
+        started = time.time()
+        analyses = self.batch.batch_analyze_story_quality(nodes)
+        self.assertLess(time.time() - started, 0.5)
+        self.assertEqual(self.provider.peak, 3)
+        self.assertIn("summary", analyses)
+        self.assertNotIn("error", analyses["structure"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import pytest
+import sys
+import os
+import base64
+import hashlib
+import threading
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.asset_pipeline import AssetPipeline, ExportCancelled, encode_file
+
+
+class TestEncodeFile:
+    """Test cases for chunked base64 encoding."""
+
+    def test_matches_whole_file_encoding(self, tmp_path):
+        """Test that chunked output equals encoding the file in one go."""
+        content = os.urandom(10 * 1024 + 1)
+        path = tmp_path / "asset.bin"
+        path.write_bytes(content)
+
+        digest, text = encode_file(str(path), prefix="data:x;base64,", chunk_size=3 * 100)
+
+        assert text == "data:x;base64," + base64.b64encode(content).decode('ascii')
+        assert digest == hashlib.sha256(content).hexdigest()
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file encodes to just the prefix."""
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+
+        assert encode_file(str(path), prefix="p")[1] == "p"
+
+    def test_rejects_unaligned_chunk_size(self, tmp_path):
+        """Test that chunk sizes must be multiples of 3."""
+        with pytest.raises(ValueError):
+            encode_file(str(tmp_path / "x"), chunk_size=1000)
+
+    def test_cancel_event_stops_encoding(self, tmp_path):
+        """Test that a set cancel event aborts the encode."""
+        path = tmp_path / "asset.bin"
+        path.write_bytes(b"abc")
+        event = threading.Event()
+        event.set()
+
+        with pytest.raises(ExportCancelled):
+            encode_file(str(path), cancel_event=event)
+
+
+class TestAssetPipeline:
+    """Test cases for concurrent asset encoding."""
+
+    def test_encodes_all_jobs(self, tmp_path):
+        """Test that every job is encoded and reported as progress."""
+        jobs = {}
+        for i in range(12):
+            path = tmp_path / f"file_{i}.bin"
+            path.write_bytes(bytes([i]) * (i + 1))
+            jobs[f"key_{i}"] = (str(path), "")
+        progress = []
+
+        results = AssetPipeline(max_workers=3).encode_files(jobs, lambda done, total: progress.append((done, total)))
+
+        assert set(results) == set(jobs)
+        assert base64.b64decode(results["key_5"][1]) == bytes([5]) * 6
+        assert progress[-1] == (12, 12)
+
+    def test_failed_files_are_left_out(self, tmp_path):
+        """Test that unreadable files do not abort the other jobs."""
+        path = tmp_path / "ok.bin"
+        path.write_bytes(b"ok")
+        jobs = {"ok": (str(path), ""), "bad": (str(tmp_path / "missing.bin"), "")}
+
+        results = AssetPipeline().encode_files(jobs)
+
+        assert list(results) == ["ok"]
+
+    def test_cancel_raises(self, tmp_path):
+        """Test that cancelling from the progress callback stops the pipeline."""
+        jobs = {}
+        for i in range(20):
+            path = tmp_path / f"file_{i}.bin"
+            path.write_bytes(b"x" * 1000)
+            jobs[i] = (str(path), "")
+        pipeline = AssetPipeline(max_workers=1, chunk_size=3)
+
+        with pytest.raises(ExportCancelled):
+            pipeline.encode_files(jobs, lambda done, total: pipeline.cancel())
+        assert pipeline.cancelled
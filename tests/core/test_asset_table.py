@@ -0,0 +1,105 @@
+import pytest
+import sys
+import os
+import json
+from unittest.mock import Mock, patch
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.asset_table import ExportAssetTable, is_asset_ref
+from dvge.core.asset_pipeline import AssetPipeline
+from dvge.core.html_exporter import HTMLExporter
+from dvge.models import DialogueNode
+
+
+class TestExportAssetTable:
+    """Test cases for the content-addressed export asset table."""
+
+    def test_same_file_is_stored_once(self, tmp_path):
+        """Test that a file used many times is read and embedded once."""
+        image = tmp_path / "bg.jpg"
+        image.write_bytes(b"jpeg bytes")
+        table = ExportAssetTable()
+
+        refs = {table.add_image(str(image)) for _ in range(50)}
+
+        assert len(refs) == 1
+        assert len(table) == 1
+        ref = refs.pop()
+        assert is_asset_ref(ref)
+        assert table.resolve(ref).startswith("data:image/jpeg;base64,")
+
+    def test_identical_content_shares_an_entry(self, tmp_path):
+        """Test that copies of a file under different names are deduplicated."""
+        first = tmp_path / "a.mp3"
+        second = tmp_path / "b.mp3"
+        first.write_bytes(b"same audio")
+        second.write_bytes(b"same audio")
+        table = ExportAssetTable()
+
+        assert table.add_audio(str(first)) == table.add_audio(str(second))
+        assert len(table) == 1
+
+    def test_missing_file_gives_empty_reference(self):
+        """Test that missing or empty paths are not added."""
+        table = ExportAssetTable()
+
+        assert table.add_image("") == ""
+        assert table.add_audio("/does/not/exist.ogg") == ""
+        assert len(table) == 0
+
+    def test_prefetch_encodes_files_once(self, tmp_path):
+        """Test that prefetched files are not read again by add_file."""
+        image = tmp_path / "bg.gif"
+        image.write_bytes(b"gif bytes")
+        table = ExportAssetTable()
+
+        table.prefetch([(str(image), "image/gif"), (str(image), "image/gif")], AssetPipeline(max_workers=2))
+        with patch('dvge.core.asset_table.encode_file') as encode_file:
+            ref = table.add_image(str(image))
+
+        encode_file.assert_not_called()
+        assert len(table) == 1
+        assert table.resolve(ref).startswith("data:image/gif;base64,")
+
+
+class TestHTMLExportAssets:
+    """Test cases for asset deduplication in the classic HTML export."""
+
+    def test_shared_background_is_embedded_once(self, tmp_path):
+        """Test that nodes sharing media reference one table entry."""
+        image = tmp_path / "bg.png"
+        image.write_bytes(b"png bytes")
+        music = tmp_path / "theme.ogg"
+        music.write_bytes(b"ogg bytes")
+
+        nodes = {}
+        for i in range(20):
+            node = DialogueNode(0, 0, f"node_{i}", text="Hello")
+            node.backgroundImage = str(image)
+            node.music = str(music)
+            nodes[node.id] = node
+        app = Mock(nodes=nodes, story_flags={}, variables={}, media_library=None)
+        exporter = HTMLExporter.__new__(HTMLExporter)
+        exporter.app = app
+        table = ExportAssetTable()
+
+        dialogue_data = json.loads(exporter._build_dialogue_json(table))
+
+        assert len(table) == 2
+        assert len({data['backgroundImage'] for data in dialogue_data.values()}) == 1
+        assert table.resolve(dialogue_data['node_0']['music']).startswith("data:audio/ogg;base64,")
+        assert dialogue_data['node_0']['audio'] == ""
+
+    def test_generated_html_contains_asset_table(self):
+        """Test that the asset table is written into the exported page."""
+        exporter = HTMLExporter.__new__(HTMLExporter)
+        exporter.app = Mock(project_settings={'title': "Test"})
+        exporter.style_settings = None
+
+        html = exporter._generate_html("{}", "{}", "{}", "{}", "{}",
+                                       asset_data='{"abc": "data:image/png;base64,AAAA"}')
+
+        assert 'const assetData = {"abc": "data:image/png;base64,AAAA"};' in html
+        assert "function resolveAsset(ref)" in html
@@ -0,0 +1,200 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.constants import GRID_SIZE, NODE_WIDTH
+from dvge.core.auto_layout import (
+    AutoLayoutJob, FORCE_DIRECTED, LAYERED, LAYER_SPACING, LayoutCancelled, LayoutGraph,
+    NUMPY_AVAILABLE, force_directed_layout, layered_layout, snap_to_grid
+)
+from dvge.core.graph_index import GraphIndex
+from dvge.core.node_map import LazyNodeMap
+from dvge.models import DialogueNode
+
+
+def make_nodes(links, positions=None):
+    """Creates dialogue nodes linked by {node_id: [target_id, ...]}."""
+    positions = positions or {}
+    nodes = {}
+    for node_id, targets in links.items():
+        options = [{"text": f"To {target}", "nextNode": target} for target in targets]
+        x, y = positions.get(node_id, (0, 0))
+        nodes[node_id] = DialogueNode(x, y, node_id, text="Text", options=options)
+    return nodes
+
+
+def snapshot(nodes, node_ids=None, include_neighbors=False):
+    return LayoutGraph.from_nodes(nodes, GraphIndex(), node_ids, include_neighbors)
+
+
+def distance(a, b):
+    return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
+
+
+class TestLayoutGraph:
+    """Test cases for layout snapshots."""
+
+    def test_snapshot_of_all_nodes(self):
+        """Test that every node and link between nodes is captured."""
+        nodes = make_nodes({"a": ["b", "c", "b"], "b": ["missing"], "c": []},
+                           {"b": (100, 200)})
+        graph = snapshot(nodes)
+
+        assert graph.ids == ["a", "b", "c"]
+        assert sorted(graph.edges) == [(0, 1), (0, 2)]
+        assert graph.positions[1] == (100, 200)
+        assert graph.fixed == set()
+
+    def test_subset_with_neighbors(self):
+        """Test that neighbors of a subset are included as fixed nodes."""
+        nodes = make_nodes({"a": ["b"], "b": ["c"], "c": ["d"], "d": []})
+        graph = snapshot(nodes, ["b"], include_neighbors=True)
+
+        assert graph.ids == ["b", "a", "c"]
+        assert graph.fixed == {1, 2}
+        assert sorted(graph.edges) == [(0, 2), (1, 0)]
+        assert list(graph.to_positions(graph.positions)) == ["b"]
+
+    def test_lazy_nodes_stay_unbuilt(self):
+        """Test that nodes of a lazily loaded project are not built for a snapshot."""
+        nodes = LazyNodeMap({
+            node_id: node.to_dict() for node_id, node in
+            make_nodes({"a": ["b"], "b": []}, {"b": (300, 400)}).items()
+        })
+        graph = snapshot(nodes)
+
+        assert graph.positions[1] == (300, 400)
+        assert graph.edges == [(0, 1)]
+        assert nodes.unmaterialized_count == 2
+
+
+class TestLayeredLayout:
+    """Test cases for the layered layout."""
+
+    def test_chain_runs_left_to_right(self):
+        """Test that each node is placed one layer after the node leading to it."""
+        nodes = make_nodes({"a": ["b"], "b": ["c"], "c": []}, {"a": (40, 60)})
+        positions = layered_layout(snapshot(nodes))
+
+        assert positions["a"] == (0, 0)
+        assert positions["b"] == (LAYER_SPACING, 0)
+        assert positions["c"] == (2 * LAYER_SPACING, 0)
+
+    def test_branches_do_not_overlap(self):
+        """Test that nodes of the same layer are stacked without overlapping."""
+        nodes = make_nodes({"a": ["b", "c", "d"], "b": [], "c": [], "d": []})
+        graph = snapshot(nodes)
+        positions = layered_layout(graph, origin=(0, 0))
+
+        column = sorted(positions[node_id][1] for node_id in "bcd")
+        assert {positions[node_id][0] for node_id in "bcd"} == {LAYER_SPACING}
+        for upper, lower in zip(column, column[1:]):
+            assert lower - upper >= graph.heights[1]
+
+    def test_cycles(self):
+        """Test that cycles are broken instead of looping forever."""
+        nodes = make_nodes({"a": ["b"], "b": ["c"], "c": ["a"], "d": ["d"]})
+        positions = layered_layout(snapshot(nodes))
+
+        assert positions["a"][0] < positions["b"][0] < positions["c"][0]
+        assert set(positions) == {"a", "b", "c", "d"}
+
+    def test_side_branch_starts_near_its_target(self):
+        """Test that a second entry point is placed just before the node it leads to."""
+        nodes = make_nodes({"a": ["b"], "b": ["c"], "c": [], "side": ["c"]})
+        positions = layered_layout(snapshot(nodes), origin=(0, 0))
+
+        assert positions["side"][0] == LAYER_SPACING
+
+    def test_fixed_nodes_are_left_out(self):
+        """Test that only the chosen nodes get positions."""
+        nodes = make_nodes({"a": ["b"], "b": ["c"], "c": []})
+        positions = layered_layout(snapshot(nodes, ["b", "c"], include_neighbors=True))
+
+        assert set(positions) == {"b", "c"}
+        assert layered_layout(snapshot(nodes, [])) == {}
+
+    def test_cancel(self):
+        """Test that a cancelled layout stops with LayoutCancelled."""
+        nodes = make_nodes({"a": ["b"], "b": []})
+        with pytest.raises(LayoutCancelled):
+            layered_layout(snapshot(nodes), should_stop=lambda: True)
+
+
+class TestForceDirectedLayout:
+    """Test cases for the force-directed layout."""
+
+    def setup_method(self):
+        """Set up a chain with one node far away and another on top of its neighbor."""
+        self.nodes = make_nodes(
+            {"a": ["b"], "b": ["c"], "c": ["d"], "d": []},
+            {"a": (0, 0), "b": (0, 0), "c": (5000, 0), "d": (5300, 100)}
+        )
+
+    def test_linked_nodes_pull_together(self):
+        """Test that a far away linked node is pulled in and stacked nodes are pushed apart."""
+        positions = force_directed_layout(snapshot(self.nodes), use_numpy=False)
+
+        assert distance(positions["b"], positions["c"]) < 4000
+        assert distance(positions["a"], positions["b"]) > NODE_WIDTH / 2
+
+    def test_fixed_nodes_do_not_move(self):
+        """Test that a subset layout only moves the chosen nodes."""
+        graph = snapshot(self.nodes, ["c"], include_neighbors=True)
+        positions = force_directed_layout(graph, use_numpy=False)
+
+        assert list(positions) == ["c"]
+        assert distance(positions["c"], (0, 0)) < 5000
+
+    def test_progress_and_cancel(self):
+        """Test that intermediate positions are streamed and cancellation stops the layout."""
+        updates = []
+        force_directed_layout(snapshot(self.nodes), iterations=20, on_progress=updates.append,
+                              use_numpy=False)
+        assert len(updates) == 3
+        assert set(updates[0]) == set(self.nodes)
+
+        with pytest.raises(LayoutCancelled):
+            force_directed_layout(snapshot(self.nodes), should_stop=lambda: True, use_numpy=False)
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy is not installed")
+    def test_numpy_matches_python(self):
+        """Test that the vectorized forces give the same positions as the pure Python ones."""
+        graph = snapshot(self.nodes)
+        expected = force_directed_layout(graph, use_numpy=False)
+        actual = force_directed_layout(graph, use_numpy=True)
+
+        for node_id, position in expected.items():
+            assert actual[node_id] == pytest.approx(position)
+
+
+class TestAutoLayoutJob:
+    """Test cases for background layout jobs."""
+
+    def test_result_is_snapped_to_grid(self):
+        """Test that a finished job holds grid-aligned positions."""
+        nodes = make_nodes({"a": ["b"], "b": []}, {"a": (13, 27)})
+        job = AutoLayoutJob(snapshot(nodes), LAYERED).start()
+
+        assert job.wait(5)
+        assert job.error is None
+        assert job.result == snap_to_grid(job.result)
+        assert all(x % GRID_SIZE == 0 and y % GRID_SIZE == 0 for x, y in job.result.values())
+
+    def test_streams_progress(self):
+        """Test that force-directed jobs report intermediate positions."""
+        nodes = make_nodes({"a": ["b"], "b": ["c"], "c": []})
+        updates = []
+        job = AutoLayoutJob(snapshot(nodes), FORCE_DIRECTED, iterations=10,
+                            on_progress=updates.append).start()
+
+        assert job.wait(5)
+        assert updates and set(job.result) == {"a", "b", "c"}
+
+    def test_unknown_algorithm(self):
+        """Test that unknown algorithms are rejected."""
+        with pytest.raises(ValueError):
+            AutoLayoutJob(snapshot(make_nodes({"a": []})), "circular")
@@ -0,0 +1,169 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.autosave import AutosaveJournal
+from dvge.core.state_manager import StateManager
+from dvge.models.dialogue_node import DialogueNode
+from unittest.mock import Mock
+
+
+class TestAutosaveJournal:
+    """Test cases for the autosave journal."""
+    
+    @pytest.fixture(autouse=True)
+    def setup_journal(self, tmp_path):
+        """Set up an app whose snapshots feed a journal in a temp directory."""
+        self.app = Mock()
+        self.app.nodes = {
+            f"n{i}": DialogueNode(i * 10, 0, f"n{i}", text=f"Node {i}") for i in range(10)
+        }
+        self.app.player_stats = {"health": 100}
+        self.app.player_inventory = []
+        self.app.story_flags = {}
+        self.app.variables = {"gold": 5}
+        self.app.quests = {}
+        self.app.enemies = {}
+        self.app.timers = {}
+        self.app.project_settings = {}
+        self.app.node_id_counter = 10
+        self.app.active_node_id = None
+        self.app.selected_node_ids = []
+        
+        self.directory = str(tmp_path / "autosave")
+        self.journal = AutosaveJournal(self.directory)
+        self.state_manager = StateManager(self.app)
+        self.state_manager.snapshot_listeners.append(self.journal.record)
+        yield
+        self.journal.close()
+    
+    def _journal_lines(self):
+        with open(self.journal.journal_path, 'r', encoding='utf-8') as f:
+            return f.readlines()
+    
+    def test_recovers_latest_state(self):
+        """Test that replaying the journal gives back the current project."""
+        self.state_manager.save_state("Initial State")
+        self.app.nodes["n2"].text = "Edited"
+        self.state_manager.save_state("Edit")
+        del self.app.nodes["n5"]
+        self.app.variables["gold"] = 7
+        self.state_manager.save_state("Delete")
+        self.journal.flush()
+        
+        recovered = self.journal.read_recovery_data()
+        
+        assert recovered["nodes"]["n2"]["game_data"]["text"] == "Edited"
+        assert "n5" not in recovered["nodes"]
+        assert len(recovered["nodes"]) == 9
+        assert recovered["variables"] == {"gold": 7}
+    
+    def test_entries_only_hold_changed_nodes(self):
+        """Test that entries after the first contain just the delta."""
+        self.state_manager.save_state("Initial State")
+        self.app.nodes["n3"].x = 500
+        self.state_manager.save_state("Move")
+        self.journal.flush()
+        
+        lines = self._journal_lines()
+        assert len(lines) == 2
+        assert '"full":true' in lines[0]
+        assert '"n3"' in lines[1] and '"n4"' not in lines[1]
+    
+    def test_undo_is_journaled(self):
+        """Test that undo records the restored state."""
+        self.state_manager.save_state("Initial State")
+        self.app.nodes["n1"].text = "Edited"
+        self.state_manager.save_state("Edit")
+        self.state_manager.undo()
+        self.journal.flush()
+        
+        recovered = self.journal.read_recovery_data()
+        assert recovered["nodes"]["n1"]["game_data"]["text"] == "Node 1"
+    
+    def test_compaction_writes_base_file(self):
+        """Test that compaction produces a full project and truncates the journal."""
+        self.journal.compact_every = 4
+        self.state_manager.save_state("Initial State")
+        for i in range(3):
+            self.app.nodes["n0"].text = f"Version {i}"
+            self.state_manager.save_state("Edit")
+        self.journal.flush()
+        
+        assert os.path.exists(self.journal.base_path)
+        assert self._journal_lines() == []
+        assert self.journal.read_recovery_data()["nodes"]["n0"]["game_data"]["text"] == "Version 2"
+    
+    def test_ignores_torn_last_line(self):
+        """Test that a partially written entry from a crash is skipped."""
+        self.state_manager.save_state("Initial State")
+        self.journal.flush()
+        with open(self.journal.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"seq": 2, "nodes": {"n1"')
+        
+        recovered = self.journal.read_recovery_data()
+        assert len(recovered["nodes"]) == 10
+    
+    def test_reset_discards_recovery_data(self):
+        """Test that reset removes the journal and starts over in full."""
+        self.state_manager.save_state("Initial State")
+        self.journal.flush()
+        self.journal.reset()
+        
+        assert self.journal.read_recovery_data() is None
+        
+        self.app.nodes["n1"].text = "After save"
+        self.state_manager.save_state("Edit")
+        self.journal.flush()
+        
+        assert '"full":true' in self._journal_lines()[0]
+
+
+class TestAutosaveSessions:
+    """Test cases for per-editor journal directories."""
+
+    def _write_session(self, root):
+        journal = AutosaveJournal.for_session(root)
+        journal.record({"nodes": {"n1": {"editor_data": {"id": "n1"}}}, "action_name": "Edit"})
+        journal.flush()
+        return journal
+
+    def test_sessions_do_not_share_a_journal(self, tmp_path):
+        """Test that two running editors write separate journals."""
+        root = str(tmp_path)
+        first, second = self._write_session(root), self._write_session(root)
+        try:
+            assert first.journal_path != second.journal_path
+            assert AutosaveJournal.find_recoverable(root) is None
+            assert first.read_recovery_data()["nodes"]
+        finally:
+            first.discard()
+            second.discard()
+
+    def test_journal_of_ended_session_is_kept_until_discarded(self, tmp_path):
+        """Test that a crashed session is recovered, claimed and only deleted by discard()."""
+        root = str(tmp_path)
+        crashed = self._write_session(root)
+        # A crash leaves the files behind and the OS releases the lock
+        crashed.close()
+        crashed._lock_file.close()
+
+        recoverable = AutosaveJournal.find_recoverable(root)
+        assert recoverable.directory == crashed.directory
+        assert recoverable.read_recovery_data()["nodes"]
+        assert AutosaveJournal.find_recoverable(root) is None
+
+        recoverable.discard()
+        assert not os.path.exists(crashed.directory)
+
+    def test_empty_sessions_are_removed(self, tmp_path):
+        """Test that ended sessions without anything to recover are cleaned up."""
+        root = str(tmp_path)
+        journal = AutosaveJournal.for_session(root)
+        journal._lock_file.close()
+
+        assert AutosaveJournal.find_recoverable(root) is None
+        assert os.listdir(root) == []
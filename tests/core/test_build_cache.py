@@ -0,0 +1,125 @@
+import pytest
+import sys
+import os
+import json
+from unittest.mock import Mock, patch
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.build_cache import BuildCache
+from dvge.core.asset_table import ExportAssetTable
+from dvge.core.html_exporter import HTMLExporter
+from dvge.models import DialogueNode
+
+
+class TestBuildCache:
+    """Test cases for the on-disk export build cache."""
+
+    def test_node_round_trip(self, tmp_path):
+        """Test that stored node JSON is returned for the same key."""
+        cache = BuildCache(str(tmp_path))
+        cache.put_node("ab" * 32, '{"text": "Hi"}')
+
+        assert BuildCache(str(tmp_path)).get_node("ab" * 32) == '{"text": "Hi"}'
+        assert cache.get_node("cd" * 32) is None
+
+    def test_asset_invalidated_when_file_changes(self, tmp_path):
+        """Test that cached assets are only used while the file is unchanged."""
+        path = tmp_path / "bg.png"
+        path.write_bytes(b"old")
+        cache = BuildCache(str(tmp_path / "cache"))
+        cache.put_asset(str(path), "image/png", "digest", "data:image/png;base64,b2xk")
+        cache.save()
+
+        reloaded = BuildCache(str(tmp_path / "cache"))
+        assert reloaded.get_asset(str(path), "image/png") == ("digest", "data:image/png;base64,b2xk")
+
+        path.write_bytes(b"newer")
+        assert reloaded.get_asset(str(path), "image/png") is None
+
+    def test_prune_removes_old_entries(self, tmp_path):
+        """Test that entries unused for longer than max_age are removed."""
+        cache = BuildCache(str(tmp_path))
+        cache.put_node("ab" * 32, "{}")
+
+        assert cache.prune(max_age=3600) == 0
+        assert cache.prune(max_age=-1) == 1
+        assert cache.get_node("ab" * 32) is None
+
+
+class TestIncrementalExport:
+    """Test cases for reusing cached nodes between exports."""
+
+    def setup_method(self):
+        self.nodes = {
+            f"node_{i}": DialogueNode(0, 0, f"node_{i}", text=f"Hello {{gold}} {i}",
+                                      options=[{"text": "Pay {gold}", "nextNode": "node_0"}])
+            for i in range(5)
+        }
+        self.exporter = HTMLExporter.__new__(HTMLExporter)
+        self.exporter.app = Mock(nodes=self.nodes, story_flags={}, variables={"gold": 7},
+                                 media_library=None)
+        self.exporter._build_cache_pruned = False
+
+    def _build(self, cache):
+        return self.exporter._build_dialogue_json(ExportAssetTable(cache=cache))
+
+    def test_only_changed_nodes_are_processed(self, tmp_path):
+        """Test that a re-export processes only edited nodes."""
+        cache = BuildCache(str(tmp_path))
+        first = self._build(cache)
+
+        self.nodes["node_3"].text = "Changed"
+        with patch.object(HTMLExporter, '_process_node_data',
+                          wraps=self.exporter._process_node_data) as process:
+            second = self._build(BuildCache(str(tmp_path)))
+
+        assert [call.args[0] for call in process.call_args_list] == ["node_3"]
+        first_data, second_data = json.loads(first), json.loads(second)
+        assert second_data["node_3"]["text"] == "Changed"
+        assert second_data["node_1"] == first_data["node_1"]
+        assert second_data["node_1"]["text"] == "Hello 7 1"
+
+    def test_in_place_option_edit_invalidates_node(self, tmp_path):
+        """Test that conditions edited in place, without touch(), are exported anew."""
+        self.nodes["node_1"].options[0]["conditions"] = [
+            {"type": "variable", "subject": "gold", "operator": ">=", "value": 5}
+        ]
+        self._build(BuildCache(str(tmp_path)))
+        self.nodes["node_1"].options[0]["conditions"][0]["value"] = 50
+
+        data = json.loads(self._build(BuildCache(str(tmp_path))))
+
+        assert data["node_1"]["options"][0]["conditions"][0]["value"] == 50
+
+    def test_variable_change_invalidates_nodes(self, tmp_path):
+        """Test that substitution inputs are part of the cache key."""
+        self._build(BuildCache(str(tmp_path)))
+        self.exporter.app.variables = {"gold": 9}
+
+        data = json.loads(self._build(BuildCache(str(tmp_path))))
+
+        assert data["node_2"]["text"] == "Hello 9 2"
+
+    def test_media_change_invalidates_nodes(self, tmp_path):
+        """Test that editing a referenced file invalidates the nodes using it."""
+        image = tmp_path / "bg.png"
+        image.write_bytes(b"first")
+        self.nodes["node_0"].backgroundImage = str(image)
+        cache_dir = str(tmp_path / "cache")
+        first_ref = json.loads(self._build(BuildCache(cache_dir)))["node_0"]["backgroundImage"]
+
+        image.write_bytes(b"second version")
+        os.utime(image, ns=(1, 1))
+        table = ExportAssetTable(cache=BuildCache(cache_dir))
+        data = json.loads(self.exporter._build_dialogue_json(table))
+
+        assert data["node_0"]["backgroundImage"] != first_ref
+        assert table.resolve(data["node_0"]["backgroundImage"]).endswith("c2Vjb25kIHZlcnNpb24=")
+
+    def test_export_does_not_change_node_options(self, tmp_path):
+        """Test that substitution leaves the editor's option text untouched."""
+        self._build(None)
+
+        assert self.nodes["node_0"].options[0]["text"] == "Pay {gold}"
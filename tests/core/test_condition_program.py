@@ -0,0 +1,191 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.condition_evaluator import ConditionEvaluator
+from dvge.core.condition_program import (
+    ConditionProgramCache, ConditionState, NodeConditionProgram,
+    compile_condition, evaluate_project, option_availability
+)
+from dvge.models import DialogueNode
+
+
+def stat(subject, operator, value):
+    return {'type': 'stat', 'subject': subject, 'operator': operator, 'value': value}
+
+
+class TestCompiledConditions:
+    """Test cases for compiled option conditions."""
+
+    def setup_method(self):
+        self.state = ConditionState(
+            stats={'health': 50, 'title': 'knight'},
+            inventory=[{'name': 'Key', 'description': ''}],
+            flags={'met_king': True},
+            quests={'rescue': {'state': 'active'}},
+            variables={'gold': 30, 'price': 25},
+        )
+
+    def test_stat_comparisons(self):
+        """Test numeric comparisons and the text fallback for non-numbers."""
+        assert compile_condition(stat('health', '>=', '50'))(self.state)
+        assert not compile_condition(stat('health', '<', 50))(self.state)
+        assert compile_condition(stat('missing', '==', 0))(self.state)
+        assert compile_condition(stat('title', '==', 'knight'))(self.state)
+        assert not compile_condition(stat('health', '~', 50))(self.state)
+
+    def test_items_flags_and_quests(self):
+        """Test inventory, flag and quest conditions."""
+        assert compile_condition({'type': 'item', 'subject': 'Key', 'operator': 'has'})(self.state)
+        assert compile_condition({'type': 'item', 'subject': 'Map', 'operator': 'not_has'})(self.state)
+        assert compile_condition({'type': 'flag', 'subject': 'met_king', 'operator': 'is', 'value': 'True'})(self.state)
+        assert compile_condition({'type': 'flag', 'subject': 'other', 'operator': 'is_not', 'value': True})(self.state)
+        assert compile_condition({'type': 'quest', 'subject': 'rescue', 'operator': 'is', 'value': 'active'})(self.state)
+        assert compile_condition({'type': 'quest', 'subject': 'lost', 'operator': 'is', 'value': 'inactive'})(self.state)
+
+    def test_variable_with_expression_value(self):
+        """Test that variable values referring to other variables use the current state."""
+        condition = {'type': 'variable', 'subject': 'gold', 'operator': '>=', 'value': '{price}'}
+        test = compile_condition(condition)
+
+        assert test(self.state)
+        self.state.variables['price'] = 40
+        assert not test(self.state)
+
+    def test_node_program_shares_repeated_conditions(self):
+        """Test that a condition used by several options is checked once."""
+        shared = stat('health', '>', 10)
+        program = NodeConditionProgram([
+            {'text': 'A', 'conditions': [shared]},
+            {'text': 'B', 'conditions': [dict(shared), stat('health', '>', 90)]},
+            {'text': 'C'},
+        ])
+
+        assert len(program.tests) == 2
+        assert program.evaluate(self.state) == [True, False, True]
+
+    def test_values_of_different_types_are_not_shared(self):
+        """Test that True and 1 compile to separate flag tests."""
+        program = NodeConditionProgram([
+            {'conditions': [{'type': 'flag', 'subject': 'met_king', 'operator': 'is', 'value': True}]},
+            {'conditions': [{'type': 'flag', 'subject': 'met_king', 'operator': 'is', 'value': 1}]},
+        ])
+
+        assert program.evaluate(self.state) == [True, False]
+
+
+class TestConditionProgramCache:
+    """Test cases for per-node program caching."""
+
+    def test_recompiles_after_touch(self):
+        """Test that editing options in place and touching the node recompiles it."""
+        node = DialogueNode(0, 0, "n1", options=[{'text': 'Go', 'conditions': [stat('health', '>', 10)]}])
+        cache = ConditionProgramCache()
+        state = ConditionState(stats={'health': 5})
+
+        program = cache.get(node)
+        assert cache.get(node) is program
+        assert program.evaluate(state) == [False]
+
+        node.options[0]['conditions'][0]['value'] = 1
+        node.touch()
+        assert cache.get(node).evaluate(state) == [True]
+
+    def test_recompiles_after_in_place_edit(self):
+        """Test that conditions edited in place without touching the node are recompiled."""
+        node = DialogueNode(0, 0, "n1", options=[{'text': 'Go', 'conditions': [stat('health', '>', 10)]}])
+        cache = ConditionProgramCache()
+        state = ConditionState(stats={'health': 5})
+
+        assert cache.get(node).evaluate(state) == [False]
+        node.options[0]['conditions'][0]['value'] = 1
+        assert cache.get(node).evaluate(state) == [True]
+
+
+class TestBatchEvaluation:
+    """Test cases for evaluating every option against many saved states."""
+
+    def test_evaluate_project(self):
+        """Test per-state results and availability fractions."""
+        nodes = {
+            'intro': DialogueNode(0, 0, 'intro', options=[
+                {'text': 'Pay', 'conditions': [{'type': 'variable', 'subject': 'gold', 'operator': '>=', 'value': 10}]},
+                {'text': 'Open', 'conditions': [{'type': 'item', 'subject': 'Key', 'operator': 'has'}]},
+            ]),
+            'end': DialogueNode(0, 0, 'end'),
+        }
+        states = [
+            {'variables': {'gold': 20}, 'player_inventory': [{'name': 'Key'}]},
+            {'variables': {'gold': 5}, 'player_inventory': []},
+            ConditionState(variables={'gold': 50}),
+        ]
+
+        results = evaluate_project(nodes, states)
+
+        assert results == {'intro': [[True, True], [False, False], [True, False]]}
+        assert option_availability(results)['intro'] == pytest.approx([2 / 3, 1 / 3])
+
+
+class TestPreviewEngineConditions:
+    """Test cases for option gating in the preview engine."""
+
+    def test_available_options_follow_state(self):
+        """Test that the preview only offers options whose conditions are met."""
+        from dvge.core.preview_engine import EnhancedPreviewGameEngine
+
+        node = DialogueNode(0, 0, 'intro', text="Hi", options=[
+            {'text': 'Strong', 'nextNode': 'a', 'conditions': [stat('strength', '>=', 5)]},
+            {'text': 'Any', 'nextNode': 'b'},
+        ])
+        app = Mock(nodes={'intro': node}, player_stats={'strength': 3}, player_inventory=[],
+                   story_flags={}, variables={}, quests={})
+        with patch.object(EnhancedPreviewGameEngine, '_initialize_feature_systems'):
+            engine = EnhancedPreviewGameEngine(app)
+
+        assert [o['text'] for o in engine._process_node_for_preview(node)['options']] == ['Any']
+        engine.player_stats['strength'] = 7
+        assert [o['text'] for o in engine._process_node_for_preview(node)['options']] == ['Strong', 'Any']
+
+
+class TestConditionEvaluatorLists:
+    """Test cases for compiled ConditionEvaluator condition lists."""
+
+    def setup_method(self):
+        self.evaluator = ConditionEvaluator()
+        self.conditions = [
+            {'variable': 'gold', 'operator': '>=', 'value': '10', 'data_type': 'number'},
+            {'variable': 'name', 'operator': 'starts_with', 'value': 'a'},
+        ]
+
+    def test_list_logic(self):
+        """Test AND and OR logic over compiled conditions."""
+        assert self.evaluator.evaluate_conditions_list(self.conditions, context={'gold': 12, 'name': 'Ann'})
+        assert not self.evaluator.evaluate_conditions_list(self.conditions, context={'gold': 2, 'name': 'Ann'})
+        assert self.evaluator.evaluate_conditions_list(self.conditions, "OR", {'gold': 2, 'name': 'Ann'})
+
+    def test_compiled_once_and_negation(self):
+        """Test that equal conditions share a compiled test and negation applies."""
+        first = self.evaluator.compile_condition(dict(self.conditions[0]))
+        assert self.evaluator.compile_condition(dict(self.conditions[0])) is first
+
+        negated = dict(self.conditions[0], negated=True)
+        assert self.evaluator.evaluate_condition(negated, {'gold': 2})
+
+    def test_variable_reference_value(self):
+        """Test comparison against another variable written as $name."""
+        condition = {'variable': 'gold', 'operator': '>', 'value': '$price', 'data_type': 'number'}
+
+        assert self.evaluator.evaluate_condition(condition, {'gold': 5, 'price': 3})
+        assert not self.evaluator.evaluate_condition(condition, {'gold': 5, 'price': 8})
+
+    def test_batch(self):
+        """Test evaluating one condition list against many contexts."""
+        contexts = [{'gold': 12, 'name': 'Ann'}, {'gold': 12, 'name': 'Bob'}, {'gold': 1, 'name': 'Al'}]
+
+        assert self.evaluator.evaluate_conditions_batch(self.conditions, contexts) == [True, False, False]
+        assert self.evaluator.evaluate_conditions_batch(self.conditions, contexts, "OR") == [True, True, True]
+        assert self.evaluator.evaluate_conditions_batch([], contexts) == [True, True, True]
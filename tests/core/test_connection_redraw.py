@@ -0,0 +1,57 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+pytest.importorskip("customtkinter")
+
+from dvge.core.graph_index import GraphIndex
+from dvge.core.node_map import LazyNodeMap
+from dvge.models.dialogue_node import DialogueNode
+from dvge.ui.canvas.connection_renderer import ConnectionRenderer
+from unittest.mock import Mock
+
+
+def make_node(node_id, *targets):
+    return DialogueNode(0, 0, node_id, text="Line",
+                        options=[{"text": "Next", "nextNode": target} for target in targets])
+
+
+class TestDrawConnectionsFor:
+    """Test cases for redrawing the connections of changed nodes."""
+
+    def setup_method(self):
+        """Set up a renderer on a fake canvas that records which nodes draw links."""
+        self.canvas = Mock()
+        self.canvas.create_line.side_effect = iter(range(1, 1000))
+        self.renderer = ConnectionRenderer(self.canvas)
+        self.drawn = []
+        draw_links = self.renderer._draw_links
+        self.renderer._draw_links = lambda node, *args, **kwargs: (
+            self.drawn.append(node.id), draw_links(node, *args, **kwargs))
+
+    def test_only_predecessors_are_redrawn(self):
+        """Test that incoming links come from the graph index, not from every node."""
+        nodes = {"a": make_node("a", "b"), "b": make_node("b", "c"), "c": make_node("c"),
+                 "other": make_node("other", "c")}
+        index = GraphIndex()
+        index.sync(nodes)
+
+        self.renderer.draw_connections_for(nodes, ["b"], index)
+
+        assert sorted(self.drawn) == ["a", "b"]
+        assert set(self.renderer._edges) == {("a", 0), ("b", 0)}
+
+    def test_unbuilt_predecessors_are_skipped(self):
+        """Test that lazily loaded predecessors are not built to redraw their links."""
+        nodes = LazyNodeMap({"a": make_node("a", "b").to_dict()})
+        nodes["b"] = make_node("b")
+        index = GraphIndex()
+        index.sync(nodes)
+
+        self.renderer.draw_connections_for(nodes, ["b"], index)
+
+        assert self.drawn == ["b"]
+        assert nodes.unmaterialized_count == 1
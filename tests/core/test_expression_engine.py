@@ -0,0 +1,95 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.expression_engine import (
+    PLACEHOLDER_BRACES, PLACEHOLDER_DOLLAR, ExpressionError, UnknownName,
+    compile_expression, evaluate_expression, mapping_lookup
+)
+from dvge.core.condition_evaluator import ConditionEvaluator
+
+
+class TestExpressionEngine:
+    """Test cases for the compiled expression engine."""
+
+    def setup_method(self):
+        self.lookup = mapping_lookup({"gold": 120, "level": 7, "name": "Ann"}, {"has_key": True})
+
+    def test_arithmetic_and_comparisons(self):
+        """Test operators, precedence and chained comparisons."""
+        assert evaluate_expression("gold * 2 + level % 4", self.lookup) == 243
+        assert evaluate_expression("1 < level <= 7", self.lookup) is True
+        assert evaluate_expression("-level ** 2", self.lookup) == -49
+        assert evaluate_expression("gold if has_key else 0", self.lookup) == 120
+
+    def test_placeholders(self):
+        """Test {name} and ${name} variable references."""
+        assert evaluate_expression("{gold} / {level}", self.lookup, placeholder=PLACEHOLDER_BRACES) == 120 / 7
+        assert evaluate_expression("${name} == 'Ann'", self.lookup, placeholder=PLACEHOLDER_DOLLAR) is True
+
+    def test_functions_must_be_provided(self):
+        """Test that only functions passed in can be called."""
+        assert evaluate_expression("max(level, 10)", self.lookup, {"max": max}) == 10
+        with pytest.raises(ExpressionError):
+            evaluate_expression("max(level, 10)", self.lookup)
+
+    def test_unsafe_expressions_are_rejected(self):
+        """Test that attribute access, dunder names and lambdas do not compile."""
+        for source in ("().__class__", "lambda: 1", "[x for x in y]", "a.b", "__builtins__"):
+            assert compile_expression(source).error
+        with pytest.raises(ExpressionError):
+            evaluate_expression("__import__('os')", self.lookup)
+
+    def test_huge_exponents_are_rejected(self):
+        """Test that ** cannot be used to stall evaluation."""
+        with pytest.raises(ExpressionError):
+            evaluate_expression("10 ** 10 ** 10", self.lookup)
+
+    def test_unknown_names(self):
+        """Test strict and lenient handling of unknown names."""
+        with pytest.raises(UnknownName):
+            evaluate_expression("missing + 1", self.lookup)
+        assert evaluate_expression("missing", self.lookup, lenient=True) is None
+        assert evaluate_expression("name == Ann", self.lookup, lenient=True) is True
+        assert evaluate_expression("level >= '5'", self.lookup, lenient=True) is True
+        assert evaluate_expression("TRUE and has_key", self.lookup, lenient=True) is True
+
+    def test_compiled_once(self):
+        """Test that compiled expressions are cached and reusable with new values."""
+        compiled = compile_expression("gold + 1")
+
+        assert compile_expression("gold + 1") is compiled
+        assert compiled.evaluate(mapping_lookup({"gold": 1})) == 2
+        assert compiled.evaluate(mapping_lookup({"gold": 5})) == 6
+        assert compiled.names == ("gold",)
+
+    def test_syntax_errors_are_reported(self):
+        """Test that invalid expressions compile with an error instead of raising."""
+        compiled = compile_expression("gold +")
+
+        assert compiled.error
+        with pytest.raises(ExpressionError):
+            compiled.evaluate(self.lookup)
+
+
+class TestConditionEvaluatorExpressions:
+    """Test cases for ConditionEvaluator expressions on the shared engine."""
+
+    def test_evaluate_expression(self):
+        """Test ${var} expressions with built-in functions."""
+        evaluator = ConditionEvaluator()
+        context = {"gold": 12, "name": "Ann"}
+
+        assert evaluator.evaluate_expression('${gold} > 10 and contains(${name}, "nn")', context) is True
+        assert evaluator.evaluate_expression("max(1, ${gold}) * 2", context) == 24
+        assert evaluator.evaluate_expression("open('x')", context) is False
+
+    def test_validate_expression(self):
+        """Test that syntax errors are reported by validation."""
+        evaluator = ConditionEvaluator()
+
+        assert evaluator.validate_expression("${a} + 1")["valid"]
+        assert not evaluator.validate_expression("${a} +")["valid"]
@@ -0,0 +1,98 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.graph_index import GraphIndex, extract_links, remove_links_to
+from dvge.core.node_map import LazyNodeMap
+from dvge.models import (
+    DialogueNode, DiceRollNode, ShopNode, TimerNode, RandomEventNode, ConditionalNode
+)
+
+
+class TestGraphIndex:
+    """Test cases for the node link index."""
+    
+    def setup_method(self):
+        """Set up a small graph covering several node types."""
+        dice = DiceRollNode(0, 0, "dice", success_node="shop", failure_node="end")
+        shop = ShopNode(0, 0, "shop", continue_node="timer")
+        timer = TimerNode(0, 0, "timer", next_node="random")
+        random_event = RandomEventNode(0, 0, "random")
+        random_event.random_outcomes = [{"weight": 1, "next_node": "branch"}]
+        branch = ConditionalNode(0, 0, "branch")
+        branch.true_node = "end"
+        branch.false_node = "missing"
+        self.nodes = {
+            "intro": DialogueNode(0, 0, "intro", options=[{"text": "Roll", "nextNode": "dice"}]),
+            "dice": dice, "shop": shop, "timer": timer, "random": random_event, "branch": branch,
+            "end": DialogueNode(0, 0, "end", options=[{"text": "Fin", "nextNode": "[End Game]"}]),
+            "lonely": DialogueNode(0, 0, "lonely"),
+        }
+        self.index = GraphIndex()
+        self.index.sync(self.nodes)
+    
+    def test_follows_all_node_types(self):
+        """Test that reachability covers special node link fields."""
+        reachable = self.index.reachable_from("intro")
+        
+        assert reachable == {"intro", "dice", "shop", "timer", "random", "branch", "end"}
+    
+    def test_reverse_links(self):
+        """Test "who links here" queries."""
+        assert self.index.predecessors("end") == {"dice", "branch"}
+        assert self.index.predecessors("lonely") == set()
+    
+    def test_broken_links_orphans_and_dead_ends(self):
+        """Test derived queries."""
+        assert self.index.broken_links() == [("branch", "false_node", None, "missing")]
+        assert self.index.orphans() == ["lonely"]
+        assert self.index.dead_ends() == ["lonely"]
+    
+    def test_sync_only_rereads_changed_nodes(self):
+        """Test that untouched nodes are not re-read."""
+        self.nodes["shop"].continue_node = "lonely"
+        self.nodes["intro"].options[0]["nextNode"] = "end"
+        self.nodes["intro"].touch()
+        
+        updated = self.index.sync(self.nodes)
+        
+        assert sorted(updated) == ["intro", "shop"]
+        assert self.index.predecessors("lonely") == {"shop"}
+        assert self.index.predecessors("dice") == set()
+    
+    def test_added_branch_is_indexed(self):
+        """Test that branches added through add_branch() are picked up by sync."""
+        self.nodes["branch"].add_branch("gold > 5", "lonely")
+        
+        assert self.index.sync(self.nodes) == ["branch"]
+        assert self.index.predecessors("lonely") == {"branch"}
+    
+    def test_removed_node_becomes_broken_target(self):
+        """Test that deleting a node updates both directions."""
+        del self.nodes["timer"]
+        
+        assert self.index.sync(self.nodes) == ["timer"]
+        assert ("shop", "continue_node", None, "timer") in self.index.broken_links()
+        assert "random" in self.index.orphans()
+    
+    def test_lazy_nodes_are_indexed_without_building(self):
+        """Test indexing serialized nodes of a lazily loaded project."""
+        lazy = LazyNodeMap({node_id: node.to_dict() for node_id, node in self.nodes.items()})
+        index = GraphIndex()
+        index.sync(lazy)
+        
+        assert lazy.unmaterialized_count == len(self.nodes)
+        assert index.predecessors("end") == {"dice", "branch"}
+        
+        lazy["intro"]
+        assert index.sync(lazy) == []
+    
+    def test_remove_links_to(self):
+        """Test clearing links of every kind that point at a node."""
+        assert remove_links_to(self.nodes["branch"], "end") is True
+        assert remove_links_to(self.nodes["branch"], "end") is False
+        assert self.nodes["branch"].true_node == ""
+        assert ("true_node", None, "end") not in extract_links(self.nodes["branch"])
@@ -0,0 +1,138 @@
+import pytest
+import sys
+import os
+import random
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.live_validation import LiveValidator, PROJECT_ISSUE_KEY
+from dvge.models.dialogue_node import DialogueNode
+from unittest.mock import Mock
+
+
+class TestLiveValidator:
+    """Test cases for incremental validation."""
+    
+    def setup_method(self):
+        """Set up a chain of nodes and a validator with a fake event loop."""
+        self.app = Mock(spec=['nodes', 'after'])
+        self.app.nodes = {
+            f"n{i}": DialogueNode(0, 0, f"n{i}", text=f"Line {i}",
+                                  options=[{"text": "Next", "nextNode": f"n{i + 1}"}])
+            for i in range(1, 6)
+        }
+        self.app.nodes["intro"] = DialogueNode(0, 0, "intro", text="Start",
+                                               options=[{"text": "Go", "nextNode": "n1"}])
+        self.app.nodes["n5"].options = []
+        
+        self.callbacks = []
+        self.app.after = lambda delay, func, *args: self.callbacks.append((func, args)) or len(self.callbacks)
+        
+        self.validator = LiveValidator(self.app)
+        self.published = []
+        self.validator.listeners.append(self.published.append)
+    
+    def _run_event_loop(self):
+        while self.callbacks:
+            func, args = self.callbacks.pop(0)
+            func(*args)
+    
+    def test_clean_project_has_no_issues(self):
+        """Test that a valid chain produces no issues."""
+        assert self.validator.validate_now() == {}
+    
+    def test_broken_link_and_unreachable(self):
+        """Test that errors and warnings are reported per node."""
+        self.app.nodes["n2"].options[0]["nextNode"] = "missing"
+        self.app.nodes["n2"].touch()
+        
+        issues = self.validator.validate_now()
+        
+        assert issues["n2"][0].severity == "error"
+        assert "missing" in issues["n2"][0].message
+        assert {"n3", "n4", "n5"} <= set(issues)
+        assert all(issue.severity == "warning" for issue in issues["n4"])
+    
+    def test_only_changed_nodes_are_rechecked(self):
+        """Test that an edit re-checks the node, not the whole project."""
+        self.validator.validate_now()
+        self.published.clear()
+        checked = []
+        original = self.validator._check_node
+        self.validator._check_node = lambda node_id, index: checked.append(node_id) or original(node_id, index)
+        
+        self.app.nodes["n3"].text = ""
+        self.validator.schedule()
+        self._run_event_loop()
+        
+        assert set(checked) == {"n3", "n2", PROJECT_ISSUE_KEY}
+        assert list(self.published[0]) == ["n3"]
+    
+    def test_deleting_target_flags_predecessor(self):
+        """Test that removing a node marks links into it as broken."""
+        self.validator.validate_now()
+        del self.app.nodes["n4"]
+        
+        self.validator.schedule()
+        self._run_event_loop()
+        
+        assert any("n4" in issue.message for issue in self.validator.issues["n3"])
+        assert "n4" not in self.validator.issues
+        assert "n5" in self.validator.issues
+    
+    def test_work_is_time_sliced(self):
+        """Test that a zero time budget spreads work over several loop turns."""
+        self.validator.time_budget = 0
+        self.app.nodes["intro"].options = []
+        
+        self.validator.schedule()
+        self._run_event_loop()
+        
+        assert len(self.published) > 1
+        assert set(self.validator.issues) == {f"n{i}" for i in range(1, 6)}
+    
+    def test_missing_intro_is_project_issue(self):
+        """Test the project-level error."""
+        del self.app.nodes["intro"]
+        
+        self.validator.validate_now()
+        errors, warnings = self.validator.get_errors_and_warnings()
+        
+        assert any("intro" in error for error in errors)
+    
+    def test_text_edit_skips_reachability_search(self):
+        """Test that edits leaving the links alone do not search the graph."""
+        self.validator.validate_now()
+        index = self.app.graph_index
+        index.reachable_from = Mock(side_effect=AssertionError("graph searched"))
+        
+        self.app.nodes["n3"].text = "Changed"
+        self.validator.validate_now()
+        
+        assert self.validator._reachable == {"intro", "n1", "n2", "n3", "n4", "n5"}
+    
+    def test_reachability_follows_link_edits(self):
+        """Test that reachability updated from changed links matches a full search."""
+        rng = random.Random(3)
+        for i in range(6, 40):
+            self.app.nodes[f"n{i}"] = DialogueNode(0, 0, f"n{i}", text="Line", npc="NPC")
+        self.validator.validate_now()
+        
+        for step in range(200):
+            node_ids = list(self.app.nodes)
+            node_id = rng.choice(node_ids)
+            action = rng.random()
+            if action < 0.1 and node_id != "intro":
+                del self.app.nodes[node_id]
+            elif action < 0.2:
+                new_id = f"extra{step}"
+                self.app.nodes[new_id] = DialogueNode(0, 0, new_id, text="Line", npc="NPC")
+            else:
+                self.app.nodes[node_id].options = [
+                    {"text": "Next", "nextNode": rng.choice(node_ids + ["missing"])}
+                    for _ in range(rng.randrange(3))
+                ]
+            self.validator.validate_now()
+            
+            assert self.validator._reachable == self.app.graph_index.reachable_from("intro")
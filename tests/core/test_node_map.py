@@ -0,0 +1,70 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.node_map import LazyNodeMap, iter_materialized
+from dvge.models.dialogue_node import DialogueNode
+
+
+class TestLazyNodeMap:
+    """Test cases for lazily materialized node maps."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.raw = {
+            f"node_{i}": DialogueNode(i * 100, 50, f"node_{i}", text=f"Line {i}",
+                                      options=[{"text": "Go", "nextNode": "node_0"}]).to_dict()
+            for i in range(5)
+        }
+        self.nodes = LazyNodeMap(self.raw)
+    
+    def test_ids_without_materializing(self):
+        """Test that len, membership and iteration leave nodes unbuilt."""
+        assert len(self.nodes) == 5
+        assert "node_2" in self.nodes
+        assert "missing" not in self.nodes
+        assert list(self.nodes) == list(self.raw)
+        assert self.nodes.unmaterialized_count == 5
+        assert self.nodes.peek_position("node_3") == (300, 50)
+    
+    def test_access_materializes_once(self):
+        """Test that indexing builds the node and caches it."""
+        node = self.nodes["node_1"]
+        
+        assert isinstance(node, DialogueNode)
+        assert node.text == "Line 1"
+        assert self.nodes["node_1"] is node
+        assert self.nodes.is_materialized("node_1")
+        assert self.nodes.unmaterialized_count == 4
+        assert [nid for nid, _ in iter_materialized(self.nodes)] == ["node_1"]
+    
+    def test_materialized_node_does_not_alias_raw_data(self):
+        """Test that editing a built node leaves the loaded data untouched."""
+        self.nodes["node_0"].options[0]["text"] = "Changed"
+        
+        assert self.raw["node_0"]["game_data"]["options"][0]["text"] == "Go"
+    
+    def test_unchanged_since_load(self):
+        """Test that attribute edits are noticed on built nodes."""
+        assert self.nodes.is_unchanged_since_load("node_4")
+        node = self.nodes["node_4"]
+        assert self.nodes.is_unchanged_since_load("node_4")
+        
+        node.text = "Edited"
+        
+        assert not self.nodes.is_unchanged_since_load("node_4")
+    
+    def test_set_and_delete(self):
+        """Test that assigned nodes replace raw data and deletes work unbuilt."""
+        replacement = DialogueNode(0, 0, "node_2", text="New")
+        self.nodes["node_2"] = replacement
+        del self.nodes["node_3"]
+        
+        assert self.nodes["node_2"] is replacement
+        assert not self.nodes.is_unchanged_since_load("node_2")
+        assert "node_3" not in self.nodes
+        with pytest.raises(KeyError):
+            self.nodes["node_3"]
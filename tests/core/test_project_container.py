@@ -0,0 +1,160 @@
+import json
+import pytest
+import sys
+import os
+import zipfile
+from unittest.mock import Mock, patch
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.project_container import (
+    ProjectContainerReader, is_container_file, read_project_file, write_project_container
+)
+from dvge.core.project_handler import ProjectHandler
+from dvge.models import create_node_from_dict
+from dvge.models.dialogue_node import DialogueNode
+
+
+class TestProjectContainer:
+    """Test cases for the chunked project container format."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.nodes = {
+            f"node_{i}": DialogueNode(i * 10, 20, f"node_{i}", text=f"Line {i}",
+                                      options=[{"text": "Go", "nextNode": f"node_{i + 1}"}])
+            for i in range(25)
+        }
+        self.project_data = {
+            "version": "1.0.0",
+            "player_stats": {"health": 100},
+            "story_flags": {"met_guard": True},
+            "node_id_counter": 25
+        }
+    
+    def _node_items(self):
+        return ((node_id, node.to_dict()) for node_id, node in self.nodes.items())
+    
+    def test_round_trip(self, tmp_path):
+        """Test that a container reads back the same project data."""
+        path = str(tmp_path / "story.dvgz")
+        count = write_project_container(path, self.project_data, self._node_items(), chunk_size=10)
+        
+        assert count == 25
+        loaded = read_project_file(path)
+        assert loaded["player_stats"] == {"health": 100}
+        assert loaded["nodes"] == {nid: n.to_dict() for nid, n in self.nodes.items()}
+        
+        node = create_node_from_dict(loaded["nodes"]["node_3"])
+        assert node.text == "Line 3"
+        assert node.options[0]["nextNode"] == "node_4"
+    
+    def test_nodes_are_chunked(self, tmp_path):
+        """Test that nodes are split across chunks in order."""
+        path = str(tmp_path / "story.dvgz")
+        write_project_container(path, self.project_data, self._node_items(), chunk_size=10)
+        
+        with ProjectContainerReader(path) as reader:
+            assert reader.node_count == 25
+            sizes = [len(chunk) for chunk in reader.iter_node_chunks()]
+            assert "nodes" not in reader.read_project_data()
+        
+        assert sizes == [10, 10, 5]
+    
+    def test_container_detection(self, tmp_path):
+        """Test that containers and plain JSON projects are told apart."""
+        container_path = str(tmp_path / "story.dvgz")
+        json_path = str(tmp_path / "story.dvgproj")
+        write_project_container(container_path, self.project_data, self._node_items())
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(self.project_data, nodes={}), f)
+        
+        assert is_container_file(container_path) is True
+        assert is_container_file(json_path) is False
+        assert read_project_file(json_path)["node_id_counter"] == 25
+    
+    def test_rejects_unrelated_zip(self, tmp_path):
+        """Test that a zip without a manifest is not accepted."""
+        path = str(tmp_path / "other.zip")
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr("readme.txt", "hello")
+        
+        with pytest.raises(ValueError):
+            ProjectContainerReader(path)
+    
+    def test_failed_write_keeps_existing_file(self, tmp_path):
+        """Test that an error while writing leaves the previous save intact."""
+        path = str(tmp_path / "story.dvgz")
+        write_project_container(path, self.project_data, self._node_items())
+        
+        def broken_items():
+            yield "node_0", self.nodes["node_0"].to_dict()
+            raise RuntimeError("serialization failed")
+        
+        with pytest.raises(RuntimeError):
+            write_project_container(path, self.project_data, broken_items())
+        
+        assert read_project_file(path)["node_id_counter"] == 25
+        assert os.listdir(tmp_path) == ["story.dvgz"]
+
+
+class TestProgressiveLoad:
+    """Test cases for loading a container chunk by chunk."""
+
+    def setup_method(self):
+        """Set up a handler for a headless stand-in of the editor."""
+        self.app = Mock(nodes={})
+        self.app.media_library = None
+        self.app.after.side_effect = lambda delay, callback, *args: self.scheduled.append((callback, args))
+        self.scheduled = []
+        self.handler = ProjectHandler(self.app)
+
+    def _write(self, path):
+        nodes = {f"node_{i}": DialogueNode(0, 0, f"node_{i}") for i in range(25)}
+        write_project_container(path, {"node_id_counter": 25},
+                                ((node_id, node.to_dict()) for node_id, node in nodes.items()),
+                                chunk_size=10)
+
+    def _run_scheduled(self):
+        while self.scheduled:
+            callback, args = self.scheduled.pop(0)
+            callback(*args)
+
+    @patch('dvge.core.project_handler.messagebox')
+    def test_loads_remaining_chunks(self, messagebox, tmp_path):
+        """Test that all chunks are added and loading then ends."""
+        path = str(tmp_path / "story.dvgz")
+        self._write(path)
+        self.handler._load_project_container(path)
+
+        assert len(self.app.nodes) == 10
+        assert self.handler.is_loading
+        self._run_scheduled()
+        assert len(self.app.nodes) == 25
+        assert not self.handler.is_loading
+
+    @patch('dvge.core.project_handler.filedialog')
+    @patch('dvge.core.project_handler.messagebox')
+    def test_save_is_refused_while_loading(self, messagebox, filedialog, tmp_path):
+        """Test that a partly loaded project is not saved."""
+        path = str(tmp_path / "story.dvgz")
+        self._write(path)
+        self.handler._load_project_container(path)
+
+        assert self.handler.save_project() is False
+        filedialog.asksaveasfilename.assert_not_called()
+
+    @patch('dvge.core.project_handler.messagebox')
+    def test_cancel_loading(self, messagebox, tmp_path):
+        """Test that a project replaced during loading gets no more chunks."""
+        path = str(tmp_path / "story.dvgz")
+        self._write(path)
+        self.handler._load_project_container(path)
+
+        self.handler.cancel_loading()
+        self.app.nodes = {}
+        self._run_scheduled()
+
+        assert self.app.nodes == {}
+        assert not self.handler.is_loading
@@ -0,0 +1,123 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.redraw_scheduler import RedrawScheduler
+from unittest.mock import Mock
+
+
+class TestRedrawScheduler:
+    """Test cases for coalescing redraw requests."""
+
+    def setup_method(self):
+        """Set up a scheduler with a fake event loop."""
+        self.app = Mock(spec=['after_idle', 'after_cancel'])
+        self.callbacks = []
+        self.app.after_idle = lambda func, *args: self.callbacks.append((func, args)) or len(self.callbacks)
+
+        self.batches = []
+        self.scheduler = RedrawScheduler(self.app, self.batches.append)
+
+    def _run_event_loop(self):
+        while self.callbacks:
+            func, args = self.callbacks.pop(0)
+            func(*args)
+
+    def test_requests_are_merged_into_one_flush(self):
+        """Test that a burst of requests is performed once."""
+        for node_id in ["a", "b", "a"]:
+            self.scheduler.request_nodes([node_id])
+            self.scheduler.request_connections([node_id])
+            self.scheduler.request_selection()
+            self.scheduler.request_properties()
+
+        assert self.scheduler.pending
+        assert len(self.callbacks) == 1
+        assert self.batches == []
+
+        self._run_event_loop()
+        assert len(self.batches) == 1
+        batch = self.batches[0]
+        assert batch.nodes == {"a", "b"}
+        assert batch.connection_nodes == {"a", "b"}
+        assert batch.all_selection and batch.properties
+        assert not batch.full and not batch.all_connections
+        assert not self.scheduler.pending
+
+    def test_full_redraw_absorbs_canvas_work(self):
+        """Test that a full redraw replaces node and connection requests."""
+        self.scheduler.request_nodes(["a"])
+        self.scheduler.request_region((0, 0, 100, 100))
+        self.scheduler.request_full_redraw()
+        self.scheduler.request_properties()
+        self._run_event_loop()
+
+        batch = self.batches[0]
+        assert batch.full and batch.properties
+        assert not batch.nodes and not batch.regions
+        assert self.scheduler.get_stats()['coalesced_by_kind']['nodes'] == 1
+
+    def test_stats(self):
+        """Test the request, flush and coalescing counters."""
+        for _ in range(10):
+            self.scheduler.request_nodes(["a"])
+        self.scheduler.request_connections()
+        self._run_event_loop()
+        self.scheduler.request_nodes(["b"])
+        self._run_event_loop()
+
+        stats = self.scheduler.get_stats()
+        assert stats['requests'] == 12
+        assert stats['flushes'] == 2
+        assert stats['coalesced'] == 9
+        assert stats['requests_by_kind']['nodes'] == 11
+
+        self.scheduler.reset_stats()
+        assert self.scheduler.get_stats()['requests'] == 0
+
+    def test_flush_now(self):
+        """Test performing pending work synchronously."""
+        self.scheduler.request_nodes(["a"])
+        self.scheduler.flush()
+        assert len(self.batches) == 1
+        self.app.after_cancel.assert_called_once()
+
+        # The cancelled idle callback finds nothing to do
+        self._run_event_loop()
+        assert len(self.batches) == 1
+        assert self.scheduler.get_stats()['flushes'] == 1
+
+    def test_discard_canvas_work_keeps_properties(self):
+        """Test dropping canvas work after the canvas was redrawn directly."""
+        self.scheduler.request_nodes(["a"])
+        self.scheduler.request_properties()
+        self.scheduler.discard_canvas_work()
+        self._run_event_loop()
+
+        assert len(self.batches) == 1
+        assert self.batches[0].properties
+        assert not self.batches[0].nodes
+
+    def test_requests_made_while_flushing(self):
+        """Test that work requested by the handler runs in the next idle turn."""
+        def handler(batch):
+            self.batches.append(batch)
+            if len(self.batches) == 1:
+                self.scheduler.request_selection(["a"])
+
+        self.scheduler.handler = handler
+        self.scheduler.request_nodes(["a"])
+        self.callbacks.pop(0)[0]()
+        assert len(self.batches) == 1
+        assert len(self.callbacks) == 1
+
+        self._run_event_loop()
+        assert self.batches[1].selection_nodes == {"a"}
+
+    def test_empty_requests_are_ignored(self):
+        """Test that requesting no nodes schedules nothing."""
+        self.scheduler.request_nodes([])
+        assert not self.scheduler.pending
@@ -0,0 +1,136 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core import script_fallback_worker
+from dvge.core.script_engine import ScriptEngine, ScriptExecutionResult
+from dvge.core.script_fallback_worker import FallbackWorker
+from dvge.models.script_node import ScriptNode
+
+
+class TestScriptEngineFallback:
+    """Test cases for the Python fallback used without Node.js."""
+
+    def setup_method(self):
+        self.engine = ScriptEngine()
+        self.engine.nodejs_available = False
+
+    def test_scripts_are_compiled_once(self):
+        """Test that converted scripts are cached by source."""
+        with patch.object(self.engine, '_convert_js_to_python',
+                          wraps=self.engine._convert_js_to_python) as convert:
+            for value in range(3):
+                result = self.engine.execute_script('return x + 1', {'x': value})
+                assert result.success
+                assert result.result == value + 1
+        assert convert.call_count == 1
+
+    def test_execute_batch(self):
+        """Test batches falling back to one execution per call."""
+        results = self.engine.execute_batch('return x * 2', [{'x': 1}, {'x': 4}])
+        assert [result.result for result in results] == [2, 8]
+
+        results = self.engine.execute_batch([('return 1', {}), ('return (', {})])
+        assert results[0].success
+        assert not results[1].success
+
+    def test_api_and_context(self):
+        """Test the DVGE API, console output and Math in a worker process."""
+        result = self.engine.execute_script(
+            'DVGE.setVariable("half", Math.floor(gold / 2))\nconsole.log("gold", gold)\nreturn gold', {'gold': 7}
+        )
+        assert result.success
+        assert result.result == 7
+        assert result.variables_set == {'half': 3}
+        assert result.console_logs == ['gold 7']
+
+    @pytest.mark.skipif(not script_fallback_worker.ALARM_AVAILABLE, reason="needs Unix signals")
+    def test_runaway_script_is_stopped(self):
+        """Test that a timed out script stops running and the worker is reused."""
+        result = self.engine.execute_script('while True:\n    pass', timeout_ms=200)
+        assert not result.success
+        assert result.timeout_occurred
+        assert result.error == "Script execution timed out"
+        assert result.execution_time_ms < 2000
+        assert self.engine.execute_script('return 5').result == 5
+
+    @pytest.mark.skipif(not script_fallback_worker.RESOURCE_AVAILABLE, reason="needs resource limits")
+    def test_memory_limit(self):
+        """Test that a script allocating too much memory fails cleanly."""
+        result = self.engine.execute_script('data = [0] * (10 ** 9)')
+        assert not result.success
+        assert result.error == "Script exceeded the memory limit"
+        assert self.engine.execute_script('return 6').result == 6
+
+    def test_in_process_without_workers(self):
+        """Test the thread fallback used where worker processes are not available."""
+        self.engine.fallback_workers_enabled = False
+        result = self.engine.execute_script('return x * 3', {'x': 2})
+        assert result.success
+        assert result.result == 6
+
+
+class TestFallbackWorker:
+    """Test cases for the fallback worker protocol."""
+
+    def setup_method(self):
+        self.worker = FallbackWorker()
+
+    def test_missing_script(self):
+        """Test that unknown hashes ask for the source."""
+        response = self.worker.handle({'id': 1, 'op': 'run', 'hash': 'abc', 'context': {}})
+        assert response['missing_script']
+        assert response['id'] == 1
+
+    def test_batch_uses_cached_scripts(self):
+        """Test that a script is compiled once and run over many contexts."""
+        response = self.worker.handle({
+            'id': 2, 'op': 'batch', 'scripts': {'h': 'result = x + 1'},
+            'calls': [{'hash': 'h', 'context': {'x': 1}}, {'hash': 'h', 'context': {'x': 2}}],
+        })
+        assert [result['result'] for result in response['results']] == [2, 3]
+        assert list(self.worker.scripts) == ['h']
+        assert self.worker.handle({'id': 3, 'op': 'run', 'hash': 'h', 'context': {'x': 9}})['result'] == 10
+
+    def test_check(self):
+        """Test syntax checking."""
+        assert self.worker.handle({'id': 4, 'op': 'check', 'code': 'x = 1'})['success']
+        assert not self.worker.handle({'id': 5, 'op': 'check', 'code': 'x = ('})['success']
+
+
+class TestScriptNodeExecution:
+    """Test cases for executing script nodes through an engine."""
+
+    def setup_method(self):
+        self.node = ScriptNode(node_id="script")
+        self.node.script_code = "return gold;"
+
+    def test_passes_input_and_filters_output_variables(self):
+        """Test input_variables, output_variables and the result."""
+        execution = ScriptExecutionResult()
+        execution.success = True
+        execution.result = 10
+        execution.variables_set = {'gold': 5, 'temp': 1}
+        engine = Mock()
+        engine.execute_script.return_value = execution
+
+        self.node.input_variables = ['gold']
+        self.node.output_variables = ['gold']
+        result = self.node.execute_script({'gold': 10, 'secret': 1}, engine)
+
+        engine.execute_script.assert_called_once_with("return gold;", {'gold': 10}, self.node.timeout_ms)
+        assert result['success']
+        assert result['result'] == 10
+        assert result['variables'] == {'gold': 5}
+        assert not result['timeout_occurred']
+
+    def test_validate_script(self):
+        """Test that validation is delegated to the engine."""
+        engine = Mock()
+        engine.validate_script.return_value = {"valid": False, "errors": ["x"], "warnings": []}
+        assert not self.node.validate_script(engine)['valid']
+        engine.validate_script.assert_called_once_with("return gold;")
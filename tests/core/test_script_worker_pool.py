@@ -0,0 +1,211 @@
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.script_engine import ScriptEngine
+from dvge.core.script_worker_pool import NodeWorkerPool, WorkerError, nodejs_available, script_hash
+
+
+pytestmark = pytest.mark.skipif(not nodejs_available(), reason="Node.js is not installed")
+
+
+class TestNodeWorkerPool:
+    """Test cases for the persistent Node.js worker pool."""
+
+    def setup_method(self):
+        self.pool = NodeWorkerPool(size=1, max_memory_mb=64)
+
+    def teardown_method(self):
+        self.pool.shutdown()
+
+    def test_run_returns_result_and_logs(self):
+        """Test results, console output and variables set through the API."""
+        response = self.pool.run(
+            'DVGE.setVariable("gold", gold * 2); console.log("gold", gold); return gold + 1;',
+            {'gold': 5}
+        )
+        assert response['success']
+        assert response['result'] == 6
+        assert response['console_logs'] == ['gold 5']
+        assert response['variables_set'] == {'gold': 10}
+
+    def test_workers_are_reused_and_isolated(self):
+        """Test that one worker serves many scripts without leaking globals."""
+        self.pool.run('leaked = 1; return true;')
+        response = self.pool.run('return typeof leaked;')
+        assert response['result'] == 'undefined'
+        assert len(self.pool._workers) == 1
+
+    def test_script_errors(self):
+        """Test that thrown errors are reported without killing the worker."""
+        response = self.pool.run('throw new Error("boom");')
+        assert not response['success']
+        assert response['error'] == 'boom'
+        assert not response['timed_out']
+        assert self.pool.run('return 1;')['result'] == 1
+
+    def test_code_generation_is_blocked(self):
+        """Test that eval and Function are not available to scripts."""
+        assert not self.pool.run('return eval("1 + 1");')['success']
+        assert not self.pool.run('return new Function("return 1")();')['success']
+        assert not self.pool.run('return require("fs");')['success']
+
+    def test_timeout(self):
+        """Test that a runaway script is stopped and the pool keeps working."""
+        response = self.pool.run('while (true) {}', timeout_ms=200)
+        assert not response['success']
+        assert response['timed_out']
+        assert self.pool.run('return 2;')['result'] == 2
+
+    def test_unresponsive_worker_is_replaced(self):
+        """Test that a worker that stops answering is killed and replaced."""
+        self.pool.run('return 1;')
+        worker = self.pool._workers[0]
+        with patch.object(NodeWorkerPool, '_wait', return_value=0.2):
+            # The pool gives up long before the worker's own timeout
+            response = self.pool.run('while (true) {}', timeout_ms=5000)
+        assert response['timed_out']
+        assert not worker.alive
+        assert self.pool.run('return 3;')['result'] == 3
+
+    def test_worker_with_invalid_output_is_replaced(self):
+        """Test that a worker answering with something other than JSON is discarded."""
+        garbage_worker = [sys.executable, '-c',
+                          'import sys\nfor line in sys.stdin: print("not json", flush=True)']
+        with patch.object(NodeWorkerPool, 'worker_command', return_value=garbage_worker):
+            response = self.pool.run('return 1;')
+        assert not response['success']
+        assert 'invalid response' in response['error']
+        assert self.pool._workers == [] and self.pool._started == 0
+        assert self.pool.run('return 5;')['result'] == 5
+
+    def test_workers_are_recycled(self):
+        """Test that workers are replaced after max_calls_per_worker calls."""
+        pool = NodeWorkerPool(size=1, max_calls_per_worker=2)
+        try:
+            pool.run('return 1;')
+            first = pool._workers[0]
+            pool.run('return 1;')
+            assert not first.alive
+            assert pool.run('return 4;')['result'] == 4
+            assert pool._workers[0] is not first
+        finally:
+            pool.shutdown()
+
+    def test_globals_and_builtins_do_not_leak(self):
+        """Test that changes to globals and built-ins do not reach the next script."""
+        self.pool.run('this.a = 1; globalThis.b = 2; Array.prototype.c = 3; Math.max = null; JSON = null;')
+        response = self.pool.run('return [typeof a, typeof b, typeof [].c, Math.max(1, 2), typeof JSON];')
+        assert response['result'] == ['undefined', 'undefined', 'undefined', 2, 'object']
+
+    def test_promise_callbacks_are_isolated_and_timed(self):
+        """Test that promise callbacks cannot leak globals or escape the timeout."""
+        self.pool.run('Promise.resolve().then(() => { globalThis.secret = 1; }); return true;')
+        assert self.pool.run('return typeof secret;')['result'] == 'undefined'
+
+        response = self.pool.run('Promise.resolve().then(() => { while (true) {} }); return true;',
+                                 timeout_ms=200)
+        assert not response['success']
+        assert response['timed_out']
+        assert self.pool.run('return 5;', timeout_ms=1000)['result'] == 5
+
+    def test_worker_objects_are_unreachable(self):
+        """Test that scripts cannot reach Node.js through constructors."""
+        for code in ('return this.constructor.constructor("return process")();',
+                     'return console.log.constructor("return process")();',
+                     'return DVGE.setVariable.constructor("return process")();'):
+            response = self.pool.run(code)
+            assert not response['success']
+            assert 'Code generation' in response['error']
+
+    def test_scripts_are_sent_once(self):
+        """Test that a worker is only sent the source of a script the first time."""
+        code = 'return x * 2;'
+        assert self.pool.run(code, {'x': 2})['result'] == 4
+        worker = self.pool._workers[0]
+        assert script_hash(code) in worker.known_scripts
+
+        with patch.object(worker, 'request', wraps=worker.request) as request:
+            assert self.pool.run(code, {'x': 3})['result'] == 6
+        assert request.call_args[0][0]['scripts'] == {}
+
+    def test_missing_script_is_resent(self):
+        """Test recovery when the worker no longer has a script the pool thinks it has."""
+        code = 'return x + 1;'
+        self.pool.run(code, {'x': 1})
+        worker = self.pool._workers[0]
+        worker.known_scripts.add(script_hash('return x - 1;'))
+        assert self.pool.run('return x - 1;', {'x': 1})['result'] == 0
+        worker.known_scripts.add(script_hash('return x * 3;'))
+        responses = self.pool.run_batch([('return x * 3;', {'x': 5}), (code, {'x': 5})])
+        assert [response['result'] for response in responses] == [15, 6]
+
+    def test_run_batch(self):
+        """Test many calls in one round-trip, each with its own outcome."""
+        responses = self.pool.run_batch([
+            ('return x * 2;', {'x': 1}),
+            ('return x * 2;', {'x': 2}),
+            ('return (;', {}),
+            ('while (true) {}', {}),
+            ('DVGE.setFlag("done", 1); return null;', {}),
+        ], timeout_ms=100)
+        assert [response['result'] for response in responses[:2]] == [2, 4]
+        assert not responses[2]['success'] and not responses[2]['timed_out']
+        assert responses[3]['timed_out']
+        assert responses[4]['variables_set'] == {'done': True}
+        assert self.pool.run_batch([]) == []
+
+    def test_check_syntax(self):
+        """Test syntax checking without running the script."""
+        assert self.pool.check_syntax('while (true) {}') is None
+        assert self.pool.check_syntax('return (;')
+
+    def test_shutdown(self):
+        """Test that a shut down pool refuses work."""
+        self.pool.run('return 1;')
+        self.pool.shutdown()
+        assert self.pool.run('return 1;')['error'] == "Script worker pool is shut down"
+        with pytest.raises(WorkerError):
+            self.pool.check_syntax('return 1;')
+
+
+class TestScriptEngineNodeExecution:
+    """Test cases for ScriptEngine running on the worker pool."""
+
+    def test_execute_script(self):
+        """Test context from the variable system and results."""
+        variable_system = Mock(variables={'gold': 10}, flags={'brave': True})
+        engine = ScriptEngine(variable_system)
+        result = engine.execute_script('return brave ? gold + bonus : 0;', {'bonus': 5})
+        assert result.success
+        assert result.result == 15
+
+    def test_timeout(self):
+        """Test that timeouts are reported on the result."""
+        result = ScriptEngine().execute_script('while (true) {}', timeout_ms=200)
+        assert not result.success
+        assert result.timeout_occurred
+        assert result.error == "Script execution timed out"
+
+    def test_execute_batch(self):
+        """Test one script over many contexts and many scripts at once."""
+        engine = ScriptEngine()
+        results = engine.execute_batch('return level * 10;', [{'level': 1}, {'level': 2}])
+        assert [result.result for result in results] == [10, 20]
+
+        results = engine.execute_batch([('return 1;', {}), ('while (true) {}', {})], timeout_ms=100)
+        assert results[0].success
+        assert results[1].timeout_occurred
+        assert results[1].error == "Script execution timed out"
+
+    def test_validate_script(self):
+        """Test syntax errors found by validation."""
+        engine = ScriptEngine()
+        assert engine.validate_script('return 1;')['valid']
+        validation = engine.validate_script('return (;')
+        assert not validation['valid']
+        assert validation['errors'][0].startswith("Syntax error")
@@ -0,0 +1,138 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.constants import NODE_WIDTH
+from dvge.core.node_map import LazyNodeMap
+from dvge.core.spatial_index import DEFAULT_NODE_HEIGHT, NodeSpatialIndex, SpatialIndex, node_bounds
+from dvge.models import DialogueNode
+
+
+class TestSpatialIndex:
+    """Test cases for the grid of rectangles."""
+
+    def setup_method(self):
+        """Set up rectangles spread over several grid cells."""
+        self.index = SpatialIndex(cell_size=100)
+        self.index.insert("a", (0, 0, 50, 50))
+        self.index.insert("b", (40, 40, 120, 90))
+        self.index.insert("c", (500, 500, 550, 550))
+        self.index.insert("wide", (-1000, 300, 1000, 320))
+
+    def test_query_overlapping(self):
+        """Test area queries return overlapping rectangles in insertion order."""
+        assert self.index.query((45, 45, 60, 60)) == ["a", "b"]
+        assert self.index.query((60, 60, 45, 45)) == ["a", "b"]
+        assert self.index.query((0, 310, 10, 400)) == ["wide"]
+        assert self.index.query((200, 200, 250, 250)) == []
+
+    def test_query_enclosed(self):
+        """Test that enclosed queries skip rectangles sticking out of the area."""
+        assert self.index.query((-10, -10, 100, 100), enclosed=True) == ["a"]
+        assert self.index.query((-10, -10, 130, 100), enclosed=True) == ["a", "b"]
+
+    def test_large_query_area(self):
+        """Test queries far larger than the occupied grid."""
+        assert self.index.query((-10**7, -10**7, 10**7, 10**7)) == ["a", "b", "c", "wide"]
+
+    def test_at_point_prefers_topmost(self):
+        """Test that the rectangle inserted last wins where rectangles overlap."""
+        assert self.index.at_point(45, 45) == "b"
+        assert self.index.at_point(10, 10) == "a"
+        assert self.index.at_point(700, 10) is None
+
+        # Moving a rectangle keeps its place in the stacking order
+        self.index.insert("a", (30, 30, 80, 80))
+        assert self.index.at_point(45, 45) == "b"
+
+    def test_move_and_remove(self):
+        """Test that moved and removed rectangles leave their old cells."""
+        self.index.insert("c", (0, 0, 10, 10))
+        assert self.index.query((500, 500, 510, 510)) == []
+        assert "c" in self.index.query((0, 0, 5, 5))
+
+        self.index.remove("c")
+        self.index.remove("missing")
+        assert "c" not in self.index
+        assert len(self.index) == 3
+        assert self.index.query((0, 0, 5, 5)) == ["a"]
+
+    def test_bounds_and_center(self):
+        """Test the bounds and mean center as rectangles change."""
+        assert self.index.bounds() == (-1000, 0, 1000, 550)
+        assert self.index.bounds(["a", "b", "missing"]) == (0, 0, 120, 90)
+        assert self.index.bounds(["missing"]) is None
+
+        # Removing an edge rectangle shrinks the bounds
+        self.index.remove("wide")
+        self.index.remove("c")
+        assert self.index.bounds() == (0, 0, 120, 90)
+        self.index.insert("d", (200, -50, 210, 10))
+        assert self.index.bounds() == (0, -50, 210, 90)
+        assert self.index.mean_center() == pytest.approx(((25 + 80 + 205) / 3, (25 + 65 - 20) / 3))
+
+        self.index.clear()
+        assert self.index.bounds() is None
+        assert self.index.mean_center() is None
+
+
+class TestNodeSpatialIndex:
+    """Test cases for the index of node areas."""
+
+    def setup_method(self):
+        """Set up nodes in a row."""
+        self.nodes = {f"n{i}": DialogueNode(i * 400, 0, f"n{i}") for i in range(5)}
+        self.index = NodeSpatialIndex()
+        self.index.sync(self.nodes)
+
+    def test_node_areas(self):
+        """Test that nodes are indexed by the area they cover."""
+        node = self.nodes["n1"]
+        assert self.index.rect("n1") == node_bounds(node)
+        assert self.index.rect("n1")[2] == 400 + NODE_WIDTH
+        assert self.index.at_point(410, 20) == "n1"
+        assert self.index.at_point(390, 20) is None
+
+    def test_sync_updates_only_changed_nodes(self):
+        """Test that sync re-measures moved, re-rendered, added and removed nodes."""
+        assert self.index.sync(self.nodes) == []
+
+        self.nodes["n2"].x = 5000
+        self.nodes["n3"].calculated_text_height = 400
+        self.nodes["new"] = DialogueNode(0, 900, "new")
+        del self.nodes["n4"]
+        assert sorted(self.index.sync(self.nodes)) == ["n2", "n3", "n4", "new"]
+
+        assert self.index.at_point(5010, 20) == "n2"
+        assert self.index.rect("n3")[3] == self.nodes["n3"].get_height()
+        assert self.index.query((0, 800, 100, 1000)) == ["new"]
+        assert "n4" not in self.index
+
+    def test_update_node(self):
+        """Test moving a node without a full sync."""
+        node = self.nodes["n0"]
+        node.x, node.y = 2000, 2000
+        self.index.update_node(node)
+        assert self.index.at_point(2010, 2010) == "n0"
+        assert self.index.sync(self.nodes) == []
+
+    def test_lazy_nodes_stay_unbuilt(self):
+        """Test that nodes of a lazily loaded project are indexed without building them."""
+        nodes = LazyNodeMap({
+            "intro": DialogueNode(0, 0, "intro").to_dict(),
+            "far": DialogueNode(3000, 1000, "far").to_dict(),
+        })
+        index = NodeSpatialIndex()
+        index.sync(nodes)
+
+        assert index.rect("far") == (3000, 1000, 3000 + NODE_WIDTH, 1000 + DEFAULT_NODE_HEIGHT)
+        assert index.query((2900, 900, 3100, 1100)) == ["far"]
+        assert nodes.unmaterialized_count == 2
+
+        # Built nodes are measured from the node object on the next sync
+        nodes["far"].x = 100
+        assert index.sync(nodes) == ["far"]
+        assert index.at_point(110, 1010) == "far"
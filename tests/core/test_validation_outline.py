@@ -0,0 +1,68 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+pytest.importorskip("customtkinter")
+
+from dvge.constants import COLOR_ERROR, COLOR_WARNING
+from dvge.core.live_validation import ValidationIssue
+from dvge.models.dialogue_node import DialogueNode
+from dvge.ui.canvas.canvas_manager import CanvasManager
+from dvge.ui.canvas.viewport import RENDER_FULL
+from dvge.ui.canvas.enhanced_node_renderer import EnhancedNodeRenderer
+from dvge.ui.canvas.node_themes import theme_manager
+from unittest.mock import Mock
+
+
+class TestValidationOutline:
+    """Test cases for outlining nodes with validation issues."""
+
+    def setup_method(self):
+        """Set up a canvas manager with one drawn node on a fake canvas."""
+        self.node = DialogueNode(0, 0, "n1", text="Line")
+        self.node.canvas_item_ids['border'] = 42
+
+        self.canvas = Mock()
+        # The canvas belongs to a frame, not to the app
+        self.canvas.master = Mock(spec=[])
+
+        self.manager = CanvasManager.__new__(CanvasManager)
+        self.manager.app = Mock(spec=['nodes'])
+        self.manager.app.nodes = {"n1": self.node}
+        self.manager.canvas = self.canvas
+        self.manager.use_enhanced_rendering = True
+        self.manager.enhanced_node_renderer = EnhancedNodeRenderer(self.canvas)
+        self.manager.rendered_nodes = {"n1": RENDER_FULL}
+
+    def _border_outline(self):
+        call = self.canvas.itemconfig.call_args
+        assert call.args == (42,)
+        return call.kwargs['outline']
+
+    def test_border_is_set_and_cleared(self):
+        """Test that the border takes the issue colour and returns to the theme colour."""
+        self.manager.show_validation_issues({"n1": [ValidationIssue("n1", "error", "Broken link")]})
+        assert self._border_outline() == COLOR_ERROR
+
+        self.manager.show_validation_issues({"n1": [ValidationIssue("n1", "warning", "Unreachable")]})
+        assert self._border_outline() == COLOR_WARNING
+
+        self.manager.show_validation_issues({"n1": []})
+        assert self._border_outline() == theme_manager.get_theme_for_node(self.node).border_color
+
+    def test_highlight_wins_over_outline(self):
+        """Test that a condition highlight is shown over the outline and the outline comes back."""
+        renderer = self.manager.enhanced_node_renderer
+        self.manager.show_validation_issues({"n1": [ValidationIssue("n1", "error", "Broken link")]})
+
+        renderer.get_node_state("n1").is_highlighted = True
+        renderer.get_node_state("n1").highlight_color = "#00FF00"
+        renderer.refresh_outline(self.node)
+        assert self._border_outline() == "#00FF00"
+
+        renderer.get_node_state("n1").is_highlighted = False
+        renderer.refresh_outline(self.node)
+        assert self._border_outline() == COLOR_ERROR
@@ -0,0 +1,56 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.core.variable_system import VariableSystem, compile_template
+
+
+class TestTextSubstitution:
+    """Test cases for compiled text substitution templates."""
+
+    def setup_method(self):
+        self.var_system = VariableSystem()
+        self.var_system.set_variables_ref({"gold": 7, "name": "Ann", "level": 3})
+        self.var_system.set_flags_ref({"has_key": True, "met_king": False})
+
+    def test_variables_and_flags(self):
+        """Test that variable and flag placeholders are replaced."""
+        text = "Hello {name}, {gold} gold, key: {has_key}, king: {met_king}"
+
+        assert self.var_system.substitute_text(text) == "Hello Ann, 7 gold, key: true, king: false"
+
+    def test_unknown_placeholders_are_kept(self):
+        """Test that placeholders without a variable or flag stay unchanged."""
+        assert self.var_system.substitute_text("{unknown} and {}") == "{unknown} and {}"
+
+    def test_math_with_nested_variables(self):
+        """Test that math expressions see substituted variables."""
+        assert self.var_system.substitute_text("{= {gold} * 2} coins") == "14 coins"
+        assert self.var_system.substitute_text("{= 10/4}") == "2.5"
+        assert self.var_system.substitute_text("{=bad}") == "0"
+
+    def test_conditionals(self):
+        """Test conditional text on variables and flags."""
+        assert self.var_system.substitute_text("{gold > 5 ? rich : poor}!") == "rich!"
+        assert self.var_system.substitute_text("{has_key ? open : closed}") == "open"
+        assert self.var_system.substitute_text("{level >= 4 ? Veteran : Rookie}") == "Rookie"
+
+    def test_values_are_read_at_render_time(self):
+        """Test that a cached template reflects later variable changes."""
+        self.var_system.substitute_text("{gold}")
+        self.var_system.variables["gold"] = 8
+
+        assert self.var_system.substitute_text("{gold}") == "8"
+
+    def test_templates_are_cached(self):
+        """Test that a text is only parsed once."""
+        assert compile_template("Hi {name}") is compile_template("Hi {name}")
+
+    def test_unrelated_variables_do_not_matter(self):
+        """Test that substitution is unaffected by many unused variables."""
+        self.var_system.variables.update({f"var_{i}": i for i in range(2000)})
+
+        assert self.var_system.substitute_text("{name} has {var_1999}") == "Ann has 1999"
@@ -0,0 +1 @@
+# Runtime tests package
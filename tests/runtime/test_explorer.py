@@ -0,0 +1,111 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.models import CombatNode, DialogueNode, DiceRollNode
+from dvge.runtime import END_GAME, RuntimeState, StoryProject
+from dvge.runtime.explorer import StateExplorer, bucketed, clamped, exact_values
+
+
+def gold_option(text, next_node, amount):
+    return {'text': text, 'nextNode': next_node,
+            'effects': [{'type': 'variable', 'subject': 'gold', 'operator': '+=', 'value': amount}]}
+
+
+def make_project():
+    """A vault that needs 20 gold when only 10 can be earned, and a key path."""
+    nodes = [
+        DialogueNode(0, 0, "intro", options=[
+            gold_option("Work", "town", 10),
+            {'text': "Take key", 'nextNode': "town",
+             'effects': [{'type': 'item', 'subject': "Key", 'operator': 'add'}]},
+        ]),
+        DialogueNode(0, 0, "town", options=[
+            {'text': "Vault", 'nextNode': "vault",
+             'conditions': [{'type': 'variable', 'subject': 'gold', 'operator': '>=', 'value': 20}]},
+            {'text': "Door", 'nextNode': "door",
+             'conditions': [{'type': 'item', 'subject': "Key", 'operator': 'has'}]},
+            {'text': "Leave", 'nextNode': END_GAME},
+        ]),
+        DialogueNode(0, 0, "vault", options=[{'text': "End", 'nextNode': END_GAME}]),
+        DiceRollNode(0, 0, "door", num_dice=1, num_sides=6, success_threshold=7,
+                     success_node="treasure", failure_node="trap"),
+        DialogueNode(0, 0, "treasure"),
+        DialogueNode(0, 0, "trap", text="The end of you."),
+        DialogueNode(0, 0, "island", text="Not linked at all."),
+    ]
+    return StoryProject({node.id: node for node in nodes}, variables={'gold': 0})
+
+
+class TestStateExplorer:
+    """Test cases for exhaustive state-space exploration."""
+
+    def test_conditionally_unreachable_nodes(self):
+        """Test that nodes behind unsatisfiable conditions or rolls are reported."""
+        project = make_project()
+        result = StateExplorer(project).explore()
+
+        assert result.complete
+        assert result.reachable_nodes == {"intro", "town", "door", "trap"}
+        # The island is not linked, so graph validation already reports it
+        assert result.conditionally_unreachable == ["treasure", "vault"]
+        assert result.unavailable_choices(project) == [("town", 0)]
+        assert result.endings == {"town"}
+
+    def test_dead_end_states(self):
+        """Test that stuck states are counted and kept as examples."""
+        result = StateExplorer(make_project()).explore()
+
+        assert result.dead_ends == {"trap": 1}
+        assert result.dead_end_examples[0]['current_node'] == "trap"
+        assert result.dead_end_examples[0]['player_inventory'][0]['name'] == "Key"
+
+    def test_loops_terminate_with_abstraction(self):
+        """Test that an unbounded counter is explored finitely when clamped."""
+        grind = DialogueNode(0, 0, "intro", options=[
+            gold_option("Grind", "intro", 1),
+            {'text': "Rich", 'nextNode': "rich",
+             'conditions': [{'type': 'variable', 'subject': 'gold', 'operator': '>=', 'value': 5}]},
+        ])
+        project = StoryProject({"intro": grind, "rich": DialogueNode(0, 0, "rich")}, variables={'gold': 0})
+
+        bounded = StateExplorer(project, abstraction=clamped(0, 5)).explore()
+        assert bounded.complete
+        assert "rich" in bounded.reachable_nodes
+
+        limited = StateExplorer(project, max_states=50).explore()
+        assert not limited.complete
+        assert limited.states == 50
+
+    def test_combat_takes_both_outcomes_when_possible(self):
+        """Test that combat branches to victory and defeat only when each can happen."""
+        combat = CombatNode(0, 0, "intro", successNode="won", failNode="lost")
+        nodes = {"intro": combat, "won": DialogueNode(0, 0, "won"), "lost": DialogueNode(0, 0, "lost")}
+
+        even = StateExplorer(StoryProject(nodes, player_stats={'strength': 30, 'defense': 5, 'health': 100})).explore()
+        strong = StateExplorer(StoryProject(nodes, player_stats={'strength': 90})).explore()
+
+        assert {"won", "lost"} <= even.reachable_nodes
+        assert "lost" not in strong.reachable_nodes
+
+    def test_state_digest(self):
+        """Test which state differences are told apart."""
+        explorer = StateExplorer(make_project())
+        base = RuntimeState({'hp': 10.0}, [{'name': "Key"}], {'met': False}, {}, {'gold': 12})
+        same = RuntimeState({'hp': 10}, [{'name': "Key", 'description': "x"}], {}, {}, {'gold': 12})
+        other = RuntimeState({'hp': 10}, [], {}, {}, {'gold': 12})
+
+        assert explorer.state_digest(base) == explorer.state_digest(same)
+        assert explorer.state_digest(base) != explorer.state_digest(other)
+        assert len(explorer.state_digest(base)) == 8
+
+    def test_abstractions(self):
+        """Test bucketing and clamping of numeric values."""
+        assert bucketed(10)('gold', 17) == bucketed(10)('gold', 11) == 1
+        assert bucketed(10, names=['gold'])('hp', 17) == 17
+        assert clamped(0, 5)('gold', 99) == 5
+        assert exact_values('gold', 3.0) == 3
+        assert bucketed(10)('flag', True) is True
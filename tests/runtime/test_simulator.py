@@ -0,0 +1,78 @@
+import pytest
+import sys
+import os
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.models import DialogueNode
+from dvge.runtime import END_GAME, RUN_DEAD_END, RUN_ENDED, RUN_MAX_STEPS, StoryProject
+from dvge.runtime.simulator import SimulationReport, first_choice_policy, run_batch, simulate
+
+
+def make_project():
+    """Two endings, a loop, a soft-lock and an option that needs a missing flag."""
+    nodes = [
+        DialogueNode(0, 0, "intro", options=[
+            {'text': "Left", 'nextNode': "left",
+             'effects': [{'type': 'variable', 'subject': 'gold', 'operator': '+=', 'value': 10}]},
+            {'text': "Right", 'nextNode': "right"},
+            {'text': "Secret", 'nextNode': "secret",
+             'conditions': [{'type': 'flag', 'subject': 'chosen_one', 'operator': 'is', 'value': True}]},
+        ]),
+        DialogueNode(0, 0, "left", options=[{'text': "End", 'nextNode': END_GAME}]),
+        DialogueNode(0, 0, "right", options=[{'text': "Back", 'nextNode': "intro"},
+                                              {'text': "On", 'nextNode': "pit"}]),
+        DialogueNode(0, 0, "pit", text="No way out."),
+        DialogueNode(0, 0, "secret", options=[{'text': "End", 'nextNode': END_GAME}]),
+    ]
+    return StoryProject({node.id: node for node in nodes}, variables={'gold': 0})
+
+
+class TestSimulator:
+    """Test cases for Monte Carlo playthroughs."""
+
+    def test_report_statistics(self):
+        """Test endings, soft-locks, visits and unreachable choices."""
+        project = make_project()
+        report = simulate(project, runs=400, seed=1, workers=1)
+
+        assert report.runs == 400
+        assert set(report.outcomes) == {RUN_ENDED, RUN_DEAD_END}
+        assert list(report.endings) == ["left"]
+        assert list(report.soft_locks) == ["pit"]
+        assert report.node_visits["intro"] >= 400
+        assert report.unvisited_nodes(project) == ["secret"]
+        assert report.unreachable_choices(project) == [("intro", 2)]
+        assert sum(report.variable_histograms['gold'].values()) == 400
+        assert set(report.variable_histograms['gold']) == {0, 10}
+
+    def test_policy_and_step_limit(self):
+        """Test policy-driven runs and stopping at max_steps."""
+        project = make_project()
+        report = run_batch(project, 3, policy=first_choice_policy)
+        assert report.outcomes == {RUN_ENDED: 3}
+        assert report.options_taken[("intro", 0)] == 3
+
+        back_and_forth = lambda runtime, choices: choices[1] if runtime.current_node_id == "intro" else choices[0]
+        report = run_batch(project, 2, policy=back_and_forth, max_steps=9)
+        assert report.outcomes == {RUN_MAX_STEPS: 2}
+        assert report.total_steps == 18
+
+    def test_seeded_simulation_is_reproducible(self):
+        """Test that a seed gives the same report, also across worker processes."""
+        project = make_project()
+        first = simulate(project, runs=600, seed=5, workers=1).to_dict(project)
+        second = simulate(project, runs=600, seed=5, workers=2).to_dict(project)
+
+        assert first == second
+
+    def test_merge_and_bins(self):
+        """Test merging reports and binning histogram values."""
+        report = SimulationReport(bin_width=10)
+        report._add_values(report.variable_histograms, {'gold': 17, 'flag': True, 'name': "x"})
+        other = SimulationReport(bin_width=10)
+        other._add_values(other.variable_histograms, {'gold': 12})
+        report.merge(other)
+
+        assert report.variable_histograms == {'gold': {10: 2}}
@@ -0,0 +1,183 @@
+import pytest
+import sys
+import os
+import json
+import random
+import subprocess
+from unittest.mock import Mock, patch
+
+# Add the project root to Python path for testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from dvge.models import DialogueNode, DiceRollNode, RandomEventNode
+from dvge.runtime import (
+    ACTION_ROLL_DICE, END_GAME, RUN_DEAD_END, RUN_ENDED, RUN_MAX_STEPS,
+    RuntimeState, StoryProject, StoryRuntime, load_project
+)
+from dvge.runtime.rules import apply_effects
+
+
+def make_project():
+    """A small story: a gated option, effects, a dice roll and two endings."""
+    intro = DialogueNode(0, 0, "intro", text="A locked door.", options=[
+        {'text': "Open it", 'nextNode': "hall",
+         'conditions': [{'type': 'item', 'subject': "Key", 'operator': 'has'}]},
+        {'text': "Search", 'nextNode': "intro",
+         'effects': [{'type': 'item', 'subject': "Key", 'operator': 'add'},
+                     {'type': 'variable', 'subject': 'searches', 'operator': '+=', 'value': 1}]},
+    ])
+    hall = DiceRollNode(0, 0, "hall", text="Jump the gap", num_dice=1, num_sides=6,
+                        success_threshold=4, success_node="win", failure_node="lose")
+    win = DialogueNode(0, 0, "win", options=[{'text': "The end", 'nextNode': END_GAME}])
+    lose = DialogueNode(0, 0, "lose", text="Stuck forever.")
+    return StoryProject({node.id: node for node in (intro, hall, win, lose)},
+                        player_stats={'health': 100}, variables={'searches': 0})
+
+
+class TestStoryRuntime:
+    """Test cases for the headless story runtime."""
+
+    def test_conditions_and_effects(self):
+        """Test that options are gated by state and effects change it."""
+        runtime = StoryRuntime(make_project())
+
+        assert [choice.text for choice in runtime.choices()] == ["Search"]
+        runtime.step(0)
+
+        assert runtime.current_node_id == "intro"
+        assert runtime.state.variables['searches'] == 1
+        assert [choice.text for choice in runtime.choices()] == ["Open it", "Search"]
+        assert runtime.step(0) == "hall"
+        assert runtime.choices()[0].action == ACTION_ROLL_DICE
+
+    def test_options_edited_in_place(self):
+        """Test that options and conditions edited without touching the node are picked up."""
+        project = make_project()
+        runtime = StoryRuntime(project)
+        assert [choice.text for choice in runtime.choices()] == ["Search"]
+
+        intro = project.nodes["intro"]
+        intro.options[0]['conditions'][0]['operator'] = 'not_has'
+        intro.options[1]['text'] = "Look around"
+        runtime.reset()
+
+        assert [choice.text for choice in runtime.choices()] == ["Open it", "Look around"]
+
+    def test_project_state_is_not_modified(self):
+        """Test that playthroughs start from a copy of the project state."""
+        project = make_project()
+        runtime = StoryRuntime(project)
+        runtime.step(0)
+        runtime.reset()
+
+        assert project.variables == {'searches': 0}
+        assert project.player_inventory == []
+        assert runtime.state.variables == {'searches': 0}
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test that the same seed gives the same playthrough."""
+        endings = []
+        for _ in range(2):
+            runtime = StoryRuntime(make_project(), rng=random.Random(7))
+            runtime.run()
+            endings.append((runtime.current_node_id, runtime.history))
+
+        assert endings[0] == endings[1]
+
+    def test_run_reasons(self):
+        """Test that run() reports endings, dead ends and the step limit."""
+        always_first = lambda runtime, choices: choices[-1] if len(choices) == 1 else choices[0]
+        runtime = StoryRuntime(make_project(), rng=Mock(randint=Mock(return_value=6)))
+        assert runtime.run(always_first) == RUN_ENDED
+        assert runtime.history == ["intro", "hall", "win"]
+
+        runtime = StoryRuntime(make_project(), rng=Mock(randint=Mock(return_value=1)))
+        assert runtime.run(always_first) == RUN_DEAD_END
+        assert runtime.current_node_id == "lose"
+
+        runtime = StoryRuntime(make_project())
+        assert runtime.run(lambda runtime, choices: choices[-1], max_steps=5) == RUN_MAX_STEPS
+        assert runtime.steps == 5
+
+    def test_random_event(self):
+        """Test that random events follow the chosen outcome."""
+        event = RandomEventNode(0, 0, "intro", random_outcomes=[
+            {'description': "Rain", 'weight': 1, 'next_node': "a"},
+            {'description': "Sun", 'weight': 3, 'next_node': "b"},
+        ])
+        project = StoryProject({"intro": event, "a": DialogueNode(0, 0, "a"), "b": DialogueNode(0, 0, "b")})
+        runtime = StoryRuntime(project, rng=Mock(random=Mock(return_value=0.9)))
+
+        assert runtime.step(0) == "b"
+
+    def test_state_copy_is_independent(self):
+        """Test that copied states can be changed without affecting the original."""
+        state = RuntimeState({'hp': 1}, [{'name': "Key"}], {'met': True}, {'q': {'state': 'active'}}, {'gold': 3})
+        copy = state.copy()
+        copy.player_inventory[0]['name'] = "Map"
+        copy.quests['q']['state'] = 'completed'
+        copy.var_system.apply_variable_effect('gold', '+=', 2)
+
+        assert state.player_inventory == [{'name': "Key"}]
+        assert state.quests['q']['state'] == 'active'
+        assert state.variables['gold'] == 3
+        assert copy.variables['gold'] == 5
+
+
+class TestLoadProject:
+    """Test cases for loading projects headlessly."""
+
+    def test_load_dvgproj(self, tmp_path):
+        """Test loading a saved project file and playing it."""
+        project = make_project()
+        path = tmp_path / "story.dvgproj"
+        path.write_text(json.dumps({
+            "player_stats": project.player_stats,
+            "player_inventory": [],
+            "story_flags": {},
+            "variables": project.variables,
+            "quests": {},
+            "nodes": {node_id: node.to_dict() for node_id, node in project.nodes.items()},
+        }))
+
+        loaded = load_project(str(path))
+        runtime = StoryRuntime(loaded)
+        runtime.step(0)
+
+        assert isinstance(loaded.nodes["hall"], DiceRollNode)
+        assert runtime.state.variables['searches'] == 1
+
+    def test_runtime_does_not_import_tk(self):
+        """Test that the runtime can be imported without the GUI toolkit."""
+        code = "import sys, dvge.runtime; print('tkinter' in sys.modules or 'customtkinter' in sys.modules)"
+        root = os.path.join(os.path.dirname(__file__), '../..')
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+
+        assert output.stdout.strip() == "False"
+
+
+class TestPreviewSemantics:
+    """Test cases checking the preview engine and runtime agree."""
+
+    def test_effects_match_preview(self):
+        """Test that the same effects give the same state in both engines."""
+        from dvge.core.preview_engine import EnhancedPreviewGameEngine
+
+        effects = [
+            {'type': 'stat', 'subject': 'health', 'operator': '-=', 'value': '15'},
+            {'type': 'item', 'subject': "Sword", 'operator': 'add'},
+            {'type': 'flag', 'subject': 'brave', 'value': 'True'},
+            {'type': 'variable', 'subject': 'gold', 'operator': '+=', 'value': '{gold} * 2'},
+        ]
+        project = StoryProject({}, player_stats={'health': 100}, variables={'gold': 5})
+        app = Mock(nodes={}, player_stats={'health': 100}, player_inventory=[],
+                   story_flags={}, variables={'gold': 5}, quests={})
+        with patch.object(EnhancedPreviewGameEngine, '_initialize_feature_systems'):
+            preview = EnhancedPreviewGameEngine(app)
+        runtime = StoryRuntime(project)
+
+        preview._apply_effects(effects)
+        apply_effects(runtime.state, effects)
+
+        for name in ('player_stats', 'player_inventory', 'story_flags', 'variables'):
+            assert getattr(preview, name) == getattr(runtime.state, name)
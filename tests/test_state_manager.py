@@ -24,6 +24,8 @@ class TestStateManager:
         self.mock_app.quests = {}
         self.mock_app.enemies = {}
         self.mock_app.timers = {}
+        self.mock_app.active_node_id = None
+        self.mock_app.selected_node_ids = []
         
         self.state_manager = StateManager(self.mock_app)
     
@@ -62,4 +64,141 @@ class TestStateManager:
         self.state_manager.clear_history()
         
         assert len(self.state_manager.undo_stack) == 0
-        assert len(self.state_manager.redo_stack) == 0
\ No newline at end of file
+        assert len(self.state_manager.redo_stack) == 0
+
+class TestStructuralSharing:
+    """Test that history cost scales with the size of the change."""
+    
+    def setup_method(self):
+        """Set up an app with real dialogue nodes."""
+        from dvge.models import DialogueNode
+        
+        self.mock_app = Mock()
+        self.mock_app.nodes = {
+            f"n{i}": DialogueNode(i * 10, 0, f"n{i}", text=f"Node {i}",
+                                  options=[{"text": "Next", "nextNode": f"n{i + 1}"}])
+            for i in range(20)
+        }
+        self.mock_app.player_stats = {"health": 100}
+        self.mock_app.player_inventory = []
+        self.mock_app.story_flags = {}
+        self.mock_app.variables = {}
+        self.mock_app.quests = {}
+        self.mock_app.enemies = {}
+        self.mock_app.timers = {}
+        self.mock_app.project_settings = {}
+        self.mock_app.node_id_counter = 20
+        self.mock_app.active_node_id = None
+        self.mock_app.selected_node_ids = []
+        
+        self.state_manager = StateManager(self.mock_app)
+        self.state_manager.save_state("Initial State")
+    
+    def _count_to_dict_calls(self, action):
+        """Runs an action and counts node serializations."""
+        calls = []
+        for node in self.mock_app.nodes.values():
+            original = node.to_dict
+            node.__dict__['to_dict'] = lambda original=original: calls.append(1) or original()
+        action()
+        for node in self.mock_app.nodes.values():
+            node.__dict__.pop('to_dict', None)
+        return len(calls)
+    
+    def test_unchanged_nodes_are_shared(self):
+        """Test that a snapshot only serializes and stores edited nodes."""
+        self.mock_app.nodes["n3"].text = "Edited"
+        
+        calls = self._count_to_dict_calls(lambda: self.state_manager.save_state("Edit"))
+        
+        first, second = self.state_manager.undo_stack
+        assert calls == 1
+        assert second['changed_node_ids'] == {"n3"}
+        assert second['nodes']["n3"] is not first['nodes']["n3"]
+        assert second['nodes']["n0"] is first['nodes']["n0"]
+        assert second['player_stats'] is first['player_stats']
+    
+    def test_in_place_edit_of_marked_node(self):
+        """Test that marking a node dirty captures in-place edits."""
+        self.mock_app.nodes["n5"].options[0]["text"] = "Changed"
+        self.state_manager.mark_dirty("n5")
+        self.state_manager.save_state("Edit option")
+        
+        latest = self.state_manager.undo_stack[-1]
+        assert latest['changed_node_ids'] == {"n5"}
+        assert latest['nodes']["n5"]['game_data']['options'][0]['text'] == "Changed"
+    
+    def test_undo_redo_rebuild_only_changed_nodes(self):
+        """Test that undo and redo only recreate the changed nodes."""
+        untouched = self.mock_app.nodes["n0"]
+        self.mock_app.nodes["n7"].text = "Edited"
+        self.state_manager.save_state("Edit")
+        
+        assert self.state_manager.undo() is True
+        assert self.mock_app.nodes["n7"].text == "Node 7"
+        assert self.mock_app.nodes["n0"] is untouched
+        
+        assert self.state_manager.redo() is True
+        assert self.mock_app.nodes["n7"].text == "Edited"
+        assert self.mock_app.nodes["n0"] is untouched
+    
+    def test_undo_restores_deleted_node(self):
+        """Test that undoing a deletion brings the node back."""
+        del self.mock_app.nodes["n4"]
+        self.state_manager.save_state("Delete")
+        
+        assert "n4" in self.state_manager.undo_stack[-1]['changed_node_ids']
+        self.state_manager.undo()
+        
+        assert self.mock_app.nodes["n4"].text == "Node 4"
+    
+    def test_restored_nodes_do_not_alias_history(self):
+        """Test that editing a restored node leaves the snapshots intact."""
+        self.mock_app.nodes["n2"].text = "Edited"
+        self.state_manager.save_state("Edit")
+        self.state_manager.undo()
+        
+        self.mock_app.nodes["n2"].options[0]["text"] = "Mutated"
+        
+        snapshot = self.state_manager.undo_stack[-1]['nodes']["n2"]
+        assert snapshot['game_data']['options'][0]['text'] == "Next"
+    
+    def test_undo_refreshes_only_changed_nodes(self):
+        """Test that undo asks the canvas to redraw just the changed nodes."""
+        self.mock_app.nodes["n7"].text = "Edited"
+        self.state_manager.save_state("Edit")
+        del self.mock_app.nodes["n9"]
+        self.state_manager.save_state("Delete")
+        
+        self.state_manager.undo()
+        
+        canvas_manager = self.mock_app.canvas_manager
+        canvas_manager.redraw_all_nodes.assert_not_called()
+        canvas_manager.refresh_nodes.assert_called_once_with({"n9"}, set(), set(), [])
+        
+        self.state_manager.undo()
+        
+        assert canvas_manager.refresh_nodes.call_args[0][:3] == (set(), set(), {"n7"})
+    
+    def test_lazy_nodes_are_snapshotted_without_building(self):
+        """Test that nodes never built since loading are shared, not serialized."""
+        from dvge.core.node_map import LazyNodeMap
+        
+        raw = {node_id: node.to_dict() for node_id, node in self.mock_app.nodes.items()}
+        self.mock_app.nodes = LazyNodeMap(raw)
+        self.state_manager.clear_history()
+        self.state_manager.save_state("Load Project")
+        
+        self.mock_app.nodes["n1"].text = "Edited"
+        self.state_manager.save_state("Edit")
+        
+        first, second = self.state_manager.undo_stack
+        assert first['nodes']["n5"] is raw["n5"]
+        assert second['nodes']["n5"] is raw["n5"]
+        assert second['changed_node_ids'] == {"n1"}
+        assert self.mock_app.nodes.unmaterialized_count == 19
+        
+        self.state_manager.undo()
+        
+        assert self.mock_app.nodes["n1"].text == "Node 1"
+        assert self.mock_app.nodes.unmaterialized_count == 19